@@ -0,0 +1,61 @@
+"""
+Management command to rebuild AttendanceSummary rows from StudentAttendance.
+
+Summaries are maintained incrementally on every attendance write; this is
+the repair path (after imports, raw SQL fixes or a bug). Each tenant is
+rebuilt with one grouped aggregation query and a bulk upsert.
+
+Usage:
+    python manage.py rebuild_attendance_summaries --schema_name=school_demo
+    python manage.py rebuild_attendance_summaries --all
+    python manage.py rebuild_attendance_summaries --schema_name=school_demo --academic_year=<id> --month=2026-10
+"""
+
+from datetime import datetime
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.attendance.services.summary import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild attendance summaries for a tenant, academic year or month'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schema_name', type=str, help='Tenant schema to rebuild (e.g., school_demo)')
+        parser.add_argument('--all', action='store_true', help='Rebuild every active tenant')
+        parser.add_argument('--academic_year', type=str, help='Only this academic year (id)')
+        parser.add_argument('--month', type=str, help='Only this month (YYYY-MM)')
+
+    def handle(self, *args, **options):
+        month = None
+        if options.get('month'):
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--month must be YYYY-MM')
+
+        if options.get('all'):
+            from apps.tenants.models import School
+            schemas = list(School.objects.filter(is_active=True).values_list('schema_name', flat=True))
+        elif options.get('schema_name'):
+            schemas = [options['schema_name']]
+        elif connection.vendor != 'postgresql':
+            schemas = [None]  # single-schema (local/test) database
+        else:
+            raise CommandError('Provide --schema_name=<name> or --all')
+
+        for schema_name in schemas:
+            if schema_name and connection.vendor == 'postgresql':
+                from django_tenants.utils import schema_context
+                context = schema_context(schema_name)
+            else:
+                context = nullcontext()
+
+            with context:
+                count = rebuild_summaries(academic_year_id=options.get('academic_year'), month=month)
+            self.stdout.write(f"  {schema_name or 'default'}: {count} summaries")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt attendance summaries for {len(schemas)} tenant(s)."))
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+def backfill_half_days(apps, schema_editor):
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+    StudentAttendance = apps.get_model('attendance', 'StudentAttendance')
+
+    half_days = (
+        StudentAttendance.objects
+        .annotate(summary_month=TruncMonth('date'))
+        .filter(
+            student=OuterRef('student'),
+            academic_year=OuterRef('academic_year'),
+            summary_month=OuterRef('month'),
+            status='HALF_DAY',
+        )
+        .order_by()
+        .values('student')
+        .annotate(n=Count('id'))
+        .values('n')
+    )
+    AttendanceSummary.objects.update(half_days=Coalesce(Subquery(half_days), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_classattendancelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='half_days',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_half_days, migrations.RunPython.noop),
+    ]
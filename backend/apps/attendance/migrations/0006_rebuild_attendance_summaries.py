@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-17 09:12
+
+from collections import Counter, defaultdict
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+STATUS_FIELDS = {
+    'PRESENT': 'present_days',
+    'ABSENT': 'absent_days',
+    'LATE': 'late_days',
+    'LEAVE': 'leave_days',
+    'HALF_DAY': 'half_days',
+}
+COUNT_FIELDS = ('total_days', 'present_days', 'absent_days', 'late_days', 'leave_days', 'half_days')
+
+
+def rebuild_attendance_summaries(apps, schema_editor):
+    # Summaries are maintained by deltas from here on, so they must start out
+    # matching the attendance already recorded. migrate_schemas runs this in
+    # every tenant schema.
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+    StudentAttendance = apps.get_model('attendance', 'StudentAttendance')
+
+    grouped = (
+        StudentAttendance.objects
+        .annotate(summary_month=TruncMonth('date'))
+        .order_by()
+        .values('student_id', 'academic_year_id', 'summary_month', 'status')
+        .annotate(n=Count('id'))
+    )
+
+    counts = defaultdict(Counter)
+    for row in grouped:
+        summary_month = row['summary_month']
+        if hasattr(summary_month, 'date'):
+            summary_month = summary_month.date()
+        counter = counts[(row['student_id'], row['academic_year_id'], summary_month)]
+        counter['total_days'] += row['n']
+        if row['status'] in STATUS_FIELDS:
+            counter[STATUS_FIELDS[row['status']]] += row['n']
+
+    now = timezone.now()
+    summaries = []
+    for (student_id, academic_year_id, summary_month), counter in counts.items():
+        attended = counter['present_days'] + counter['late_days']
+        total = counter['total_days']
+        summaries.append(AttendanceSummary(
+            student_id=student_id,
+            academic_year_id=academic_year_id,
+            month=summary_month,
+            attendance_percentage=round(attended / total * 100, 2) if total else 0,
+            last_updated=now,
+            **{field: counter[field] for field in COUNT_FIELDS},
+        ))
+
+    AttendanceSummary.objects.bulk_create(
+        summaries,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['student', 'academic_year', 'month'],
+        update_fields=[*COUNT_FIELDS, 'attendance_percentage', 'last_updated'],
+    )
+    # Summaries without any attendance left
+    AttendanceSummary.objects.filter(last_updated__lt=now).update(
+        attendance_percentage=0, last_updated=now, **{field: 0 for field in COUNT_FIELDS},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_attendancesummary_half_days'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_attendance_summaries, migrations.RunPython.noop),
+    ]
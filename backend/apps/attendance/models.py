@@ -123,6 +123,17 @@ class StudentAttendance(BaseModel):
             models.Index(fields=['academic_year', 'date']),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so AttendanceSummary can be updated
+        # with a delta (old status out, new status in) on save
+        instance._summary_state = instance.summary_state()
+        return instance
+
+    def summary_state(self):
+        return (self.student_id, self.academic_year_id, self.date, self.status)
+
     def __str__(self):
         period_str = f" - {self.period.name}" if self.period else ""
         return f"{self.student.get_full_name()} - {self.date}{period_str} - {self.get_status_display()}"
@@ -418,6 +429,14 @@ class StaffLeave(BaseModel):
             models.Index(fields=['start_date', 'end_date']),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored dates so an edit that moves the leave also
+        # clears the old dates in the substitute index (timetable.services.availability)
+        instance._stored_dates = (instance.start_date, instance.end_date)
+        return instance
+
     def __str__(self):
         return f"{self.staff_member.get_full_name()} - {self.get_leave_type_display()} ({self.start_date} to {self.end_date})"
 
@@ -521,6 +540,7 @@ class AttendanceSummary(BaseModel):
     absent_days = models.PositiveIntegerField(default=0)
     late_days = models.PositiveIntegerField(default=0)
     leave_days = models.PositiveIntegerField(default=0)
+    half_days = models.PositiveIntegerField(default=0)
     
     # Percentage
     attendance_percentage = models.DecimalField(
@@ -546,28 +566,15 @@ class AttendanceSummary(BaseModel):
         return f"{self.student.get_full_name()} - {self.month.strftime('%B %Y')} - {self.attendance_percentage}%"
 
     def calculate(self):
-        """Calculate attendance summary"""
-        # Get all attendance for the month
-        start_date = self.month
-        if self.month.month == 12:
-            end_date = self.month.replace(year=self.month.year + 1, month=1, day=1)
-        else:
-            end_date = self.month.replace(month=self.month.month + 1, day=1)
-        
-        attendance_records = StudentAttendance.objects.filter(
-            student=self.student,
-            academic_year=self.academic_year,
-            date__gte=start_date,
-            date__lt=end_date
+        """Calculate attendance summary (one grouped query, see services.summary)"""
+        from apps.attendance.services.summary import rebuild_summaries
+
+        rebuild_summaries(
+            academic_year_id=self.academic_year_id,
+            month=self.month,
+            student_ids=[self.student_id],
         )
-        
-        self.total_days = attendance_records.count()
-        self.present_days = attendance_records.filter(status='PRESENT').count()
-        self.absent_days = attendance_records.filter(status='ABSENT').count()
-        self.late_days = attendance_records.filter(status='LATE').count()
-        self.leave_days = attendance_records.filter(status='LEAVE').count()
-        
-        self.save()
+        self.refresh_from_db()
 
 
 class ClassAttendanceLog(BaseModel):
@@ -259,11 +259,11 @@ class AttendanceSummarySerializer(serializers.ModelSerializer):
             'id', 'student', 'student_name', 'student_admission_number',
             'class_name', 'academic_year', 'month', 'month_name',
             'total_days', 'present_days', 'absent_days', 'late_days',
-            'leave_days', 'attendance_percentage', 'last_updated'
+            'leave_days', 'half_days', 'attendance_percentage', 'last_updated'
         ]
         read_only_fields = [
             'total_days', 'present_days', 'absent_days', 'late_days',
-            'leave_days', 'attendance_percentage', 'last_updated'
+            'leave_days', 'half_days', 'attendance_percentage', 'last_updated'
         ]
     
     def get_month_name(self, obj):
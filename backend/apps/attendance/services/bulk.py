@@ -0,0 +1,138 @@
+"""
+Bulk student attendance writes.
+
+``mark_bulk`` used to call ``update_or_create`` per student: a SELECT plus an
+INSERT/UPDATE per row, each sending ``post_save``. ``BulkAttendanceService``
+writes a whole section in a fixed number of queries:
+
+1. one SELECT for the existing rows of (date, period, students);
+2. one ``bulk_create`` for new rows;
+3. one ``bulk_update`` for existing rows;
+4. grouped AttendanceSummary delta updates (see ``services.summary``);
+
+and then sends a single ``student_attendance_bulk_marked`` signal for the
+batch. Created/updated counts and newly-absent detection match the old
+per-row loop exactly, including repeated student ids in one payload (later
+entries win and count as updates).
+"""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.attendance.models import StudentAttendance
+from apps.attendance.services.summary import SummaryDeltas
+from apps.attendance.signals import student_attendance_bulk_marked
+
+logger = logging.getLogger(__name__)
+
+UPDATE_FIELDS = [
+    'academic_year', 'status', 'check_in_time', 'check_out_time', 'remarks', 'marked_by', 'updated_at',
+]
+
+
+class BulkAttendanceService:
+    """Create or update many StudentAttendance rows for one date/period."""
+
+    def __init__(self, academic_year, date, period=None, marked_by=None):
+        self.academic_year = academic_year
+        self.date = date
+        self.period = period
+        self.marked_by = marked_by
+
+    def mark(self, attendance_data):
+        """
+        Write ``attendance_data`` (dicts with ``student_id``, ``status`` and
+        optional ``check_in_time``, ``check_out_time``, ``remarks``).
+
+        Returns ``{'created', 'updated', 'absent_student_ids'}``.
+        """
+        student_ids = list(dict.fromkeys(str(record['student_id']) for record in attendance_data))
+        existing = {
+            str(row.student_id): row
+            for row in StudentAttendance.objects.filter(
+                student_id__in=student_ids,
+                date=self.date,
+                period=self.period,
+            )
+        }
+
+        now = timezone.now()
+        to_create = {}
+        to_update = {}
+        created_count = updated_count = 0
+        absent_student_ids = []
+
+        for record in attendance_data:
+            student_id = str(record['student_id'])
+            values = {
+                'academic_year': self.academic_year,
+                'status': record['status'],
+                'check_in_time': record.get('check_in_time'),
+                'check_out_time': record.get('check_out_time'),
+                'remarks': record.get('remarks', ''),
+                'marked_by': self.marked_by,
+            }
+
+            row = to_create.get(student_id) or to_update.get(student_id) or existing.get(student_id)
+            if row is None:
+                row = StudentAttendance(student_id=record['student_id'], date=self.date, period=self.period)
+                to_create[student_id] = row
+                created_count += 1
+                # Alerts only for rows this request creates, as before
+                if record['status'] == 'ABSENT':
+                    absent_student_ids.append(record['student_id'])
+            else:
+                if student_id not in to_create:
+                    to_update[student_id] = row
+                updated_count += 1
+
+            for field, value in values.items():
+                setattr(row, field, value)
+            row.updated_at = now
+
+        summary_deltas = SummaryDeltas()
+        for row in to_create.values():
+            summary_deltas.change(None, row.summary_state())
+        for row in to_update.values():
+            summary_deltas.change(row._summary_state, row.summary_state())
+
+        with transaction.atomic():
+            if to_create:
+                self._create(list(to_create.values()))
+            if to_update:
+                StudentAttendance.objects.bulk_update(list(to_update.values()), UPDATE_FIELDS)
+            summary_deltas.apply()
+        for row in [*to_create.values(), *to_update.values()]:
+            row._summary_state = row.summary_state()
+
+        if to_create or to_update:
+            student_attendance_bulk_marked.send(
+                sender=StudentAttendance,
+                date=self.date,
+                period=self.period,
+                created_records=list(to_create.values()),
+                updated_records=list(to_update.values()),
+                absent_student_ids=absent_student_ids,
+            )
+
+        return {
+            'created': created_count,
+            'updated': updated_count,
+            'absent_student_ids': absent_student_ids,
+        }
+
+    def _create(self, rows):
+        if self.period is None:
+            # NULL periods never conflict on the unique constraint
+            StudentAttendance.objects.bulk_create(rows)
+            return
+        # A concurrent submission may have inserted some of these rows since
+        # the prefetch; update them instead of failing the whole batch.
+        StudentAttendance.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['student', 'date', 'period'],
+            update_fields=UPDATE_FIELDS,
+        )
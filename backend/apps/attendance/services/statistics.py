@@ -0,0 +1,136 @@
+"""
+Attendance statistics for one or many students over a date range.
+
+Endpoints used to issue a ``COUNT`` per status (and per child on the parent
+dashboard). ``attendance_statistics`` answers any number of students with at
+most two grouped queries:
+
+- whole calendar months inside the range are summed from AttendanceSummary
+  rows (kept current incrementally, see ``services.summary``);
+- the partial months at either edge of the range, and any whole month a
+  student has no summary row for, are counted from StudentAttendance with
+  one conditional-aggregation query (``Count(filter=Q(status=...))``).
+
+A range inside a single month never touches AttendanceSummary.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from apps.attendance.models import AttendanceSummary, StudentAttendance
+from apps.attendance.services.summary import COUNT_FIELDS, STATUS_FIELDS, month_start, percentage
+
+
+def next_month(day):
+    return (month_start(day).replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def empty_statistics():
+    stats = {field: 0 for field in COUNT_FIELDS}
+    stats['attended_days'] = 0
+    stats['attendance_percentage'] = 0
+    return stats
+
+
+def split_range(start_date=None, end_date=None):
+    """
+    Split ``[start_date, end_date]`` (either end open) into whole months and
+    partial edges.
+
+    Returns ``(months, edges)``: ``months`` is ``(first, stop)`` - summary
+    months ``first <= month < stop``, either bound ``None`` for open - or
+    ``None`` when there are no whole months; ``edges`` is a list of inclusive
+    ``(start, end)`` date ranges to count from raw rows.
+    """
+    first = start_date if start_date is None or start_date.day == 1 else next_month(start_date)
+    stop = None
+    if end_date is not None:
+        # A range ending on the last day of a month includes that month
+        stop = month_start(end_date + timedelta(days=1))
+
+    if first is not None and stop is not None and first >= stop:
+        return None, [(start_date, end_date)]
+
+    edges = []
+    if start_date is not None and first != start_date:
+        edges.append((start_date, first - timedelta(days=1)))
+    if end_date is not None and stop <= end_date:
+        edges.append((stop, end_date))
+    return (first, stop), edges
+
+
+def attendance_statistics(student_ids, start_date=None, end_date=None, academic_year=None):
+    """
+    Attendance counts and percentage per student.
+
+    Returns ``{student_id (str): stats}`` with an entry for every requested
+    student; ``stats`` holds ``COUNT_FIELDS`` (``present_days`` is strictly
+    PRESENT), ``attended_days`` (PRESENT + LATE) and ``attendance_percentage``.
+    """
+    student_ids = list(dict.fromkeys(str(student_id) for student_id in student_ids))
+    results = {student_id: empty_statistics() for student_id in student_ids}
+    if not student_ids:
+        return results
+
+    months, edges = split_range(start_date, end_date)
+
+    raw = Q()
+    for edge_start, edge_end in edges:
+        raw |= Q(date__gte=edge_start, date__lte=edge_end)
+
+    if months is not None:
+        summaries = AttendanceSummary.objects.filter(student_id__in=student_ids)
+        first, stop = months
+        in_months = Q()
+        if first is not None:
+            summaries = summaries.filter(month__gte=first)
+            in_months &= Q(date__gte=first)
+        if stop is not None:
+            summaries = summaries.filter(month__lt=stop)
+            in_months &= Q(date__lt=stop)
+        if academic_year is not None:
+            summaries = summaries.filter(academic_year=academic_year)
+        rows = summaries.order_by().values('student_id').annotate(
+            **{field: Sum(field) for field in COUNT_FIELDS}
+        )
+        _accumulate(results, rows)
+
+        # Months without a summary row (e.g. recorded before summaries were
+        # kept) are counted from the attendance itself.
+        has_summary = AttendanceSummary.objects.filter(
+            student=OuterRef('student'),
+            academic_year=OuterRef('academic_year'),
+            month=OuterRef('summary_month'),
+        )
+        raw |= in_months & ~Q(Exists(has_summary))
+
+    if raw:
+        attendance = (
+            StudentAttendance.objects
+            .annotate(summary_month=TruncMonth('date'))
+            .filter(raw, student_id__in=student_ids)
+        )
+        if academic_year is not None:
+            attendance = attendance.filter(academic_year=academic_year)
+        counts = {'total_days': Count('id')}
+        counts.update({field: Count('id', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()})
+        _accumulate(results, attendance.order_by().values('student_id').annotate(**counts))
+
+    for stats in results.values():
+        stats['attended_days'] = stats['present_days'] + stats['late_days']
+        stats['attendance_percentage'] = percentage(stats['attended_days'], stats['total_days'])
+    return results
+
+
+def student_attendance_statistics(student_id, start_date=None, end_date=None, academic_year=None):
+    """``attendance_statistics`` for a single student."""
+    return attendance_statistics([student_id], start_date, end_date, academic_year)[str(student_id)]
+
+
+def _accumulate(results, rows):
+    for row in rows:
+        stats = results[str(row['student_id'])]
+        for field in COUNT_FIELDS:
+            stats[field] += row[field] or 0
@@ -0,0 +1,217 @@
+"""
+Incremental AttendanceSummary maintenance.
+
+Summaries are kept current by applying deltas instead of recounting a month:
+every insert, status change or delete of a StudentAttendance row removes the
+old status from its (student, academic year, month) row and adds the new one.
+Deltas for many rows are grouped so that students with the same change share
+one ``UPDATE ... WHERE student_id IN (...)`` (a bulk mark of a whole section
+is typically two or three statements).
+
+``rebuild_summaries`` recomputes summaries from scratch for a scope with one
+``GROUP BY student, academic_year, month, status`` query and a bulk upsert;
+it backs the ``rebuild_attendance_summaries`` command and
+``AttendanceSummary.calculate()``.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Value, When
+from django.db.models.functions import Cast, Greatest, TruncMonth
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from apps.attendance.models import AttendanceSummary, StudentAttendance
+
+logger = logging.getLogger(__name__)
+
+# Status -> counter field; every row also counts towards total_days
+STATUS_FIELDS = {
+    'PRESENT': 'present_days',
+    'ABSENT': 'absent_days',
+    'LATE': 'late_days',
+    'LEAVE': 'leave_days',
+    'HALF_DAY': 'half_days',
+}
+COUNT_FIELDS = ('total_days', 'present_days', 'absent_days', 'late_days', 'leave_days', 'half_days')
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def percentage(attended: int, total: int) -> float:
+    return round(attended / total * 100, 2) if total else 0
+
+
+def _status_delta(status, sign):
+    delta = Counter(total_days=sign)
+    field = STATUS_FIELDS.get(status)
+    if field:
+        delta[field] += sign
+    return delta
+
+
+class SummaryDeltas:
+    """
+    Accumulates summary changes and applies them in grouped UPDATEs.
+
+    Usage:
+        deltas = SummaryDeltas()
+        deltas.change(old_state, new_state)   # either may be None
+        deltas.apply()
+    """
+
+    def __init__(self):
+        self._deltas = defaultdict(Counter)
+
+    def __bool__(self):
+        return any(any(delta.values()) for delta in self._deltas.values())
+
+    def change(self, old=None, new=None):
+        """
+        Record a row moving from ``old`` to ``new`` state, each ``None`` or a
+        ``StudentAttendance.summary_state()`` tuple.
+        """
+        if old == new:
+            return
+        if old is not None:
+            student_id, academic_year_id, day, status = old
+            self._deltas[(student_id, academic_year_id, month_start(day))].update(_status_delta(status, -1))
+        if new is not None:
+            student_id, academic_year_id, day, status = new
+            self._deltas[(student_id, academic_year_id, month_start(day))].update(_status_delta(status, 1))
+
+    def apply(self):
+        """Write all pending deltas; returns the number of UPDATE statements."""
+        # Drop zero entries (e.g. PRESENT -> ABSENT -> PRESENT)
+        pending = {
+            key: {field: delta[field] for field in COUNT_FIELDS}
+            for key, delta in self._deltas.items()
+            if any(delta[field] for field in COUNT_FIELDS)
+        }
+        self._deltas.clear()
+        if not pending:
+            return 0
+
+        groups = defaultdict(list)
+        for (student_id, academic_year_id, month), delta in pending.items():
+            groups[(academic_year_id, month, tuple(delta[field] for field in COUNT_FIELDS))].append(student_id)
+
+        with transaction.atomic():
+            # Make sure every target row exists; existing rows are untouched
+            AttendanceSummary.objects.bulk_create([
+                AttendanceSummary(student_id=student_id, academic_year_id=academic_year_id, month=month)
+                for student_id, academic_year_id, month in pending
+            ], ignore_conflicts=True)
+
+            for (academic_year_id, month, delta), student_ids in groups.items():
+                AttendanceSummary.objects.filter(
+                    academic_year_id=academic_year_id,
+                    month=month,
+                    student_id__in=student_ids,
+                ).update(**self._update_expressions(dict(zip(COUNT_FIELDS, delta))))
+
+        return len(groups)
+
+    @staticmethod
+    def _update_expressions(delta):
+        def counter(field):
+            # Never below zero: a row that predates its summary may remove a
+            # status the summary never counted.
+            return Greatest(F(field) + delta[field], 0) if delta[field] else F(field)
+
+        values = {field: counter(field) for field in COUNT_FIELDS if delta[field]}
+        # UPDATE evaluates the right-hand side against the old row, so the
+        # percentage is computed from the same deltas.
+        new_total = counter('total_days')
+        attended = counter('present_days') + counter('late_days')
+        decimal = DecimalField(max_digits=5, decimal_places=2)
+        values['attendance_percentage'] = Case(
+            When(
+                GreaterThan(new_total, 0),
+                then=Cast(Cast(attended, DecimalField(max_digits=12, decimal_places=4)) * 100 / new_total, decimal),
+            ),
+            default=Value(0),
+            output_field=decimal,
+        )
+        values['last_updated'] = timezone.now()
+        return values
+
+
+def apply_row_changes(changes):
+    """Apply ``[(old_state, new_state), ...]`` in one go."""
+    deltas = SummaryDeltas()
+    for old, new in changes:
+        deltas.change(old, new)
+    return deltas.apply()
+
+
+def rebuild_summaries(academic_year_id=None, month=None, student_ids=None):
+    """
+    Recompute summaries for the given scope from StudentAttendance.
+
+    One grouped aggregation query produces every count; the rows are written
+    with one bulk upsert. Summaries in scope that no longer have any
+    attendance are reset to zero. Returns the number of summaries written.
+    """
+    attendance = StudentAttendance.objects.all()
+    summaries = AttendanceSummary.objects.all()
+    if academic_year_id:
+        attendance = attendance.filter(academic_year_id=academic_year_id)
+        summaries = summaries.filter(academic_year_id=academic_year_id)
+    if month:
+        month = month_start(month)
+        next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        attendance = attendance.filter(date__gte=month, date__lt=next_month)
+        summaries = summaries.filter(month=month)
+    if student_ids is not None:
+        attendance = attendance.filter(student_id__in=student_ids)
+        summaries = summaries.filter(student_id__in=student_ids)
+
+    grouped = (
+        attendance
+        .annotate(summary_month=TruncMonth('date'))
+        .order_by()
+        .values('student_id', 'academic_year_id', 'summary_month', 'status')
+        .annotate(n=Count('id'))
+    )
+
+    counts = defaultdict(Counter)
+    for row in grouped:
+        summary_month = row['summary_month']
+        if hasattr(summary_month, 'date'):
+            summary_month = summary_month.date()
+        key = (row['student_id'], row['academic_year_id'], summary_month)
+        counts[key].update({field: n * row['n'] for field, n in _status_delta(row['status'], 1).items()})
+
+    now = timezone.now()
+    objects = []
+    for (student_id, academic_year_id, summary_month), counter in counts.items():
+        objects.append(AttendanceSummary(
+            student_id=student_id,
+            academic_year_id=academic_year_id,
+            month=summary_month,
+            attendance_percentage=percentage(counter['present_days'] + counter['late_days'], counter['total_days']),
+            last_updated=now,
+            **{field: counter[field] for field in COUNT_FIELDS},
+        ))
+
+    with transaction.atomic():
+        AttendanceSummary.objects.bulk_create(
+            objects,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['student', 'academic_year', 'month'],
+            update_fields=[*COUNT_FIELDS, 'attendance_percentage', 'last_updated'],
+        )
+        # Anything in scope the aggregation did not produce has no rows left
+        summaries.filter(last_updated__lt=now).update(
+            attendance_percentage=0, last_updated=now, **{field: 0 for field in COUNT_FIELDS},
+        )
+
+    logger.info("Rebuilt %d attendance summaries", len(objects))
+    return len(objects)
@@ -0,0 +1,45 @@
+"""
+Attendance signals.
+
+``student_attendance_bulk_marked`` is sent once per ``mark_bulk`` call, after
+the rows have been written with ``bulk_create`` / ``bulk_update`` (which do
+not send ``post_save``). Receivers get the whole batch:
+
+    sender              StudentAttendance
+    date                attendance date
+    period              AttendancePeriod or None
+    created_records     list of newly created StudentAttendance rows
+    updated_records     list of updated StudentAttendance rows
+    absent_student_ids  students newly marked ABSENT in this batch
+
+Single-row saves and deletes keep AttendanceSummary current through the
+post_save / post_delete receivers below; the bulk path applies the same
+deltas itself.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from apps.attendance.models import StudentAttendance
+
+student_attendance_bulk_marked = Signal()
+
+
+@receiver(post_save, sender=StudentAttendance)
+def update_summary_on_attendance_save(sender, instance, created, raw=False, **kwargs):
+    """Apply the status change of a single row to its monthly summary"""
+    if raw:
+        return
+    from apps.attendance.services.summary import apply_row_changes
+
+    old = None if created else getattr(instance, '_summary_state', None)
+    new = instance.summary_state()
+    apply_row_changes([(old, new)])
+    instance._summary_state = new
+
+
+@receiver(post_delete, sender=StudentAttendance)
+def update_summary_on_attendance_delete(sender, instance, **kwargs):
+    from apps.attendance.services.summary import apply_row_changes
+
+    apply_row_changes([(getattr(instance, '_summary_state', None) or instance.summary_state(), None)])
@@ -91,3 +91,481 @@ class TestAttendanceAccess:
     def test_summaries_list(self, auth_client):
         response = auth_client.get('/api/v1/attendance/summaries/')
         assert response.status_code == 200
+
+
+# ─── Bulk marking ────────────────────────────────────────────────────────────
+
+from datetime import date, time  # noqa: E402
+from unittest import mock  # noqa: E402
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from apps.academics.models import AcademicYear, Board, Class, Section  # noqa: E402
+from apps.attendance.models import AttendancePeriod, StudentAttendance  # noqa: E402
+from apps.attendance.services.bulk import BulkAttendanceService  # noqa: E402
+from apps.attendance.signals import student_attendance_bulk_marked  # noqa: E402
+from apps.students.models import Student  # noqa: E402
+
+MARK_DATE = date(2026, 10, 12)
+
+
+@pytest.fixture
+def section_students(db):
+    board = Board.objects.create(board_type='CBSE', board_name='CBSE', board_code='CBSE-ATT')
+    year = AcademicYear.objects.create(
+        name='2026-27', start_date=date(2026, 4, 1), end_date=date(2027, 3, 31), is_current=True,
+    )
+    class_obj = Class.objects.create(name='6', display_name='Class 6', class_order=6, board=board)
+    section = Section.objects.create(class_instance=class_obj, name='A', academic_year=year)
+    students = [
+        Student.objects.create(
+            user=User.objects.create_user(
+                email=f'att_student{i}@test.com', password='x', first_name=f'S{i}', last_name='Bulk',
+                phone=f'77777300{i:02d}', user_type='STUDENT',
+            ),
+            admission_number=f'ATT{i}', admission_date=date(2026, 4, 1),
+            first_name=f'S{i}', last_name='Bulk', date_of_birth=date(2015, 1, 1), gender='F',
+        )
+        for i in range(12)
+    ]
+    return {'year': year, 'class': class_obj, 'section': section, 'students': students}
+
+
+def _records(students, status='PRESENT'):
+    return [{'student_id': s.id, 'status': status} for s in students]
+
+
+@pytest.mark.django_db
+class TestBulkAttendanceService:
+
+    def test_counts_and_newly_absent(self, section_students):
+        year, students = section_students['year'], section_students['students']
+        StudentAttendance.objects.create(
+            student=students[0], academic_year=year, date=MARK_DATE, status='PRESENT',
+        )
+
+        records = _records(students[:2], 'ABSENT') + _records(students[2:4])
+        result = BulkAttendanceService(year, MARK_DATE).mark(records)
+
+        assert result['created'] == 3
+        assert result['updated'] == 1
+        # students[0] already had a row: updated to ABSENT, but not "newly" absent
+        assert result['absent_student_ids'] == [students[1].id]
+        assert StudentAttendance.objects.filter(date=MARK_DATE).count() == 4
+        assert StudentAttendance.objects.get(student=students[0], date=MARK_DATE).status == 'ABSENT'
+
+    def test_repeated_student_counts_as_update(self, section_students):
+        year, student = section_students['year'], section_students['students'][0]
+        records = [
+            {'student_id': student.id, 'status': 'ABSENT'},
+            {'student_id': student.id, 'status': 'LATE', 'remarks': 'bus'},
+        ]
+        result = BulkAttendanceService(year, MARK_DATE).mark(records)
+
+        assert (result['created'], result['updated']) == (1, 1)
+        row = StudentAttendance.objects.get(student=student, date=MARK_DATE)
+        assert (row.status, row.remarks) == ('LATE', 'bus')
+
+    def test_query_count_is_constant(self, section_students):
+        year, students = section_students['year'], section_students['students']
+
+        with CaptureQueriesContext(connection) as small:
+            BulkAttendanceService(year, MARK_DATE).mark(_records(students[:2]))
+        with CaptureQueriesContext(connection) as large:
+            BulkAttendanceService(year, date(2026, 10, 13)).mark(_records(students))
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_period_rows_upsert(self, section_students):
+        year, students = section_students['year'], section_students['students']
+        period = AttendancePeriod.objects.create(name='P1', start_time=time(9), end_time=time(9, 45))
+
+        BulkAttendanceService(year, MARK_DATE, period=period).mark(_records(students[:3]))
+        result = BulkAttendanceService(year, MARK_DATE, period=period).mark(_records(students[:5], 'LATE'))
+
+        assert (result['created'], result['updated']) == (2, 3)
+        assert StudentAttendance.objects.filter(period=period, status='LATE').count() == 5
+
+    def test_sends_one_aggregated_signal(self, section_students):
+        year, students = section_students['year'], section_students['students']
+        handler = mock.Mock()
+        student_attendance_bulk_marked.connect(handler)
+        try:
+            BulkAttendanceService(year, MARK_DATE).mark(_records(students))
+        finally:
+            student_attendance_bulk_marked.disconnect(handler)
+
+        assert handler.call_count == 1
+        kwargs = handler.call_args.kwargs
+        assert len(kwargs['created_records']) == len(students)
+        assert kwargs['updated_records'] == []
+
+    def test_mark_bulk_endpoint(self, auth_client, section_students):
+        students = section_students['students']
+        payload = {
+            'class_id': str(section_students['class'].id),
+            'section_id': str(section_students['section'].id),
+            'date': MARK_DATE.isoformat(),
+            'attendance_data': [{'student_id': str(s.id), 'status': 'PRESENT'} for s in students[:4]],
+        }
+        response = auth_client.post('/api/v1/attendance/student-attendance/mark_bulk/', payload, format='json')
+
+        assert response.status_code == 201
+        assert response.data['created'] == 4
+        assert response.data['total'] == 4
+
+
+# ─── Attendance summaries ────────────────────────────────────────────────────
+
+import importlib  # noqa: E402
+from decimal import Decimal  # noqa: E402
+
+from django.core.management import call_command  # noqa: E402
+
+from apps.attendance.models import AttendanceSummary  # noqa: E402
+from apps.attendance.services.summary import rebuild_summaries  # noqa: E402
+
+
+def _summary(student, year, month=date(2026, 10, 1)):
+    return AttendanceSummary.objects.get(student=student, academic_year=year, month=month)
+
+
+@pytest.mark.django_db
+class TestAttendanceSummaryDeltas:
+
+    def test_insert_change_and_delete(self, section_students):
+        year, student = section_students['year'], section_students['students'][0]
+
+        row = StudentAttendance.objects.create(
+            student=student, academic_year=year, date=MARK_DATE, status='PRESENT',
+        )
+        StudentAttendance.objects.create(
+            student=student, academic_year=year, date=date(2026, 10, 13), status='ABSENT',
+        )
+        summary = _summary(student, year)
+        assert (summary.total_days, summary.present_days, summary.absent_days) == (2, 1, 1)
+        assert summary.attendance_percentage == Decimal('50.00')
+
+        row = StudentAttendance.objects.get(pk=row.pk)
+        row.status = 'LATE'
+        row.save()
+        summary.refresh_from_db()
+        assert (summary.total_days, summary.present_days, summary.late_days) == (2, 0, 1)
+        assert summary.attendance_percentage == Decimal('50.00')
+
+        row.delete()
+        summary.refresh_from_db()
+        assert (summary.total_days, summary.late_days, summary.absent_days) == (1, 0, 1)
+        assert summary.attendance_percentage == Decimal('0.00')
+
+    def test_bulk_mark_matches_rebuild(self, section_students):
+        year, students = section_students['year'], section_students['students']
+        BulkAttendanceService(year, MARK_DATE).mark(_records(students[:6]) + _records(students[6:], 'ABSENT'))
+        BulkAttendanceService(year, MARK_DATE).mark(_records(students[:3], 'LATE'))
+
+        incremental = {
+            s.student_id: (s.total_days, s.present_days, s.absent_days, s.late_days, s.attendance_percentage)
+            for s in AttendanceSummary.objects.all()
+        }
+        AttendanceSummary.objects.all().delete()
+        rebuild_summaries()
+        rebuilt = {
+            s.student_id: (s.total_days, s.present_days, s.absent_days, s.late_days, s.attendance_percentage)
+            for s in AttendanceSummary.objects.all()
+        }
+
+        assert incremental == rebuilt
+        assert incremental[students[0].id] == (1, 0, 0, 1, Decimal('100.00'))
+        assert incremental[students[6].id] == (1, 0, 1, 0, Decimal('0.00'))
+
+    def test_change_to_row_predating_summary_does_not_go_negative(self, section_students):
+        year, student = section_students['year'], section_students['students'][0]
+        row = StudentAttendance.objects.create(student=student, academic_year=year, date=MARK_DATE, status='ABSENT')
+        AttendanceSummary.objects.all().delete()
+
+        row = StudentAttendance.objects.get(pk=row.pk)
+        row.status = 'PRESENT'
+        row.save()
+
+        summary = _summary(student, year)
+        assert (summary.total_days, summary.present_days, summary.absent_days) == (0, 1, 0)
+        assert summary.attendance_percentage == Decimal('0.00')
+
+    def test_bulk_mark_groups_summary_updates(self, section_students):
+        year, students = section_students['year'], section_students['students']
+        with CaptureQueriesContext(connection) as queries:
+            BulkAttendanceService(year, MARK_DATE).mark(_records(students[:6]) + _records(students[6:], 'ABSENT'))
+
+        summary_updates = [
+            q for q in queries.captured_queries if q['sql'].startswith('UPDATE "attendance_attendancesummary"')
+        ]
+        assert len(summary_updates) == 2
+
+
+@pytest.mark.django_db
+class TestRebuildAttendanceSummaries:
+
+    def test_rebuild_resets_stale_rows_and_fixes_counts(self, section_students):
+        year, students = section_students['year'], section_students['students']
+        BulkAttendanceService(year, MARK_DATE).mark(_records(students[:4]))
+        AttendanceSummary.objects.filter(student=students[0]).update(total_days=99, present_days=99)
+        AttendanceSummary.objects.create(student=students[5], academic_year=year, month=date(2026, 10, 1), total_days=3)
+
+        call_command('rebuild_attendance_summaries', stdout=mock.Mock())
+
+        assert _summary(students[0], year).total_days == 1
+        assert _summary(students[5], year).total_days == 0
+
+    def test_rebuild_query_count_does_not_grow(self, section_students):
+        year, students = section_students['year'], section_students['students']
+        BulkAttendanceService(year, MARK_DATE).mark(_records(students[:2]))
+        with CaptureQueriesContext(connection) as small:
+            rebuild_summaries(academic_year_id=year.id)
+
+        BulkAttendanceService(year, date(2026, 9, 14)).mark(_records(students))
+        with CaptureQueriesContext(connection) as large:
+            rebuild_summaries(academic_year_id=year.id)
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_migration_backfills_existing_attendance(self, section_students):
+        from django.apps import apps
+
+        migration = importlib.import_module('apps.attendance.migrations.0006_rebuild_attendance_summaries')
+        year, students = section_students['year'], section_students['students']
+        BulkAttendanceService(year, MARK_DATE).mark(_records(students[:2]) + _records(students[2:4], 'ABSENT'))
+        AttendanceSummary.objects.all().delete()
+        AttendanceSummary.objects.create(student=students[5], academic_year=year, month=date(2026, 10, 1), total_days=3)
+
+        migration.rebuild_attendance_summaries(apps, None)
+
+        assert (_summary(students[0], year).present_days, _summary(students[2], year).absent_days) == (1, 1)
+        assert _summary(students[0], year).attendance_percentage == Decimal('100.00')
+        assert _summary(students[5], year).total_days == 0
+        assert AttendanceSummary.objects.count() == 5
+
+    def test_calculate_uses_rebuild(self, section_students):
+        year, student = section_students['year'], section_students['students'][0]
+        StudentAttendance.objects.create(student=student, academic_year=year, date=MARK_DATE, status='PRESENT')
+        summary = _summary(student, year)
+        AttendanceSummary.objects.filter(pk=summary.pk).update(total_days=0, present_days=0)
+
+        summary.calculate()
+
+        assert (summary.total_days, summary.present_days) == (1, 1)
+        assert summary.attendance_percentage == Decimal('100.00')
+
+
+# ─── Export ──────────────────────────────────────────────────────────────────
+
+import csv  # noqa: E402
+import io  # noqa: E402
+
+from apps.academics.models import StudentEnrollment  # noqa: E402
+from apps.attendance.services.export import AttendanceExporter  # noqa: E402
+
+
+@pytest.fixture
+def marked_section(section_students):
+    year, section, students = section_students['year'], section_students['section'], section_students['students']
+    for i, student in enumerate(students[:8]):
+        StudentEnrollment.objects.create(
+            student=student, section=section, academic_year=year,
+            enrollment_date=date(2026, 4, 1), roll_number=str(i + 1),
+        )
+    for day in (MARK_DATE, date(2026, 10, 13)):
+        BulkAttendanceService(year, day).mark(_records(students))
+    return section_students
+
+
+def _export_rows(response):
+    content = b''.join(response.streaming_content).decode()
+    return list(csv.reader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+class TestAttendanceExport:
+
+    def test_csv_stream(self, auth_client, marked_section):
+        response = auth_client.post('/api/v1/attendance/student-attendance/export_report/', {}, format='json')
+
+        assert response.status_code == 200
+        assert response.streaming
+        rows = _export_rows(response)
+        assert rows[0][0] == 'Date'
+        assert len(rows) == 1 + 2 * 12
+        class_sections = {row[1]: row[2] for row in rows[1:]}
+        assert class_sections['S0 Bulk'] == '6 - A'
+        assert class_sections['S11 Bulk'] == '-'
+
+    def test_query_count_does_not_depend_on_rows(self, marked_section):
+        def run(queryset):
+            with CaptureQueriesContext(connection) as queries:
+                b''.join(chunk.encode() for chunk in AttendanceExporter(queryset, chunk_size=5).iter_csv())
+            return len(queries.captured_queries)
+
+        one_day = run(StudentAttendance.objects.filter(date=MARK_DATE))
+        both_days = run(StudentAttendance.objects.all())
+        assert both_days == one_day
+
+    def test_section_filter_and_xlsx(self, auth_client, marked_section):
+        from openpyxl import load_workbook
+
+        response = auth_client.post('/api/v1/attendance/student-attendance/export_report/', {
+            'section_id': str(marked_section['section'].id),
+            'start_date': MARK_DATE.isoformat(),
+            'end_date': MARK_DATE.isoformat(),
+            'format': 'xlsx',
+        }, format='json')
+
+        assert response.status_code == 200
+        assert response['Content-Disposition'].endswith('.xlsx"')
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        rows = list(sheet.iter_rows(values_only=True))
+        assert rows[0][0] == 'Date'
+        assert len(rows) == 1 + 8
+
+    def test_rejects_unknown_format(self, auth_client, marked_section):
+        response = auth_client.post(
+            '/api/v1/attendance/student-attendance/export_report/', {'format': 'pdf'}, format='json',
+        )
+        assert response.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Attendance statistics
+# ---------------------------------------------------------------------------
+
+from apps.attendance.services.statistics import (  # noqa: E402
+    attendance_statistics, split_range, student_attendance_statistics,
+)
+
+
+@pytest.fixture
+def term_attendance(section_students):
+    """Two students marked across September and October."""
+    year = section_students['year']
+    first, second = section_students['students'][:2]
+    statuses = ['PRESENT', 'LATE', 'ABSENT', 'HALF_DAY', 'LEAVE']
+    for day in range(1, 31):
+        status = statuses[day % len(statuses)]
+        StudentAttendance.objects.create(student=first, academic_year=year, date=date(2026, 9, day), status=status)
+    for day in range(1, 16):
+        StudentAttendance.objects.create(student=first, academic_year=year, date=date(2026, 10, day), status='PRESENT')
+        StudentAttendance.objects.create(student=second, academic_year=year, date=date(2026, 10, day), status='ABSENT')
+    return section_students
+
+
+def _raw_counts(student, start, end):
+    rows = StudentAttendance.objects.filter(student=student, date__gte=start, date__lte=end)
+    return {
+        'total_days': rows.count(),
+        'present_days': rows.filter(status='PRESENT').count(),
+        'late_days': rows.filter(status='LATE').count(),
+        'absent_days': rows.filter(status='ABSENT').count(),
+        'leave_days': rows.filter(status='LEAVE').count(),
+        'half_days': rows.filter(status='HALF_DAY').count(),
+    }
+
+
+class TestSplitRange:
+
+    def test_whole_months_and_edges(self):
+        months, edges = split_range(date(2026, 9, 10), date(2026, 12, 5))
+        assert months == (date(2026, 10, 1), date(2026, 12, 1))
+        assert edges == [(date(2026, 9, 10), date(2026, 9, 30)), (date(2026, 12, 1), date(2026, 12, 5))]
+
+    def test_exact_months_have_no_edges(self):
+        assert split_range(date(2026, 9, 1), date(2026, 10, 31)) == ((date(2026, 9, 1), date(2026, 11, 1)), [])
+
+    def test_inside_one_month_is_raw_only(self):
+        assert split_range(date(2026, 10, 2), date(2026, 10, 31)) == (None, [(date(2026, 10, 2), date(2026, 10, 31))])
+
+    def test_open_ranges(self):
+        assert split_range() == ((None, None), [])
+        assert split_range(end_date=date(2026, 10, 15)) == (
+            (None, date(2026, 10, 1)), [(date(2026, 10, 1), date(2026, 10, 15))],
+        )
+
+
+@pytest.mark.django_db
+class TestAttendanceStatistics:
+
+    @pytest.mark.parametrize('start, end', [
+        (date(2026, 9, 1), date(2026, 9, 30)),
+        (date(2026, 9, 12), date(2026, 10, 7)),
+        (date(2026, 9, 3), date(2026, 9, 20)),
+        (None, None),
+    ])
+    def test_matches_raw_counts(self, term_attendance, start, end):
+        student = term_attendance['students'][0]
+        stats = student_attendance_statistics(student.id, start, end)
+
+        expected = _raw_counts(student, start or date(2000, 1, 1), end or date(2100, 1, 1))
+        assert {field: stats[field] for field in expected} == expected
+        assert stats['attended_days'] == expected['present_days'] + expected['late_days']
+        assert stats['attendance_percentage'] == round(stats['attended_days'] / expected['total_days'] * 100, 2)
+
+    def test_many_students_in_two_queries(self, term_attendance):
+        students = term_attendance['students']
+        with CaptureQueriesContext(connection) as queries:
+            stats = attendance_statistics([s.id for s in students], date(2026, 9, 12), date(2026, 11, 5))
+        assert len(queries.captured_queries) == 2
+
+        assert stats[str(students[1].id)]['absent_days'] == 15
+        expected = _raw_counts(students[0], date(2026, 9, 12), date(2026, 11, 5))
+        assert {field: stats[str(students[0].id)][field] for field in expected} == expected
+        assert stats[str(students[1].id)]['attendance_percentage'] == 0
+        assert stats[str(students[5].id)] == {
+            'total_days': 0, 'present_days': 0, 'absent_days': 0, 'late_days': 0, 'leave_days': 0,
+            'half_days': 0, 'attended_days': 0, 'attendance_percentage': 0,
+        }
+
+    def test_whole_months_sum_summaries(self, term_attendance):
+        student = term_attendance['students'][0]
+        with CaptureQueriesContext(connection) as queries:
+            stats = student_attendance_statistics(student.id, academic_year=term_attendance['year'])
+        assert len(queries.captured_queries) == 2
+        assert 'attendance_attendancesummary' in queries.captured_queries[0]['sql']
+        assert stats['total_days'] == 45
+
+    @pytest.mark.parametrize('start, end', [
+        (date(2026, 9, 1), date(2026, 10, 31)),
+        (date(2026, 9, 12), date(2026, 11, 5)),
+        (None, None),
+    ])
+    def test_months_without_summary_count_attendance(self, term_attendance, start, end):
+        student = term_attendance['students'][0]
+        AttendanceSummary.objects.filter(student=student, month=date(2026, 10, 1)).delete()
+
+        stats = student_attendance_statistics(student.id, start, end, academic_year=term_attendance['year'])
+
+        expected = _raw_counts(student, start or date(2000, 1, 1), end or date(2100, 1, 1))
+        assert {field: stats[field] for field in expected} == expected
+
+    def test_student_summary_endpoint(self, auth_client, term_attendance):
+        student = term_attendance['students'][0]
+        StudentEnrollment.objects.create(
+            student=student, section=term_attendance['section'], academic_year=term_attendance['year'],
+            enrollment_date=date(2026, 4, 1), roll_number='1',
+        )
+
+        response = auth_client.get('/api/v1/attendance/student-attendance/student_summary/', {
+            'student_id': str(student.id), 'start_date': '2026-09-12', 'end_date': '2026-10-07',
+        })
+
+        assert response.status_code == 200
+        assert response.data['class'] == '6'
+        assert response.data['section'] == 'A'
+        expected = _raw_counts(student, date(2026, 9, 12), date(2026, 10, 7))
+        statistics = response.data['statistics']
+        assert statistics['total_days'] == expected['total_days']
+        assert statistics['present_days'] == expected['present_days'] + expected['late_days']
+        assert statistics['half_days'] == expected['half_days']
+
+    def test_student_summary_rejects_bad_dates(self, auth_client, term_attendance):
+        response = auth_client.get('/api/v1/attendance/student-attendance/student_summary/', {
+            'student_id': str(term_attendance['students'][0].id), 'start_date': '2026-13-01',
+        })
+        assert response.status_code == 400
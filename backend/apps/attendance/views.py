@@ -10,6 +10,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from django.db.models import Count, Q, Avg, F
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 from datetime import datetime, timedelta
 from collections import defaultdict
 
@@ -39,6 +40,9 @@ from .serializers import (
     ClassAttendanceSerializer,
     StudentAttendanceStatsSerializer
 )
+from .services.bulk import BulkAttendanceService
+from .services.export import EXPORT_FORMATS, AttendanceExporter
+from .services.statistics import student_attendance_statistics
 from apps.students.models import Student
 from apps.academics.models import Section, AcademicYear, StudentEnrollment
 
@@ -161,41 +165,17 @@ class StudentAttendanceViewSet(viewsets.ModelViewSet):
         if period_id:
             period = get_object_or_404(AttendancePeriod, id=period_id)
         
-        # Create or update attendance records
-        created_count = 0
-        updated_count = 0
-        newly_absent_student_ids = []  # Track students newly marked ABSENT for alerts
-
-        for record in attendance_data:
-            student_id = record['student_id']
-            attendance_status = record['status']
-            check_in_time = record.get('check_in_time')
-            check_out_time = record.get('check_out_time')
-            remarks = record.get('remarks', '')
-
-            # Get or create attendance
-            attendance, created = StudentAttendance.objects.update_or_create(
-                student_id=student_id,
-                date=date,
-                period=period,
-                defaults={
-                    'academic_year': academic_year,
-                    'status': attendance_status,
-                    'check_in_time': check_in_time,
-                    'check_out_time': check_out_time,
-                    'remarks': remarks,
-                    'marked_by': request.user if request.user.is_authenticated else None
-                }
-            )
-
-            if created:
-                created_count += 1
-            else:
-                updated_count += 1
-
-            # Queue absence alert for newly ABSENT students (not updates to existing)
-            if created and attendance_status == 'ABSENT':
-                newly_absent_student_ids.append(student_id)
+        # Create or update attendance records in bulk (fixed query count,
+        # one aggregated signal instead of post_save per row)
+        result = BulkAttendanceService(
+            academic_year,
+            date,
+            period=period,
+            marked_by=request.user if request.user.is_authenticated else None,
+        ).mark(attendance_data)
+        created_count = result['created']
+        updated_count = result['updated']
+        newly_absent_student_ids = result['absent_student_ids']  # Track students newly marked ABSENT for alerts
 
         # Fire Celery absence alert tasks (after all DB writes succeed)
         if newly_absent_student_ids:
@@ -343,63 +323,68 @@ class StudentAttendanceViewSet(viewsets.ModelViewSet):
                  status=status.HTTP_404_NOT_FOUND
              )
         
-        # Build filter
-        filters = {'student_id': student_id}
-        if start_date:
-            filters['date__gte'] = start_date
-        if end_date:
-            filters['date__lte'] = end_date
-        
-        # Get attendance records
-        attendance = StudentAttendance.objects.filter(**filters)
-        
-        # Calculate statistics
-        total_days = attendance.count()
-        present_days = attendance.filter(status__in=['PRESENT', 'LATE']).count()
-        absent_days = attendance.filter(status='ABSENT').count()
-        late_days = attendance.filter(status='LATE').count()
-        leave_days = attendance.filter(status='LEAVE').count()
-        half_days = attendance.filter(status='HALF_DAY').count()
-        
-        attendance_percentage = (present_days / total_days * 100) if total_days > 0 else 0
-        
+        try:
+            start = parse_date(start_date) if start_date else None
+            end = parse_date(end_date) if end_date else None
+        except ValueError:
+            start = end = None
+        if (start_date and start is None) or (end_date and end is None):
+            return Response(
+                {'error': 'Dates must be in YYYY-MM-DD format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        stats = student_attendance_statistics(student.id, start, end)
+        enrollment = student.class_enrollments.filter(
+            is_active=True,
+            is_deleted=False
+        ).select_related('section__class_instance').first()
+
         return Response({
             'student_id': student.id,
             'student_name': student.get_full_name(),
             'admission_number': student.admission_number,
-            'class': student.current_class.name if student.current_class else None,
-            'section': student.current_section.name if student.current_section else None,
+            'class': enrollment.section.class_instance.name if enrollment else None,
+            'section': enrollment.section.name if enrollment else None,
             'period': {
                 'start_date': start_date,
                 'end_date': end_date
             },
             'statistics': {
-                'total_days': total_days,
-                'present_days': present_days,
-                'absent_days': absent_days,
-                'late_days': late_days,
-                'leave_days': leave_days,
-                'half_days': half_days,
-                'attendance_percentage': round(attendance_percentage, 2)
+                'total_days': stats['total_days'],
+                # present_days has always included LATE here
+                'present_days': stats['attended_days'],
+                'absent_days': stats['absent_days'],
+                'late_days': stats['late_days'],
+                'leave_days': stats['leave_days'],
+                'half_days': stats['half_days'],
+                'attendance_percentage': stats['attendance_percentage']
             }
         })
 
     @action(detail=False, methods=['post'])
     def export_report(self, request):
         """
-        Generate and export attendance report as CSV
+        Generate and export attendance report as CSV or XLSX
+
+        The report is streamed: rows are read in chunks and class/section
+        is resolved for all students with a single query.
         """
-        import csv
-        from django.http import HttpResponse
-        from datetime import datetime
-        
         # Get parameters
         report_type = request.data.get('report_type', 'daily')
         start_date = request.data.get('start_date')
         end_date = request.data.get('end_date')
         class_id = request.data.get('class_id')
         section_id = request.data.get('section_id')
-        export_format = request.data.get('format', 'csv')
+        export_format = str(request.data.get('format', 'csv')).lower()
+        if export_format in ('excel', 'xls'):
+            export_format = 'xlsx'
+        
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Build queryset
         queryset = self.get_queryset()
@@ -410,46 +395,20 @@ class StudentAttendanceViewSet(viewsets.ModelViewSet):
         if end_date:
             queryset = queryset.filter(date__lte=end_date)
         
-        # Get data
-        attendance_records = queryset.select_related(
-            'student', 'period', 'academic_year'
-        ).order_by('date', 'student__first_name')
-        
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="attendance_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Student Name', 'Class-Section', 'Status', 'Check In', 'Check Out', 'Remarks'])
+        # Class/section come in the POST body for this action
+        if class_id or section_id:
+            enrollment_filters = {'is_active': True}
+            if class_id:
+                enrollment_filters['section__class_instance_id'] = class_id
+            if section_id:
+                enrollment_filters['section_id'] = section_id
+            queryset = queryset.filter(
+                student_id__in=StudentEnrollment.objects.filter(
+                    **enrollment_filters
+                ).values('student_id')
+            )
         
-        for record in attendance_records:
-            # Get class/section from enrollment
-            class_section = '-'
-            try:
-                from apps.academics.models import StudentEnrollment
-                enrollment = StudentEnrollment.objects.filter(
-                    student=record.student,
-                    is_active=True
-                ).select_related('section', 'section__class_instance').first()
-                
-                if enrollment and enrollment.section:
-                    class_name = enrollment.section.class_instance.name if enrollment.section.class_instance else ''
-                    section_name = enrollment.section.name
-                    class_section = f"{class_name} - {section_name}" if class_name else section_name
-            except Exception:
-                pass
-            
-            writer.writerow([
-                record.date.strftime('%Y-%m-%d'),
-                record.student.get_full_name(),
-                class_section,
-                record.get_status_display(),
-                record.check_in_time.strftime('%H:%M') if record.check_in_time else '-',
-                record.check_out_time.strftime('%H:%M') if record.check_out_time else '-',
-                record.remarks or '-'
-            ])
-        
-        return response
+        return AttendanceExporter(queryset).response(export_format)
 
 
 class StaffAttendanceViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,206 @@
+"""
+Island-model runner for the scheduling genetic algorithms.
+
+A single GA population runs on one core. ``run_islands`` splits the search
+into ``island_count`` independent populations that evolve on a process pool
+(``services.process_pool``, which Celery workers can start as well); every
+``migration_interval`` generations each island
+sends copies of its best individuals to the next island in a ring, where
+they replace the worst ones. Progress from all islands is merged and reported
+through the optimizer's ``progress_callback``.
+
+An island is plain data (population as solution dicts, scores, RNG state),
+so each epoch can run on any worker and the outcome depends only on the
+seed - not on the number of workers or the order they finish in.
+
+Optimizers plug in by providing:
+
+- ``rng``: the ``random.Random`` every GA operator draws from
+- ``max_iterations``, ``plateau_threshold``, ``progress_callback``
+- ``island_worker_args()``: ``(args, kwargs)`` to rebuild the optimizer in a
+  worker process
+- ``_generate_population()``, ``_score_states(population)``,
+  ``_next_generation(scored)``
+- ``load_solution(solution)`` / ``dump_solution(state)``: convert between GA
+  states and picklable solution dicts
+"""
+
+import logging
+import os
+import random
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+from django.conf import settings
+
+from apps.core.services.process_pool import process_pool
+
+logger = logging.getLogger(__name__)
+
+# Stop every island once one of them reaches this score
+EXCELLENT_SCORE = 95.0
+
+# Best individuals each island sends to its neighbour per migration
+DEFAULT_MIGRANTS = 2
+
+_worker_optimizer = None
+
+
+@dataclass
+class Island:
+    """One sub-population between epochs."""
+    index: int
+    rng_state: tuple
+    population: list = field(default_factory=list)   # solutions, best first
+    scores: list = field(default_factory=list)
+    best_solution: dict = None
+    best_score: float = -1
+    stale_generations: int = 0
+    generations: int = 0
+    done: bool = False
+
+
+def model_snapshot(instance):
+    """Picklable copy of a model instance's column values (no DB access in workers)."""
+    return SimpleNamespace(**{
+        f.attname: getattr(instance, f.attname) for f in instance._meta.concrete_fields
+    })
+
+
+def island_seeds(seed, island_count):
+    """Per-island RNG states derived from one run seed."""
+    master = random.Random(seed)
+    return [random.Random(master.getrandbits(64)).getstate() for _ in range(island_count)]
+
+
+def evolve_island(optimizer, island, generations):
+    """Advance ``island`` by up to ``generations`` generations with ``optimizer``."""
+    optimizer.rng.setstate(island.rng_state)
+
+    scored = None
+    if island.population:
+        states = [optimizer.load_solution(solution) for solution in island.population]
+        scored = list(zip(states, island.scores))
+
+    for _ in range(generations):
+        if scored is None:
+            population = optimizer._generate_population()
+        else:
+            population = optimizer._next_generation(scored)
+        scored = list(zip(population, optimizer._score_states(population)))
+        scored.sort(key=lambda x: x[1], reverse=True)
+        island.generations += 1
+
+        if scored[0][1] > island.best_score:
+            island.best_score = scored[0][1]
+            island.best_solution = optimizer.dump_solution(scored[0][0])
+            island.stale_generations = 0
+        else:
+            island.stale_generations += 1
+
+        if (island.stale_generations >= optimizer.plateau_threshold
+                or island.best_score >= EXCELLENT_SCORE
+                or island.generations >= optimizer.max_iterations):
+            island.done = True
+            break
+
+    island.population = [optimizer.dump_solution(state) for state, _ in scored]
+    island.scores = [score for _, score in scored]
+    island.rng_state = optimizer.rng.getstate()
+    return island
+
+
+def migrate(islands, migrants=DEFAULT_MIGRANTS):
+    """Ring migration: each island's best replace the next island's worst."""
+    outgoing = [
+        list(zip(island.population[:migrants], island.scores[:migrants]))
+        for island in islands
+    ]
+    for idx, island in enumerate(islands):
+        incoming = outgoing[idx - 1]
+        if island.done or island is islands[idx - 1] or not incoming:
+            continue
+        kept = list(zip(island.population, island.scores))[:max(0, len(island.population) - len(incoming))]
+        merged = sorted(kept + incoming, key=lambda x: x[1], reverse=True)
+        island.population = [solution for solution, _ in merged]
+        island.scores = [score for _, score in merged]
+
+
+def run_islands(optimizer, island_count, migration_interval, seed=None,
+                migrants=DEFAULT_MIGRANTS, max_workers=None):
+    """
+    Run ``optimizer``'s GA as ``island_count`` islands.
+
+    ``max_workers`` defaults to one worker per island, up to the CPU count;
+    ``max_workers=0`` evolves the islands in this process (same results), as
+    does every run when ``GA_ISLAND_EXECUTION_MODE`` is ``'serial'``.
+
+    Returns (best_solution, best_score); ``best_solution`` is ``None`` if no
+    generation ran. ``optimizer.generations_run`` is set to the generations
+    run across all islands.
+    """
+    islands = [
+        Island(index=idx, rng_state=state)
+        for idx, state in enumerate(island_seeds(seed, island_count))
+    ]
+    if max_workers is None:
+        max_workers = _default_workers(island_count)
+
+    pool = nullcontext()
+    if max_workers:
+        args, kwargs = optimizer.island_worker_args()
+        pool = process_pool(max_workers, initializer=_init_worker, initargs=(type(optimizer), args, kwargs))
+
+    with pool as executor:
+        while True:
+            active = [island for island in islands if not island.done]
+            if not active:
+                break
+            if executor is None:
+                evolved = [evolve_island(optimizer, island, migration_interval) for island in active]
+            else:
+                evolved = executor.map(_evolve_in_worker, [(island, migration_interval) for island in active])
+            for island in evolved:
+                islands[island.index] = island
+
+            best = max(islands, key=lambda island: island.best_score)
+            generation = max(island.generations for island in islands)
+            _report_progress(
+                optimizer,
+                int(generation / optimizer.max_iterations * 100),
+                f'Generation {generation}/{optimizer.max_iterations} on {island_count} islands, '
+                f'best score: {best.best_score:.1f}',
+            )
+            if best.best_score >= EXCELLENT_SCORE:
+                break
+            migrate(islands, migrants)
+
+    optimizer.generations_run = sum(island.generations for island in islands)
+    best = max(islands, key=lambda island: island.best_score)
+    logger.info(
+        'Island GA finished: %d islands, best score %.2f from island %d',
+        island_count, best.best_score, best.index,
+    )
+    return best.best_solution, best.best_score
+
+
+def _default_workers(island_count):
+    if getattr(settings, 'GA_ISLAND_EXECUTION_MODE', 'processes') == 'serial':
+        return 0
+    return min(island_count, os.cpu_count() or 1)
+
+
+def _report_progress(optimizer, percent, message):
+    if optimizer.progress_callback:
+        optimizer.progress_callback(min(percent, 100), message)
+
+
+def _init_worker(optimizer_class, args, kwargs):
+    global _worker_optimizer
+    _worker_optimizer = optimizer_class(*args, **kwargs)
+
+
+def _evolve_in_worker(job):
+    island, generations = job
+    return evolve_island(_worker_optimizer, island, generations)
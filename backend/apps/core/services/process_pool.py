@@ -0,0 +1,35 @@
+"""
+Process pools that also work inside Celery workers.
+
+Celery's prefork workers are daemonic processes, and ``multiprocessing``
+refuses to start children from one ("daemonic processes are not allowed to
+have children"), so a ``ProcessPoolExecutor`` cannot be used from a task.
+billiard - Celery's fork of ``multiprocessing``, installed with it - has no
+such restriction, so CPU-bound work started from a task (GA islands, report
+card PDFs) runs on a billiard pool and uses the worker's idle cores.
+
+Usage:
+    with process_pool(4, initializer=load_renderer, initargs=(options,)) as pool:
+        outputs = pool.map(render, jobs)
+"""
+
+from contextlib import contextmanager
+
+from billiard.pool import Pool
+
+
+@contextmanager
+def process_pool(workers, initializer=None, initargs=()):
+    """
+    A pool of ``workers`` processes, each running ``initializer(*initargs)``
+    when it starts. ``map`` blocks and returns a list, in order.
+
+    The pool is terminated on exit: every ``map`` has returned by then, and
+    ``close()`` would wait up to half a minute for the idle workers to stop.
+    """
+    pool = Pool(processes=workers, initializer=initializer, initargs=initargs)
+    try:
+        yield pool
+    finally:
+        pool.terminate()
+        pool.join()
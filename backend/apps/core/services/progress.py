@@ -0,0 +1,162 @@
+"""
+Throttled, out-of-band progress reporting for long-running jobs.
+
+Generation runs used to save their progress row on every callback, so tight
+CSP/GA loops blocked on DB writes and every poll of a ``progress`` endpoint
+hit the database. A ``ProgressChannel`` splits the two:
+
+- ``update()`` writes the job's progress to the cache, at most once every
+  ``interval_ms`` (the latest value is kept and written by the next call
+  that is due, or by the next phase);
+- ``phase()`` marks a phase boundary: the cache is written immediately and,
+  when the channel has a model instance, its progress fields (and status)
+  are saved to the DB;
+- ``close()`` drops the cache entry once the final state is in the DB;
+  jobs without a row call ``finish()`` to leave the final state in the cache.
+
+Progress endpoints still look the job up (permissions, queryset scoping),
+then return ``read_progress()`` and only fall back to the job's own fields
+when nothing is cached. Keys are scoped by tenant schema.
+
+Usage:
+    channel = ProgressChannel.for_instance(run, base={'id': str(run.id)})
+    channel.phase(10, 'Validation complete.', status='GENERATING')
+    for ...:
+        channel.update(pct, 'CSP iteration 5000...')
+    run.save()
+    channel.close()
+
+    cached = read_progress(TimetableGenerationRun, run_id)
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Minimum time between two cache writes from ``update()``
+DEFAULT_INTERVAL_MS = 500
+
+# Cache entries outlive a stuck worker by at most this long
+PROGRESS_TTL = 3600
+
+
+def progress_key(kind, object_id):
+    """
+    Cache key for a job's progress. ``kind`` is a model class (its label is
+    used) or a plain string for jobs without a row.
+    """
+    if not isinstance(kind, str):
+        kind = kind._meta.label_lower
+    schema = getattr(connection, 'schema_name', 'public')
+    return f'progress:{schema}:{kind}:{object_id}'
+
+
+def read_progress(kind, object_id):
+    """The cached progress payload, or None when the job is not reporting."""
+    return cache.get(progress_key(kind, object_id))
+
+
+class ProgressChannel:
+    """Progress of one job, published to the cache and persisted at phase boundaries."""
+
+    def __init__(self, kind, object_id, instance=None, base=None,
+                 percent_field='progress_percent', message_field='progress_message',
+                 interval_ms=DEFAULT_INTERVAL_MS, timeout=PROGRESS_TTL, clock=time.monotonic):
+        self.key = progress_key(kind, object_id)
+        self.instance = instance
+        self.base = dict(base or {})
+        self.percent_field = percent_field
+        self.message_field = message_field
+        self.interval = interval_ms / 1000
+        self.timeout = timeout
+        self.clock = clock
+
+        self.status = getattr(instance, 'status', None)
+        self.percent = getattr(instance, percent_field, 0) if percent_field else 0
+        self.message = getattr(instance, message_field, '') if message_field else ''
+        self.extra = {}
+        self.writes = 0
+        self._last_write = None
+        self._pending = False
+
+    @classmethod
+    def for_instance(cls, instance, **kwargs):
+        """Channel keyed by ``instance``'s model and pk; see ``read_progress``."""
+        return cls(type(instance), instance.pk, instance=instance, **kwargs)
+
+    def update(self, percent, message, force=False, **extra):
+        """Record progress; written to the cache if ``interval_ms`` has passed (or ``force``)."""
+        self._set(percent, message, extra)
+        now = self.clock()
+        if force or self._last_write is None or now - self._last_write >= self.interval:
+            self._write(now)
+        else:
+            self._pending = True
+
+    def phase(self, percent, message, status=None, **extra):
+        """Phase boundary: write the cache now and persist progress (and status) to the DB."""
+        if status is not None:
+            self.status = status
+        self._set(percent, message, extra)
+        self._write(self.clock())
+        self._persist()
+
+    def flush(self):
+        """Write a throttled update that has not reached the cache yet."""
+        if self._pending:
+            self._write(self.clock())
+
+    def finish(self, percent=100, message='', status='COMPLETED', **extra):
+        """Final state for jobs without a DB row: kept in the cache until it expires."""
+        self.phase(percent, message, status=status, **extra)
+
+    def close(self):
+        """Drop the cache entry; readers fall back to the (now final) DB row."""
+        self._pending = False
+        cache.delete(self.key)
+
+    def payload(self):
+        return {
+            **self.base,
+            **self.extra,
+            'status': self.status,
+            'progress_percent': self.percent,
+            'progress_message': self.message,
+            'updated_at': timezone.now().isoformat(),
+        }
+
+    def _set(self, percent, message, extra):
+        self.percent = percent
+        self.message = message
+        self.extra.update(extra)
+
+    def _write(self, now):
+        try:
+            cache.set(self.key, self.payload(), self.timeout)
+        except Exception:
+            # Progress is advisory; never fail the job because the cache is down
+            logger.warning('Could not publish progress to %s', self.key, exc_info=True)
+        self._last_write = now
+        self._pending = False
+        self.writes += 1
+
+    def _persist(self):
+        if self.instance is None:
+            return
+        fields = []
+        if self.percent_field:
+            setattr(self.instance, self.percent_field, self.percent)
+            fields.append(self.percent_field)
+        if self.message_field:
+            setattr(self.instance, self.message_field, self.message)
+            fields.append(self.message_field)
+        if self.status is not None and getattr(self.instance, 'status', None) != self.status:
+            self.instance.status = self.status
+            fields.append('status')
+        if fields:
+            self.instance.save(update_fields=fields)
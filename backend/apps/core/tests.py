@@ -30,6 +30,7 @@ from apps.core.utils import (
     chunk_list,
     mask_sensitive_data,
 )
+from apps.core.services.progress import ProgressChannel, read_progress
 
 
 # =====================
@@ -449,3 +450,118 @@ class TestTenantDatabaseRouter:
 
     def test_disallow_migrate_other_db(self):
         assert self.router.allow_migrate('other', 'auth') is False
+
+
+# =====================
+# Progress Channel Tests
+# =====================
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressChannel:
+    """Throttled cache progress with DB writes only at phase boundaries."""
+
+    def _channel(self, instance=None, **kwargs):
+        self.clock = FakeClock()
+        job_id = uuid.uuid4()
+        channel = ProgressChannel('tests.job', job_id, instance=instance, clock=self.clock, **kwargs)
+        return channel, job_id
+
+    def test_updates_are_throttled(self):
+        channel, job_id = self._channel(interval_ms=500)
+        channel.update(1, 'first')
+        channel.update(2, 'second')
+        assert read_progress('tests.job', job_id)['progress_percent'] == 1
+
+        self.clock.now = 0.6
+        channel.update(3, 'third')
+        cached = read_progress('tests.job', job_id)
+        assert (cached['progress_percent'], cached['progress_message']) == (3, 'third')
+        assert channel.writes == 2
+        channel.close()
+
+    def test_flush_writes_pending_update(self):
+        channel, job_id = self._channel()
+        channel.update(1, 'first')
+        channel.update(2, 'second')
+        channel.flush()
+        assert read_progress('tests.job', job_id)['progress_percent'] == 2
+        channel.close()
+
+    def test_phase_persists_progress_and_status(self):
+        instance = MagicMock(status='VALIDATING', progress_percent=0, progress_message='')
+        channel, job_id = self._channel(instance=instance, base={'id': 'run-1'})
+
+        for pct in range(10, 60):
+            channel.update(pct, 'CSP iteration...')
+        instance.save.assert_not_called()
+
+        channel.phase(60, 'Feasible timetable generated.', status='OPTIMIZING')
+        instance.save.assert_called_once_with(
+            update_fields=['progress_percent', 'progress_message', 'status']
+        )
+        assert instance.status == 'OPTIMIZING'
+        cached = read_progress('tests.job', job_id)
+        assert cached['id'] == 'run-1'
+        assert cached['status'] == 'OPTIMIZING'
+
+        channel.close()
+        assert read_progress('tests.job', job_id) is None
+
+    def test_finish_keeps_final_state_without_instance(self):
+        channel, job_id = self._channel()
+        channel.update(50, 'Half way')
+        channel.finish(message='Done', generated=3)
+        cached = read_progress('tests.job', job_id)
+        assert cached['status'] == 'COMPLETED'
+        assert cached['progress_percent'] == 100
+        assert cached['generated'] == 3
+        channel.close()
+
+
+# =====================
+# Process Pool Tests
+# =====================
+
+import multiprocessing  # noqa: E402
+import os  # noqa: E402
+
+from apps.core.services.process_pool import process_pool  # noqa: E402
+
+_pool_label = None
+
+
+def _set_pool_label(label):
+    global _pool_label
+    _pool_label = label
+
+
+def _pool_job(n):
+    return os.getpid(), _pool_label, n * 2
+
+
+class TestProcessPool:
+
+    def test_starts_inside_a_daemonic_process(self):
+        context = multiprocessing.get_context('fork')
+        queue = context.SimpleQueue()
+
+        def task():
+            with process_pool(2, initializer=_set_pool_label, initargs=('ready',)) as pool:
+                queue.put((os.getpid(), pool.map(_pool_job, range(4))))
+
+        worker = context.Process(target=task, daemon=True)
+        worker.start()
+        parent, results = queue.get()
+        worker.join()
+
+        assert worker.exitcode == 0
+        assert [n for _, _, n in results] == [0, 2, 4, 6]
+        assert {label for _, label, _ in results} == {'ready'}
+        assert parent not in {pid for pid, _, _ in results}
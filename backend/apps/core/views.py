@@ -68,6 +68,9 @@ def health_check(request):
         health_status['status'] = 'unhealthy'
         health_status['database_error'] = str(e)
 
+    from apps.tenants.resolution import tenant_cache
+    health_status['tenant_cache'] = tenant_cache.stats()
+
     status_code = 200 if health_status['status'] == 'healthy' else 503
 
     return JsonResponse(health_status, status=status_code)
@@ -2,6 +2,8 @@
 Admin interface for Examinations models
 """
 
+from collections import defaultdict
+
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
@@ -317,7 +319,7 @@ class ExamResultAdmin(admin.ModelAdmin):
             'fields': ('total_marks_obtained', 'total_max_marks', 'percentage')
         }),
         ('Grading', {
-            'fields': ('cgpa', 'overall_grade', 'rank')
+            'fields': ('cgpa', 'overall_grade', 'rank', 'section_rank')
         }),
         ('Summary', {
             'fields': ('is_passed', 'subjects_passed', 'subjects_failed')
@@ -346,33 +348,27 @@ class ExamResultAdmin(admin.ModelAdmin):
 
     def recalculate_results(self, request, queryset):
         """Recalculate selected results"""
+        from .services.result_engine import compute_examination_results
+
+        students = defaultdict(list)
+        for examination_id, student_id in queryset.values_list('examination_id', 'student_id'):
+            students[examination_id].append(student_id)
+
         count = 0
-        for result in queryset:
-            result.calculate_result()
-            count += 1
+        for examination in Examination.objects.filter(id__in=students):
+            count += compute_examination_results(examination, student_ids=students[examination.id])['students']
         self.message_user(request, f'{count} result(s) recalculated.')
     recalculate_results.short_description = 'Recalculate results'
 
     def calculate_ranks(self, request, queryset):
-        """Calculate ranks for selected results"""
-        # Group by examination, class, and section
-        groups = {}
-        for result in queryset:
-            key = (result.examination_id, result.class_obj_id, result.section_id)
-            if key not in groups:
-                groups[key] = []
-            groups[key].append(result)
-        
+        """Calculate class and section ranks for the selected results' examinations"""
+        from .services.result_engine import rank_examination_results
+
         count = 0
-        for group in groups.values():
-            # Sort by percentage descending
-            sorted_results = sorted(group, key=lambda x: x.percentage, reverse=True)
-            for rank, result in enumerate(sorted_results, 1):
-                result.rank = rank
-                result.save()
-                count += 1
-        
-        self.message_user(request, f'Ranks calculated for {count} result(s).')
+        for examination in Examination.objects.filter(id__in=queryset.values('examination_id')):
+            count += rank_examination_results(examination)
+
+        self.message_user(request, f'Ranks updated for {count} result(s).')
     calculate_ranks.short_description = 'Calculate ranks'
 
     def get_queryset(self, request):
@@ -0,0 +1,157 @@
+"""
+Management command to benchmark the CSP exam scheduler.
+
+Builds synthetic board-exam inputs (no database access) and times
+``ExamScheduleGenerator.generate()`` with indexed occupancy, forward
+checking and dynamic MRV against the previous search, kept here as
+``ScanExamScheduleGenerator`` (static MRV order, every check scanning the
+assignment).
+
+Usage:
+    python manage.py benchmark_exam_scheduler --classes 15 --subjects 12
+    python manage.py benchmark_exam_scheduler --classes 15 --subjects 12 --days 16 --min-gap 1
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.examinations.models import ExamScheduleConfig
+from apps.examinations.services.exam_optimizer import ExamScheduleOptimizer
+from apps.examinations.services.exam_scheduler import ExamScheduleGenerator
+from apps.examinations.services.exam_synthetic import build_synthetic_exam_inputs
+
+
+class ScanExamScheduleGenerator(ExamScheduleGenerator):
+    """The scheduler as it was: static MRV order and scanning checks."""
+
+    def generate(self):
+        ordered = sorted(
+            self.exams_to_schedule,
+            key=lambda k: (-len(self.class_conflicts.get(k, set())),
+                           -self.exam_info[k]['student_count'])
+        )
+        self.iterations = 0
+        return self._scan_backtrack(ordered, 0, {})
+
+    def _scan_backtrack(self, ordered_exams, idx, assignment):
+        if idx == len(ordered_exams):
+            return dict(assignment)
+
+        self.iterations += 1
+        if self.iterations > self.max_iterations:
+            return None
+
+        exam_key = ordered_exams[idx]
+        exam = self.exam_info[exam_key]
+        valid_slots = [
+            (slot_date, session) for slot_date, session in self.exam_slots
+            if self._scan_constraints(exam_key, slot_date, session, assignment)
+        ]
+        random.shuffle(valid_slots)
+
+        for slot_date, session in valid_slots:
+            halls = self._scan_halls(exam, slot_date, session, assignment)
+            if halls is None:
+                continue
+            assignment[exam_key] = {'date': slot_date, 'session': session, 'hall_ids': halls}
+            result = self._scan_backtrack(ordered_exams, idx + 1, assignment)
+            if result is not None:
+                return result
+            del assignment[exam_key]
+        return None
+
+    def _scan_constraints(self, exam_key, slot_date, session, assignment):
+        class_id = exam_key[0]
+        for other_key, other_val in assignment.items():
+            if other_val['date'] == slot_date and other_val['session'] == session:
+                if other_key in self.class_conflicts.get(exam_key, set()):
+                    return False
+        day_count = 0
+        for other_key, other_val in assignment.items():
+            if other_val['date'] == slot_date and other_key[0] == class_id:
+                day_count += 1
+        if day_count >= self.max_exams_per_day:
+            return False
+        if self.min_gap > 0:
+            for other_key, other_val in assignment.items():
+                if other_key[0] == class_id:
+                    gap = abs((slot_date - other_val['date']).days)
+                    if 0 < gap < self.min_gap:
+                        return False
+        return True
+
+    def _scan_halls(self, exam, slot_date, session, assignment):
+        used_halls = set()
+        for other_val in assignment.values():
+            if other_val['date'] == slot_date and other_val['session'] == session:
+                used_halls.update(other_val.get('hall_ids', []))
+        available = [h for h in self.halls if h['id'] not in used_halls]
+        available.sort(key=lambda h: -h['seating_capacity'])
+        selected, capacity_so_far = [], 0
+        for hall in available:
+            selected.append(hall['id'])
+            capacity_so_far += hall['seating_capacity']
+            if capacity_so_far >= exam['student_count']:
+                return selected
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark CSP exam scheduling on synthetic inputs: indexed vs scanning search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--classes', type=int, default=15, help='Classes sitting the exam')
+        parser.add_argument('--subjects', type=int, default=12, help='Papers per class')
+        parser.add_argument('--days', type=int, default=20, help='Exam weekdays (two sessions each)')
+        parser.add_argument('--halls', type=int, default=20, help='Halls of 60 seats')
+        parser.add_argument('--min-gap', type=int, default=1, help='Minimum days between a class\'s exams')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per engine')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for inputs and slot shuffling')
+        parser.add_argument('--skip-baseline', action='store_true', help='Do not time the scanning search')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+
+        inputs = build_synthetic_exam_inputs(
+            num_classes=options['classes'], num_subjects=options['subjects'],
+            num_days=options['days'], num_halls=options['halls'],
+            min_gap=options['min_gap'], seed=options['seed'],
+        )
+        engines = [('indexed', ExamScheduleGenerator)]
+        if not options['skip_baseline']:
+            engines.append(('scan', ScanExamScheduleGenerator))
+
+        self.stdout.write(
+            f"\n{'engine':<8} {'exams':>6} {'median s':>10} {'min s':>10} {'iterations':>11} {'valid':>6}"
+        )
+        medians = {}
+        for name, generator_class in engines:
+            samples, schedule, generator = [], None, None
+            for _ in range(options['repeat']):
+                random.seed(options['seed'])
+                generator = generator_class(inputs)
+                started = time.perf_counter()
+                schedule = generator.generate()
+                samples.append(time.perf_counter() - started)
+            medians[name] = statistics.median(samples)
+            self.stdout.write(
+                f"{name:<8} {len(generator.exams_to_schedule):>6} {medians[name]:>10.3f} "
+                f"{min(samples):>10.3f} {generator.iterations:>11} "
+                f"{'yes' if self._is_valid(schedule, generator, inputs) else 'no':>6}"
+            )
+
+        if 'scan' in medians and medians['indexed']:
+            self.stdout.write(self.style.SUCCESS(
+                f"indexed speedup {medians['scan'] / medians['indexed']:.1f}x"
+            ))
+
+    @staticmethod
+    def _is_valid(schedule, generator, inputs):
+        if schedule is None or len(schedule) != len(generator.exams_to_schedule):
+            return False
+        optimizer = ExamScheduleOptimizer(schedule, inputs, ExamScheduleConfig())
+        return optimizer._verify_hard_constraints(schedule)
@@ -0,0 +1,79 @@
+"""
+Management command to benchmark report card PDF rendering.
+
+Renders synthetic single-exam (STANDARD) and cumulative report cards (no
+database access) and reports cards per second when every card builds its
+own style sheet, table styles and column widths - as rendering used to -
+against reusing one cached ``ReportCardRenderer`` for the whole run.
+
+Usage:
+    python manage.py benchmark_report_card_pdf --cards 200
+    python manage.py benchmark_report_card_pdf --cards 500 --subjects 8 --exams 4 --repeat 5
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.examinations.services.report_card_pdf import ReportCardRenderer, clear_renderers, get_renderer
+from apps.examinations.services.report_card_synthetic import build_synthetic_report_data
+
+
+class Command(BaseCommand):
+    help = 'Benchmark report card PDF rendering with and without the cached renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=200, help='Report cards rendered per run')
+        parser.add_argument('--subjects', type=int, default=6, help='Subjects per report card')
+        parser.add_argument('--exams', type=int, default=3, help='Examinations per cumulative report card')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per layout and engine')
+
+    def handle(self, *args, **options):
+        if options['cards'] < 1 or options['repeat'] < 1:
+            raise CommandError('--cards and --repeat must be at least 1')
+        if not 1 <= options['subjects'] <= 10:
+            raise CommandError('--subjects must be between 1 and 10')
+
+        self.stdout.write(
+            f"\n{'layout':<11} {'engine':<9} {'cards':>6} {'median s':>10} {'cards/s':>9} {'ms/card':>8}"
+        )
+        for layout, cumulative in (('STANDARD', False), ('CUMULATIVE', True)):
+            cards = [
+                build_synthetic_report_data(
+                    num_subjects=options['subjects'], cumulative=cumulative,
+                    num_exams=options['exams'], seed=seed,
+                )
+                for seed in range(options['cards'])
+            ]
+
+            # Interleave the engines so machine noise hits both alike
+            samples = {'per-card': [], 'cached': []}
+            for _ in range(options['repeat']):
+                for name, samples_of in samples.items():
+                    clear_renderers()
+                    started = time.perf_counter()
+                    for data in cards:
+                        renderer = ReportCardRenderer() if name == 'per-card' else get_renderer()
+                        renderer.render(data)
+                    samples_of.append(time.perf_counter() - started)
+
+            medians = {}
+            for name, samples_of in samples.items():
+                medians[name] = statistics.median(samples_of)
+                self.stdout.write(
+                    f"{layout:<11} {name:<9} {len(cards):>6} {medians[name]:>10.3f} "
+                    f"{len(cards) / medians[name]:>9.1f} {1000 * medians[name] / len(cards):>8.2f}"
+                )
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{layout:<11} cached renderer speedup {medians['per-card'] / medians['cached']:.2f}x "
+                f"(renderer setup {_setup_ms():.2f} ms, paid once per worker)"
+            ))
+
+
+def _setup_ms(rounds=50):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        ReportCardRenderer()
+    return 1000 * (time.perf_counter() - started) / rounds
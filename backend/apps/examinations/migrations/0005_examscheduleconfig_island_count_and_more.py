@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:49
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examinations', '0004_alter_examhall_id_alter_examination_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examscheduleconfig',
+            name='island_count',
+            field=models.IntegerField(default=1, help_text='Parallel GA populations (islands); 1 runs a single population', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(16)]),
+        ),
+        migrations.AddField(
+            model_name='examscheduleconfig',
+            name='migration_interval',
+            field=models.IntegerField(default=10, help_text='Generations between exchanges of the best individuals across islands', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AddField(
+            model_name='examscheduleconfig',
+            name='random_seed',
+            field=models.IntegerField(blank=True, help_text='Seed for reproducible optimization runs (empty = random)', null=True),
+        ),
+    ]
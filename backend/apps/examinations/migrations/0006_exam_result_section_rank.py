@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examinations', '0005_examscheduleconfig_island_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examresult',
+            name='section_rank',
+            field=models.IntegerField(blank=True, help_text='Rank in section', null=True),
+        ),
+    ]
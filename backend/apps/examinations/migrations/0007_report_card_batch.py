@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:24
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('academics', '0005_class_group_preprimary'),
+        ('examinations', '0006_exam_result_section_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportCardBatch',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('generate_pdf', models.BooleanField(default=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PREPARING', 'Preparing Data'), ('RENDERING', 'Rendering PDFs'), ('COMPLETED', 'Completed'), ('COMPLETED_WITH_ERRORS', 'Completed with Errors'), ('FAILED', 'Failed')], default='PENDING', max_length=25)),
+                ('progress_percent', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('progress_message', models.CharField(blank=True, max_length=500)),
+                ('total_students', models.IntegerField(default=0)),
+                ('generated_count', models.IntegerField(default=0)),
+                ('failed_count', models.IntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, help_text='Per-student failures: [{"student_id", "stage", "error"}]')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+                ('celery_task_id', models.CharField(blank=True, max_length=255)),
+                ('error_message', models.TextField(blank=True)),
+                ('class_obj', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_card_batches', to='academics.class')),
+                ('examination', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_card_batches', to='examinations.examination')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_card_batches', to='academics.section')),
+                ('template', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='batches', to='examinations.reportcardtemplate')),
+                ('triggered_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_card_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Report Card Batch',
+                'verbose_name_plural': 'Report Card Batches',
+                'db_table': 'examinations_report_card_batches',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['examination', 'section', '-created_at'], name='examination_examina_2e190d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examinations', '0007_report_card_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportcard',
+            name='pdf_data_hash',
+            field=models.CharField(blank=True, help_text='Hash of the report data, template and remarks pdf_file was rendered from', max_length=64),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_class_group_preprimary'),
+        ('examinations', '0008_report_card_pdf_data_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamStatistics',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('total_students', models.IntegerField(default=0)),
+                ('students_passed', models.IntegerField(default=0)),
+                ('students_failed', models.IntegerField(default=0)),
+                ('pass_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('average_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('median_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('highest_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('lowest_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('percentiles', models.JSONField(blank=True, default=dict, help_text='Percentage at the 10th, 25th, 75th and 90th percentiles: {"p10": 41.5, ...}')),
+                ('subjects', models.JSONField(blank=True, default=list, help_text='Per-subject breakdown: appeared, absent, passed, failed, average/median/highest/lowest marks')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('class_obj', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exam_statistics', to='academics.class')),
+                ('examination', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='examinations.examination')),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exam_statistics', to='academics.section')),
+            ],
+            options={
+                'verbose_name': 'Exam Statistics',
+                'verbose_name_plural': 'Exam Statistics',
+                'db_table': 'examinations_exam_statistics',
+                'indexes': [models.Index(fields=['examination', 'class_obj', 'section'], name='examination_examina_b9fe7e_idx')],
+            },
+        ),
+    ]
@@ -424,6 +424,11 @@ class ExamResult(BaseModel):
         blank=True,
         help_text='Rank in class'
     )
+    section_rank = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text='Rank in section'
+    )
     is_passed = models.BooleanField(default=False)
     subjects_passed = models.IntegerField(default=0)
     subjects_failed = models.IntegerField(default=0)
@@ -445,40 +450,76 @@ class ExamResult(BaseModel):
         return f"{self.student.get_full_name()} - {self.examination.name} - {self.percentage}%"
 
     def calculate_result(self):
-        """Calculate overall result from individual marks"""
-        marks = StudentMark.objects.filter(
-            exam_schedule__examination=self.examination,
-            student=self.student,
-            status='PRESENT'
-        )
-        
-        self.total_marks_obtained = sum(m.marks_obtained or 0 for m in marks)
-        self.total_max_marks = sum(m.exam_schedule.max_marks for m in marks)
-        
-        if self.total_max_marks > 0:
-            self.percentage = (self.total_marks_obtained / self.total_max_marks) * 100
-        
-        # Calculate CGPA
-        grade_points = [m.grade_point for m in marks if m.grade_point]
-        if grade_points:
-            self.cgpa = sum(grade_points) / len(grade_points)
-        
-        # Calculate overall grade
-        grade_scale = self.examination.grade_scale
-        grade_obj = grade_scale.grades.filter(
-            min_percentage__lte=self.percentage,
-            max_percentage__gte=self.percentage
-        ).first()
-        
-        if grade_obj:
-            self.overall_grade = grade_obj.grade
-        
-        # Count passed/failed subjects
-        self.subjects_passed = marks.filter(is_passed=True).count()
-        self.subjects_failed = marks.filter(is_passed=False).count()
-        self.is_passed = self.subjects_failed == 0
-        
-        self.save()
+        """
+        Recalculate this result from the student's marks.
+
+        Uses the set-based engine (``services.result_engine``), which also
+        serves whole examinations; ranks are left to ``rank_examination_results``.
+        """
+        from apps.examinations.services.result_engine import compute_examination_results
+
+        compute_examination_results(self.examination, student_ids=[self.student_id], rank=False)
+        self.refresh_from_db()
+
+
+class ExamStatistics(BaseModel):
+    """
+    Materialised result statistics of an examination for one section, one
+    class (no section) or the whole examination (no class), refreshed each
+    time results are computed (``services.exam_statistics``).
+    """
+    objects = TenantManager()
+
+    examination = models.ForeignKey(
+        Examination,
+        on_delete=models.CASCADE,
+        related_name='statistics'
+    )
+    class_obj = models.ForeignKey(
+        'academics.Class',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='exam_statistics'
+    )
+    section = models.ForeignKey(
+        'academics.Section',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='exam_statistics'
+    )
+    total_students = models.IntegerField(default=0)
+    students_passed = models.IntegerField(default=0)
+    students_failed = models.IntegerField(default=0)
+    pass_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    average_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    median_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    highest_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    lowest_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    percentiles = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Percentage at the 10th, 25th, 75th and 90th percentiles: {"p10": 41.5, ...}'
+    )
+    subjects = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Per-subject breakdown: appeared, absent, passed, failed, average/median/highest/lowest marks'
+    )
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'examinations_exam_statistics'
+        verbose_name = 'Exam Statistics'
+        verbose_name_plural = 'Exam Statistics'
+        indexes = [
+            models.Index(fields=['examination', 'class_obj', 'section']),
+        ]
+
+    def __str__(self):
+        scope = self.section or self.class_obj or 'All classes'
+        return f"{self.examination.name} - {scope}"
 
 
 # ============================================================================
@@ -630,6 +671,21 @@ class ExamScheduleConfig(BaseModel):
         default=40,
         validators=[MinValueValidator(10), MaxValueValidator(200)],
     )
+    island_count = models.IntegerField(
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(16)],
+        help_text='Parallel GA populations (islands); 1 runs a single population'
+    )
+    migration_interval = models.IntegerField(
+        default=10,
+        validators=[MinValueValidator(1), MaxValueValidator(100)],
+        help_text='Generations between exchanges of the best individuals across islands'
+    )
+    random_seed = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text='Seed for reproducible optimization runs (empty = random)'
+    )
 
     # Soft constraint weights
     weight_gap_balance = models.FloatField(
@@ -900,6 +956,11 @@ class ReportCard(BaseModel):
         null=True,
         blank=True
     )
+    pdf_data_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text='Hash of the report data, template and remarks pdf_file was rendered from'
+    )
     teacher_remarks = models.TextField(blank=True)
     principal_remarks = models.TextField(blank=True)
 
@@ -921,3 +982,92 @@ class ReportCard(BaseModel):
             student_name = 'Unknown'
             exam_name = 'Unknown'
         return f"Report Card - {student_name} - {exam_name}"
+
+
+class ReportCardBatch(BaseModel):
+    """
+    Tracks a background bulk generation of report cards for one section.
+    """
+    objects = TenantManager()
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('PREPARING', 'Preparing Data'),
+        ('RENDERING', 'Rendering PDFs'),
+        ('COMPLETED', 'Completed'),
+        ('COMPLETED_WITH_ERRORS', 'Completed with Errors'),
+        ('FAILED', 'Failed'),
+    ]
+    ACTIVE_STATUSES = ('PENDING', 'PREPARING', 'RENDERING')
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    examination = models.ForeignKey(
+        Examination,
+        on_delete=models.CASCADE,
+        related_name='report_card_batches'
+    )
+    class_obj = models.ForeignKey(
+        'academics.Class',
+        on_delete=models.CASCADE,
+        related_name='report_card_batches'
+    )
+    section = models.ForeignKey(
+        'academics.Section',
+        on_delete=models.CASCADE,
+        related_name='report_card_batches'
+    )
+    template = models.ForeignKey(
+        ReportCardTemplate,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='batches'
+    )
+    generate_pdf = models.BooleanField(default=True)
+
+    status = models.CharField(
+        max_length=25,
+        choices=STATUS_CHOICES,
+        default='PENDING'
+    )
+
+    # Progress
+    progress_percent = models.IntegerField(
+        default=0,
+        validators=[MinValueValidator(0), MaxValueValidator(100)]
+    )
+    progress_message = models.CharField(max_length=500, blank=True)
+    total_students = models.IntegerField(default=0)
+    generated_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Per-student failures: [{"student_id", "stage", "error"}]'
+    )
+
+    # Metadata
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    celery_task_id = models.CharField(max_length=255, blank=True)
+    error_message = models.TextField(blank=True)
+
+    triggered_by = models.ForeignKey(
+        'authentication.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='report_card_batches'
+    )
+
+    class Meta:
+        db_table = 'examinations_report_card_batches'
+        ordering = ['-created_at']
+        verbose_name = 'Report Card Batch'
+        verbose_name_plural = 'Report Card Batches'
+        indexes = [
+            models.Index(fields=['examination', 'section', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"Report cards - {self.examination.name} - {self.section} ({self.status})"
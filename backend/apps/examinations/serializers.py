@@ -14,6 +14,7 @@ from .models import (
     ExamResult,
     ReportCard,
     ReportCardTemplate,
+    ReportCardBatch,
     ExamHall,
     ExamScheduleConfig,
     ExamScheduleRun,
@@ -139,7 +140,7 @@ class StudentMarkSerializer(serializers.ModelSerializer):
 
 class BulkMarkEntrySerializer(serializers.Serializer):
     """Serializer for bulk mark entry"""
-    exam_schedule_id = serializers.IntegerField(required=True)
+    exam_schedule_id = serializers.UUIDField(required=True)
     marks_data = serializers.ListField(
         child=serializers.DictField(),
         required=True
@@ -171,7 +172,7 @@ class ExamResultSerializer(serializers.ModelSerializer):
             'id', 'examination', 'examination_name', 'student', 'student_name',
             'student_admission_number', 'class_obj', 'class_name', 'section',
             'section_name', 'total_marks_obtained', 'total_max_marks',
-            'percentage', 'cgpa', 'overall_grade', 'rank', 'is_passed',
+            'percentage', 'cgpa', 'overall_grade', 'rank', 'section_rank', 'is_passed',
             'subjects_passed', 'subjects_failed', 'remarks',
             'created_at', 'updated_at'
         ]
@@ -191,7 +192,7 @@ class DetailedExamResultSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'examination_name', 'student_name', 'class_name', 'section_name',
             'total_marks_obtained', 'total_max_marks', 'percentage', 'cgpa',
-            'overall_grade', 'rank', 'is_passed', 'subjects_passed',
+            'overall_grade', 'rank', 'section_rank', 'is_passed', 'subjects_passed',
             'subjects_failed', 'subject_marks', 'remarks'
         ]
     
@@ -296,13 +297,39 @@ class GenerateReportCardSerializer(serializers.Serializer):
 
 class BulkGenerateReportCardSerializer(serializers.Serializer):
     """Serializer for bulk report card generation"""
-    examination_id = serializers.IntegerField(required=True)
-    class_id = serializers.IntegerField(required=True)
-    section_id = serializers.IntegerField(required=True)
-    template_id = serializers.IntegerField(required=False)
+    examination_id = serializers.UUIDField(required=True)
+    class_id = serializers.UUIDField(required=True)
+    section_id = serializers.UUIDField(required=True)
+    template_id = serializers.UUIDField(required=False)
     generate_pdf = serializers.BooleanField(default=True)
 
 
+class ReportCardBatchSerializer(serializers.ModelSerializer):
+    """Serializer for background bulk report card batches"""
+    examination_name = serializers.CharField(source='examination.name', read_only=True)
+    section_name = serializers.CharField(source='section.name', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    triggered_by_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportCardBatch
+        fields = [
+            'id', 'examination', 'examination_name', 'class_obj', 'section', 'section_name',
+            'template', 'generate_pdf',
+            'status', 'status_display',
+            'progress_percent', 'progress_message',
+            'total_students', 'generated_count', 'failed_count', 'errors',
+            'started_at', 'completed_at', 'duration_seconds',
+            'celery_task_id', 'error_message',
+            'triggered_by', 'triggered_by_name',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+    def get_triggered_by_name(self, obj):
+        return obj.triggered_by.get_full_name() if obj.triggered_by else None
+
+
 # ============================================================================
 # AI EXAM SCHEDULER SERIALIZERS
 # ============================================================================
@@ -338,6 +365,7 @@ class ExamScheduleConfigSerializer(serializers.ModelSerializer):
             'avoid_back_to_back_heavy', 'heavy_subjects',
             'algorithm', 'algorithm_display',
             'max_iterations', 'population_size',
+            'island_count', 'migration_interval', 'random_seed',
             'weight_gap_balance', 'weight_heavy_subject_spread',
             'weight_hall_utilization', 'weight_invigilator_balance',
             'is_active', 'created_by', 'created_by_name',
@@ -0,0 +1,263 @@
+"""
+Incremental (delta) evaluation for the exam schedule GA.
+
+An ``ExamScheduleState`` owns one candidate schedule
+``(class_id, subject_id) -> {date, session, hall_ids}`` and keeps counters
+for every hard constraint, so moving one exam updates a handful of entries
+and feasibility is an O(1) check:
+
+- per (class, date, session): exams sitting together (H1 clash)
+- per (class, date):          exams on a day beyond ``max_exams_per_day``
+- per class:                  date counts, for pairs closer than ``min_gap``
+- per (date, session, hall):  exams sharing a hall
+
+Soft-constraint contributions are cached per class (S1 gap variance, S2
+heavy spread) and per exam (S3 hall waste); a move only marks its class and
+exam dirty, and ``score()`` recomputes those rows. S4 (daily balance) is
+derived from the per-date exam counts.
+
+Changes are recorded in an undo log: ``mark()`` / ``undo(mark)`` roll a move
+back in place, ``commit()`` forgets the log once a candidate is kept. Entry
+dicts are never modified, so copies share them.
+"""
+
+import math
+from datetime import timedelta
+
+
+class ExamContext:
+    """Static inputs shared by every state of one optimizer run."""
+
+    def __init__(self, exam_info, halls, heavy_subject_ids, min_gap, max_exams_per_day, weights):
+        self.student_counts = {key: info['student_count'] for key, info in exam_info.items()}
+        self.hall_capacity = {hall['id']: hall['seating_capacity'] for hall in halls}
+        self.heavy_subject_ids = set(heavy_subject_ids)
+        self.min_gap = min_gap
+        self.max_exams_per_day = max_exams_per_day
+        self.weights = weights
+        # Offsets whose dates are too close to another exam of the same class
+        self.gap_offsets = [timedelta(days=days) for days in range(1, min_gap)]
+        self.gap_offsets += [-offset for offset in self.gap_offsets]
+
+    def hall_waste(self, key, entry):
+        """Share of the allocated seats left empty (0 when no hall is set)."""
+        capacity = sum(self.hall_capacity.get(hall_id, 0) for hall_id in entry.get('hall_ids', []))
+        if capacity <= 0:
+            return 0.0
+        return (capacity - self.student_counts.get(key, 0)) / capacity
+
+
+class ExamScheduleState:
+    """A candidate exam schedule with hard-constraint counters and cached penalties."""
+
+    def __init__(self, context, schedule=None):
+        self.context = context
+        self.schedule = {}
+        self.log = []
+
+        self.class_slot = {}        # (class, date, session) -> exams
+        self.class_day = {}         # (class, date) -> exams
+        self.class_dates = {}       # class -> {date: exams}
+        self.heavy_dates = {}       # class -> {date: heavy-subject exams}
+        self.hall_slot = {}         # (date, session, hall) -> exams
+        self.date_count = {}        # date -> exams (S4)
+        self.violations = 0         # hard-constraint violations of all kinds
+
+        self.gaps = {}              # class -> S1 gap variance
+        self.heavy = {}             # class -> S2 heavy spread
+        self.waste = {}             # exam -> S3 hall waste ratio
+        self._dirty_classes = set()
+        self._dirty_exams = set()
+
+        for key, entry in (schedule or {}).items():
+            self.schedule[key] = entry
+            self._count(key, entry, 1)
+
+    def copy(self):
+        """Independent state sharing entry dicts (entries are never mutated)."""
+        self.flush()
+        clone = ExamScheduleState.__new__(ExamScheduleState)
+        clone.context = self.context
+        clone.log = []
+        for name in ('schedule', 'class_slot', 'class_day', 'hall_slot', 'date_count',
+                     'gaps', 'heavy', 'waste'):
+            setattr(clone, name, getattr(self, name).copy())
+        for name in ('class_dates', 'heavy_dates'):
+            setattr(clone, name, {class_id: dates.copy() for class_id, dates in getattr(self, name).items()})
+        clone.violations = self.violations
+        clone._dirty_classes = set()
+        clone._dirty_exams = set()
+        return clone
+
+    # ------------------------------------------------------------------
+    # Moves
+    # ------------------------------------------------------------------
+
+    def set_entry(self, key, entry, log=True):
+        """Place exam ``key`` at ``entry`` (or drop it when ``None``)."""
+        old = self.schedule.get(key)
+        if old is entry:
+            return
+        if log:
+            self.log.append((key, old))
+        if old is not None:
+            self._count(key, old, -1)
+        if entry is None:
+            del self.schedule[key]
+        else:
+            self.schedule[key] = entry
+            self._count(key, entry, 1)
+
+    def move(self, key, exam_date, session):
+        """Move exam ``key`` to another slot, keeping its halls."""
+        entry = self.schedule[key]
+        self.set_entry(key, {'date': exam_date, 'session': session, 'hall_ids': entry['hall_ids']})
+
+    def mark(self):
+        return len(self.log)
+
+    def undo(self, mark=0):
+        """Roll back every change made since ``mark``."""
+        while len(self.log) > mark:
+            key, old = self.log.pop()
+            self.set_entry(key, old, log=False)
+
+    def commit(self):
+        self.log.clear()
+
+    @property
+    def is_feasible(self):
+        """All hard constraints hold (see module docstring)."""
+        return self.violations == 0
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def penalties(self):
+        """
+        Soft-constraint penalties, matching ``ExamScheduleOptimizer._calc_*``.
+
+        Row caches are summed with ``math.fsum`` so the result does not depend
+        on the order rows were touched in.
+        """
+        self.flush()
+        waste = math.fsum(self.waste.values()) / (len(self.schedule) or 1)
+        daily = 0.0
+        if self.date_count:
+            counts = self.date_count.values()
+            mean = sum(counts) / len(counts)
+            daily = sum((c - mean) ** 2 for c in counts) / len(counts)
+        return {
+            'gap_balance': min(math.fsum(self.gaps.values()) * 0.3, 10.0),
+            'heavy_spread': min(math.fsum(self.heavy.values()) * 1.5, 10.0),
+            'hall_utilization': min(waste * 10.0, 10.0),
+            'invigilator_balance': min(daily * 0.5, 10.0),
+        }
+
+    def score(self):
+        penalties = self.penalties()
+        weights = self.context.weights
+        score = 100.0 - sum(weights[name] * penalty for name, penalty in penalties.items())
+        return max(0.0, score)
+
+    def flush(self):
+        """Recompute the rows touched since the last flush."""
+        for class_id in self._dirty_classes:
+            _store(self.gaps, class_id, _gap_variance(self.class_dates.get(class_id)))
+            _store(self.heavy, class_id, _heavy_spread(self.heavy_dates.get(class_id)))
+        for key in self._dirty_exams:
+            entry = self.schedule.get(key)
+            _store(self.waste, key, self.context.hall_waste(key, entry) if entry else 0.0)
+        self._dirty_classes.clear()
+        self._dirty_exams.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _count(self, key, entry, sign):
+        class_id = key[0]
+        exam_date, session = entry['date'], entry['session']
+        context = self.context
+
+        # H1: another exam of the class in the same session
+        self.violations += _overlap(self.class_slot, (class_id, exam_date, session), sign)
+
+        # Max exams per class per day: each exam beyond the limit is one violation
+        day_key = (class_id, exam_date)
+        before = self.class_day.get(day_key, 0)
+        _bump(self.class_day, day_key, sign)
+        limit = context.max_exams_per_day
+        self.violations += max(0, before + sign - limit) - max(0, before - limit)
+
+        # Min gap: pairs of the class's exams 0 < gap < min_gap days apart
+        dates = self.class_dates.get(class_id, {})
+        close = sum(dates.get(exam_date + offset, 0) for offset in context.gap_offsets)
+        self.violations += sign * close
+        _bump_nested(self.class_dates, class_id, exam_date, sign)
+        if key[1] in context.heavy_subject_ids:
+            _bump_nested(self.heavy_dates, class_id, exam_date, sign)
+
+        # Hall shared by two exams in the same session
+        for hall_id in entry.get('hall_ids', []):
+            self.violations += _overlap(self.hall_slot, (exam_date, session, hall_id), sign)
+
+        _bump(self.date_count, exam_date, sign)
+        self._dirty_classes.add(class_id)
+        self._dirty_exams.add(key)
+
+
+def _day_gaps(dates):
+    """Day gaps between consecutive exams, from a ``{date: exams}`` counter."""
+    ordered = sorted(day for day, count in (dates or {}).items() for _ in range(count))
+    return [(later - earlier).days for earlier, later in zip(ordered, ordered[1:])]
+
+
+def _gap_variance(dates):
+    gaps = _day_gaps(dates)
+    if not gaps:
+        return 0.0
+    mean = sum(gaps) / len(gaps)
+    return sum((g - mean) ** 2 for g in gaps) / len(gaps)
+
+
+def _heavy_spread(dates):
+    penalty = 0.0
+    for gap in _day_gaps(dates):
+        if gap <= 1:
+            penalty += 2
+        elif gap == 2:
+            penalty += 0.5
+    return penalty
+
+
+def _overlap(counter, key, sign):
+    """Change in "extra occupants" when one occupant joins (+1) or leaves (-1)."""
+    occupants = counter.get(key, 0)
+    _bump(counter, key, sign)
+    if sign > 0:
+        return 1 if occupants else 0
+    return -1 if occupants > 1 else 0
+
+
+def _store(cache, row, value):
+    if value:
+        cache[row] = value
+    else:
+        cache.pop(row, None)
+
+
+def _bump_nested(counters, outer, key, sign):
+    counter = counters.setdefault(outer, {})
+    _bump(counter, key, sign)
+    if not counter:
+        del counters[outer]
+
+
+def _bump(counter, key, sign):
+    value = counter.get(key, 0) + sign
+    if value:
+        counter[key] = value
+    else:
+        del counter[key]
@@ -0,0 +1,96 @@
+"""
+Indexed slot occupancy for the exam CSP.
+
+The scheduler's hard-constraint checks used to walk the whole assignment
+dict three or four times per candidate slot. ``ExamOccupancy`` keeps the
+answers indexed and updates them incrementally on assign/unassign:
+
+- per (date, session): classes sitting an exam, halls in use and the seats
+  still free;
+- per class: exams per date, for the max-exams-per-day and minimum-gap
+  rules.
+
+Halls are sorted by capacity once, so picking halls for an exam is a single
+pass over the free ones.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+
+class ExamOccupancy:
+    """
+    Usage:
+        occupancy = ExamOccupancy(halls, max_exams_per_day, min_gap)
+        if occupancy.can_place(class_id, slot_date, session):
+            hall_ids = occupancy.find_halls(needed, slot_date, session)
+            occupancy.assign(class_id, slot_date, session, hall_ids)
+        occupancy.unassign(class_id, slot_date, session, hall_ids)
+    """
+
+    def __init__(self, halls, max_exams_per_day, min_gap):
+        # Largest first, as the greedy hall selection has always done
+        self.halls = sorted(halls, key=lambda h: -h['seating_capacity'])
+        self.capacity = {hall['id']: hall['seating_capacity'] for hall in self.halls}
+        self.total_capacity = sum(self.capacity.values())
+        self.max_exams_per_day = max_exams_per_day
+        self.min_gap = min_gap
+
+        self.slot_classes = defaultdict(set)     # (date, session) -> class ids
+        self.slot_halls = defaultdict(set)       # (date, session) -> hall ids
+        self.slot_used_seats = defaultdict(int)  # (date, session) -> seats taken
+        self.class_dates = defaultdict(lambda: defaultdict(int))  # class -> date -> exams
+
+    def assign(self, class_id, slot_date, session, hall_ids):
+        slot = (slot_date, session)
+        self.slot_classes[slot].add(class_id)
+        self.slot_halls[slot].update(hall_ids)
+        self.slot_used_seats[slot] += sum(self.capacity.get(hid, 0) for hid in hall_ids)
+        self.class_dates[class_id][slot_date] += 1
+
+    def unassign(self, class_id, slot_date, session, hall_ids):
+        slot = (slot_date, session)
+        self.slot_classes[slot].discard(class_id)
+        self.slot_halls[slot].difference_update(hall_ids)
+        self.slot_used_seats[slot] -= sum(self.capacity.get(hid, 0) for hid in hall_ids)
+        dates = self.class_dates[class_id]
+        dates[slot_date] -= 1
+        if not dates[slot_date]:
+            del dates[slot_date]
+
+    def free_seats(self, slot_date, session):
+        return self.total_capacity - self.slot_used_seats.get((slot_date, session), 0)
+
+    def can_place(self, class_id, slot_date, session):
+        """H1 (no clash for the class), max exams per day and minimum gap."""
+        if class_id in self.slot_classes.get((slot_date, session), ()):
+            return False
+        dates = self.class_dates.get(class_id)
+        if not dates:
+            return True
+        if dates.get(slot_date, 0) >= self.max_exams_per_day:
+            return False
+        for gap in range(1, self.min_gap):
+            offset = timedelta(days=gap)
+            if dates.get(slot_date - offset) or dates.get(slot_date + offset):
+                return False
+        return True
+
+    def find_halls(self, needed, slot_date, session):
+        """
+        Free halls, largest first, until ``needed`` seats are covered.
+        Returns the hall ids or None if the free capacity is too small.
+        """
+        if self.free_seats(slot_date, session) < needed:
+            return None
+        used = self.slot_halls.get((slot_date, session), ())
+        selected = []
+        seats = 0
+        for hall in self.halls:
+            if hall['id'] in used:
+                continue
+            selected.append(hall['id'])
+            seats += hall['seating_capacity']
+            if seats >= needed:
+                return selected
+        return None
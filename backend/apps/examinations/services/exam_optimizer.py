@@ -9,23 +9,43 @@ Takes a feasible schedule from the CSP solver and optimizes for:
 """
 
 import random
-from copy import deepcopy
 from collections import defaultdict
 
+from apps.core.services.islands import model_snapshot, run_islands
+
+from .exam_incremental import ExamContext, ExamScheduleState
+
+# How the GA scores candidates:
+# - incremental: each ExamScheduleState keeps its penalties up to date as exams move
+# - full: every candidate is re-scored from scratch with fitness()
+EVALUATION_INCREMENTAL = 'incremental'
+EVALUATION_FULL = 'full'
+EVALUATION_MODES = (EVALUATION_INCREMENTAL, EVALUATION_FULL)
+
 
 class ExamScheduleOptimizer:
     """
     GA optimizer for exam scheduling soft constraints.
     """
 
-    def __init__(self, feasible_schedule, inputs, config, progress_callback=None):
+    plateau_threshold = 40
+
+    def __init__(self, feasible_schedule, inputs, config, progress_callback=None,
+                 evaluation=EVALUATION_INCREMENTAL, seed=None):
         """
         Args:
             feasible_schedule: dict from ExamScheduleGenerator
             inputs: dict from collect_exam_inputs()
             config: ExamScheduleConfig model instance
             progress_callback: callable(percent, message)
+            evaluation: one of EVALUATION_MODES
+            seed: RNG seed; defaults to config.random_seed (None = unseeded)
         """
+        if evaluation not in EVALUATION_MODES:
+            raise ValueError(f'Unknown evaluation mode: {evaluation}')
+        self.evaluation = evaluation
+        self.seed = seed if seed is not None else getattr(config, 'random_seed', None)
+        self.rng = random.Random(self.seed)
         self.initial_schedule = feasible_schedule
         self.inputs = inputs
         self.config = config
@@ -56,6 +76,11 @@ class ExamScheduleOptimizer:
 
         self.exam_keys = list(feasible_schedule.keys())
 
+        # Exam keys per class, in a stable order for crossover
+        self.class_keys = defaultdict(list)
+        for key in self.exam_keys:
+            self.class_keys[key[0]].append(key)
+
         # Class conflict graph
         self.class_conflicts = defaultdict(set)
         for i, k1 in enumerate(self.exam_keys):
@@ -72,29 +97,47 @@ class ExamScheduleOptimizer:
         }
 
         self.population_size = config.population_size
+        self.island_count = getattr(config, 'island_count', 1) or 1
+        self.migration_interval = getattr(config, 'migration_interval', 10) or 10
         self.max_iterations = config.max_iterations
+        self.generations_run = 0
+
+        # Shared inputs for incrementally evaluated candidates
+        self.delta_context = ExamContext(
+            self.exam_info, self.halls, self.heavy_subject_ids,
+            self.min_gap, self.max_exams_per_day, self.weights,
+        )
 
     def optimize(self):
         """
         Run GA optimization.
         Returns (optimized_schedule, fitness_score).
         """
+        if self.island_count > 1:
+            best_solution, best_score = run_islands(
+                self, self.island_count, self.migration_interval, seed=self.seed,
+            )
+            self._report_progress(100, f'Optimization complete. Score: {best_score:.1f}')
+            return best_solution or self.initial_schedule, best_score
+
         population = self._generate_population()
 
         best_score = -1
         best_solution = None
         no_improvement = 0
-        plateau_threshold = 40
+        self.generations_run = 0
 
         for gen in range(self.max_iterations):
-            scored = [(sol, self.fitness(sol)) for sol in population]
+            self.generations_run += 1
+            scored = list(zip(population, self._score_states(population)))
             scored.sort(key=lambda x: x[1], reverse=True)
 
             current_best = scored[0][1]
 
             if current_best > best_score:
                 best_score = current_best
-                best_solution = deepcopy(scored[0][0])
+                # Kept states are never modified again, so no copy is needed
+                best_solution = scored[0][0]
                 no_improvement = 0
             else:
                 no_improvement += 1
@@ -103,7 +146,7 @@ class ExamScheduleOptimizer:
                 pct = int((gen / self.max_iterations) * 100)
                 self._report_progress(pct, f'Gen {gen}/{self.max_iterations}, score: {best_score:.1f}')
 
-            if no_improvement >= plateau_threshold:
+            if no_improvement >= self.plateau_threshold:
                 self._report_progress(100, f'Converged at gen {gen}. Score: {best_score:.1f}')
                 break
 
@@ -111,28 +154,34 @@ class ExamScheduleOptimizer:
                 self._report_progress(100, f'Excellent score ({best_score:.1f}).')
                 break
 
-            # Selection + Crossover + Mutation
-            new_pop = []
-
-            elite_count = max(2, self.population_size // 10)
-            for i in range(elite_count):
-                new_pop.append(deepcopy(scored[i][0]))
-
-            while len(new_pop) < self.population_size:
-                p1 = self._tournament_select(scored)
-                p2 = self._tournament_select(scored)
-                child = self._crossover(p1, p2)
-                child = self._mutate(child)
-
-                if self._verify_hard_constraints(child):
-                    new_pop.append(child)
-                else:
-                    new_pop.append(deepcopy(p1))
-
-            population = new_pop
+            population = self._next_generation(scored)
 
         self._report_progress(100, f'Optimization complete. Score: {best_score:.1f}')
-        return best_solution if best_solution else self.initial_schedule, best_score
+        if best_solution is None:
+            return self.initial_schedule, best_score
+        return best_solution.schedule, best_score
+
+    def _next_generation(self, scored):
+        """Selection + crossover + mutation over ``scored`` (sorted best first)."""
+        new_pop = []
+
+        elite_count = max(2, self.population_size // 10)
+        for i in range(elite_count):
+            new_pop.append(scored[i][0])
+
+        while len(new_pop) < self.population_size:
+            p1 = self._tournament_select(scored)
+            p2 = self._tournament_select(scored)
+            child = self._crossover(p1, p2)
+            # Mutation undoes its own infeasible moves, so an infeasible
+            # child here means crossover broke constraints: keep a parent
+            self._mutate(child)
+            if not child.is_feasible:
+                child = p1
+            child.commit()
+            new_pop.append(child)
+
+        return new_pop
 
     def fitness(self, schedule):
         """Calculate fitness score 0-100."""
@@ -152,6 +201,24 @@ class ExamScheduleOptimizer:
 
         return max(0.0, score)
 
+    # Island model hooks (see apps.core.services.islands)
+
+    def island_worker_args(self):
+        """Constructor arguments for a copy of this optimizer in a worker process."""
+        args = (self.initial_schedule, self.inputs, model_snapshot(self.config))
+        return args, {'evaluation': self.evaluation}
+
+    def load_solution(self, schedule):
+        return ExamScheduleState(self.delta_context, schedule)
+
+    def dump_solution(self, state):
+        return state.schedule
+
+    def _score_states(self, population):
+        if self.evaluation == EVALUATION_FULL:
+            return [self.fitness(state.schedule) for state in population]
+        return [state.score() for state in population]
+
     def _calc_gap_penalty(self, schedule):
         """Penalty for uneven gaps between exams for same class."""
         class_dates = defaultdict(list)
@@ -228,70 +295,75 @@ class ExamScheduleOptimizer:
 
     def _generate_population(self):
         """Generate initial population from feasible schedule."""
-        population = [deepcopy(self.initial_schedule)]
+        initial = ExamScheduleState(self.delta_context, self.initial_schedule)
+        population = [initial]
         for _ in range(self.population_size - 1):
-            variant = deepcopy(self.initial_schedule)
-            for _ in range(random.randint(2, 6)):
-                variant = self._mutate(variant)
-                if not self._verify_hard_constraints(variant):
-                    variant = deepcopy(self.initial_schedule)
+            variant = initial.copy()
+            for _ in range(self.rng.randint(2, 6)):
+                self._mutate(variant)
+                if not variant.is_feasible:
+                    variant.undo()
                     break
+            variant.commit()
             population.append(variant)
         return population
 
     def _tournament_select(self, scored, k=3):
-        candidates = random.sample(scored, min(k, len(scored)))
+        candidates = self.rng.sample(scored, min(k, len(scored)))
         candidates.sort(key=lambda x: x[1], reverse=True)
-        return deepcopy(candidates[0][0])
+        return candidates[0][0]
 
     def _crossover(self, parent1, parent2):
-        """Crossover: for each class, take schedule from one parent."""
-        child = {}
-        class_ids = set(k[0] for k in self.exam_keys)
+        """
+        Crossover: for each class, take schedule from one parent.
 
-        for cid in class_ids:
-            source = parent1 if random.random() < 0.5 else parent2
-            for key in self.exam_keys:
-                if key[0] == cid and key in source:
-                    child[key] = deepcopy(source[key])
+        The child starts as a copy of parent1; only classes taken from
+        parent2 are rewritten (and re-scored).
+        """
+        child = parent1.copy()
+
+        for cid, keys in self.class_keys.items():
+            if self.rng.random() < 0.5:
+                continue
+            for key in keys:
+                child.set_entry(key, parent2.schedule.get(key))
 
         return child
 
-    def _mutate(self, schedule, mutation_rate=0.15):
-        """Mutation: move a random exam to a different valid slot."""
-        if random.random() > mutation_rate:
-            return schedule
+    def _mutate(self, state, mutation_rate=0.15):
+        """
+        Mutation: move a random exam to a different valid slot.
+
+        Applied in place; each tried slot is checked with the state's O(1)
+        feasibility counters and undone if it breaks a hard constraint.
+        """
+        if self.rng.random() > mutation_rate:
+            return state
 
-        schedule = deepcopy(schedule)
         if not self.exam_keys:
-            return schedule
+            return state
 
-        key = random.choice(self.exam_keys)
-        if key not in schedule:
-            return schedule
+        key = self.rng.choice(self.exam_keys)
+        if key not in state.schedule:
+            return state
 
         # Try to find a new valid slot
-        current = schedule[key]
+        current = state.schedule[key]
         available_slots = [s for s in self.exam_slots
                           if s != (current['date'], current['session'])]
 
-        random.shuffle(available_slots)
+        self.rng.shuffle(available_slots)
 
         for new_date, new_session in available_slots[:10]:
-            # Quick feasibility check
-            old_val = schedule[key]
-            schedule[key] = {
-                'date': new_date,
-                'session': new_session,
-                'hall_ids': old_val['hall_ids'],
-            }
+            mark = state.mark()
+            state.move(key, new_date, new_session)
 
-            if self._verify_hard_constraints(schedule):
-                return schedule
+            if state.is_feasible:
+                return state
 
-            schedule[key] = old_val
+            state.undo(mark)
 
-        return schedule
+        return state
 
     def _verify_hard_constraints(self, schedule):
         """Verify all hard constraints are satisfied."""
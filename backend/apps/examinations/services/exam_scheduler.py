@@ -7,12 +7,18 @@ Generates a feasible exam schedule that satisfies all hard constraints:
 - H3: Each subject scheduled exactly once per class/section
 - H4: Exams only on allowed dates/sessions
 - H5: Minimum gap between exams for same students respected
+
+Search keeps slot occupancy indexed (``ExamOccupancy``), shrinks the
+remaining exams' slot domains after every placement (forward checking) and
+always expands the most constrained exam next (dynamic MRV + degree).
 """
 
 import random
 from datetime import date, timedelta
 from collections import defaultdict
 
+from .exam_occupancy import ExamOccupancy
+
 
 class ExamScheduleGenerator:
     """
@@ -69,6 +75,7 @@ class ExamScheduleGenerator:
         self.class_conflicts = self._build_class_conflict_graph()
 
         self.max_iterations = 100000
+        self.occupancy = ExamOccupancy(self.halls, self.max_exams_per_day, self.min_gap)
         self.schedule = {}  # (class_id, subject_id) -> (date, session, hall_ids)
 
     def _build_class_conflict_graph(self):
@@ -90,7 +97,8 @@ class ExamScheduleGenerator:
 
     def generate(self):
         """
-        Generate a feasible exam schedule using CSP backtracking with MRV.
+        Generate a feasible exam schedule using CSP backtracking with forward
+        checking and dynamic MRV/degree ordering.
 
         Returns:
             dict mapping (class_id, subject_id) -> {date, session, hall_ids}
@@ -98,15 +106,32 @@ class ExamScheduleGenerator:
         """
         self._report_progress(0, 'Starting CSP exam schedule generation...')
 
-        # Sort exams by most constrained first (MRV heuristic)
-        ordered = sorted(
-            self.exams_to_schedule,
-            key=lambda k: (-len(self.class_conflicts.get(k, set())),
-                           -self.exam_info[k]['student_count'])
-        )
+        self.occupancy = ExamOccupancy(self.halls, self.max_exams_per_day, self.min_gap)
+        self.slots_by_date = defaultdict(list)
+        for slot_idx, (slot_date, _) in enumerate(self.exam_slots):
+            self.slots_by_date[slot_date].append(slot_idx)
+        self.class_exams = defaultdict(list)
+        for exam_key in self.exams_to_schedule:
+            self.class_exams[exam_key[0]].append(exam_key)
+
+        # Domains: slot indices still possible for each unplaced exam
+        all_slots = range(len(self.exam_slots))
+        self.domains = {
+            exam_key: {
+                idx for idx in all_slots
+                if self.exam_info[exam_key]['student_count'] <= self.occupancy.total_capacity
+            }
+            for exam_key in self.exams_to_schedule
+        }
+        self.unassigned = set(self.exams_to_schedule)
+        self.unassigned_per_class = {
+            class_id: len(exams) for class_id, exams in self.class_exams.items()
+        }
+        self._order = {exam_key: idx for idx, exam_key in enumerate(self.exams_to_schedule)}
+        self._trail = []
 
         self.iterations = 0
-        result = self._backtrack(ordered, 0, {})
+        result = self._backtrack({})
 
         if result is not None:
             self._report_progress(100, f'Feasible schedule found after {self.iterations} iterations.')
@@ -115,124 +140,179 @@ class ExamScheduleGenerator:
         self._report_progress(100, 'No feasible schedule found.')
         return None
 
-    def _backtrack(self, ordered_exams, idx, assignment):
-        """Recursive backtracking with forward checking."""
-        if idx == len(ordered_exams):
-            return dict(assignment)
-
-        self.iterations += 1
-        if self.iterations > self.max_iterations:
-            return None
-
-        if self.iterations % 5000 == 0:
-            pct = min(int((self.iterations / self.max_iterations) * 100), 99)
-            self._report_progress(pct, f'CSP iteration {self.iterations}...')
-
-        exam_key = ordered_exams[idx]
-        exam = self.exam_info[exam_key]
-
-        # Get valid slots for this exam
-        valid_slots = self._get_valid_slots(exam_key, assignment)
+    def _backtrack(self, assignment):
+        """
+        Depth-first search with an explicit stack (one frame per placed
+        exam). The next exam is always the unplaced one with the fewest
+        remaining slots (MRV), ties broken by how many unplaced exams of
+        its class it constrains (degree), then by size.
+        """
+        stack = []
+        total = len(self.exams_to_schedule)
+
+        while True:
+            if not self.unassigned:
+                return dict(assignment)
+
+            self.iterations += 1
+            if self.iterations > self.max_iterations:
+                return None
+
+            if self.iterations % 5000 == 0:
+                pct = min(int((len(assignment) / max(total, 1)) * 100), 99)
+                self._report_progress(pct, f'CSP iteration {self.iterations}...')
+
+            exam_key = self._select_exam()
+
+            # Shuffle to add randomness for diversity; with a minimum gap, try
+            # the slots that cost the class's other exams the fewest days first
+            candidates = sorted(self.domains[exam_key])
+            random.shuffle(candidates)
+            if self.min_gap > 1:
+                candidates.sort(key=lambda idx: self._gap_cost(exam_key, idx))
+            stack.append([exam_key, iter(candidates), len(self._trail), None])
+
+            # Place the deepest exam at its next candidate; unwind exhausted frames
+            while not self._place_next(assignment, stack[-1]):
+                stack.pop()
+                if not stack:
+                    return None
+
+    def _select_exam(self):
+        """Dynamic MRV with the degree heuristic as tie-break."""
+        return min(
+            self.unassigned,
+            key=lambda k: (
+                len(self.domains[k]),
+                -self.unassigned_per_class[k[0]],
+                -self.exam_info[k]['student_count'],
+                self._order[k],
+            ),
+        )
 
-        # Shuffle to add randomness for diversity
-        random.shuffle(valid_slots)
+    def _place_next(self, assignment, frame):
+        """
+        Undo the frame's current placement, then place its exam at the next
+        candidate slot that keeps every unplaced exam's domain non-empty.
+        Returns False when the candidates run out.
+        """
+        exam_key, candidates, trail_mark, placed = frame
+        if placed is not None:
+            self._unplace(assignment, exam_key, trail_mark)
+            frame[3] = None
 
-        for slot_date, session in valid_slots:
-            # Find available halls with enough capacity
-            halls = self._find_halls(exam, slot_date, session, assignment)
+        needed = self.exam_info[exam_key]['student_count']
+        class_id = exam_key[0]
+        for slot_idx in candidates:
+            slot_date, session = self.exam_slots[slot_idx]
+            if not self.occupancy.can_place(class_id, slot_date, session):
+                continue
+            halls = self.occupancy.find_halls(needed, slot_date, session)
             if halls is None:
                 continue
 
-            # Make assignment
             assignment[exam_key] = {
                 'date': slot_date,
                 'session': session,
                 'hall_ids': halls,
             }
-
-            result = self._backtrack(ordered_exams, idx + 1, assignment)
-            if result is not None:
-                return result
-
-            # Undo
-            del assignment[exam_key]
-
-        return None
-
-    def _get_valid_slots(self, exam_key, assignment):
-        """Get all valid (date, session) pairs for an exam."""
-        valid = []
+            self.occupancy.assign(class_id, slot_date, session, halls)
+            self.unassigned.discard(exam_key)
+            self.unassigned_per_class[class_id] -= 1
+
+            if self._forward_check(class_id, slot_idx):
+                frame[3] = slot_idx
+                return True
+            self._unplace(assignment, exam_key, trail_mark)
+
+        return False
+
+    def _unplace(self, assignment, exam_key, trail_mark):
+        placed = assignment.pop(exam_key)
+        self.occupancy.unassign(exam_key[0], placed['date'], placed['session'], placed['hall_ids'])
+        self.unassigned.add(exam_key)
+        self.unassigned_per_class[exam_key[0]] += 1
+        while len(self._trail) > trail_mark:
+            other_key, slot_idx = self._trail.pop()
+            self.domains[other_key].add(slot_idx)
+
+    def _gap_cost(self, exam_key, slot_idx):
+        """
+        Slots on neighbouring days that the class's other unplaced exams
+        would lose to the minimum gap (least constraining value).
+        """
         class_id = exam_key[0]
+        slot_date = self.exam_slots[slot_idx][0]
+        blocked = self._class_blocked_slots(class_id, slot_idx).difference(self.slots_by_date[slot_date])
+        return sum(
+            len(self.domains[other_key] & blocked)
+            for other_key in self.class_exams[class_id]
+            if other_key != exam_key and other_key in self.unassigned
+        )
 
-        for slot_date, session in self.exam_slots:
-            if not self._check_hard_constraints(exam_key, slot_date, session, assignment):
-                continue
-            valid.append((slot_date, session))
-
-        return valid
-
-    def _check_hard_constraints(self, exam_key, slot_date, session, assignment):
-        """Check all hard constraints for placing exam at (date, session)."""
-        class_id, subject_id = exam_key
-
-        # H1: No conflicting exam at same date+session
-        for other_key, other_val in assignment.items():
-            if other_val['date'] == slot_date and other_val['session'] == session:
-                if other_key in self.class_conflicts.get(exam_key, set()):
-                    return False
-
-        # H4: Max exams per day for same class
-        day_count = 0
-        for other_key, other_val in assignment.items():
-            if other_val['date'] == slot_date and other_key[0] == class_id:
-                day_count += 1
-        if day_count >= self.max_exams_per_day:
-            return False
-
-        # H5: Minimum gap between exams for same class
-        if self.min_gap > 0:
-            for other_key, other_val in assignment.items():
-                if other_key[0] == class_id:
-                    other_date = other_val['date']
-                    gap = abs((slot_date - other_date).days)
-                    if 0 < gap < self.min_gap:
-                        return False
-
+    def _class_blocked_slots(self, class_id, slot_idx):
+        """
+        Slots closed to ``class_id`` by its exam at ``slot_idx``: the session,
+        the whole day once it is full, and the days within the minimum gap.
+        """
+        slot_date = self.exam_slots[slot_idx][0]
+        blocked = {slot_idx}
+        if self.occupancy.class_dates[class_id].get(slot_date, 0) >= self.max_exams_per_day:
+            blocked.update(self.slots_by_date[slot_date])
+        for gap in range(1, self.min_gap):
+            for offset in (timedelta(days=gap), timedelta(days=-gap)):
+                blocked.update(self.slots_by_date.get(slot_date + offset, ()))
+        return blocked
+
+    def _forward_check(self, class_id, slot_idx):
+        """
+        Remove slots made invalid by a placement at ``slot_idx`` from the
+        unplaced exams' domains (recorded on the trail). Returns False if
+        some domain becomes empty.
+        """
+        slot_date, session = self.exam_slots[slot_idx]
+        occupancy = self.occupancy
+
+        pruned = self._class_blocked_slots(class_id, slot_idx)
+
+        for other_key in self.class_exams[class_id]:
+            if other_key in self.unassigned and not self._prune(other_key, pruned):
+                return False
+
+        # Every class: exams that no longer fit in the seats left at this slot
+        free = occupancy.free_seats(slot_date, session)
+        for other_key in self.unassigned:
+            if (slot_idx in self.domains[other_key]
+                    and self.exam_info[other_key]['student_count'] > free
+                    and not self._prune(other_key, (slot_idx,))):
+                return False
         return True
 
-    def _find_halls(self, exam, slot_date, session, assignment):
+    def _prune(self, exam_key, slot_indices):
+        domain = self.domains[exam_key]
+        for slot_idx in slot_indices:
+            if slot_idx in domain:
+                domain.remove(slot_idx)
+                self._trail.append((exam_key, slot_idx))
+        return bool(domain)
+
+    def _get_valid_slots(self, exam_key):
+        """Get all valid (date, session) pairs for an exam, given the current placements."""
+        return [
+            (slot_date, session) for slot_date, session in self.exam_slots
+            if self._check_hard_constraints(exam_key, slot_date, session)
+        ]
+
+    def _check_hard_constraints(self, exam_key, slot_date, session):
+        """Check all hard constraints for placing exam at (date, session) against ``self.occupancy``."""
+        return self.occupancy.can_place(exam_key[0], slot_date, session)
+
+    def _find_halls(self, exam, slot_date, session):
         """
-        Find halls to accommodate the exam at the given slot.
+        Find free halls to accommodate the exam at the given slot.
         Returns list of hall IDs or None if not enough capacity.
         """
-        # Get halls already used at this slot
-        used_halls = set()
-        for other_key, other_val in assignment.items():
-            if other_val['date'] == slot_date and other_val['session'] == session:
-                for hid in other_val.get('hall_ids', []):
-                    used_halls.add(hid)
-
-        # Find available halls
-        available = [h for h in self.halls if h['id'] not in used_halls]
-        if not available:
-            return None
-
-        # Greedy: pick halls until we have enough capacity
-        needed = exam['student_count']
-        selected = []
-        capacity_so_far = 0
-
-        # Sort by capacity descending for efficiency
-        available.sort(key=lambda h: -h['seating_capacity'])
-
-        for hall in available:
-            selected.append(hall['id'])
-            capacity_so_far += hall['seating_capacity']
-            if capacity_so_far >= needed:
-                return selected
-
-        # Not enough capacity
-        return None
+        return self.occupancy.find_halls(exam['student_count'], slot_date, session)
 
     def _report_progress(self, percent, message):
         if self.progress_callback:
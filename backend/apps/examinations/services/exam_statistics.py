@@ -0,0 +1,173 @@
+"""
+Materialised examination statistics.
+
+``ExaminationViewSet.statistics`` used to count and aggregate the results on
+every call, and every report card recomputed its section's average, highest
+and lowest percentage. ``refresh_examination_statistics`` instead stores one
+``ExamStatistics`` row per section, per class and for the whole examination
+- counts, pass rate, mean, median, percentiles and a per-subject breakdown -
+from two queries (results and marks). ``compute_examination_results`` calls
+it after writing results, so reads are a single indexed row fetch. Saving
+or deleting a single ExamResult (viewset, admin) drops the examination's
+rows instead (``invalidate_examination_statistics``, from ``signals``); the
+next ``examination_statistics`` call refreshes them.
+
+Percentiles interpolate linearly between the closest ranks (as numpy's
+default does).
+
+Usage:
+    refresh_examination_statistics(examination)
+    row = examination_statistics(examination, class_id=cls.id, section_id=section.id)
+"""
+
+import logging
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.examinations.models import Examination, ExamResult, ExamStatistics, StudentMark
+from apps.examinations.services.result_engine import CENT
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 75, 90)
+
+WHOLE_EXAMINATION = (None, None)
+
+
+def examination_statistics(examination, class_id=None, section_id=None):
+    """
+    The stored statistics of ``examination`` (or one class / section of it),
+    refreshed first if the examination has none yet. None if the scope has
+    no results.
+    """
+    rows = ExamStatistics.objects.filter(examination=examination)
+    row = rows.filter(class_obj_id=class_id, section_id=section_id).first()
+    if row is None and not rows.exists():
+        refresh_examination_statistics(examination)
+        row = rows.filter(class_obj_id=class_id, section_id=section_id).first()
+    return row
+
+
+def invalidate_examination_statistics(examination_id):
+    """Drop the stored statistics of an examination; the next read refreshes them."""
+    ExamStatistics.objects.filter(examination_id=examination_id).delete()
+
+
+@transaction.atomic
+def refresh_examination_statistics(examination):
+    """
+    Replace the statistics rows of ``examination`` from its results and marks.
+
+    Returns the number of rows written.
+    """
+    # Serialise refreshes of one examination so rows are replaced exactly once
+    list(Examination.objects.select_for_update().filter(pk=examination.pk).values_list('pk'))
+
+    results = defaultdict(lambda: {'percentages': [], 'passed': 0})
+    rows = ExamResult.objects.filter(examination=examination).values_list(
+        'class_obj_id', 'section_id', 'percentage', 'is_passed',
+    )
+    for class_id, section_id, percentage, is_passed in rows:
+        for scope in _scopes(class_id, section_id):
+            results[scope]['percentages'].append(percentage)
+            results[scope]['passed'] += is_passed
+
+    subjects = defaultdict(dict)
+    marks = StudentMark.objects.filter(exam_schedule__examination=examination).values_list(
+        'exam_schedule__class_obj_id', 'exam_schedule__section_id', 'exam_schedule__subject_id',
+        'exam_schedule__subject__name', 'exam_schedule__max_marks', 'status', 'marks_obtained', 'is_passed',
+    )
+    for class_id, section_id, subject_id, name, max_marks, mark_status, obtained, is_passed in marks:
+        for scope in _scopes(class_id, section_id):
+            subject = subjects[scope].setdefault(subject_id, {
+                'subject_name': name, 'max_marks': max_marks, 'marks': [], 'passed': 0, 'absent': 0,
+            })
+            subject['max_marks'] = max(subject['max_marks'], max_marks)
+            if mark_status == 'ABSENT':
+                subject['absent'] += 1
+            elif mark_status == 'PRESENT' and obtained is not None:
+                subject['marks'].append(obtained)
+                subject['passed'] += is_passed
+
+    now = timezone.now()
+    statistics = []
+    for scope in {WHOLE_EXAMINATION} | set(results) | set(subjects):
+        class_id, section_id = scope
+        row = ExamStatistics(
+            examination=examination, class_obj_id=class_id, section_id=section_id, computed_at=now,
+            **_result_summary(results[scope]['percentages'], results[scope]['passed']),
+        )
+        row.subjects = sorted(
+            (_subject_summary(subject_id, subject) for subject_id, subject in subjects[scope].items()),
+            key=lambda subject: subject['subject_name'],
+        )
+        statistics.append(row)
+
+    ExamStatistics.objects.filter(examination=examination).delete()
+    ExamStatistics.objects.bulk_create(statistics)
+    logger.info('Refreshed %d statistics row(s) for examination %s', len(statistics), examination.pk)
+    return len(statistics)
+
+
+def _scopes(class_id, section_id):
+    return (WHOLE_EXAMINATION, (class_id, None), (class_id, section_id))
+
+
+def _result_summary(percentages, passed):
+    """ExamStatistics field values for a scope's result percentages."""
+    values = sorted(percentages)
+    total = len(values)
+    if not total:
+        return {'percentiles': {}}
+    return {
+        'total_students': total,
+        'students_passed': passed,
+        'students_failed': total - passed,
+        'pass_percentage': _round(Decimal(passed) * 100 / total),
+        'average_percentage': _round(sum(values) / total),
+        'median_percentage': _round(percentile(values, 50)),
+        'highest_percentage': values[-1],
+        'lowest_percentage': values[0],
+        'percentiles': {f'p{q}': float(_round(percentile(values, q))) for q in PERCENTILES},
+    }
+
+
+def _subject_summary(subject_id, subject):
+    values = sorted(subject['marks'])
+    appeared = len(values)
+    summary = {
+        'subject_id': str(subject_id),
+        'subject_name': subject['subject_name'],
+        'max_marks': float(subject['max_marks']),
+        'students_appeared': appeared,
+        'students_absent': subject['absent'],
+        'students_passed': subject['passed'],
+        'students_failed': appeared - subject['passed'],
+        'pass_percentage': 0.0, 'average_marks': 0.0, 'median_marks': 0.0,
+        'highest_marks': 0.0, 'lowest_marks': 0.0,
+    }
+    if appeared:
+        summary.update(
+            pass_percentage=float(_round(Decimal(subject['passed']) * 100 / appeared)),
+            average_marks=float(_round(sum(values) / appeared)),
+            median_marks=float(_round(percentile(values, 50))),
+            highest_marks=float(values[-1]),
+            lowest_marks=float(values[0]),
+        )
+    return summary
+
+
+def percentile(values, q):
+    """The ``q``-th percentile of sorted ``values``, interpolated between ranks."""
+    position = Decimal(len(values) - 1) * q / 100
+    lower = int(position)
+    if lower + 1 >= len(values):
+        return values[-1]
+    return values[lower] + (values[lower + 1] - values[lower]) * (position - lower)
+
+
+def _round(value):
+    return Decimal(value).quantize(CENT, ROUND_HALF_UP)
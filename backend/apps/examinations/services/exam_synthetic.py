@@ -0,0 +1,68 @@
+"""
+Synthetic board-exam inputs for benchmarking the exam scheduler.
+
+``build_synthetic_exam_inputs`` returns a dict in the shape produced by
+``exam_schedule_validators.collect_exam_inputs`` without touching the
+database.
+"""
+
+import random
+from datetime import date, timedelta
+
+SYNTHETIC_SESSIONS = ('MORNING', 'AFTERNOON')
+
+
+def build_synthetic_exam_inputs(num_classes=15, num_subjects=12, num_days=20,
+                                sections_per_class=4, num_halls=20, hall_capacity=60,
+                                min_gap=1, max_exams_per_day=1, seed=0):
+    """
+    Inputs for ``num_classes`` classes of ``sections_per_class`` sections
+    (35-45 students each) sitting ``num_subjects`` papers over ``num_days``
+    weekdays with two sessions a day, in ``num_halls`` halls.
+    """
+    rng = random.Random(seed)
+
+    exam_slots = []
+    current = date(2026, 3, 2)  # a Monday
+    while len(exam_slots) < num_days * len(SYNTHETIC_SESSIONS):
+        if current.weekday() < 5:
+            exam_slots.extend((current, session) for session in SYNTHETIC_SESSIONS)
+        current += timedelta(days=1)
+
+    sections = []
+    subjects = {}
+    for class_idx in range(num_classes):
+        class_id = f'class-{class_idx + 1}'
+        for section_idx in range(sections_per_class):
+            sections.append({
+                'id': f'section-{class_idx + 1}-{section_idx + 1}',
+                'class_id': class_id,
+                'class_name': f'Class {class_idx + 1}',
+                'name': 'ABCDEFGH'[section_idx],
+                'student_count': rng.randint(35, 45),
+            })
+        subjects[class_id] = [
+            {
+                'subject_id': f'subject-{subject_idx + 1}',
+                'subject_name': f'Subject {subject_idx + 1}',
+                'duration_minutes': 180,
+                'max_marks': 100,
+                'min_passing_marks': 33,
+            }
+            for subject_idx in range(num_subjects)
+        ]
+
+    halls = [
+        {'id': f'hall-{idx + 1}', 'name': f'Hall {idx + 1}', 'seating_capacity': hall_capacity}
+        for idx in range(num_halls)
+    ]
+
+    return {
+        'exam_slots': exam_slots,
+        'subjects': subjects,
+        'halls': halls,
+        'sections': sections,
+        'min_gap': min_gap,
+        'max_exams_per_day': max_exams_per_day,
+        'heavy_subject_ids': {'subject-1', 'subject-2', 'subject-3'},
+    }
@@ -0,0 +1,177 @@
+"""
+Bulk mark entry for one exam schedule.
+
+``StudentMarkViewSet.bulk_entry`` used to ``update_or_create`` each student's
+mark: every save looked the grade up in the database and fired the house
+points signal, which queried the student's house and a system user and
+inserted a point log on its own. ``enter_marks`` instead:
+
+- validates every entry in memory (status, marks within
+  ``exam_schedule.max_marks``), checking the students with one query;
+- computes percentage, pass and grade the way ``StudentMark.save`` does,
+  against the scale's cached ``GradeTable``;
+- upserts all rows with one ``INSERT ... ON CONFLICT`` statement;
+- awards house points for newly reached grades with one ``bulk_create``
+  (``AutoPointService.award_academic_excellence_bulk``);
+- queues the recomputation of the students' existing ExamResults
+  (``compute_examination_results_task``) once the transaction commits.
+
+Usage:
+    stats = enter_marks(exam_schedule, [
+        {'student_id': student.id, 'marks_obtained': 85, 'status': 'PRESENT', 'remarks': ''},
+    ], entered_by=request.user)
+"""
+
+import logging
+import uuid
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import partial
+
+from django.db import transaction
+
+from apps.examinations.models import ExamResult, StudentMark
+from apps.examinations.services.result_engine import CENT, GradeTable
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+STATUSES = {value for value, _ in StudentMark.STATUS_CHOICES}
+
+MARK_FIELDS = [
+    'marks_obtained', 'status', 'is_passed', 'grade', 'grade_point', 'percentage',
+    'remarks', 'entered_by', 'updated_at',
+]
+
+
+def enter_marks(exam_schedule, entries, entered_by=None):
+    """
+    Validate and upsert the marks of ``exam_schedule`` (with its examination
+    and subject loaded). Invalid entries are reported, not saved.
+
+    Returns a dict: created, updated, errors (list of {student_id, error}),
+    house_points (logs created), results_queued (results to recompute).
+    """
+    from apps.students.models import Student
+
+    errors = []
+    valid = {}
+    for entry in entries:
+        student_id, values, error = _clean_entry(exam_schedule, entry)
+        if error is None and student_id in valid:
+            error = 'Duplicate entry for this student'
+        if error is not None:
+            errors.append({'student_id': str(entry.get('student_id')), 'error': error})
+        else:
+            valid[student_id] = values
+
+    known = set(Student.objects.filter(id__in=list(valid)).values_list('id', flat=True))
+    for student_id in [student_id for student_id in valid if student_id not in known]:
+        del valid[student_id]
+        errors.append({'student_id': str(student_id), 'error': 'Student not found'})
+
+    grades = GradeTable.cached(exam_schedule.examination.grade_scale_id)
+    previous = dict(
+        StudentMark.objects.filter(exam_schedule=exam_schedule, student_id__in=list(valid))
+        .values_list('student_id', 'grade')
+    )
+
+    marks = []
+    for student_id, values in valid.items():
+        mark = StudentMark(
+            exam_schedule=exam_schedule, student_id=student_id, entered_by=entered_by, **values,
+        )
+        _grade_mark(mark, exam_schedule, grades)
+        marks.append(mark)
+
+    awards = [
+        (mark.student_id, exam_schedule.subject.name, mark.grade)
+        for mark in marks
+        if mark.grade and previous.get(mark.student_id) != mark.grade
+    ]
+
+    with transaction.atomic():
+        StudentMark.objects.bulk_create(
+            marks,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['exam_schedule', 'student'],
+            update_fields=MARK_FIELDS,
+        )
+        examination = exam_schedule.examination
+        house_points = _award_house_points(awards, examination.academic_year_id)
+
+        result_students = [
+            str(student_id) for student_id in ExamResult.objects.filter(
+                examination=examination, student_id__in=list(valid),
+            ).values_list('student_id', flat=True)
+        ]
+        if result_students:
+            from apps.examinations.tasks import compute_examination_results_task
+
+            transaction.on_commit(partial(
+                compute_examination_results_task.delay, str(examination.id), result_students,
+            ))
+
+    stats = {
+        'created': len(marks) - len(previous),
+        'updated': len(previous),
+        'errors': errors,
+        'house_points': len(house_points),
+        'results_queued': len(result_students),
+    }
+    logger.info(
+        'Marks entered for exam schedule %s: %s created, %s updated, %s rejected',
+        exam_schedule.pk, stats['created'], stats['updated'], len(errors),
+    )
+    return stats
+
+
+def _clean_entry(exam_schedule, entry):
+    """(student_id, field values, None) for a valid entry, else (None, None, error)."""
+    try:
+        student_id = uuid.UUID(str(entry.get('student_id')))
+    except ValueError:
+        return None, None, 'Invalid student_id'
+
+    status = entry.get('status') or 'PRESENT'
+    if status not in STATUSES:
+        return None, None, f"Invalid status '{status}'"
+
+    marks_obtained = entry.get('marks_obtained')
+    if marks_obtained is not None and marks_obtained != '':
+        try:
+            marks_obtained = Decimal(str(marks_obtained)).quantize(CENT, ROUND_HALF_UP)
+        except (InvalidOperation, ValueError):
+            return None, None, 'Invalid marks_obtained'
+        if marks_obtained < 0:
+            return None, None, 'Marks obtained cannot be negative'
+        if marks_obtained > exam_schedule.max_marks:
+            return None, None, 'Marks obtained cannot exceed maximum marks'
+    else:
+        marks_obtained = None
+
+    return student_id, {
+        'marks_obtained': marks_obtained,
+        'status': status,
+        'remarks': entry.get('remarks') or '',
+    }, None
+
+
+def _grade_mark(mark, exam_schedule, grades):
+    """Percentage, pass and grade of ``mark``, as ``StudentMark.save`` sets them."""
+    if mark.status != 'PRESENT' or mark.marks_obtained is None:
+        return
+    mark.percentage = (mark.marks_obtained / exam_schedule.max_marks * 100).quantize(CENT, ROUND_HALF_UP)
+    mark.is_passed = mark.marks_obtained >= exam_schedule.min_passing_marks
+    grade = grades.lookup(mark.percentage)
+    if grade:
+        mark.grade, mark.grade_point = grade
+
+
+def _award_house_points(awards, academic_year_id):
+    if not awards:
+        return []
+    from apps.houses.services.auto_points import AutoPointService
+
+    return AutoPointService.award_academic_excellence_bulk(awards, academic_year_id)
@@ -0,0 +1,318 @@
+"""
+Background bulk generation of a section's report cards.
+
+``ReportCardViewSet.generate_bulk`` used to build every report card of a
+section inside the request: a ``ReportCardGenerator`` per student re-ran the
+class statistics, school and grade scale queries, loaded that student's
+marks, attendance and enrollment on their own, rendered the PDFs one after
+the other and dropped render failures silently. A ``ReportCardBatch`` runs
+in a Celery task instead (``generate_report_card_batch_task``):
+
+- ``SectionReportContext`` loads what the section's report cards share once
+  (school, class statistics, grade scale) and every student's marks,
+  attendance totals and enrollment with one query each;
+- students are processed in chunks: report data is built from the context
+  and written with ``bulk_create`` / ``bulk_update``, then the chunk's PDFs
+  are rendered across a process pool (rendering is CPU-bound and needs no
+  database; ``core.services.process_pool`` starts one inside the Celery
+  worker too) and stored; each worker builds the template's
+  ``ReportCardRenderer`` once, when it starts. A card whose stored PDF
+  was rendered from the same data (``pdf_data_hash``) is not rendered again;
+- per-student progress goes through a ``ProgressChannel``; counts and every
+  student that could not be generated (with the failing stage) are saved on
+  the batch after each chunk.
+
+Usage:
+    batch = ReportCardBatch.objects.create(examination=exam, class_obj=cls, section=section)
+    generate_report_card_batch_task.delay(str(batch.id))
+
+    stats = run_report_card_batch(batch, workers=1)
+"""
+
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.core.services.process_pool import process_pool
+from apps.examinations.models import ExamResult, ReportCard, StudentMark
+from apps.examinations.services.report_card_generator import (
+    attendance_summary, class_statistics, grade_scale_rows, school_info,
+    single_exam_report, student_info, subject_row,
+)
+from apps.examinations.services.report_card_pdf import get_renderer, report_card_hash, template_options
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_CHUNK_SIZE = 50
+BATCH_SIZE = 500
+
+REPORT_CARD_FIELDS = ['student', 'academic_year', 'report_data', 'template', 'generated_by', 'updated_at']
+
+# The renderer of the batch being rendered in this process (see ``_start_worker``)
+_worker_renderer = None
+
+
+class SectionReportContext:
+    """
+    What the report cards of one (examination, class, section) need, loaded
+    with a fixed number of queries whatever the number of students.
+    """
+
+    def __init__(self, examination, class_id, section_id, student_ids):
+        self.examination = examination
+        self.academic_year = examination.academic_year
+
+        self.school = school_info()
+        self.class_stats = class_statistics(examination.id, class_id, section_id)
+        self.grade_scale = grade_scale_rows(examination.grade_scale)
+
+        self.marks = defaultdict(list)
+        marks = StudentMark.objects.filter(
+            exam_schedule__examination=examination, student_id__in=student_ids,
+        ).select_related('exam_schedule__subject').order_by('exam_schedule__subject__name')
+        for mark in marks:
+            self.marks[mark.student_id].append(mark)
+
+        self.attendance = self._load_attendance(student_ids)
+        self.enrollments = self._load_enrollments(student_ids)
+
+    def _load_attendance(self, student_ids):
+        from apps.attendance.models import AttendanceSummary
+
+        rows = AttendanceSummary.objects.filter(
+            student_id__in=student_ids, academic_year=self.academic_year,
+        ).values('student_id').annotate(
+            total_days=Sum('total_days'),
+            present_days=Sum('present_days'),
+            absent_days=Sum('absent_days'),
+            late_days=Sum('late_days'),
+        ).order_by()
+        return {row['student_id']: attendance_summary(row) for row in rows}
+
+    def _load_enrollments(self, student_ids):
+        from apps.academics.models import StudentEnrollment
+
+        enrollments = {}
+        rows = StudentEnrollment.objects.filter(
+            student_id__in=student_ids,
+            academic_year=self.academic_year,
+            is_active=True,
+            is_deleted=False,
+        ).select_related('section__class_instance')
+        for enrollment in rows:
+            # Same pick as ReportCardGenerator._get_enrollment (first in default order)
+            enrollments.setdefault(enrollment.student_id, enrollment)
+        return enrollments
+
+    def report_data(self, result):
+        """report_data of ``result``'s single-exam report card."""
+        student_id = result.student_id
+        return single_exam_report(
+            result,
+            student=student_info(result.student, self.enrollments.get(student_id)),
+            subjects=[subject_row(mark) for mark in self.marks.get(student_id, [])],
+            attendance=self.attendance.get(student_id),
+            class_stats=self.class_stats,
+            school=self.school,
+            grade_scale=self.grade_scale,
+            academic_year_name=self.academic_year.name,
+        )
+
+
+def run_report_card_batch(batch, workers=None, chunk_size=None, channel=None):
+    """
+    Generate (or regenerate) the report cards of ``batch``'s section.
+
+    Updates the batch's counts and errors after every chunk and reports
+    per-student progress on ``channel`` when given. Status and timing are
+    left to the caller.
+
+    Returns a dict: total, generated, failed.
+    """
+    workers = workers or getattr(settings, 'REPORT_CARD_PDF_WORKERS', DEFAULT_WORKERS)
+    chunk_size = chunk_size or getattr(settings, 'REPORT_CARD_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    examination = batch.examination
+
+    results = list(
+        ExamResult.objects.filter(
+            examination=examination, class_obj_id=batch.class_obj_id, section_id=batch.section_id,
+        ).select_related('student')
+    )
+    for result in results:
+        result.examination = examination
+
+    _report(channel, 2, 'Loading section data...', status='PREPARING')
+    context = SectionReportContext(
+        examination, batch.class_obj_id, batch.section_id, [result.student_id for result in results],
+    )
+    total = len(results)
+    batch.total_students = total
+    batch.generated_count = batch.failed_count = 0
+    batch.errors = []
+    _save_counts(batch)
+
+    options = template_options(batch.template) if batch.generate_pdf else None
+    done = 0
+    _report(channel, 5, f'Generating {total} report card(s)...', status='RENDERING' if batch.generate_pdf else None)
+
+    with _render_pool(workers if batch.generate_pdf else 1, options) as pool:
+        render = pool.map if pool is not None else map
+        for start in range(0, total, chunk_size):
+            chunk = results[start:start + chunk_size]
+            cards = _write_report_cards(batch, context, chunk)
+            done += len(chunk) - len(cards)
+
+            if batch.generate_pdf:
+                stale = []
+                for card in cards:
+                    digest = report_card_hash(card)
+                    if _pdf_is_current(card, digest):
+                        batch.generated_count += 1
+                        done += 1
+                    else:
+                        stale.append((card, digest))
+                _progress(channel, batch, done, total)
+
+                jobs = [(card.report_data, card.teacher_remarks, card.principal_remarks) for card, _ in stale]
+                rendered = []
+                for (card, digest), (output, error) in zip(stale, render(_render, jobs)):
+                    if error is None:
+                        error = _store_pdf(card, *output)
+                    if error is None:
+                        card.pdf_data_hash = digest
+                        rendered.append(card)
+                        batch.generated_count += 1
+                    else:
+                        _fail(batch, card.student_id, 'pdf', error)
+                    done += 1
+                    _progress(channel, batch, done, total)
+                ReportCard.objects.bulk_update(rendered, ['pdf_file', 'pdf_data_hash'], batch_size=BATCH_SIZE)
+            else:
+                done += len(cards)
+                batch.generated_count += len(cards)
+                _progress(channel, batch, done, total)
+
+            _save_counts(batch)
+
+    stats = {'total': total, 'generated': batch.generated_count, 'failed': batch.failed_count}
+    logger.info('Report card batch %s: %s', batch.pk, stats)
+    return stats
+
+
+def _write_report_cards(batch, context, results):
+    """Build and upsert the report cards of ``results``; failures are recorded on the batch."""
+    data = {}
+    for result in results:
+        try:
+            data[result.id] = context.report_data(result)
+        except Exception as exc:
+            logger.warning('Report data failed for student %s', result.student_id, exc_info=True)
+            _fail(batch, result.student_id, 'data', _describe(exc))
+
+    existing = {
+        card.exam_result_id: card
+        for card in ReportCard.objects.filter(exam_result_id__in=list(data))
+    }
+    now = timezone.now()
+    cards, to_create, to_update = [], [], []
+    for result in results:
+        if result.id not in data:
+            continue
+        card = existing.get(result.id)
+        if card is None:
+            card = ReportCard(exam_result=result)
+            to_create.append(card)
+        else:
+            to_update.append(card)
+        card.student_id = result.student_id
+        card.academic_year = context.academic_year
+        card.report_data = data[result.id]
+        card.template = batch.template
+        card.generated_by = batch.triggered_by
+        card.updated_at = now
+        cards.append(card)
+
+    ReportCard.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    ReportCard.objects.bulk_update(to_update, REPORT_CARD_FIELDS, batch_size=BATCH_SIZE)
+    return cards
+
+
+@contextmanager
+def _render_pool(workers, options):
+    """
+    A process pool whose workers each build the renderer for ``options``
+    once, or None to render in this process.
+    """
+    if workers <= 1:
+        _start_worker(options)
+        yield None
+        return
+    with process_pool(workers, initializer=_start_worker, initargs=(options,)) as pool:
+        yield pool
+
+
+def _start_worker(options):
+    global _worker_renderer
+    _worker_renderer = get_renderer(options)
+
+
+def _render(job):
+    """Render one card with this process's renderer: ((filename, pdf bytes), None) or (None, error)."""
+    data, teacher_remarks, principal_remarks = job
+    try:
+        return _worker_renderer.render(data, teacher_remarks, principal_remarks), None
+    except Exception as exc:
+        return None, _describe(exc)
+
+
+def _pdf_is_current(card, digest):
+    """Whether ``card``'s stored PDF was rendered from what it holds now."""
+    if not card.pdf_file or card.pdf_data_hash != digest:
+        return False
+    try:
+        return card.pdf_file.storage.exists(card.pdf_file.name)
+    except Exception:
+        logger.warning('Checking report card PDF %s failed', card.pdf_file.name, exc_info=True)
+        return False
+
+
+def _store_pdf(card, filename, content):
+    """Save the rendered file to storage (the row is updated in bulk); returns an error or None."""
+    try:
+        card.pdf_file.save(filename, ContentFile(content), save=False)
+    except Exception as exc:
+        logger.warning('Storing report card PDF %s failed', filename, exc_info=True)
+        return _describe(exc)
+    return None
+
+
+def _fail(batch, student_id, stage, error):
+    batch.failed_count += 1
+    batch.errors.append({'student_id': str(student_id), 'stage': stage, 'error': error})
+
+
+def _describe(exc):
+    return f'{type(exc).__name__}: {exc}'
+
+
+def _report(channel, percent, message, status=None):
+    if channel is not None:
+        channel.phase(percent, message, status=status)
+
+
+def _progress(channel, batch, done, total):
+    if channel is not None:
+        channel.update(
+            5 + int(done / total * 94), f'Generated {done}/{total} report card(s)...',
+            total=total, generated=batch.generated_count, failed=batch.failed_count,
+        )
+
+
+def _save_counts(batch):
+    batch.save(update_fields=['total_students', 'generated_count', 'failed_count', 'errors', 'updated_at'])
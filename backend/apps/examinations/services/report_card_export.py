@@ -0,0 +1,272 @@
+"""
+Section-wide report card export.
+
+Printing a section's report cards used to mean one ``download_pdf`` request
+per student. ``ReportCardViewSet.export_section`` streams them all in one
+response instead, as either
+
+- one merged PDF (``stream_merged_pdf``): ``StreamingPdfMerger`` parses one
+  card at a time, renumbers its pages and the objects they use and writes
+  them out straight away, keeping only cross-reference offsets and page
+  numbers until the end; or
+- a ZIP of the individual PDFs (``stream_zip``), written through an
+  unseekable sink so every entry leaves as soon as it is added.
+
+Either way only one document is held in memory at a time. A card's stored
+PDF is reused while its ``pdf_data_hash`` matches what the card holds now;
+missing or stale PDFs are rendered on the way and stored back.
+
+Usage:
+    cards = ReportCard.objects.filter(exam_result__section=section).iterator()
+    response = StreamingHttpResponse(stream_merged_pdf(cards), content_type='application/pdf')
+    response = StreamingHttpResponse(stream_zip(cards), content_type='application/zip')
+"""
+
+import io
+import logging
+import zipfile
+from collections import deque
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from apps.examinations.services.report_card_pdf import get_renderer, report_card_filename, report_card_hash
+
+logger = logging.getLogger(__name__)
+
+ERRORS_ENTRY = 'errors.txt'
+
+
+def card_pdf(card):
+    """
+    (filename, pdf bytes) of ``card``: its stored PDF while current, else a
+    fresh render, which is stored on the card.
+    """
+    digest = report_card_hash(card)
+    filename = report_card_filename(card.report_data)
+    if card.pdf_file and card.pdf_data_hash == digest:
+        try:
+            with card.pdf_file.open('rb') as stored:
+                return filename, stored.read()
+        except Exception:
+            logger.warning('Stored PDF of report card %s unreadable, rendering it again', card.pk, exc_info=True)
+
+    filename, content = get_renderer(card.template).render(
+        card.report_data, card.teacher_remarks, card.principal_remarks,
+    )
+    card.pdf_file.save(filename, ContentFile(content), save=False)
+    card.pdf_data_hash = digest
+    card.save(update_fields=['pdf_file', 'pdf_data_hash', 'updated_at'])
+    return filename, content
+
+
+def iter_card_pdfs(cards):
+    """(card, filename, pdf bytes, error) for each card, one at a time."""
+    for card in cards:
+        try:
+            filename, content = card_pdf(card)
+        except Exception as exc:
+            logger.warning('Report card %s could not be exported', card.pk, exc_info=True)
+            yield card, None, None, f'{type(exc).__name__}: {exc}'
+        else:
+            yield card, filename, content, None
+
+
+def stream_merged_pdf(cards):
+    """
+    Chunks of one PDF holding every card's pages, in order. Cards that
+    cannot be rendered are left out (and logged).
+
+    Raises:
+        ImportError: pypdf is not installed (raised here, before streaming).
+    """
+    return _merged_chunks(StreamingPdfMerger(), cards)
+
+
+def _merged_chunks(merger, cards):
+    yield merger.start()
+    for card, filename, content, error in iter_card_pdfs(cards):
+        if error is None:
+            yield merger.add(content)
+    yield merger.close()
+
+
+def stream_zip(cards):
+    """
+    Chunks of a ZIP with one PDF per card, named after the admission number;
+    cards that could not be exported are listed in ``errors.txt``.
+    """
+    sink = _ZipSink()
+    errors = []
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for card, filename, content, error in iter_card_pdfs(cards):
+            if error is not None:
+                errors.append(f'{_admission_number(card)}: {error}')
+                continue
+            archive.writestr(_zip_info(f'{_admission_number(card)}_{filename}'), content)
+            yield sink.drain()
+        if errors:
+            archive.writestr(_zip_info(ERRORS_ENTRY), '\n'.join(errors) + '\n')
+    yield sink.drain()
+
+
+def _admission_number(card):
+    return (card.report_data or {}).get('student', {}).get('admission_number') or str(card.pk)
+
+
+def _zip_info(name):
+    # PDFs are compressed already; storing them keeps the ZIP cheap to build
+    info = zipfile.ZipInfo(name, date_time=timezone.localtime().timetuple()[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    return info
+
+
+class _ZipSink(io.RawIOBase):
+    """
+    Write-only, unseekable file for ``ZipFile`` (which then writes data
+    descriptors instead of seeking back); ``drain`` returns what was written
+    since the last call.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class StreamingPdfMerger:
+    """
+    Concatenates PDFs into one document, writing as it goes.
+
+    ``start`` returns the header; ``add`` parses one PDF and returns its
+    pages and every object they reach, renumbered after what was written
+    before; ``close`` returns the page tree, catalog, cross-reference table
+    and trailer. Only object offsets and page numbers are kept between calls.
+    """
+
+    PAGES = 1
+    CATALOG = 2
+
+    def __init__(self):
+        from pypdf import PdfReader
+        from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+        self.PdfReader = PdfReader
+        self.ArrayObject, self.DictionaryObject = ArrayObject, DictionaryObject
+        self.IndirectObject, self.StreamObject = IndirectObject, StreamObject
+
+        self.offsets = {}
+        self.pages = []
+        self.position = 0
+        self.next_number = self.CATALOG + 1
+
+    def start(self):
+        return self._emit(b'%PDF-1.4\n%\x93\x8c\x8b\x9e\n')
+
+    def add(self, content):
+        """The objects of one more PDF's pages, ready to write."""
+        reader = self.PdfReader(io.BytesIO(content))
+        numbers = {}
+        pending = deque()
+
+        def number_of(reference):
+            key = (reference.idnum, reference.generation)
+            if key not in numbers:
+                numbers[key] = self.next_number
+                self.next_number += 1
+                pending.append(reference)
+            return numbers[key]
+
+        for page in reader.pages:
+            self.pages.append(number_of(page.indirect_reference))
+
+        chunks = []
+        while pending:
+            reference = pending.popleft()
+            number = numbers[(reference.idnum, reference.generation)]
+            body = []
+            self._write(reference.get_object(), number_of, body)
+            chunks.append(self._object(number, b''.join(body)))
+        return b''.join(chunks)
+
+    def close(self):
+        """Page tree, catalog, cross-reference table and trailer."""
+        kids = b' '.join(b'%d 0 R' % number for number in self.pages)
+        chunks = [
+            self._object(self.PAGES, b'<< /Type /Pages /Count %d /Kids [%s] >>' % (len(self.pages), kids)),
+            self._object(self.CATALOG, b'<< /Type /Catalog /Pages %d 0 R >>' % self.PAGES),
+        ]
+        xref_at = self.position
+        size = self.next_number
+        xref = [b'xref\n0 %d\n0000000000 65535 f \n' % size]
+        xref.extend(b'%010d 00000 n \n' % self.offsets[number] for number in range(1, size))
+        xref.append(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            size, self.CATALOG, xref_at,
+        ))
+        chunks.append(b''.join(xref))
+        return b''.join(chunks)
+
+    def _object(self, number, body):
+        self.offsets[number] = self.position
+        return self._emit(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+
+    def _emit(self, data):
+        self.position += len(data)
+        return data
+
+    def _write(self, obj, number_of, out):
+        """Serialize ``obj`` into ``out`` with references renumbered."""
+        if isinstance(obj, self.IndirectObject):
+            out.append(b'%d 0 R' % number_of(obj))
+        elif isinstance(obj, self.StreamObject):
+            # The still-encoded stream data, copied as is
+            data = obj._data
+            self._write_dict(obj, number_of, out, skip='/Length', extra=b'/Length %d' % len(data))
+            out.append(b'\nstream\n')
+            out.append(data)
+            out.append(b'\nendstream')
+        elif isinstance(obj, self.DictionaryObject):
+            self._write_dict(obj, number_of, out)
+        elif isinstance(obj, self.ArrayObject):
+            out.append(b'[')
+            for item in list.__iter__(obj):
+                self._write(item, number_of, out)
+                out.append(b' ')
+            out.append(b']')
+        else:
+            buffer = io.BytesIO()
+            obj.write_to_stream(buffer)
+            out.append(buffer.getvalue())
+
+    def _write_dict(self, obj, number_of, out, skip=None, extra=b''):
+        is_page = obj.get('/Type') == '/Page'
+        out.append(b'<<')
+        for key, value in dict.items(obj):
+            if key == skip:
+                continue
+            self._write(key, number_of, out)
+            out.append(b' ')
+            if is_page and key == '/Parent':
+                # Every page hangs off the merged page tree
+                out.append(b'%d 0 R' % self.PAGES)
+            else:
+                self._write(value, number_of, out)
+            out.append(b'\n')
+        out.append(extra)
+        out.append(b'>>')
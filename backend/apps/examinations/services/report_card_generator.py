@@ -41,60 +41,16 @@ class ReportCardGenerator:
             'exam_schedule__examination__grade_scale',
         ).order_by('exam_schedule__subject__name')
 
-        subjects = []
-        for mark in marks:
-            subjects.append({
-                'subject_name': mark.exam_schedule.subject.name,
-                'subject_code': mark.exam_schedule.subject.code,
-                'subject_type': mark.exam_schedule.subject.subject_type,
-                'max_marks': float(mark.exam_schedule.max_marks),
-                'min_passing_marks': float(mark.exam_schedule.min_passing_marks),
-                'marks_obtained': float(mark.marks_obtained or 0),
-                'percentage': float(mark.percentage or 0),
-                'grade': mark.grade,
-                'grade_point': float(mark.grade_point or 0),
-                'is_passed': mark.is_passed,
-                'status': mark.status,
-            })
-
-        # Attendance data
-        attendance_data = self._get_attendance_data()
-
-        # Class statistics for ranking context
-        class_stats = self._get_class_statistics(exam_result)
-
-        enrollment = self._get_enrollment()
-
-        data = {
-            'student': self._student_info(enrollment),
-            'school': self._school_info(),
-            'examination': {
-                'name': exam_result.examination.name,
-                'type': exam_result.examination.exam_type.name,
-                'academic_year': self.academic_year.name,
-                'start_date': str(exam_result.examination.start_date),
-                'end_date': str(exam_result.examination.end_date),
-            },
-            'subjects': subjects,
-            'overall': {
-                'total_marks_obtained': float(exam_result.total_marks_obtained),
-                'total_max_marks': float(exam_result.total_max_marks),
-                'percentage': float(exam_result.percentage),
-                'cgpa': float(exam_result.cgpa or 0),
-                'overall_grade': exam_result.overall_grade,
-                'rank': exam_result.rank,
-                'total_students_in_class': class_stats.get('total_students', 0),
-                'is_passed': exam_result.is_passed,
-                'subjects_passed': exam_result.subjects_passed,
-                'subjects_failed': exam_result.subjects_failed,
-            },
-            'attendance': attendance_data,
-            'class_statistics': class_stats,
-            'grade_scale': self._get_grade_scale(exam_result.examination.grade_scale),
-            'generated_at': timezone.now().isoformat(),
-        }
-
-        return data
+        return single_exam_report(
+            exam_result,
+            student=self._student_info(self._get_enrollment()),
+            subjects=[subject_row(mark) for mark in marks],
+            attendance=self._get_attendance_data(),
+            class_stats=self._get_class_statistics(exam_result),
+            school=self._school_info(),
+            grade_scale=self._get_grade_scale(exam_result.examination.grade_scale),
+            academic_year_name=self.academic_year.name,
+        )
 
     def generate_cumulative(self, examinations):
         """
@@ -216,39 +172,11 @@ class ReportCardGenerator:
 
     def _student_info(self, enrollment=None):
         """Build student info dict."""
-        info = {
-            'name': self.student.get_full_name(),
-            'admission_number': self.student.admission_number,
-            'date_of_birth': str(self.student.date_of_birth),
-            'gender': self.student.get_gender_display(),
-            'father_name': self.student.father_name,
-            'mother_name': self.student.mother_name,
-            'photo_url': self.student.photo.url if self.student.photo else None,
-        }
-        if enrollment:
-            info['class'] = enrollment.section.class_instance.display_name
-            info['section'] = enrollment.section.name
-            info['roll_number'] = enrollment.roll_number
-        return info
+        return student_info(self.student, enrollment)
 
     def _school_info(self):
         """Build school info from tenant."""
-        from django.db import connection
-        try:
-            from apps.tenants.models import School
-            school = School.objects.filter(
-                schema_name=connection.schema_name
-            ).first()
-            if school:
-                return {
-                    'name': school.name,
-                    'address': getattr(school, 'address', ''),
-                    'phone': getattr(school, 'phone_number', ''),
-                    'email': getattr(school, 'email', ''),
-                }
-        except Exception:
-            pass
-        return {'name': '', 'address': '', 'phone': '', 'email': ''}
+        return school_info()
 
     def _get_enrollment(self):
         """Get current enrollment for the student."""
@@ -273,58 +201,176 @@ class ReportCardGenerator:
             if not summaries.exists():
                 return None
 
-            totals = summaries.aggregate(
+            return attendance_summary(summaries.aggregate(
                 total_days=Sum('total_days'),
                 present_days=Sum('present_days'),
                 absent_days=Sum('absent_days'),
                 late_days=Sum('late_days'),
-            )
-            total = totals['total_days'] or 0
-            present = totals['present_days'] or 0
-            return {
-                'total_working_days': total,
-                'days_present': present,
-                'days_absent': totals['absent_days'] or 0,
-                'days_late': totals['late_days'] or 0,
-                'attendance_percentage': round(
-                    (present / total * 100) if total > 0 else 0, 2
-                ),
-            }
+            ))
         except Exception:
             return None
 
     def _get_class_statistics(self, exam_result):
         """Get class-level statistics for context."""
-        from apps.examinations.models import ExamResult
-        class_results = ExamResult.objects.filter(
-            examination=exam_result.examination,
-            class_obj=exam_result.class_obj,
-            section=exam_result.section,
-        )
-        stats = class_results.aggregate(
-            total_students=Count('id'),
-            avg_percentage=Avg('percentage'),
-            highest_percentage=Max('percentage'),
-            lowest_percentage=Min('percentage'),
+        return class_statistics(
+            exam_result.examination_id, exam_result.class_obj_id, exam_result.section_id,
         )
-        return {
-            'total_students': stats['total_students'] or 0,
-            'class_average': round(float(stats['avg_percentage'] or 0), 2),
-            'highest_percentage': round(float(stats['highest_percentage'] or 0), 2),
-            'lowest_percentage': round(float(stats['lowest_percentage'] or 0), 2),
-        }
 
     def _get_grade_scale(self, grade_scale):
         """Return grade scale as list of dicts for display."""
-        if not grade_scale:
-            return []
-        return [
-            {
-                'grade': g.grade,
-                'min_percentage': float(g.min_percentage),
-                'max_percentage': float(g.max_percentage),
-                'grade_point': float(g.grade_point),
-                'description': g.description,
+        return grade_scale_rows(grade_scale)
+
+
+def single_exam_report(exam_result, student, subjects, attendance, class_stats,
+                       school, grade_scale, academic_year_name):
+    """Assemble the report_data of a single-exam report card."""
+    examination = exam_result.examination
+    return {
+        'student': student,
+        'school': school,
+        'examination': {
+            'name': examination.name,
+            'type': examination.exam_type.name,
+            'academic_year': academic_year_name,
+            'start_date': str(examination.start_date),
+            'end_date': str(examination.end_date),
+        },
+        'subjects': subjects,
+        'overall': {
+            'total_marks_obtained': float(exam_result.total_marks_obtained),
+            'total_max_marks': float(exam_result.total_max_marks),
+            'percentage': float(exam_result.percentage),
+            'cgpa': float(exam_result.cgpa or 0),
+            'overall_grade': exam_result.overall_grade,
+            'rank': exam_result.rank,
+            'total_students_in_class': class_stats.get('total_students', 0),
+            'is_passed': exam_result.is_passed,
+            'subjects_passed': exam_result.subjects_passed,
+            'subjects_failed': exam_result.subjects_failed,
+        },
+        'attendance': attendance,
+        'class_statistics': class_stats,
+        'grade_scale': grade_scale,
+        'generated_at': timezone.now().isoformat(),
+    }
+
+
+def subject_row(mark):
+    """One subject line of a single-exam report card (mark with exam_schedule__subject loaded)."""
+    return {
+        'subject_name': mark.exam_schedule.subject.name,
+        'subject_code': mark.exam_schedule.subject.code,
+        'subject_type': mark.exam_schedule.subject.subject_type,
+        'max_marks': float(mark.exam_schedule.max_marks),
+        'min_passing_marks': float(mark.exam_schedule.min_passing_marks),
+        'marks_obtained': float(mark.marks_obtained or 0),
+        'percentage': float(mark.percentage or 0),
+        'grade': mark.grade,
+        'grade_point': float(mark.grade_point or 0),
+        'is_passed': mark.is_passed,
+        'status': mark.status,
+    }
+
+
+def attendance_summary(totals):
+    """Attendance block from summed AttendanceSummary day counts."""
+    total = totals['total_days'] or 0
+    present = totals['present_days'] or 0
+    return {
+        'total_working_days': total,
+        'days_present': present,
+        'days_absent': totals['absent_days'] or 0,
+        'days_late': totals['late_days'] or 0,
+        'attendance_percentage': round(
+            (present / total * 100) if total > 0 else 0, 2
+        ),
+    }
+
+
+def student_info(student, enrollment=None):
+    """Build student info dict."""
+    info = {
+        'name': student.get_full_name(),
+        'admission_number': student.admission_number,
+        'date_of_birth': str(student.date_of_birth),
+        'gender': student.get_gender_display(),
+        'father_name': student.father_name,
+        'mother_name': student.mother_name,
+        'photo_url': student.photo.url if student.photo else None,
+    }
+    if enrollment:
+        info['class'] = enrollment.section.class_instance.display_name
+        info['section'] = enrollment.section.name
+        info['roll_number'] = enrollment.roll_number
+    return info
+
+
+def school_info():
+    """Build school info from tenant."""
+    from django.db import connection
+    try:
+        from apps.tenants.models import School
+        school = School.objects.filter(
+            schema_name=connection.schema_name
+        ).first()
+        if school:
+            return {
+                'name': school.name,
+                'address': getattr(school, 'address', ''),
+                'phone': getattr(school, 'phone_number', ''),
+                'email': getattr(school, 'email', ''),
             }
-            for g in grade_scale.grades.all().order_by('-min_percentage')
-        ]
+    except Exception:
+        pass
+    return {'name': '', 'address': '', 'phone': '', 'email': ''}
+
+
+def class_statistics(examination_id, class_obj_id, section_id):
+    """
+    Class-level statistics for context: the section's stored statistics
+    (``services.exam_statistics``), aggregated from its results if none.
+    """
+    from apps.examinations.models import ExamResult, ExamStatistics
+    row = ExamStatistics.objects.filter(
+        examination_id=examination_id, class_obj_id=class_obj_id, section_id=section_id,
+    ).only('total_students', 'average_percentage', 'highest_percentage', 'lowest_percentage').first()
+    if row is not None:
+        return {
+            'total_students': row.total_students,
+            'class_average': round(float(row.average_percentage), 2),
+            'highest_percentage': round(float(row.highest_percentage), 2),
+            'lowest_percentage': round(float(row.lowest_percentage), 2),
+        }
+
+    stats = ExamResult.objects.filter(
+        examination_id=examination_id,
+        class_obj_id=class_obj_id,
+        section_id=section_id,
+    ).aggregate(
+        total_students=Count('id'),
+        avg_percentage=Avg('percentage'),
+        highest_percentage=Max('percentage'),
+        lowest_percentage=Min('percentage'),
+    )
+    return {
+        'total_students': stats['total_students'] or 0,
+        'class_average': round(float(stats['avg_percentage'] or 0), 2),
+        'highest_percentage': round(float(stats['highest_percentage'] or 0), 2),
+        'lowest_percentage': round(float(stats['lowest_percentage'] or 0), 2),
+    }
+
+
+def grade_scale_rows(grade_scale):
+    """Return grade scale as list of dicts for display."""
+    if not grade_scale:
+        return []
+    return [
+        {
+            'grade': g.grade,
+            'min_percentage': float(g.min_percentage),
+            'max_percentage': float(g.max_percentage),
+            'grade_point': float(g.grade_point),
+            'description': g.description,
+        }
+        for g in grade_scale.grades.all().order_by('-min_percentage')
+    ]
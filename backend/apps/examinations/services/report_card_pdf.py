@@ -3,14 +3,58 @@ Report Card PDF Renderer.
 
 Generates PDF report cards from report_data JSON using ReportLab.
 Supports multiple layouts (STANDARD, CBSE, ICSE, COMPACT).
+
+Everything that does not depend on the card itself - the style sheet and
+custom paragraph styles, table styles, column widths, the template's flags
+and its decoded logo - lives on a ``ReportCardRenderer``. Renderers are
+cached per process, keyed by template (and its last update) and layout, so
+a bulk run pays for them once per worker instead of once per card.
+
+A stored PDF records ``pdf_data_hash`` - the hash of everything it was
+rendered from - so callers can tell whether it is still current.
+
+Usage:
+    generate_report_card_pdf(report_card)
+    filename, pdf = get_renderer(template).render(report_data)
+    current = report_card.pdf_data_hash == report_card_hash(report_card)
 """
 
+import hashlib
 import io
+import json
 import logging
+from collections import OrderedDict
+
 from django.core.files.base import ContentFile
 
 logger = logging.getLogger(__name__)
 
+# ReportCardTemplate fields read while rendering
+TEMPLATE_FIELDS = (
+    'layout', 'header_text', 'footer_text',
+    'show_rank', 'show_percentage', 'show_grade', 'show_cgpa', 'show_attendance',
+    'show_teacher_remarks', 'show_principal_signature', 'show_parent_signature_line',
+    'show_grade_scale',
+)
+
+DEFAULT_OPTIONS = {
+    'id': None, 'updated_at': None, 'logo': None,
+    'layout': 'STANDARD', 'header_text': '', 'footer_text': '',
+    **{field: True for field in TEMPLATE_FIELDS if field.startswith('show_')},
+}
+
+# Renderers kept per process; a batch uses one template
+MAX_CACHED_RENDERERS = 8
+
+LOGO_HEIGHT_MM = 18
+
+SECTION_HEADINGS = (
+    'Subject-wise Performance', 'Overall Summary', 'Attendance Summary',
+    'Class Teacher Remarks', "Principal's Remarks", 'Grading Scale',
+)
+
+_renderers = OrderedDict()
+
 
 def generate_report_card_pdf(report_card):
     """
@@ -22,382 +66,533 @@ def generate_report_card_pdf(report_card):
     Returns:
         bool: True if PDF generated successfully.
     """
+    if not report_card.report_data:
+        logger.error("No report_data on report card %s", report_card.id)
+        return False
+
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.lib.units import mm, cm
-        from reportlab.platypus import (
-            SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+        filename, pdf_content = render_report_card_pdf(
+            report_card.report_data,
+            template=report_card.template,
+            teacher_remarks=report_card.teacher_remarks,
+            principal_remarks=report_card.principal_remarks,
         )
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
     except ImportError:
         logger.error("ReportLab not installed. Install with: pip install reportlab")
         return False
 
-    data = report_card.report_data
-    if not data:
-        logger.error("No report_data on report card %s", report_card.id)
-        return False
+    report_card.pdf_data_hash = report_card_hash(report_card)
+    report_card.pdf_file.save(filename, ContentFile(pdf_content), save=True)
+    logger.info("PDF generated for report card %s: %s", report_card.id, filename)
+    return True
+
 
-    template = report_card.template
-    layout = template.layout if template else 'STANDARD'
-
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=15 * mm,
-        leftMargin=15 * mm,
-        topMargin=15 * mm,
-        bottomMargin=15 * mm,
+def render_report_card_pdf(data, template=None, teacher_remarks='', principal_remarks=''):
+    """
+    Render report_data to PDF bytes without touching the database.
+
+    ``template`` is a ReportCardTemplate, a ``template_options()`` dict or None.
+
+    Returns:
+        tuple: (filename, pdf_bytes)
+
+    Raises:
+        ImportError: ReportLab is not installed.
+    """
+    return get_renderer(template).render(data, teacher_remarks, principal_remarks)
+
+
+def pdf_data_hash(data, template=None, teacher_remarks='', principal_remarks=''):
+    """
+    SHA-256 of what a report card PDF is rendered from: report_data (less
+    its ``generated_at`` stamp, which is not printed), the renderer's
+    template key and the remarks.
+    """
+    payload = {
+        'data': {key: value for key, value in (data or {}).items() if key != 'generated_at'},
+        'renderer': renderer_key(template),
+        'remarks': [teacher_remarks or '', principal_remarks or ''],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def report_card_hash(report_card):
+    """``pdf_data_hash`` of a ReportCard as it stands."""
+    return pdf_data_hash(
+        report_card.report_data,
+        report_card.template,
+        report_card.teacher_remarks,
+        report_card.principal_remarks,
     )
 
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    styles.add(ParagraphStyle(
-        'SchoolName', parent=styles['Heading1'],
-        fontSize=16, alignment=TA_CENTER, spaceAfter=2 * mm,
-        textColor=colors.HexColor('#1a237e'),
-    ))
-    styles.add(ParagraphStyle(
-        'ReportTitle', parent=styles['Heading2'],
-        fontSize=13, alignment=TA_CENTER, spaceAfter=4 * mm,
-        textColor=colors.HexColor('#333333'),
-    ))
-    styles.add(ParagraphStyle(
-        'SectionHeader', parent=styles['Heading3'],
-        fontSize=11, spaceAfter=2 * mm, spaceBefore=4 * mm,
-        textColor=colors.HexColor('#1a237e'),
-    ))
-    styles.add(ParagraphStyle(
-        'CellText', parent=styles['Normal'],
-        fontSize=9, leading=11,
-    ))
-    styles.add(ParagraphStyle(
-        'FooterText', parent=styles['Normal'],
-        fontSize=8, alignment=TA_CENTER, textColor=colors.grey,
-    ))
-
-    elements = []
-
-    # -- Header Section --
-    school_info = data.get('school', {})
-    school_name = school_info.get('name', 'School Name')
-    elements.append(Paragraph(school_name, styles['SchoolName']))
-
-    header_text = ''
-    if template and template.header_text:
-        header_text = template.header_text
-    elif school_info.get('address'):
-        header_text = school_info['address']
-    if header_text:
-        elements.append(Paragraph(header_text, styles['CellText']))
-
-    # Report title
-    exam_info = data.get('examination', {})
-    if data.get('is_cumulative'):
-        title = f"Cumulative Report Card - {data.get('academic_year', '')}"
-    else:
-        title = f"Report Card - {exam_info.get('name', '')}"
-    elements.append(Spacer(1, 3 * mm))
-    elements.append(Paragraph(title, styles['ReportTitle']))
-
-    # -- Student Info Table --
-    student = data.get('student', {})
-    student_info_data = [
-        ['Student Name', student.get('name', ''), 'Class', student.get('class', '')],
-        ['Admission No.', student.get('admission_number', ''), 'Section', student.get('section', '')],
-        ['Father\'s Name', student.get('father_name', ''), 'Roll No.', student.get('roll_number', '')],
-        ['Date of Birth', student.get('date_of_birth', ''), 'Gender', student.get('gender', '')],
-    ]
-
-    student_table = Table(student_info_data, colWidths=[35 * mm, 55 * mm, 30 * mm, 55 * mm])
-    student_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8eaf6')),
-        ('BACKGROUND', (2, 0), (2, -1), colors.HexColor('#e8eaf6')),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bbbbbb')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('TOPPADDING', (0, 0), (-1, -1), 3),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(student_table)
-
-    # -- Subject Marks Table --
-    elements.append(Paragraph('Subject-wise Performance', styles['SectionHeader']))
 
+def report_card_filename(data):
+    """File name of the PDF rendered from report_data."""
+    student_name = data.get('student', {}).get('name', 'student').replace(' ', '_')
     if data.get('is_cumulative'):
-        _build_cumulative_marks_table(elements, data, styles, template)
+        return f"report_card_cumulative_{student_name}_{data.get('academic_year', '')}.pdf"
+    exam_name = data.get('examination', {}).get('name', 'exam').replace(' ', '_')
+    return f"report_card_{student_name}_{exam_name}.pdf"
+
+
+def template_options(template):
+    """
+    The template settings the renderer reads, as a plain dict that can be
+    sent to another process (None for the default layout).
+    """
+    if template is None:
+        return None
+    options = {field: getattr(template, field) for field in TEMPLATE_FIELDS}
+    options.update(
+        id=str(template.pk),
+        updated_at=template.updated_at.isoformat() if template.updated_at else None,
+        logo=_read_logo(template),
+    )
+    return options
+
+
+def renderer_key(template):
+    """Cache key of the renderer for a template, options dict or None."""
+    if template is None:
+        return (None, None, 'STANDARD')
+    if isinstance(template, dict):
+        return (template.get('id'), template.get('updated_at'), template.get('layout', 'STANDARD'))
+    updated_at = template.updated_at.isoformat() if template.updated_at else None
+    return (str(template.pk), updated_at, template.layout)
+
+
+def get_renderer(template=None):
+    """This process's renderer for ``template``, built on first use."""
+    key = renderer_key(template)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        options = template if template is None or isinstance(template, dict) else template_options(template)
+        renderer = ReportCardRenderer(options)
+        _renderers[key] = renderer
+        while len(_renderers) > MAX_CACHED_RENDERERS:
+            _renderers.popitem(last=False)
     else:
-        _build_single_exam_marks_table(elements, data, styles, template)
-
-    # -- Overall Summary --
-    elements.append(Paragraph('Overall Summary', styles['SectionHeader']))
-    overall = data.get('overall') or data.get('cumulative_overall', {})
-
-    show_rank = template.show_rank if template else True
-    show_pct = template.show_percentage if template else True
-    show_grade = template.show_grade if template else True
-    show_cgpa = template.show_cgpa if template else True
-
-    summary_rows = []
-    if show_pct:
-        pct_val = overall.get('percentage') or overall.get('weighted_percentage', 0)
-        summary_rows.append(['Percentage', f"{pct_val}%"])
-    if show_grade and overall.get('overall_grade'):
-        summary_rows.append(['Overall Grade', overall.get('overall_grade', '')])
-    if show_cgpa and overall.get('cgpa'):
-        summary_rows.append(['CGPA', str(overall.get('cgpa', ''))])
-    if show_rank and overall.get('rank'):
-        rank_text = f"{overall['rank']}"
-        total = overall.get('total_students_in_class')
-        if total:
-            rank_text += f" / {total}"
-        summary_rows.append(['Rank', rank_text])
-
-    result_text = 'PASS' if overall.get('is_passed', True) else 'FAIL'
-    summary_rows.append(['Result', result_text])
-
-    if summary_rows:
-        summary_table = Table(summary_rows, colWidths=[45 * mm, 130 * mm])
-        summary_table.setStyle(TableStyle([
+        _renderers.move_to_end(key)
+    return renderer
+
+
+def clear_renderers():
+    _renderers.clear()
+
+
+def _read_logo(template):
+    if not getattr(template, 'school_logo', None):
+        return None
+    try:
+        with template.school_logo.open('rb') as logo:
+            return logo.read()
+    except Exception:
+        logger.warning("Could not read logo of report card template %s", template.pk, exc_info=True)
+        return None
+
+
+class ReportCardRenderer:
+    """
+    Compiled styles and layout of one template; ``render`` turns report_data
+    into a PDF. Reused for any number of cards, one card at a time (the
+    shared flowables are not safe to lay out from two threads at once).
+    """
+
+    def __init__(self, options=None):
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.lib.units import mm
+        from reportlab.lib.utils import ImageReader
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+        self.Paragraph, self.Spacer, self.Table = Paragraph, Spacer, Table
+        self.SimpleDocTemplate = SimpleDocTemplate
+        self.pagesize = A4
+        self.mm = mm
+
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        opts = self.options
+        self.layout = opts['layout']
+        self.show_rank = opts['show_rank']
+        self.show_pct = opts['show_percentage']
+        self.show_grade = opts['show_grade']
+        self.show_cgpa = opts['show_cgpa']
+        self.show_attendance = opts['show_attendance']
+        self.show_remarks = opts['show_teacher_remarks']
+        self.show_signatures = opts['show_principal_signature']
+        self.show_parent_sig = opts['show_parent_signature_line']
+        self.show_grade_scale = opts['show_grade_scale']
+        self.header_text = opts['header_text']
+        self.footer_text = opts['footer_text']
+
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(
+            'SchoolName', parent=styles['Heading1'],
+            fontSize=16, alignment=TA_CENTER, spaceAfter=2 * mm,
+            textColor=colors.HexColor('#1a237e'),
+        ))
+        styles.add(ParagraphStyle(
+            'ReportTitle', parent=styles['Heading2'],
+            fontSize=13, alignment=TA_CENTER, spaceAfter=4 * mm,
+            textColor=colors.HexColor('#333333'),
+        ))
+        styles.add(ParagraphStyle(
+            'SectionHeader', parent=styles['Heading3'],
+            fontSize=11, spaceAfter=2 * mm, spaceBefore=4 * mm,
+            textColor=colors.HexColor('#1a237e'),
+        ))
+        styles.add(ParagraphStyle(
+            'CellText', parent=styles['Normal'],
+            fontSize=9, leading=11,
+        ))
+        styles.add(ParagraphStyle(
+            'FooterText', parent=styles['Normal'],
+            fontSize=8, alignment=TA_CENTER, textColor=colors.grey,
+        ))
+        self.styles = styles
+
+        light = colors.HexColor('#e8eaf6')
+        border = colors.HexColor('#bbbbbb')
+        heading = colors.HexColor('#1a237e')
+        stripes = [colors.white, colors.HexColor('#f5f5f5')]
+
+        self.student_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('BACKGROUND', (0, 0), (0, -1), light),
+            ('BACKGROUND', (2, 0), (2, -1), light),
+            ('GRID', (0, 0), (-1, -1), 0.5, border),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TOPPADDING', (0, 0), (-1, -1), 3),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+            ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ])
+        self.single_marks_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BACKGROUND', (0, 0), (-1, 0), heading),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, border),
+            ('ALIGN', (2, 0), (-1, -1), 'CENTER'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), stripes),
+            ('TOPPADDING', (0, 0), (-1, -1), 3),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+        ])
+        self.cumulative_marks_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('BACKGROUND', (0, 0), (-1, 0), heading),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, border),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), stripes),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+        ])
+        self.summary_style = TableStyle([
             ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 0), (-1, -1), 10),
             ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8eaf6')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bbbbbb')),
+            ('BACKGROUND', (0, 0), (0, -1), light),
+            ('GRID', (0, 0), (-1, -1), 0.5, border),
             ('TOPPADDING', (0, 0), (-1, -1), 3),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
             ('LEFTPADDING', (0, 0), (-1, -1), 4),
-        ]))
-        elements.append(summary_table)
-
-    # -- Attendance --
-    show_attendance = template.show_attendance if template else True
-    attendance = data.get('attendance')
-    if show_attendance and attendance:
-        elements.append(Paragraph('Attendance Summary', styles['SectionHeader']))
-        att_rows = [
-            ['Total Working Days', str(attendance.get('total_working_days', ''))],
-            ['Days Present', str(attendance.get('days_present', ''))],
-            ['Days Absent', str(attendance.get('days_absent', ''))],
-            ['Attendance %', f"{attendance.get('attendance_percentage', 0)}%"],
-        ]
-        att_table = Table(att_rows, colWidths=[45 * mm, 130 * mm])
-        att_table.setStyle(TableStyle([
+        ])
+        self.attendance_style = TableStyle([
             ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
             ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bbbbbb')),
+            ('GRID', (0, 0), (-1, -1), 0.5, border),
             ('TOPPADDING', (0, 0), (-1, -1), 2),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
             ('LEFTPADDING', (0, 0), (-1, -1), 4),
-        ]))
-        elements.append(att_table)
-
-    # -- Remarks --
-    show_remarks = template.show_teacher_remarks if template else True
-    if show_remarks:
-        if report_card.teacher_remarks:
-            elements.append(Paragraph('Class Teacher Remarks', styles['SectionHeader']))
-            elements.append(Paragraph(report_card.teacher_remarks, styles['CellText']))
-        if report_card.principal_remarks:
-            elements.append(Paragraph("Principal's Remarks", styles['SectionHeader']))
-            elements.append(Paragraph(report_card.principal_remarks, styles['CellText']))
-
-    # -- Grade Scale --
-    show_grade_scale = template.show_grade_scale if template else True
-    grade_scale = data.get('grade_scale', [])
-    if show_grade_scale and grade_scale:
-        elements.append(Spacer(1, 4 * mm))
-        elements.append(Paragraph('Grading Scale', styles['SectionHeader']))
-        gs_header = ['Grade', 'Range (%)', 'Grade Point', 'Description']
-        gs_rows = [gs_header]
-        for g in grade_scale:
-            gs_rows.append([
-                g['grade'],
-                f"{g['min_percentage']} - {g['max_percentage']}",
-                str(g['grade_point']),
-                g.get('description', ''),
-            ])
-        gs_table = Table(gs_rows, colWidths=[25 * mm, 35 * mm, 30 * mm, 85 * mm])
-        gs_table.setStyle(TableStyle([
+        ])
+        self.grade_scale_style = TableStyle([
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
+            ('BACKGROUND', (0, 0), (-1, 0), heading),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bbbbbb')),
+            ('GRID', (0, 0), (-1, -1), 0.5, border),
             ('TOPPADDING', (0, 0), (-1, -1), 2),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
             ('LEFTPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        elements.append(gs_table)
-
-    # -- Signature Lines --
-    show_signatures = template.show_principal_signature if template else True
-    show_parent_sig = template.show_parent_signature_line if template else True
-    if show_signatures or show_parent_sig:
-        elements.append(Spacer(1, 15 * mm))
-        sig_cols = []
-        if show_remarks:
-            sig_cols.append('Class Teacher')
-        if show_signatures:
-            sig_cols.append('Principal')
-        if show_parent_sig:
-            sig_cols.append('Parent/Guardian')
-
-        sig_line = '_' * 20
-        sig_data = [
-            [sig_line] * len(sig_cols),
-            sig_cols,
-        ]
-        sig_table = Table(sig_data, colWidths=[175 * mm // max(len(sig_cols), 1)] * len(sig_cols))
-        sig_table.setStyle(TableStyle([
+        ])
+        self.signature_style = TableStyle([
             ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('TOPPADDING', (0, 0), (-1, -1), 2),
-        ]))
-        elements.append(sig_table)
-
-    # -- Footer --
-    if template and template.footer_text:
-        elements.append(Spacer(1, 5 * mm))
-        elements.append(Paragraph(template.footer_text, styles['FooterText']))
+        ])
+
+        self.student_widths = [35 * mm, 55 * mm, 30 * mm, 55 * mm]
+        self.two_column_widths = [45 * mm, 130 * mm]
+        self.grade_scale_widths = [25 * mm, 35 * mm, 30 * mm, 85 * mm]
+
+        header = ['#', 'Subject', 'Max Marks', 'Marks Obtained']
+        if self.show_pct:
+            header.append('%')
+        if self.show_grade:
+            header.append('Grade')
+        header.append('Status')
+        self.single_header = header
+        self._col_widths = {}
+        self.single_widths = self.col_widths(len(header))
+
+        # Flowables that are the same on every card, built once
+        self.headings = {
+            text: Paragraph(text, styles['SectionHeader']) for text in SECTION_HEADINGS
+        }
+        self.footer = Paragraph(self.footer_text, styles['FooterText']) if self.footer_text else None
 
-    # Build PDF
-    doc.build(elements)
-    pdf_content = buffer.getvalue()
-    buffer.close()
-
-    # Determine filename
-    student_name = data.get('student', {}).get('name', 'student').replace(' ', '_')
-    if data.get('is_cumulative'):
-        filename = f"report_card_cumulative_{student_name}_{data.get('academic_year', '')}.pdf"
-    else:
-        exam_name = data.get('examination', {}).get('name', 'exam').replace(' ', '_')
-        filename = f"report_card_{student_name}_{exam_name}.pdf"
-
-    report_card.pdf_file.save(filename, ContentFile(pdf_content), save=True)
-    logger.info("PDF generated for report card %s: %s", report_card.id, filename)
-    return True
-
-
-def _build_single_exam_marks_table(elements, data, styles, template):
-    """Build marks table for single exam report card."""
-    from reportlab.lib import colors
-    from reportlab.lib.units import mm
-    from reportlab.platypus import Table, TableStyle
-
-    subjects = data.get('subjects', [])
-
-    show_grade = template.show_grade if template else True
-    show_pct = template.show_percentage if template else True
-
-    header = ['#', 'Subject', 'Max Marks', 'Marks Obtained']
-    if show_pct:
-        header.append('%')
-    if show_grade:
-        header.append('Grade')
-    header.append('Status')
+        sig_cols = []
+        if self.show_remarks:
+            sig_cols.append('Class Teacher')
+        if self.show_signatures:
+            sig_cols.append('Principal')
+        if self.show_parent_sig:
+            sig_cols.append('Parent/Guardian')
+        sig_line = '_' * 20
+        self.signature_table = Table(
+            [[sig_line] * len(sig_cols), sig_cols],
+            colWidths=[175 * mm // max(len(sig_cols), 1)] * len(sig_cols),
+        )
+        self.signature_table.setStyle(self.signature_style)
+        self._grade_scale_tables = {}
+
+        self.logo = None
+        if opts['logo']:
+            try:
+                self.logo = ImageReader(io.BytesIO(opts['logo']))
+                width, height = self.logo.getSize()
+                self.logo_size = (LOGO_HEIGHT_MM * mm * width / height, LOGO_HEIGHT_MM * mm)
+            except Exception:
+                logger.warning("Could not decode logo of report card template %s", opts['id'], exc_info=True)
+                self.logo = None
+
+    def col_widths(self, col_count):
+        """Column widths to fit A4 page (175mm usable), computed once per count."""
+        widths = self._col_widths.get(col_count)
+        if widths is None:
+            mm = self.mm
+            total = 175 * mm
+            if col_count <= 5:
+                widths = [total / col_count] * col_count
+            else:
+                first_col = 40 * mm
+                rest_width = (total - first_col) / (col_count - 1)
+                widths = [first_col] + [rest_width] * (col_count - 1)
+            self._col_widths[col_count] = widths
+        return widths
+
+    def render(self, data, teacher_remarks='', principal_remarks=''):
+        """(filename, pdf bytes) of one report card."""
+        Paragraph, Spacer, Table = self.Paragraph, self.Spacer, self.Table
+        styles = self.styles
+        mm = self.mm
+
+        buffer = io.BytesIO()
+        doc = self.SimpleDocTemplate(
+            buffer,
+            pagesize=self.pagesize,
+            rightMargin=15 * mm,
+            leftMargin=15 * mm,
+            topMargin=15 * mm,
+            bottomMargin=15 * mm,
+        )
 
-    rows = [header]
-    for idx, subj in enumerate(subjects, 1):
-        row = [
-            str(idx),
-            subj['subject_name'],
-            str(subj['max_marks']),
-            str(subj['marks_obtained']) if subj['status'] == 'PRESENT' else subj['status'],
+        elements = []
+
+        # -- Header Section --
+        school_info = data.get('school', {})
+        school_name = school_info.get('name', 'School Name')
+        elements.append(Paragraph(school_name, styles['SchoolName']))
+
+        header_text = self.header_text or school_info.get('address')
+        if header_text:
+            elements.append(Paragraph(header_text, styles['CellText']))
+
+        # Report title
+        exam_info = data.get('examination', {})
+        if data.get('is_cumulative'):
+            title = f"Cumulative Report Card - {data.get('academic_year', '')}"
+        else:
+            title = f"Report Card - {exam_info.get('name', '')}"
+        elements.append(Spacer(1, 3 * mm))
+        elements.append(Paragraph(title, styles['ReportTitle']))
+
+        # -- Student Info Table --
+        student = data.get('student', {})
+        student_info_data = [
+            ['Student Name', student.get('name', ''), 'Class', student.get('class', '')],
+            ['Admission No.', student.get('admission_number', ''), 'Section', student.get('section', '')],
+            ['Father\'s Name', student.get('father_name', ''), 'Roll No.', student.get('roll_number', '')],
+            ['Date of Birth', student.get('date_of_birth', ''), 'Gender', student.get('gender', '')],
         ]
-        if show_pct:
-            row.append(f"{subj['percentage']:.1f}" if subj['status'] == 'PRESENT' else '-')
-        if show_grade:
-            row.append(subj['grade'] if subj['status'] == 'PRESENT' else '-')
-        row.append('Pass' if subj['is_passed'] else 'Fail')
-        rows.append(row)
-
-    col_count = len(header)
-    col_widths = _calc_col_widths(col_count)
-
-    marks_table = Table(rows, colWidths=col_widths)
-    marks_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bbbbbb')),
-        ('ALIGN', (2, 0), (-1, -1), 'CENTER'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 3),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ('LEFTPADDING', (0, 0), (-1, -1), 3),
-    ]))
-    elements.append(marks_table)
-
-
-def _build_cumulative_marks_table(elements, data, styles, template):
-    """Build marks table for cumulative multi-exam report card."""
-    from reportlab.lib import colors
-    from reportlab.lib.units import mm
-    from reportlab.platypus import Table, TableStyle, Paragraph
-
-    cumulative_subjects = data.get('cumulative_subjects', [])
-    exam_breakdowns = data.get('exam_breakdowns', [])
-
-    # Header row: Subject, then each exam name, then Weighted %
-    header = ['Subject']
-    for eb in exam_breakdowns:
-        header.append(eb['exam_name'][:15])
-    header.append('Weighted %')
-
-    rows = [header]
-    for subj in cumulative_subjects:
-        row = [subj['subject_name']]
+        student_table = Table(student_info_data, colWidths=self.student_widths)
+        student_table.setStyle(self.student_style)
+        elements.append(student_table)
+
+        # -- Subject Marks Table --
+        elements.append(self.headings['Subject-wise Performance'])
+        if data.get('is_cumulative'):
+            elements.append(self._cumulative_marks_table(data))
+        else:
+            elements.append(self._single_exam_marks_table(data))
+
+        # -- Overall Summary --
+        elements.append(self.headings['Overall Summary'])
+        overall = data.get('overall') or data.get('cumulative_overall', {})
+
+        summary_rows = []
+        if self.show_pct:
+            pct_val = overall.get('percentage') or overall.get('weighted_percentage', 0)
+            summary_rows.append(['Percentage', f"{pct_val}%"])
+        if self.show_grade and overall.get('overall_grade'):
+            summary_rows.append(['Overall Grade', overall.get('overall_grade', '')])
+        if self.show_cgpa and overall.get('cgpa'):
+            summary_rows.append(['CGPA', str(overall.get('cgpa', ''))])
+        if self.show_rank and overall.get('rank'):
+            rank_text = f"{overall['rank']}"
+            total = overall.get('total_students_in_class')
+            if total:
+                rank_text += f" / {total}"
+            summary_rows.append(['Rank', rank_text])
+
+        result_text = 'PASS' if overall.get('is_passed', True) else 'FAIL'
+        summary_rows.append(['Result', result_text])
+
+        summary_table = Table(summary_rows, colWidths=self.two_column_widths)
+        summary_table.setStyle(self.summary_style)
+        elements.append(summary_table)
+
+        # -- Attendance --
+        attendance = data.get('attendance')
+        if self.show_attendance and attendance:
+            elements.append(self.headings['Attendance Summary'])
+            att_rows = [
+                ['Total Working Days', str(attendance.get('total_working_days', ''))],
+                ['Days Present', str(attendance.get('days_present', ''))],
+                ['Days Absent', str(attendance.get('days_absent', ''))],
+                ['Attendance %', f"{attendance.get('attendance_percentage', 0)}%"],
+            ]
+            att_table = Table(att_rows, colWidths=self.two_column_widths)
+            att_table.setStyle(self.attendance_style)
+            elements.append(att_table)
+
+        # -- Remarks --
+        if self.show_remarks:
+            if teacher_remarks:
+                elements.append(self.headings['Class Teacher Remarks'])
+                elements.append(Paragraph(teacher_remarks, styles['CellText']))
+            if principal_remarks:
+                elements.append(self.headings["Principal's Remarks"])
+                elements.append(Paragraph(principal_remarks, styles['CellText']))
+
+        # -- Grade Scale --
+        grade_scale = data.get('grade_scale', [])
+        if self.show_grade_scale and grade_scale:
+            elements.append(Spacer(1, 4 * mm))
+            elements.append(self.headings['Grading Scale'])
+            elements.append(self._grade_scale_table(grade_scale))
+
+        # -- Signature Lines --
+        if self.show_signatures or self.show_parent_sig:
+            elements.append(Spacer(1, 15 * mm))
+            elements.append(self.signature_table)
+
+        # -- Footer --
+        if self.footer_text:
+            elements.append(Spacer(1, 5 * mm))
+            elements.append(self.footer)
+
+        # Build PDF
+        if self.logo is not None:
+            doc.build(elements, onFirstPage=self._draw_logo)
+        else:
+            doc.build(elements)
+        pdf_content = buffer.getvalue()
+        buffer.close()
+
+        return report_card_filename(data), pdf_content
+
+    def _single_exam_marks_table(self, data):
+        """Marks table for single exam report card."""
+        rows = [self.single_header]
+        for idx, subj in enumerate(data.get('subjects', []), 1):
+            present = subj['status'] == 'PRESENT'
+            row = [
+                str(idx),
+                subj['subject_name'],
+                str(subj['max_marks']),
+                str(subj['marks_obtained']) if present else subj['status'],
+            ]
+            if self.show_pct:
+                row.append(f"{subj['percentage']:.1f}" if present else '-')
+            if self.show_grade:
+                row.append(subj['grade'] if present else '-')
+            row.append('Pass' if subj['is_passed'] else 'Fail')
+            rows.append(row)
+
+        marks_table = self.Table(rows, colWidths=self.single_widths)
+        marks_table.setStyle(self.single_marks_style)
+        return marks_table
+
+    def _cumulative_marks_table(self, data):
+        """Marks table for cumulative multi-exam report card."""
+        exam_breakdowns = data.get('exam_breakdowns', [])
+
+        # Header row: Subject, then each exam name, then Weighted %
+        header = ['Subject'] + [eb['exam_name'][:15] for eb in exam_breakdowns] + ['Weighted %']
+        percentages = []
         for eb in exam_breakdowns:
-            # Find this subject in this exam
-            match = next(
-                (s for s in eb['subjects'] if s['subject_name'] == subj['subject_name']),
-                None
-            )
-            if match:
-                row.append(f"{match['percentage']:.0f}%")
-            else:
-                row.append('-')
-        row.append(f"{subj['weighted_percentage']:.1f}%")
-        rows.append(row)
-
-    col_count = len(header)
-    col_widths = _calc_col_widths(col_count)
-
-    marks_table = Table(rows, colWidths=col_widths)
-    marks_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a237e')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bbbbbb')),
-        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-        ('TOPPADDING', (0, 0), (-1, -1), 2),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ('LEFTPADDING', (0, 0), (-1, -1), 3),
-    ]))
-    elements.append(marks_table)
-
-
-def _calc_col_widths(col_count):
-    """Calculate column widths to fit A4 page (175mm usable)."""
-    from reportlab.lib.units import mm
-    total = 175 * mm
-    if col_count <= 5:
-        return [total / col_count] * col_count
-    first_col = 40 * mm
-    remaining = total - first_col
-    rest_width = remaining / (col_count - 1)
-    return [first_col] + [rest_width] * (col_count - 1)
+            by_subject = {}
+            for s in eb['subjects']:
+                by_subject.setdefault(s['subject_name'], s['percentage'])
+            percentages.append(by_subject)
+
+        rows = [header]
+        for subj in data.get('cumulative_subjects', []):
+            row = [subj['subject_name']]
+            for exam_percentages in percentages:
+                # This subject in this exam, if taken
+                pct = exam_percentages.get(subj['subject_name'])
+                row.append(f"{pct:.0f}%" if pct is not None else '-')
+            row.append(f"{subj['weighted_percentage']:.1f}%")
+            rows.append(row)
+
+        marks_table = self.Table(rows, colWidths=self.col_widths(len(header)))
+        marks_table.setStyle(self.cumulative_marks_style)
+        return marks_table
+
+    def _grade_scale_table(self, grade_scale):
+        """Grading scale table; a section's cards share one scale, so it is built once."""
+        key = tuple(
+            (g['grade'], g['min_percentage'], g['max_percentage'], g['grade_point'], g.get('description', ''))
+            for g in grade_scale
+        )
+        gs_table = self._grade_scale_tables.get(key)
+        if gs_table is None:
+            gs_rows = [['Grade', 'Range (%)', 'Grade Point', 'Description']]
+            for grade, low, high, point, description in key:
+                gs_rows.append([grade, f"{low} - {high}", str(point), description])
+            gs_table = self.Table(gs_rows, colWidths=self.grade_scale_widths)
+            gs_table.setStyle(self.grade_scale_style)
+            if len(self._grade_scale_tables) >= MAX_CACHED_RENDERERS:
+                self._grade_scale_tables.clear()
+            self._grade_scale_tables[key] = gs_table
+        return gs_table
+
+    def _draw_logo(self, canvas, doc):
+        width, height = self.logo_size
+        canvas.drawImage(
+            self.logo, doc.leftMargin, doc.pagesize[1] - doc.topMargin - height,
+            width=width, height=height, mask='auto',
+        )
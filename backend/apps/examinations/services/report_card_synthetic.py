@@ -0,0 +1,132 @@
+"""
+Synthetic report card data for benchmarking the PDF renderer.
+
+``build_synthetic_report_data`` returns report_data in the shape produced by
+``ReportCardGenerator.generate_single_exam`` (or ``generate_cumulative``)
+without touching the database.
+"""
+
+import random
+
+SYNTHETIC_SUBJECTS = (
+    'English', 'Hindi', 'Mathematics', 'Science', 'Social Science', 'Sanskrit',
+    'Computer Science', 'Physical Education', 'Art', 'Music',
+)
+
+SYNTHETIC_GRADES = (
+    ('A1', 91, 100, 10), ('A2', 81, 90, 9), ('B1', 71, 80, 8), ('B2', 61, 70, 7),
+    ('C1', 51, 60, 6), ('C2', 41, 50, 5), ('D', 33, 40, 4), ('E', 0, 32, 0),
+)
+
+
+def build_synthetic_report_data(num_subjects=6, cumulative=False, num_exams=3, seed=0):
+    """
+    report_data for one student taking ``num_subjects`` subjects; cumulative
+    cards break each subject down over ``num_exams`` examinations.
+    """
+    rng = random.Random(seed)
+    subjects = SYNTHETIC_SUBJECTS[:num_subjects]
+
+    data = {
+        'student': {
+            'name': f'Student {seed}',
+            'admission_number': f'ADM{seed:05d}',
+            'date_of_birth': '2011-05-14',
+            'gender': 'Female' if seed % 2 else 'Male',
+            'father_name': 'Parent Name',
+            'mother_name': 'Parent Name',
+            'photo_url': None,
+            'class': 'Class 9',
+            'section': 'A',
+            'roll_number': str(seed + 1),
+        },
+        'school': {
+            'name': 'Synthetic Public School',
+            'address': '1 School Road, Sample City',
+            'phone': '0000000000',
+            'email': 'office@example.com',
+        },
+        'attendance': {
+            'total_working_days': 110,
+            'days_present': 100,
+            'days_absent': 10,
+            'days_late': 3,
+            'attendance_percentage': 90.91,
+        },
+        'grade_scale': [
+            {
+                'grade': grade,
+                'min_percentage': float(low),
+                'max_percentage': float(high),
+                'grade_point': float(point),
+                'description': '',
+            }
+            for grade, low, high, point in SYNTHETIC_GRADES
+        ],
+        'generated_at': '2026-10-01T00:00:00',
+    }
+
+    if cumulative:
+        exams = [f'Exam {idx + 1}' for idx in range(num_exams)]
+        breakdowns = [{
+            'exam_name': name, 'exam_type': 'Term', 'weightage': 100 / num_exams,
+            'percentage': 0, 'grade': '', 'rank': None, 'subjects': [],
+        } for name in exams]
+        cumulative_subjects = []
+        for subject in subjects:
+            scores = [rng.randint(35, 100) for _ in exams]
+            for breakdown, score in zip(breakdowns, scores):
+                breakdown['subjects'].append({
+                    'subject_name': subject, 'marks_obtained': float(score),
+                    'max_marks': 100.0, 'percentage': float(score), 'grade': _grade(score),
+                })
+            cumulative_subjects.append({
+                'subject_name': subject, 'subject_code': subject[:4].upper(),
+                'weighted_percentage': round(sum(scores) / len(scores), 2),
+                'exam_count': len(exams), 'exams': [],
+            })
+        overall = round(sum(s['weighted_percentage'] for s in cumulative_subjects) / len(subjects), 2)
+        data.update({
+            'academic_year': '2026-27',
+            'is_cumulative': True,
+            'exam_breakdowns': breakdowns,
+            'cumulative_subjects': cumulative_subjects,
+            'cumulative_overall': {'weighted_percentage': overall, 'total_exams': len(exams)},
+        })
+        return data
+
+    rows = []
+    for subject in subjects:
+        score = rng.randint(25, 100)
+        rows.append({
+            'subject_name': subject, 'subject_code': subject[:4].upper(), 'subject_type': 'CORE',
+            'max_marks': 100.0, 'min_passing_marks': 33.0, 'marks_obtained': float(score),
+            'percentage': float(score), 'grade': _grade(score), 'grade_point': 0.0,
+            'is_passed': score >= 33, 'status': 'PRESENT',
+        })
+    obtained = sum(row['marks_obtained'] for row in rows)
+    percentage = round(obtained / len(rows), 2)
+    data.update({
+        'examination': {
+            'name': 'Half Yearly', 'type': 'Term', 'academic_year': '2026-27',
+            'start_date': '2026-09-01', 'end_date': '2026-09-12',
+        },
+        'subjects': rows,
+        'overall': {
+            'total_marks_obtained': obtained, 'total_max_marks': 100.0 * len(rows),
+            'percentage': percentage, 'cgpa': 8.4, 'overall_grade': _grade(percentage),
+            'rank': seed + 1, 'total_students_in_class': 40,
+            'is_passed': all(row['is_passed'] for row in rows),
+            'subjects_passed': sum(row['is_passed'] for row in rows),
+            'subjects_failed': sum(not row['is_passed'] for row in rows),
+        },
+        'class_statistics': {
+            'total_students': 40, 'class_average': 68.2,
+            'highest_percentage': 97.5, 'lowest_percentage': 31.0,
+        },
+    })
+    return data
+
+
+def _grade(percentage):
+    return next(grade for grade, low, high, point in SYNTHETIC_GRADES if percentage >= low)
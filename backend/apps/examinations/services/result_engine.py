@@ -0,0 +1,235 @@
+"""
+Set-based exam result computation and ranking.
+
+``ExamResult.calculate_result()`` used to load one student's marks, follow
+``exam_schedule`` for each mark's max marks, count passes and failures with
+two more queries and look the grade up in the database; ranking then saved
+each result on its own. For a whole examination this module instead:
+
+- aggregates every student's marks with one ``GROUP BY student`` query;
+- maps percentages to grades against the scale loaded once and searched
+  with ``bisect`` (``GradeTable``; ``GradeTable.cached`` keeps it in the
+  cache for mark entry, dropped when a grade changes);
+- writes results back with ``bulk_update`` / ``bulk_create``, skipping rows
+  whose values did not change;
+- ranks with ``RANK()`` (competition) or ``DENSE_RANK()`` window functions
+  partitioned by class and by section;
+- refreshes the examination's materialised statistics
+  (``services.exam_statistics``).
+
+Usage:
+    stats = compute_examination_results(examination)
+    compute_examination_results(examination, student_ids=[student.id], rank=False)
+    rank_examination_results(examination, method='dense')
+    GradeTable.cached(examination.grade_scale_id).lookup(Decimal('87.5'))
+"""
+
+import logging
+from bisect import bisect_right
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F, FloatField, Q, Sum, Window
+from django.db.models.functions import Cast, DenseRank, Rank
+from django.utils import timezone
+
+from apps.examinations.models import ExamResult, Grade, StudentMark
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+GRADE_TABLE_TTL = 24 * 3600
+
+RANK_FUNCTIONS = {
+    'competition': Rank,      # 1, 2, 2, 4
+    'dense': DenseRank,       # 1, 2, 2, 3
+}
+
+CENT = Decimal('0.01')
+
+RESULT_FIELDS = [
+    'total_marks_obtained', 'total_max_marks', 'percentage', 'cgpa',
+    'overall_grade', 'is_passed', 'subjects_passed', 'subjects_failed',
+]
+
+
+def _grade_table_key(grade_scale_id):
+    schema = getattr(connection, 'schema_name', 'public')
+    return f'grade_table:{schema}:{grade_scale_id}'
+
+
+class GradeTable:
+    """
+    A grade scale's grades sorted by ``min_percentage``; ``lookup`` finds the
+    grade whose [min, max] range holds a percentage with one bisect.
+    """
+
+    def __init__(self, grades):
+        """``grades``: iterable of (min_percentage, max_percentage, grade, grade_point)."""
+        self.rows = sorted(grades, key=lambda row: row[0])
+        self.mins = [row[0] for row in self.rows]
+
+    @classmethod
+    def for_scale(cls, grade_scale_id):
+        return cls(
+            Grade.objects.filter(grade_scale_id=grade_scale_id)
+            .values_list('min_percentage', 'max_percentage', 'grade', 'grade_point')
+        )
+
+    @classmethod
+    def cached(cls, grade_scale_id):
+        """The scale's table from the cache, loaded from the database on a miss."""
+        rows = cache.get(_grade_table_key(grade_scale_id))
+        if rows is not None:
+            return cls(rows)
+        table = cls.for_scale(grade_scale_id)
+        cache.set(_grade_table_key(grade_scale_id), table.rows, GRADE_TABLE_TTL)
+        return table
+
+    @staticmethod
+    def invalidate(grade_scale_id):
+        cache.delete(_grade_table_key(grade_scale_id))
+
+    def lookup(self, percentage):
+        """(grade, grade_point) for ``percentage``, or None if no range holds it."""
+        idx = bisect_right(self.mins, percentage) - 1
+        if idx < 0:
+            return None
+        low, high, grade, grade_point = self.rows[idx]
+        return (grade, grade_point) if percentage <= high else None
+
+
+def compute_examination_results(examination, student_ids=None, rank=True, statistics=True):
+    """
+    Recompute the ExamResult of every student with marks in ``examination``
+    (or only ``student_ids``), creating missing results, then re-rank and
+    refresh the examination's statistics.
+
+    Returns a dict of counts: students, created, updated, unchanged, ranked.
+    """
+    grades = GradeTable.for_scale(examination.grade_scale_id)
+
+    marks = StudentMark.objects.filter(exam_schedule__examination=examination, status='PRESENT')
+    results = ExamResult.objects.filter(examination=examination)
+    if student_ids is not None:
+        marks = marks.filter(student_id__in=student_ids)
+        results = results.filter(student_id__in=student_ids)
+
+    totals = {}
+    rows = marks.values(
+        'student_id', 'exam_schedule__class_obj_id', 'exam_schedule__section_id',
+    ).annotate(
+        obtained=Sum('marks_obtained'),
+        max_marks=Sum('exam_schedule__max_marks'),
+        grade_points=Sum('grade_point', filter=Q(grade_point__gt=0)),
+        graded=Count('id', filter=Q(grade_point__gt=0)),
+        passed=Count('id', filter=Q(is_passed=True)),
+        failed=Count('id', filter=Q(is_passed=False)),
+    ).order_by()
+    for row in rows:
+        # A student normally sits every paper in one section; merge if not
+        total = totals.setdefault(row['student_id'], {
+            'class_obj_id': row['exam_schedule__class_obj_id'],
+            'section_id': row['exam_schedule__section_id'],
+            'obtained': Decimal(0), 'max_marks': Decimal(0), 'grade_points': Decimal(0),
+            'graded': 0, 'passed': 0, 'failed': 0,
+        })
+        for field in ('obtained', 'max_marks', 'grade_points', 'graded', 'passed', 'failed'):
+            total[field] += row[field] or 0
+
+    existing = {result.student_id: result for result in results.only('id', 'student_id', *RESULT_FIELDS)}
+    now = timezone.now()
+    to_create, to_update = [], []
+
+    for student_id, result in existing.items():
+        values = _result_values(totals.get(student_id), grades)
+        if any(getattr(result, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(result, field, value)
+            result.updated_at = now
+            to_update.append(result)
+
+    for student_id, total in totals.items():
+        if student_id not in existing:
+            to_create.append(ExamResult(
+                examination=examination, student_id=student_id,
+                class_obj_id=total['class_obj_id'], section_id=total['section_id'],
+                **_result_values(total, grades),
+            ))
+
+    with transaction.atomic():
+        ExamResult.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        ExamResult.objects.bulk_update(to_update, RESULT_FIELDS + ['updated_at'], batch_size=BATCH_SIZE)
+        ranked = rank_examination_results(examination) if rank else 0
+        if statistics:
+            from apps.examinations.services.exam_statistics import refresh_examination_statistics
+            refresh_examination_statistics(examination)
+
+    stats = {
+        'students': len(existing) + len(to_create),
+        'created': len(to_create),
+        'updated': len(to_update),
+        'unchanged': len(existing) - len(to_update),
+        'ranked': ranked,
+    }
+    logger.info('Computed results for examination %s: %s', examination.pk, stats)
+    return stats
+
+
+def rank_examination_results(examination, method='competition', class_id=None, section_id=None):
+    """
+    Rank results by percentage within each class (``rank``) and each section
+    (``section_rank``). Only results in ``class_id`` / ``section_id`` are
+    written when given; only changed ranks are written at all.
+
+    Returns the number of results whose ranks changed.
+    """
+    rank_function = RANK_FUNCTIONS[method]
+    # Ordering a window by a DecimalField compiles to invalid SQL on SQLite
+    # (CAST around the ORDER BY); two-place percentages order the same as floats
+    order_by = [Cast('percentage', FloatField()).desc()]
+    rows = ExamResult.objects.filter(examination=examination).annotate(
+        class_position=Window(rank_function(), partition_by=[F('class_obj_id')], order_by=order_by),
+        section_position=Window(rank_function(), partition_by=[F('section_id')], order_by=order_by),
+    ).values_list('id', 'class_obj_id', 'section_id', 'rank', 'section_rank', 'class_position', 'section_position')
+
+    now = timezone.now()
+    changed = []
+    for pk, class_obj_id, result_section_id, rank, section_rank, class_position, section_position in rows:
+        if class_id and str(class_obj_id) != str(class_id):
+            continue
+        if section_id and str(result_section_id) != str(section_id):
+            continue
+        if (rank, section_rank) != (class_position, section_position):
+            changed.append(ExamResult(
+                id=pk, rank=class_position, section_rank=section_position, updated_at=now,
+            ))
+
+    ExamResult.objects.bulk_update(changed, ['rank', 'section_rank', 'updated_at'], batch_size=BATCH_SIZE)
+    return len(changed)
+
+
+def _result_values(total, grades):
+    """ExamResult field values for a student's aggregated marks (None: no marks)."""
+    if total is None:
+        return {
+            'total_marks_obtained': Decimal(0), 'total_max_marks': Decimal(0), 'percentage': Decimal(0),
+            'cgpa': None, 'overall_grade': '', 'is_passed': True, 'subjects_passed': 0, 'subjects_failed': 0,
+        }
+
+    percentage = Decimal(0)
+    if total['max_marks'] > 0:
+        percentage = (total['obtained'] / total['max_marks'] * 100).quantize(CENT, ROUND_HALF_UP)
+    grade = grades.lookup(percentage)
+    return {
+        'total_marks_obtained': Decimal(total['obtained']).quantize(CENT),
+        'total_max_marks': Decimal(total['max_marks']).quantize(CENT),
+        'percentage': percentage,
+        'cgpa': (total['grade_points'] / total['graded']).quantize(CENT, ROUND_HALF_UP) if total['graded'] else None,
+        'overall_grade': grade[0] if grade else '',
+        'is_passed': total['failed'] == 0,
+        'subjects_passed': total['passed'],
+        'subjects_failed': total['failed'],
+    }
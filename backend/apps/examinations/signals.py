@@ -0,0 +1,38 @@
+"""
+Examinations signals.
+
+Editing or deleting a grade drops its scale's cached ``GradeTable``
+(``services.result_engine``); the next mark entry loads it again.
+
+Saving or deleting an ExamResult drops its examination's stored statistics
+(``services.exam_statistics``); the next read refreshes them. The result
+engine writes in bulk, without signals, and refreshes them itself.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.examinations.models import ExamResult, Grade
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def invalidate_grade_table(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from apps.examinations.services.result_engine import GradeTable
+
+    transaction.on_commit(partial(GradeTable.invalidate, instance.grade_scale_id))
+
+
+@receiver(post_save, sender=ExamResult)
+@receiver(post_delete, sender=ExamResult)
+def invalidate_exam_statistics(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from apps.examinations.services.exam_statistics import invalidate_examination_statistics
+
+    invalidate_examination_statistics(instance.examination_id)
@@ -1,17 +1,23 @@
 """
-Celery tasks for AI exam schedule generation.
+Celery tasks for AI exam schedule generation, bulk report cards and
+exam result recomputation.
 """
 
 from celery import shared_task
 from celery.exceptions import SoftTimeLimitExceeded
 from django.utils import timezone
 
+from apps.core.services.progress import ProgressChannel
 
-def update_exam_progress(run, percent, message):
-    """Update an exam schedule run's progress."""
-    run.progress_percent = percent
-    run.progress_message = message
-    run.save(update_fields=['progress_percent', 'progress_message'])
+
+def progress_channel(run):
+    """
+    Progress of an exam schedule run: throttled to the cache while the
+    search runs, saved to the run at phase boundaries (see ``apps.core.services.progress``).
+    """
+    return ProgressChannel.for_instance(
+        run, base={'run_id': str(run.id), 'fitness_score': None, 'error_message': ''},
+    )
 
 
 @shared_task(bind=True, max_retries=0, time_limit=600, soft_time_limit=540)
@@ -34,10 +40,11 @@ def generate_exam_schedule_task(self, run_id):
     run.status = 'VALIDATING'
     run.started_at = timezone.now()
     run.save(update_fields=['celery_task_id', 'status', 'started_at'])
+    channel = progress_channel(run)
 
     try:
         # ====== STEP 1: Validate (0-10%) ======
-        update_exam_progress(run, 2, 'Validating configuration...')
+        channel.update(2, 'Validating configuration...', force=True)
 
         from .services.exam_schedule_validators import (
             validate_exam_schedule_config,
@@ -52,19 +59,16 @@ def generate_exam_schedule_task(self, run_id):
             run.save(update_fields=['status', 'error_message', 'completed_at'])
             return
 
-        update_exam_progress(run, 5, 'Collecting inputs...')
+        channel.update(5, 'Collecting inputs...', force=True)
         inputs = collect_exam_inputs(run.config)
-        update_exam_progress(run, 10, 'Validation complete.')
+        channel.phase(10, 'Validation complete.')
 
         # ====== STEP 2: CSP Generation (10-60%) ======
-        run.status = 'GENERATING'
-        run.save(update_fields=['status'])
-
         def csp_progress(pct, msg):
             overall = 10 + int(pct * 0.5)
-            update_exam_progress(run, overall, msg)
+            channel.update(overall, msg)
 
-        update_exam_progress(run, 12, 'Building constraint model...')
+        channel.phase(12, 'Building constraint model...', status='GENERATING')
 
         from .services.exam_scheduler import ExamScheduleGenerator
 
@@ -85,18 +89,15 @@ def generate_exam_schedule_task(self, run_id):
             ])
             return
 
-        update_exam_progress(run, 60, 'Feasible schedule generated.')
-
         # ====== STEP 3: Optimization (60-90%) ======
         algorithm = run.config.algorithm
+        optimizing = algorithm in ('GENETIC', 'HYBRID')
+        channel.phase(60, 'Feasible schedule generated.', status='OPTIMIZING' if optimizing else None)
 
-        if algorithm in ('GENETIC', 'HYBRID'):
-            run.status = 'OPTIMIZING'
-            run.save(update_fields=['status'])
-
+        if optimizing:
             def ga_progress(pct, msg):
                 overall = 60 + int(pct * 0.3)
-                update_exam_progress(run, overall, msg)
+                channel.update(overall, msg)
 
             from .services.exam_optimizer import ExamScheduleOptimizer
 
@@ -117,10 +118,10 @@ def generate_exam_schedule_task(self, run_id):
             optimized = feasible
             score = optimizer.fitness(feasible)
 
-        update_exam_progress(run, 90, 'Optimization complete.')
+        channel.phase(90, 'Optimization complete.')
 
         # ====== STEP 4: Finalize (90-100%) ======
-        update_exam_progress(run, 95, 'Serializing results...')
+        channel.update(95, 'Serializing results...', force=True)
 
         generated_data = _serialize_exam_schedule(optimized, inputs)
         warnings = _generate_exam_warnings(optimized, inputs)
@@ -156,6 +157,78 @@ def generate_exam_schedule_task(self, run_id):
         run.save()
         raise
 
+    finally:
+        channel.close()
+
+
+@shared_task(bind=True, max_retries=0, time_limit=3600, soft_time_limit=3540)
+def generate_report_card_batch_task(self, batch_id):
+    """
+    Generate the report cards of a section in the background
+    (see ``apps.examinations.services.report_card_batch``).
+
+    Pipeline:
+    1. Load section context and every student's data (0-5%)
+    2. Build, save and render report cards chunk by chunk (5-99%)
+    3. Record the outcome (100%)
+
+    Time limit: 60 minutes hard, 59 minutes soft.
+    """
+    from apps.examinations.models import ReportCardBatch
+    from .services.report_card_batch import run_report_card_batch
+
+    batch = ReportCardBatch.objects.select_related(
+        'examination__academic_year', 'examination__exam_type', 'examination__grade_scale', 'template',
+    ).get(id=batch_id)
+    batch.celery_task_id = self.request.id or ''
+    batch.status = 'PREPARING'
+    batch.started_at = timezone.now()
+    batch.save(update_fields=['celery_task_id', 'status', 'started_at'])
+    channel = ProgressChannel.for_instance(
+        batch, base={'batch_id': str(batch.id), 'error_message': ''},
+    )
+
+    try:
+        stats = run_report_card_batch(batch, channel=channel)
+
+        batch.status = 'COMPLETED_WITH_ERRORS' if stats['failed'] else 'COMPLETED'
+        batch.progress_percent = 100
+        batch.progress_message = (
+            f"Generated {stats['generated']}/{stats['total']} report card(s)"
+            + (f", {stats['failed']} failed." if stats['failed'] else '.')
+        )
+
+    except SoftTimeLimitExceeded:
+        batch.status = 'FAILED'
+        batch.error_message = (
+            'Report card generation timed out (59 minute limit). '
+            'Cards generated so far are saved; run the batch again for the rest.'
+        )
+
+    except Exception as e:
+        batch.status = 'FAILED'
+        batch.error_message = str(e)
+        raise
+
+    finally:
+        batch.completed_at = timezone.now()
+        batch.duration_seconds = (batch.completed_at - batch.started_at).total_seconds()
+        batch.save()
+        channel.close()
+
+
+@shared_task(bind=True, max_retries=0, time_limit=600, soft_time_limit=540)
+def compute_examination_results_task(self, examination_id, student_ids=None):
+    """
+    Recompute the ExamResults of ``student_ids`` (all when None) set-based and
+    re-rank the examination; queued by bulk mark entry.
+    """
+    from apps.examinations.models import Examination
+    from .services.result_engine import compute_examination_results
+
+    examination = Examination.objects.get(id=examination_id)
+    return compute_examination_results(examination, student_ids=student_ids)
+
 
 def _serialize_exam_schedule(schedule, inputs):
     """
@@ -90,3 +90,1001 @@ class TestExaminationAccess:
     def test_results_list(self, auth_client):
         response = auth_client.get('/api/v1/examinations/results/')
         assert response.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Exam schedule GA: incremental evaluation
+# ---------------------------------------------------------------------------
+
+import random  # noqa: E402
+from datetime import date, timedelta  # noqa: E402
+
+from apps.examinations.models import ExamScheduleConfig  # noqa: E402
+from apps.examinations.services.exam_incremental import ExamScheduleState  # noqa: E402
+from apps.examinations.services.exam_optimizer import (  # noqa: E402
+    EVALUATION_FULL,
+    ExamScheduleOptimizer,
+)
+
+
+def _exam_inputs(num_classes=3, num_subjects=4, num_days=12, min_gap=1):
+    start = date(2026, 3, 2)
+    sections = [
+        {'id': f'sec-{c}-{s}', 'class_id': f'class-{c}', 'student_count': 30 + 5 * s}
+        for c in range(num_classes) for s in range(2)
+    ]
+    subjects = {
+        f'class-{c}': [{'subject_id': f'subject-{n}'} for n in range(num_subjects)]
+        for c in range(num_classes)
+    }
+    return {
+        'exam_slots': [
+            (start + timedelta(days=d), session)
+            for d in range(num_days) for session in ('MORNING', 'AFTERNOON')
+        ],
+        'halls': [{'id': f'hall-{h}', 'seating_capacity': 40 + 20 * h} for h in range(4)],
+        'sections': sections,
+        'subjects': subjects,
+        'min_gap': min_gap,
+        'max_exams_per_day': 1,
+        'heavy_subject_ids': {'subject-0', 'subject-1'},
+    }
+
+
+def _random_schedule(inputs, rng):
+    """Any schedule (feasible or not) covering every exam."""
+    schedule = {}
+    for class_id, subjects in inputs['subjects'].items():
+        for subject in subjects:
+            exam_date, session = rng.choice(inputs['exam_slots'])
+            halls = rng.sample([hall['id'] for hall in inputs['halls']], rng.randint(1, 2))
+            schedule[(class_id, subject['subject_id'])] = {
+                'date': exam_date, 'session': session, 'hall_ids': halls,
+            }
+    return schedule
+
+
+def _exam_optimizer(inputs, schedule, **kwargs):
+    config = ExamScheduleConfig(population_size=10, max_iterations=30)
+    return ExamScheduleOptimizer(schedule, inputs, config, **kwargs)
+
+
+class TestExamScheduleState:
+
+    def _assert_matches_full_evaluation(self, optimizer, state):
+        schedule = dict(state.schedule)
+        penalties = state.penalties()
+        assert penalties['gap_balance'] == pytest.approx(optimizer._calc_gap_penalty(schedule))
+        assert penalties['heavy_spread'] == pytest.approx(optimizer._calc_heavy_spread_penalty(schedule))
+        assert penalties['hall_utilization'] == pytest.approx(optimizer._calc_hall_penalty(schedule))
+        assert penalties['invigilator_balance'] == pytest.approx(optimizer._calc_daily_balance_penalty(schedule))
+        assert state.score() == pytest.approx(optimizer.fitness(schedule))
+        assert state.is_feasible == optimizer._verify_hard_constraints(schedule)
+
+    @pytest.mark.parametrize('min_gap', [0, 1, 3])
+    def test_random_moves_match_full_evaluation(self, min_gap):
+        rng = random.Random(min_gap)
+        inputs = _exam_inputs(min_gap=min_gap)
+        optimizer = _exam_optimizer(inputs, _random_schedule(inputs, rng))
+        donor = _random_schedule(inputs, rng)
+        state = ExamScheduleState(optimizer.delta_context, _random_schedule(inputs, rng))
+        self._assert_matches_full_evaluation(optimizer, state)
+
+        for step in range(80):
+            key = rng.choice(optimizer.exam_keys)
+            if step % 4:
+                state.move(key, *rng.choice(inputs['exam_slots']))
+            else:
+                state.set_entry(key, donor[key])
+            self._assert_matches_full_evaluation(optimizer, state)
+
+    def test_undo_restores_state(self):
+        rng = random.Random(3)
+        inputs = _exam_inputs()
+        optimizer = _exam_optimizer(inputs, _random_schedule(inputs, rng))
+        state = ExamScheduleState(optimizer.delta_context, _random_schedule(inputs, rng))
+        before = (dict(state.schedule), state.score(), state.violations)
+
+        mark = state.mark()
+        for _ in range(15):
+            state.move(rng.choice(optimizer.exam_keys), *rng.choice(inputs['exam_slots']))
+        state.undo(mark)
+
+        assert (dict(state.schedule), state.score(), state.violations) == before
+        assert state.log == []
+
+    def test_copy_is_independent(self):
+        rng = random.Random(8)
+        inputs = _exam_inputs()
+        optimizer = _exam_optimizer(inputs, _random_schedule(inputs, rng))
+        state = ExamScheduleState(optimizer.delta_context, _random_schedule(inputs, rng))
+        score = state.score()
+
+        clone = state.copy()
+        for key in optimizer.exam_keys[:5]:
+            clone.move(key, *rng.choice(inputs['exam_slots']))
+
+        assert state.score() == score
+        self._assert_matches_full_evaluation(optimizer, clone)
+
+    def test_incremental_and_full_runs_agree(self):
+        inputs = _exam_inputs(num_days=14)
+        # Feasible start: one exam per class per day, classes on separate halls
+        schedule = {}
+        for c, (class_id, subjects) in enumerate(inputs['subjects'].items()):
+            for n, subject in enumerate(subjects):
+                schedule[(class_id, subject['subject_id'])] = {
+                    'date': inputs['exam_slots'][4 * n][0],
+                    'session': 'MORNING',
+                    'hall_ids': [f'hall-{c}'],
+                }
+
+        results = []
+        for evaluation in ('incremental', EVALUATION_FULL):
+            optimizer = _exam_optimizer(inputs, schedule, evaluation=evaluation, seed=21)
+            assert optimizer._verify_hard_constraints(schedule)
+            results.append(optimizer.optimize())
+
+        (incremental, incremental_score), (full, full_score) = results
+        assert incremental == full
+        assert incremental_score == pytest.approx(full_score)
+        assert optimizer._verify_hard_constraints(incremental)
+
+    def test_rejects_unknown_evaluation_mode(self):
+        inputs = _exam_inputs()
+        with pytest.raises(ValueError):
+            _exam_optimizer(inputs, {}, evaluation='tensor')
+
+
+class TestExamIslandOptimizer:
+
+    def test_island_runs_are_deterministic_and_feasible(self):
+        inputs = _exam_inputs(num_days=14)
+        schedule = {}
+        for c, (class_id, subjects) in enumerate(inputs['subjects'].items()):
+            for n, subject in enumerate(subjects):
+                schedule[(class_id, subject['subject_id'])] = {
+                    'date': inputs['exam_slots'][4 * n][0],
+                    'session': 'MORNING',
+                    'hall_ids': [f'hall-{c}'],
+                }
+
+        results = []
+        for _ in range(2):
+            config = ExamScheduleConfig(
+                population_size=10, max_iterations=20,
+                island_count=2, migration_interval=4, random_seed=5,
+            )
+            optimizer = ExamScheduleOptimizer(schedule, inputs, config)
+            results.append(optimizer.optimize())
+
+        assert results[0] == results[1]
+        optimized, score = results[0]
+        assert score == pytest.approx(optimizer.fitness(optimized))
+        assert optimizer._verify_hard_constraints(optimized)
+
+
+# ---------------------------------------------------------------------------
+# Exam CSP: indexed occupancy and forward checking
+# ---------------------------------------------------------------------------
+
+import time  # noqa: E402
+
+from apps.examinations.services.exam_occupancy import ExamOccupancy  # noqa: E402
+from apps.examinations.services.exam_scheduler import ExamScheduleGenerator  # noqa: E402
+from apps.examinations.services.exam_synthetic import build_synthetic_exam_inputs  # noqa: E402
+
+
+class TestExamOccupancy:
+
+    def _occupancy(self, min_gap=2):
+        halls = [{'id': 'small', 'seating_capacity': 40}, {'id': 'large', 'seating_capacity': 100}]
+        return ExamOccupancy(halls, max_exams_per_day=1, min_gap=min_gap)
+
+    def test_find_halls_takes_free_halls_largest_first(self):
+        occupancy = self._occupancy()
+        day = date(2026, 3, 2)
+        assert occupancy.find_halls(120, day, 'MORNING') == ['large', 'small']
+        occupancy.assign('class-1', day, 'MORNING', ['large'])
+        assert occupancy.free_seats(day, 'MORNING') == 40
+        assert occupancy.find_halls(40, day, 'MORNING') == ['small']
+        assert occupancy.find_halls(41, day, 'MORNING') is None
+        assert occupancy.find_halls(100, day, 'AFTERNOON') == ['large']
+
+    def test_can_place_tracks_day_limit_and_gap(self):
+        occupancy = self._occupancy(min_gap=2)
+        day = date(2026, 3, 4)
+        occupancy.assign('class-1', day, 'MORNING', ['large'])
+
+        assert not occupancy.can_place('class-1', day, 'AFTERNOON')
+        assert not occupancy.can_place('class-1', day + timedelta(days=1), 'MORNING')
+        assert not occupancy.can_place('class-1', day - timedelta(days=1), 'MORNING')
+        assert occupancy.can_place('class-1', day + timedelta(days=2), 'MORNING')
+        assert occupancy.can_place('class-2', day, 'AFTERNOON')
+
+        occupancy.unassign('class-1', day, 'MORNING', ['large'])
+        assert occupancy.can_place('class-1', day + timedelta(days=1), 'MORNING')
+        assert occupancy.free_seats(day, 'MORNING') == 140
+
+
+class TestExamScheduleGenerator:
+
+    def _assert_complete_and_valid(self, generator, schedule, inputs):
+        assert schedule is not None
+        assert set(schedule) == set(generator.exams_to_schedule)
+        assert _exam_optimizer(inputs, schedule)._verify_hard_constraints(schedule)
+        capacity = {hall['id']: hall['seating_capacity'] for hall in inputs['halls']}
+        for key, entry in schedule.items():
+            seats = sum(capacity[hall_id] for hall_id in entry['hall_ids'])
+            assert seats >= generator.exam_info[key]['student_count']
+
+    @pytest.mark.parametrize('num_days, min_gap', [(16, 1), (26, 2)])
+    def test_board_exam_schedule_solves_quickly(self, num_days, min_gap):
+        # 15 classes x 12 papers; hall seats allow ~7 classes per session
+        inputs = build_synthetic_exam_inputs(num_days=num_days, min_gap=min_gap)
+        random.seed(0)
+        generator = ExamScheduleGenerator(inputs)
+
+        started = time.perf_counter()
+        schedule = generator.generate()
+        elapsed = time.perf_counter() - started
+
+        self._assert_complete_and_valid(generator, schedule, inputs)
+        assert generator.iterations < generator.max_iterations
+        assert elapsed < 5
+
+    def test_too_few_days_fails_without_search(self):
+        # Four papers a class, one a day, over three days: no schedule exists
+        inputs = _exam_inputs(num_classes=2, num_subjects=4, num_days=3)
+        generator = ExamScheduleGenerator(inputs)
+
+        assert generator.generate() is None
+        assert generator.iterations < 50
+
+
+# ---------------------------------------------------------------------------
+# Set-based result engine
+# ---------------------------------------------------------------------------
+
+from datetime import time as time_of_day  # noqa: E402
+from decimal import Decimal  # noqa: E402
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from apps.academics.models import AcademicYear, Board, Class, Section, Subject  # noqa: E402
+from apps.examinations.models import (  # noqa: E402
+    ExamResult, ExamSchedule, ExamType, Examination, Grade, GradeScale, StudentMark,
+)
+from apps.examinations.services.result_engine import (  # noqa: E402
+    GradeTable, compute_examination_results, rank_examination_results,
+)
+from apps.students.models import Student  # noqa: E402
+
+# Marks per student (maths, science); students 0-2 in section A, 3-5 in B
+RESULT_MARKS = [(95, 90), (80, 75), (95, 90), (60, 20), (70, 80), (50, 40)]
+
+
+@pytest.fixture
+def result_exam(db):
+    board = Board.objects.create(board_type='CBSE', board_name='CBSE', board_code='CBSE-RES')
+    year = AcademicYear.objects.create(
+        name='2026-27', start_date=date(2026, 4, 1), end_date=date(2027, 3, 31), is_current=True,
+    )
+    class_obj = Class.objects.create(name='9', display_name='Class 9', class_order=9, board=board)
+    sections = [Section.objects.create(class_instance=class_obj, name=name, academic_year=year) for name in 'AB']
+    subjects = [
+        Subject.objects.create(name=name, code=name[:4].upper(), subject_type='CORE')
+        for name in ('Mathematics', 'Science')
+    ]
+    scale = GradeScale.objects.create(name='Result scale')
+    for grade, low, high, point in (('A', 90, 100, 10), ('B', 75, 89.99, 8), ('C', 33, 74.99, 6), ('F', 0, 32.99, 0)):
+        Grade.objects.create(
+            grade_scale=scale, grade=grade, min_percentage=low, max_percentage=high, grade_point=point,
+        )
+    examination = Examination.objects.create(
+        name='Half yearly', exam_type=ExamType.objects.create(name='Half yearly', code='HY', exam_type='SUMMATIVE'),
+        academic_year=year, grade_scale=scale, start_date=date(2026, 9, 1), end_date=date(2026, 9, 10),
+    )
+    schedules = {
+        (section.id, subject.id): ExamSchedule.objects.create(
+            examination=examination, class_obj=class_obj, section=section, subject=subject,
+            exam_date=date(2026, 9, 1), start_time=time_of_day(9), end_time=time_of_day(12), duration_minutes=180,
+            max_marks=100, min_passing_marks=33,
+        )
+        for section in sections for subject in subjects
+    }
+    students = []
+    for idx, marks in enumerate(RESULT_MARKS):
+        student = Student.objects.create(
+            user=User.objects.create_user(
+                email=f'res_student{idx}@test.com', password='x', first_name=f'S{idx}', last_name='Result',
+                phone=f'77777310{idx:02d}', user_type='STUDENT',
+            ),
+            admission_number=f'RES{idx}', admission_date=date(2026, 4, 1),
+            first_name=f'S{idx}', last_name='Result', date_of_birth=date(2011, 1, 1), gender='F',
+        )
+        section = sections[idx // 3]
+        for subject, obtained in zip(subjects, marks):
+            StudentMark.objects.create(
+                exam_schedule=schedules[(section.id, subject.id)], student=student, marks_obtained=obtained,
+            )
+        students.append(student)
+    return {'examination': examination, 'sections': sections, 'students': students, 'subjects': subjects}
+
+
+def _results(result_exam):
+    return [ExamResult.objects.get(examination=result_exam['examination'], student=s) for s in result_exam['students']]
+
+
+class TestGradeTable:
+
+    def test_lookup(self):
+        table = GradeTable([
+            (Decimal('75'), Decimal('89.99'), 'B', 8), (Decimal('90'), Decimal('100'), 'A', 10),
+            (Decimal('0'), Decimal('74.99'), 'C', 6),
+        ])
+        assert table.lookup(Decimal('100')) == ('A', 10)
+        assert table.lookup(Decimal('90')) == ('A', 10)
+        assert table.lookup(Decimal('89.99')) == ('B', 8)
+        assert table.lookup(Decimal('0')) == ('C', 6)
+        assert table.lookup(Decimal('89.995')) is None     # between ranges
+        assert GradeTable([]).lookup(Decimal('50')) is None
+
+
+@pytest.mark.django_db
+class TestResultEngine:
+
+    def test_results_and_ranks(self, result_exam):
+        stats = compute_examination_results(result_exam['examination'])
+
+        assert (stats['students'], stats['created'], stats['updated']) == (6, 6, 0)
+        results = _results(result_exam)
+        top = results[0]
+        assert (top.total_marks_obtained, top.total_max_marks, top.percentage) == (
+            Decimal('185.00'), Decimal('200.00'), Decimal('92.50'),
+        )
+        assert (top.overall_grade, top.cgpa, top.subjects_passed, top.is_passed) == ('A', Decimal('10.00'), 2, True)
+        failed = results[3]
+        assert (failed.percentage, failed.overall_grade, failed.subjects_failed, failed.is_passed) == (
+            Decimal('40.00'), 'C', 1, False,
+        )
+
+        # Competition ranks: students 0 and 2 tie at 92.5%
+        assert [r.rank for r in results] == [1, 3, 1, 6, 4, 5]
+        assert [r.section_rank for r in results] == [1, 3, 1, 3, 1, 2]
+
+        rank_examination_results(result_exam['examination'], method='dense')
+        assert [r.rank for r in _results(result_exam)] == [1, 2, 1, 5, 3, 4]
+
+    def test_query_count_does_not_grow_with_students(self, result_exam):
+        with CaptureQueriesContext(connection) as queries:
+            compute_examination_results(result_exam['examination'])
+        # grades, marks aggregate, results, insert, ranks, then statistics:
+        # lock, results, marks, old rows, insert (+ savepoints)
+        assert len(queries) <= 16
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = compute_examination_results(result_exam['examination'])
+        assert (stats['updated'], stats['unchanged'], stats['ranked']) == (0, 6, 0)
+        assert not any(q['sql'].startswith('UPDATE') for q in queries.captured_queries)
+
+    def test_recalculating_one_student(self, result_exam):
+        compute_examination_results(result_exam['examination'])
+        student = result_exam['students'][5]
+        StudentMark.objects.filter(student=student, exam_schedule__subject=result_exam['subjects'][1]).update(
+            marks_obtained=90,
+        )
+
+        result = ExamResult.objects.get(examination=result_exam['examination'], student=student)
+        result.calculate_result()
+
+        assert result.percentage == Decimal('70.00')
+        assert ExamResult.objects.exclude(student=student).filter(updated_at__gt=result.updated_at).count() == 0
+
+    def test_calculate_ranks_endpoint(self, result_exam, auth_client):
+        compute_examination_results(result_exam['examination'], rank=False)
+
+        response = auth_client.post(
+            f"/api/v1/examinations/results/calculate_ranks/?examination_id={result_exam['examination'].id}"
+            f"&section_id={result_exam['sections'][0].id}&method=dense"
+        )
+
+        assert response.status_code == 200
+        assert response.data['count'] == 3
+        assert [r.section_rank for r in _results(result_exam)] == [1, 2, 1, None, None, None]
+
+
+# ---------------------------------------------------------------------------
+# Background report card batches
+# ---------------------------------------------------------------------------
+
+import multiprocessing  # noqa: E402
+
+from apps.academics.models import StudentEnrollment  # noqa: E402
+from apps.attendance.models import AttendanceSummary  # noqa: E402
+from apps.examinations import tasks as exam_tasks  # noqa: E402
+from apps.examinations.models import ReportCard, ReportCardBatch  # noqa: E402
+from apps.examinations.services.report_card_batch import (  # noqa: E402
+    SectionReportContext, _render, _render_pool, run_report_card_batch,
+)
+from apps.examinations.services.report_card_generator import ReportCardGenerator  # noqa: E402
+from apps.examinations.services.report_card_pdf import ReportCardRenderer, template_options  # noqa: E402
+
+
+@pytest.fixture
+def card_batch(result_exam, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.REPORT_CARD_PDF_WORKERS = 1
+    examination = result_exam['examination']
+    compute_examination_results(examination)
+    section = result_exam['sections'][0]
+    student = result_exam['students'][0]
+    StudentEnrollment.objects.create(
+        student=student, section=section, academic_year=examination.academic_year,
+        enrollment_date=date(2026, 4, 1), roll_number='7',
+    )
+    for month, present in ((date(2026, 6, 1), 18), (date(2026, 7, 1), 20)):
+        AttendanceSummary.objects.create(
+            student=student, academic_year=examination.academic_year, month=month,
+            total_days=22, present_days=present, absent_days=22 - present,
+        )
+    return ReportCardBatch.objects.create(
+        examination=examination, class_obj=section.class_instance, section=section,
+    )
+
+
+def _without_timestamp(data):
+    return {key: value for key, value in data.items() if key != 'generated_at'}
+
+
+@pytest.mark.django_db
+class TestReportCardBatch:
+
+    def test_context_matches_per_student_generator(self, card_batch, result_exam):
+        examination = result_exam['examination']
+        results = [r for r in _results(result_exam) if r.section_id == card_batch.section_id]
+        context = SectionReportContext(
+            examination, card_batch.class_obj_id, card_batch.section_id, [r.student_id for r in results],
+        )
+
+        for result in results:
+            expected = ReportCardGenerator(result.student, examination.academic_year).generate_single_exam(result)
+            assert _without_timestamp(context.report_data(result)) == _without_timestamp(expected)
+
+        data = context.report_data(results[0])
+        assert data['student']['roll_number'] == '7'
+        assert data['attendance']['days_present'] == 38
+        assert [s['subject_name'] for s in data['subjects']] == ['Mathematics', 'Science']
+
+    def test_query_count_does_not_grow_with_students(self, card_batch, result_exam):
+        card_batch.generate_pdf = False
+        with CaptureQueriesContext(connection) as queries:
+            stats = run_report_card_batch(card_batch, chunk_size=2)
+
+        assert stats == {'total': 3, 'generated': 3, 'failed': 0}
+        # results, school, class stats, grades, marks, attendance, enrollments,
+        # then per chunk: existing cards, insert, batch counts
+        assert len(queries) <= 20
+        assert ReportCard.objects.filter(exam_result__section=card_batch.section).count() == 3
+
+    def test_renders_pdfs_and_regenerates_in_place(self, card_batch):
+        run_report_card_batch(card_batch)
+        stats = run_report_card_batch(card_batch)
+
+        cards = ReportCard.objects.filter(exam_result__section=card_batch.section)
+        assert stats['generated'] == 3 and cards.count() == 3
+        for card in cards:
+            with card.pdf_file.open('rb') as pdf:
+                assert pdf.read(5) == b'%PDF-'
+
+    def test_renders_on_a_process_pool(self, card_batch):
+        stats = run_report_card_batch(card_batch, workers=2, chunk_size=2)
+
+        assert stats == {'total': 3, 'generated': 3, 'failed': 0}
+        assert not ReportCard.objects.filter(exam_result__section=card_batch.section, pdf_file='').exists()
+
+    def test_renders_on_a_pool_inside_a_daemonic_worker(self, card_batch):
+        """generate_report_card_batch_task runs in a (daemonic) Celery prefork worker."""
+        run_report_card_batch(card_batch)
+        jobs = [
+            (card.report_data, card.teacher_remarks, card.principal_remarks)
+            for card in ReportCard.objects.filter(exam_result__section=card_batch.section)
+        ]
+        options = template_options(card_batch.template)
+        context = multiprocessing.get_context('fork')
+        queue = context.SimpleQueue()
+
+        def task():
+            with _render_pool(2, options) as pool:
+                queue.put((pool is not None, pool.map(_render, jobs)))
+
+        worker = context.Process(target=task, daemon=True)
+        worker.start()
+        pooled, rendered = queue.get()
+        worker.join()
+
+        assert pooled
+        assert [error for _, error in rendered] == [None] * 3
+        assert all(content.startswith(b'%PDF-') for (_, content), _ in rendered)
+
+    def test_render_failures_are_recorded_per_student(self, card_batch, result_exam, monkeypatch):
+
+        render = ReportCardRenderer.render
+        failing = result_exam['students'][1].get_full_name()
+
+        def flaky_render(renderer, data, *args):
+            if data['student']['name'] == failing:
+                raise ValueError('bad font')
+            return render(renderer, data, *args)
+
+        monkeypatch.setattr(ReportCardRenderer, 'render', flaky_render)
+        stats = run_report_card_batch(card_batch)
+
+        card_batch.refresh_from_db()
+        assert stats == {'total': 3, 'generated': 2, 'failed': 1}
+        assert (card_batch.generated_count, card_batch.failed_count) == (2, 1)
+        assert card_batch.errors == [{
+            'student_id': str(result_exam['students'][1].id), 'stage': 'pdf', 'error': 'ValueError: bad font',
+        }]
+
+    def test_generate_bulk_runs_in_the_background(self, card_batch, auth_client, monkeypatch):
+        card_batch.delete()
+        task = exam_tasks.generate_report_card_batch_task
+        queued = []
+        monkeypatch.setattr(task, 'delay', queued.append)
+        payload = {
+            'examination_id': str(card_batch.examination_id),
+            'class_id': str(card_batch.class_obj_id),
+            'section_id': str(card_batch.section_id),
+        }
+
+        response = auth_client.post('/api/v1/examinations/report-cards/generate_bulk/', payload, format='json')
+        assert response.status_code == 202
+        assert queued == [response.data['batch_id']]
+        duplicate = auth_client.post('/api/v1/examinations/report-cards/generate_bulk/', payload, format='json')
+        assert duplicate.status_code == 409
+
+        task.apply(args=queued)
+
+        progress = auth_client.get(f"/api/v1/examinations/report-card-batches/{queued[0]}/progress/")
+        assert progress.data['status'] == 'COMPLETED'
+        assert (progress.data['generated'], progress.data['failed']) == (3, 0)
+        latest = auth_client.get(
+            '/api/v1/examinations/report-cards/bulk_progress/'
+            f"?examination_id={payload['examination_id']}&class_id={payload['class_id']}"
+            f"&section_id={payload['section_id']}"
+        )
+        assert latest.data['batch_id'] == queued[0]
+        assert latest.data['progress_percent'] == 100
+
+
+# ---------------------------------------------------------------------------
+# Cached report card renderer
+# ---------------------------------------------------------------------------
+
+import io  # noqa: E402
+
+from django.core.files.base import ContentFile  # noqa: E402
+from PIL import Image as PILImage  # noqa: E402
+from reportlab import rl_config  # noqa: E402
+
+from apps.examinations.models import ReportCardTemplate  # noqa: E402
+from apps.examinations.services.report_card_pdf import clear_renderers, get_renderer  # noqa: E402
+from apps.examinations.services.report_card_synthetic import build_synthetic_report_data  # noqa: E402
+
+
+@pytest.fixture
+def card_template(result_exam, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    clear_renderers()
+    yield ReportCardTemplate.objects.create(
+        name='CBSE term', layout='CBSE', academic_year=result_exam['examination'].academic_year,
+        footer_text='Computer generated', show_percentage=False,
+    )
+    clear_renderers()
+
+
+@pytest.mark.django_db
+class TestReportCardRenderer:
+
+    def test_renderers_are_cached_per_template_and_layout(self, card_template):
+        renderer = get_renderer(card_template)
+
+        assert get_renderer(template_options(card_template)) is renderer
+        assert get_renderer(None) is not renderer
+        assert renderer.single_header == ['#', 'Subject', 'Max Marks', 'Marks Obtained', 'Grade', 'Status']
+
+        card_template.layout = 'ICSE'
+        card_template.save()
+        assert get_renderer(card_template) is not renderer
+
+    def test_reused_renderer_renders_like_a_fresh_one(self, card_template, monkeypatch):
+        monkeypatch.setattr(rl_config, 'invariant', 1)
+        cards = [build_synthetic_report_data(cumulative=idx % 2 == 1, seed=idx) for idx in range(4)]
+        renderer = get_renderer(card_template)
+
+        reused = [renderer.render(data, 'Well done') for data in cards + cards[:1]]
+        clear_renderers()
+        fresh = get_renderer(template_options(card_template)).render(cards[0], 'Well done')
+
+        assert reused[0] == reused[-1] == fresh
+        assert reused[1][0] == 'report_card_cumulative_Student_1_2026-27.pdf'
+
+    def test_template_logo_is_drawn(self, card_template):
+        logo = io.BytesIO()
+        PILImage.new('RGB', (40, 20), 'navy').save(logo, format='PNG')
+        card_template.school_logo.save('logo.png', ContentFile(logo.getvalue()))
+
+        renderer = get_renderer(card_template)
+        _, pdf = renderer.render(build_synthetic_report_data())
+
+        assert renderer.logo is not None
+        assert b'/Subtype /Image' in pdf
+
+
+# ---------------------------------------------------------------------------
+# Section report card export
+# ---------------------------------------------------------------------------
+
+import zipfile  # noqa: E402
+
+from pypdf import PdfReader  # noqa: E402
+
+from apps.examinations.services.report_card_export import StreamingPdfMerger  # noqa: E402
+from apps.examinations.services.report_card_pdf import report_card_hash  # noqa: E402
+
+
+def _export(client, card_batch, output='merged'):
+    response = client.get(
+        '/api/v1/examinations/report-cards/export_section/'
+        f'?examination_id={card_batch.examination_id}&class_id={card_batch.class_obj_id}'
+        f'&section_id={card_batch.section_id}&output={output}'
+    )
+    assert response.status_code == 200 and response.streaming
+    return response, b''.join(response.streaming_content)
+
+
+def _count_renders(monkeypatch):
+    render = ReportCardRenderer.render
+    rendered = []
+
+    def counting_render(renderer, data, *args):
+        rendered.append(data['student']['name'])
+        return render(renderer, data, *args)
+
+    monkeypatch.setattr(ReportCardRenderer, 'render', counting_render)
+    return rendered
+
+
+@pytest.mark.django_db
+class TestReportCardExport:
+
+    def test_merger_concatenates_pages(self):
+        cards = [build_synthetic_report_data(cumulative=idx == 1, seed=idx) for idx in range(3)]
+        pdfs = [get_renderer().render(data)[1] for data in cards]
+        merger = StreamingPdfMerger()
+
+        merged = merger.start() + b''.join(merger.add(pdf) for pdf in pdfs) + merger.close()
+
+        reader = PdfReader(io.BytesIO(merged), strict=True)
+        assert len(reader.pages) == sum(len(PdfReader(io.BytesIO(pdf)).pages) for pdf in pdfs)
+        text = ''.join(page.extract_text() for page in reader.pages)
+        assert text.index('Student 0') < text.index('Student 1') < text.index('Student 2')
+
+    def test_batch_skips_current_pdfs(self, card_batch, monkeypatch):
+        run_report_card_batch(card_batch)
+        rendered = _count_renders(monkeypatch)
+
+        stats = run_report_card_batch(card_batch)
+
+        assert stats == {'total': 3, 'generated': 3, 'failed': 0}
+        assert rendered == []
+
+    def test_merged_export_reuses_current_pdfs(self, card_batch, auth_client, monkeypatch):
+        run_report_card_batch(card_batch)
+        rendered = _count_renders(monkeypatch)
+
+        response, content = _export(auth_client, card_batch)
+
+        assert response['Content-Type'] == 'application/pdf'
+        assert response['Content-Disposition'] == 'attachment; filename="report-cards-half-yearly-9-a.pdf"'
+        reader = PdfReader(io.BytesIO(content))
+        assert len(reader.pages) >= 3
+        assert 'S0 Result' in reader.pages[0].extract_text()
+        assert rendered == []
+
+    def test_zip_export_renders_stale_pdfs(self, card_batch, result_exam, auth_client, monkeypatch):
+        run_report_card_batch(card_batch)
+        card = ReportCard.objects.get(exam_result__student=result_exam['students'][1])
+        card.teacher_remarks = 'Keep it up'
+        card.save()
+        rendered = _count_renders(monkeypatch)
+
+        response, content = _export(auth_client, card_batch, output='zip')
+
+        assert response['Content-Type'] == 'application/zip'
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        assert archive.namelist() == [
+            f'RES{idx}_report_card_S{idx}_Result_Half_yearly.pdf' for idx in range(3)
+        ]
+        assert all(archive.read(name).startswith(b'%PDF-') for name in archive.namelist())
+        assert rendered == ['S1 Result']
+        card.refresh_from_db()
+        assert card.pdf_data_hash == report_card_hash(card)
+
+    def test_export_failures_are_listed_in_the_zip(self, card_batch, result_exam, auth_client, monkeypatch):
+        card_batch.generate_pdf = False
+        run_report_card_batch(card_batch)
+        render = ReportCardRenderer.render
+
+        def flaky_render(renderer, data, *args):
+            if data['student']['admission_number'] == 'RES2':
+                raise ValueError('bad font')
+            return render(renderer, data, *args)
+
+        monkeypatch.setattr(ReportCardRenderer, 'render', flaky_render)
+        _, content = _export(auth_client, card_batch, output='zip')
+
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        assert len(archive.namelist()) == 3
+        assert archive.read('errors.txt') == b'RES2: ValueError: bad font\n'
+
+    def test_export_validates_query(self, card_batch, auth_client):
+        response = auth_client.get('/api/v1/examinations/report-cards/export_section/')
+        assert response.status_code == 400
+        response = auth_client.get(
+            '/api/v1/examinations/report-cards/export_section/'
+            f'?examination_id={card_batch.examination_id}&class_id={card_batch.class_obj_id}'
+            f'&section_id={card_batch.section_id}&output=tar'
+        )
+        assert response.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Bulk mark entry
+# ---------------------------------------------------------------------------
+
+import uuid  # noqa: E402
+
+from django.core.cache import cache  # noqa: E402
+
+from apps.examinations.services.mark_entry import enter_marks  # noqa: E402
+from apps.houses.models import House, HouseMembership, HousePointLog  # noqa: E402
+
+
+@pytest.fixture
+def mark_schedule(result_exam):
+    cache.clear()
+    examination = result_exam['examination']
+    User.objects.create_user(
+        email='marks_admin@test.com', password='x', first_name='Sys', last_name='Admin',
+        phone='7777732001', user_type='SUPER_ADMIN',
+    )
+    house = House.objects.create(name='Red', code='RED', color_code='#FF0000')
+    for student in result_exam['students']:
+        HouseMembership.objects.create(student=student, house=house, academic_year=examination.academic_year)
+    return ExamSchedule.objects.select_related('examination', 'subject').get(
+        examination=examination, section=result_exam['sections'][0], subject=result_exam['subjects'][0],
+    )
+
+
+def _entries(students, marks):
+    return [
+        {'student_id': str(student.id), 'marks_obtained': obtained, 'status': 'PRESENT'}
+        for student, obtained in zip(students, marks)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkMarkEntry:
+
+    def test_upserts_and_grades_in_memory(self, mark_schedule, result_exam):
+        students = result_exam['students'][:3]
+        new = Student.objects.create(
+            user=User.objects.create_user(
+                email='res_student9@test.com', password='x', first_name='New', last_name='Result',
+                phone='7777731009', user_type='STUDENT',
+            ),
+            admission_number='RES9', admission_date=date(2026, 4, 1),
+            first_name='New', last_name='Result', date_of_birth=date(2011, 1, 1), gender='F',
+        )
+
+        stats = enter_marks(mark_schedule, _entries(students + [new], [91, '74.5', 20, 88]))
+
+        assert (stats['created'], stats['updated'], stats['errors']) == (1, 3, [])
+        marks = {m.student_id: m for m in StudentMark.objects.filter(exam_schedule=mark_schedule)}
+        assert (marks[students[1].id].percentage, marks[students[1].id].grade) == (Decimal('74.50'), 'C')
+        assert (marks[students[2].id].is_passed, marks[students[2].id].grade) == (False, 'F')
+        assert (marks[new.id].grade, marks[new.id].grade_point) == ('B', Decimal('8.00'))
+
+    def test_query_count_does_not_grow_with_students(self, mark_schedule, result_exam):
+        GradeTable.cached(mark_schedule.examination.grade_scale_id)
+        students = result_exam['students'][:3]
+
+        with CaptureQueriesContext(connection) as queries:
+            enter_marks(mark_schedule, _entries(students, [50, 60, 70]))
+        # students, existing marks, upsert, results (+ savepoints)
+        assert len(queries) <= 6
+        assert sum(q['sql'].startswith('INSERT') for q in queries.captured_queries) == 1
+
+    def test_invalid_entries_are_rejected_in_memory(self, mark_schedule, result_exam):
+        student = result_exam['students'][0]
+        entries = [
+            {'student_id': str(student.id), 'marks_obtained': 101, 'status': 'PRESENT'},
+            {'student_id': str(student.id), 'marks_obtained': 10, 'status': 'LATE'},
+            {'student_id': str(uuid.uuid4()), 'marks_obtained': 10, 'status': 'PRESENT'},
+            {'student_id': 'abc', 'marks_obtained': 10, 'status': 'PRESENT'},
+        ]
+
+        stats = enter_marks(mark_schedule, entries)
+
+        assert [error['error'] for error in stats['errors']] == [
+            'Marks obtained cannot exceed maximum marks', "Invalid status 'LATE'",
+            'Invalid student_id', 'Student not found',
+        ]
+        assert StudentMark.objects.get(exam_schedule=mark_schedule, student=student).marks_obtained == 95
+
+    def test_house_points_for_new_grades_in_one_insert(self, mark_schedule, result_exam):
+        students = result_exam['students'][:3]
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = enter_marks(mark_schedule, _entries(students, [95, 92, 50]))
+
+        # Student 0 already had an A; student 1 reaches one
+        assert stats['house_points'] == 1
+        log = HousePointLog.objects.get()
+        assert (log.student_id, log.points, log.reason) == (
+            students[1].id, 10, 'Academic Excellence: A in Mathematics',
+        )
+        assert sum('house_points_log' in q['sql'] for q in queries.captured_queries) == 1
+        assert HouseMembership.objects.get(student=students[1]).points_contributed == 10
+        assert HouseMembership.objects.get(student=students[0]).points_contributed == 0
+
+        enter_marks(mark_schedule, _entries(students, [95, 92, 50]))
+        assert HousePointLog.objects.count() == 1
+        assert HouseMembership.objects.get(student=students[1]).points_contributed == 10
+
+    def test_house_points_count_towards_the_examination_year(self, mark_schedule, result_exam):
+        student = result_exam['students'][1]
+        last_year = AcademicYear.objects.create(name='2025-26', start_date=date(2025, 4, 1), end_date=date(2026, 3, 31))
+        HouseMembership.objects.filter(student=student).update(academic_year=last_year)
+
+        stats = enter_marks(mark_schedule, _entries([student], [92]))
+
+        assert stats['house_points'] == 0
+        assert HouseMembership.objects.get(student=student).points_contributed == 0
+
+    def test_results_are_recomputed_after_commit(
+        self, mark_schedule, result_exam, auth_client, django_capture_on_commit_callbacks, monkeypatch,
+    ):
+        examination = result_exam['examination']
+        compute_examination_results(examination)
+        student = result_exam['students'][1]
+        task = exam_tasks.compute_examination_results_task
+        queued = []
+        monkeypatch.setattr(task, 'delay', lambda *args: queued.append(args))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post('/api/v1/examinations/marks/bulk_entry/', {
+                'exam_schedule_id': str(mark_schedule.id),
+                'marks_data': _entries([student], [95]),
+            }, format='json')
+
+        assert response.status_code == 200
+        assert response.data['updated'] == 1
+        assert queued == [(str(examination.id), [str(student.id)])]
+
+        task(*queued[0])
+        result = ExamResult.objects.get(examination=examination, student=student)
+        assert (result.percentage, result.section_rank) == (Decimal('85.00'), 3)
+
+    def test_grade_table_cache_drops_on_grade_change(self, mark_schedule, django_capture_on_commit_callbacks):
+        scale_id = mark_schedule.examination.grade_scale_id
+        assert GradeTable.cached(scale_id).lookup(Decimal('80')) == ('B', Decimal('8.00'))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Grade.objects.filter(grade_scale_id=scale_id, grade='B').get().delete()
+
+        assert GradeTable.cached(scale_id).lookup(Decimal('80')) is None
+
+
+# ---------------------------------------------------------------------------
+# Materialised examination statistics
+# ---------------------------------------------------------------------------
+
+from apps.examinations.models import ExamStatistics  # noqa: E402
+from apps.examinations.services.exam_statistics import percentile  # noqa: E402
+from apps.examinations.services.report_card_generator import class_statistics  # noqa: E402
+
+
+def _statistics(examination, section=None, class_obj=None):
+    return ExamStatistics.objects.get(examination=examination, class_obj=class_obj, section=section)
+
+
+@pytest.mark.django_db
+class TestExamStatistics:
+
+    def test_percentile_interpolates_between_ranks(self):
+        values = [Decimal(v) for v in (40, 45, 75, 80)]
+        assert percentile(values, 50) == Decimal('60')
+        assert percentile(values, 25) == Decimal('43.75')
+        assert percentile(values, 100) == Decimal('80')
+        assert percentile(values[:1], 90) == Decimal('40')
+
+    def test_refreshed_with_results(self, result_exam):
+        examination = result_exam['examination']
+        section_a, section_b = result_exam['sections']
+
+        compute_examination_results(examination)
+
+        # Whole examination, the class and both sections
+        assert ExamStatistics.objects.filter(examination=examination).count() == 4
+        overall = _statistics(examination)
+        assert (overall.total_students, overall.students_passed, overall.pass_percentage) == (
+            6, 5, Decimal('83.33'),
+        )
+        assert (overall.average_percentage, overall.median_percentage) == (Decimal('70.42'), Decimal('76.25'))
+        assert _statistics(examination, class_obj=section_a.class_instance).total_students == 6
+
+        a = _statistics(examination, section_a, section_a.class_instance)
+        assert (a.average_percentage, a.median_percentage, a.highest_percentage, a.lowest_percentage) == (
+            Decimal('87.50'), Decimal('92.50'), Decimal('92.50'), Decimal('77.50'),
+        )
+        assert a.percentiles['p25'] == 85.0
+
+        b = _statistics(examination, section_b, section_b.class_instance)
+        assert (b.students_failed, b.pass_percentage) == (1, Decimal('66.67'))
+        science = next(s for s in b.subjects if s['subject_name'] == 'Science')
+        assert (science['students_appeared'], science['students_passed'], science['median_marks']) == (3, 2, 40.0)
+        assert science['average_marks'] == 46.67
+
+    def test_endpoint_reads_one_row(self, result_exam, auth_client):
+        examination = result_exam['examination']
+        section = result_exam['sections'][1]
+        compute_examination_results(examination)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(
+                f'/api/v1/examinations/exams/{examination.id}/statistics/'
+                f'?class_id={section.class_instance_id}&section_id={section.id}'
+            )
+
+        assert response.status_code == 200
+        assert (response.data['total_students'], response.data['median_percentage']) == (3, Decimal('45.00'))
+        assert [s['subject_name'] for s in response.data['subjects']] == ['Mathematics', 'Science']
+        # examination, statistics row
+        assert len(queries) <= 3
+
+    def test_endpoint_refreshes_missing_statistics(self, result_exam, auth_client):
+        examination = result_exam['examination']
+        compute_examination_results(examination, statistics=False)
+
+        response = auth_client.get(f'/api/v1/examinations/exams/{examination.id}/statistics/')
+
+        assert (response.data['total_students'], response.data['students_failed']) == (6, 1)
+        assert response.data['computed_at'] is not None
+
+    def test_result_changes_refresh_statistics_on_read(self, result_exam, auth_client):
+        examination = result_exam['examination']
+        compute_examination_results(examination)
+        failed = ExamResult.objects.get(examination=examination, is_passed=False)
+
+        response = auth_client.delete(f'/api/v1/examinations/results/{failed.id}/')
+
+        assert response.status_code == 204
+        assert not ExamStatistics.objects.filter(examination=examination).exists()
+        response = auth_client.get(f'/api/v1/examinations/exams/{examination.id}/statistics/')
+        assert (response.data['total_students'], response.data['students_failed']) == (5, 0)
+
+    def test_report_cards_read_stored_section_statistics(self, result_exam):
+        examination = result_exam['examination']
+        section = result_exam['sections'][0]
+        compute_examination_results(examination)
+        ExamStatistics.objects.filter(section=section).update(average_percentage=Decimal('12.34'))
+
+        stats = class_statistics(examination.id, section.class_instance_id, section.id)
+
+        assert stats == {
+            'total_students': 3, 'class_average': 12.34, 'highest_percentage': 92.5, 'lowest_percentage': 77.5,
+        }
@@ -14,6 +14,7 @@ from .views import (
     ExamResultViewSet,
     ReportCardViewSet,
     ReportCardTemplateViewSet,
+    ReportCardBatchViewSet,
     ExamHallViewSet,
     ExamScheduleConfigViewSet,
     ExamScheduleRunViewSet,
@@ -34,6 +35,7 @@ router.register(r'marks', StudentMarkViewSet, basename='mark')
 router.register(r'results', ExamResultViewSet, basename='result')
 router.register(r'report-cards', ReportCardViewSet, basename='report-card')
 router.register(r'report-card-templates', ReportCardTemplateViewSet, basename='report-card-template')
+router.register(r'report-card-batches', ReportCardBatchViewSet, basename='report-card-batch')
 
 # AI Exam Scheduler (ENTERPRISE)
 router.register(r'exam-halls', ExamHallViewSet, basename='exam-hall')
@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg, Max, Min, Count, Q, Sum
+from django.db.models import Q
 from django.utils import timezone
 
 from .models import (
@@ -19,8 +19,10 @@ from .models import (
     ExamSchedule,
     StudentMark,
     ExamResult,
+    ExamStatistics,
     ReportCard,
     ReportCardTemplate,
+    ReportCardBatch,
     ExamHall,
     ExamScheduleConfig,
     ExamScheduleRun,
@@ -40,6 +42,7 @@ from .serializers import (
     ReportCardTemplateSerializer,
     GenerateReportCardSerializer,
     BulkGenerateReportCardSerializer,
+    ReportCardBatchSerializer,
     ExamStatisticsSerializer,
     SubjectStatisticsSerializer,
     ExamHallSerializer,
@@ -49,6 +52,9 @@ from .serializers import (
     ApplyExamScheduleSerializer,
 )
 from apps.authentication.permissions import HasFeature
+from apps.core.services.progress import read_progress
+from .services.exam_statistics import examination_statistics
+from .services.result_engine import RANK_FUNCTIONS, compute_examination_results, rank_examination_results
 
 
 class GradeScaleViewSet(viewsets.ModelViewSet):
@@ -151,6 +157,17 @@ class ExaminationViewSet(viewsets.ModelViewSet):
             'examination': ExaminationSerializer(examination).data
         })
 
+    @action(detail=True, methods=['post'])
+    def compute_results(self, request, pk=None):
+        """Recompute every student's result and the ranks from the entered marks"""
+        examination = self.get_object()
+        stats = compute_examination_results(examination)
+
+        return Response({
+            'message': f"Results computed for {stats['students']} student(s)",
+            **stats,
+        })
+
     @action(detail=True, methods=['post'])
     def unpublish_results(self, request, pk=None):
         """Unpublish examination results"""
@@ -165,34 +182,39 @@ class ExaminationViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
-        """Get examination statistics"""
+        """
+        Get examination statistics, read from the statistics stored when
+        results are computed.
+
+        Query (optional): ?class_id=&section_id= for one class or section
+        """
         examination = self.get_object()
-        
-        results = ExamResult.objects.filter(examination=examination)
-        
-        total_students = results.count()
-        students_passed = results.filter(is_passed=True).count()
-        students_failed = results.filter(is_passed=False).count()
-        
-        stats = results.aggregate(
-            avg_percentage=Avg('percentage'),
-            highest_percentage=Max('percentage'),
-            lowest_percentage=Min('percentage')
+        params = request.query_params
+        row = examination_statistics(
+            examination,
+            class_id=params.get('class_id') or None,
+            section_id=params.get('section_id') or None,
         )
-        
-        pass_percentage = (students_passed / total_students * 100) if total_students > 0 else 0
-        
+        if row is None:
+            row = ExamStatistics(examination=examination)
+
         return Response({
             'examination_id': examination.id,
             'examination_name': examination.name,
-            'total_students': total_students,
-            'students_appeared': total_students,
-            'students_passed': students_passed,
-            'students_failed': students_failed,
-            'pass_percentage': round(pass_percentage, 2),
-            'average_percentage': round(stats['avg_percentage'] or 0, 2),
-            'highest_percentage': round(stats['highest_percentage'] or 0, 2),
-            'lowest_percentage': round(stats['lowest_percentage'] or 0, 2)
+            'class_id': row.class_obj_id,
+            'section_id': row.section_id,
+            'total_students': row.total_students,
+            'students_appeared': row.total_students,
+            'students_passed': row.students_passed,
+            'students_failed': row.students_failed,
+            'pass_percentage': row.pass_percentage,
+            'average_percentage': row.average_percentage,
+            'median_percentage': row.median_percentage,
+            'highest_percentage': row.highest_percentage,
+            'lowest_percentage': row.lowest_percentage,
+            'percentiles': row.percentiles,
+            'subjects': row.subjects,
+            'computed_at': None if row._state.adding else row.computed_at,
         })
 
 
@@ -275,14 +297,16 @@ class StudentMarkViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def bulk_entry(self, request):
         """
-        Bulk mark entry for a class
-        
+        Bulk mark entry for a class. Entries are validated together and
+        upserted in one statement; affected results are recomputed in the
+        background.
+
         Expected payload:
         {
-            "exam_schedule_id": 1,
+            "exam_schedule_id": "<uuid>",
             "marks_data": [
                 {
-                    "student_id": 1,
+                    "student_id": "<uuid>",
                     "marks_obtained": 85,
                     "status": "PRESENT",
                     "remarks": ""
@@ -293,44 +317,21 @@ class StudentMarkViewSet(viewsets.ModelViewSet):
         """
         serializer = BulkMarkEntrySerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
-        exam_schedule_id = serializer.validated_data['exam_schedule_id']
-        marks_data = serializer.validated_data['marks_data']
-        
-        exam_schedule = get_object_or_404(ExamSchedule, id=exam_schedule_id)
-        
-        created_count = 0
-        updated_count = 0
-        errors = []
-        
-        for entry in marks_data:
-            try:
-                mark, created = StudentMark.objects.update_or_create(
-                    exam_schedule=exam_schedule,
-                    student_id=entry['student_id'],
-                    defaults={
-                        'marks_obtained': entry.get('marks_obtained'),
-                        'status': entry.get('status', 'PRESENT'),
-                        'remarks': entry.get('remarks', ''),
-                        'entered_by': request.user
-                    }
-                )
-                if created:
-                    created_count += 1
-                else:
-                    updated_count += 1
-            except Exception as e:
-                errors.append({
-                    'student_id': entry['student_id'],
-                    'error': str(e)
-                })
-        
+
+        exam_schedule = get_object_or_404(
+            ExamSchedule.objects.select_related('examination', 'subject'),
+            id=serializer.validated_data['exam_schedule_id'],
+        )
+
+        from .services.mark_entry import enter_marks
+        stats = enter_marks(exam_schedule, serializer.validated_data['marks_data'], entered_by=request.user)
+
         return Response({
             'message': 'Bulk mark entry completed',
-            'created': created_count,
-            'updated': updated_count,
-            'errors': errors
-        }, status=status.HTTP_201_CREATED if created_count > 0 else status.HTTP_200_OK)
+            'created': stats['created'],
+            'updated': stats['updated'],
+            'errors': stats['errors'],
+        }, status=status.HTTP_201_CREATED if stats['created'] > 0 else status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'])
     def by_student(self, request):
@@ -393,12 +394,13 @@ class ExamResultViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def calculate_ranks(self, request):
         """
-        Calculate ranks for an examination
+        Calculate class and section ranks for an examination
         
         Query params:
         - examination_id: Examination ID
         - class_id: Class ID (optional)
         - section_id: Section ID (optional)
+        - method: competition (1, 2, 2, 4; default) or dense (1, 2, 2, 3)
         """
         examination_id = request.query_params.get('examination_id')
         
@@ -418,17 +420,25 @@ class ExamResultViewSet(viewsets.ModelViewSet):
         if section_id:
             filters['section_id'] = section_id
         
-        results = ExamResult.objects.filter(**filters).order_by('-percentage')
-        
-        count = 0
-        for rank, result in enumerate(results, 1):
-            result.rank = rank
-            result.save()
-            count += 1
-        
+        examination = get_object_or_404(Examination, id=examination_id)
+        method = request.query_params.get('method', 'competition')
+        if method not in RANK_FUNCTIONS:
+            return Response(
+                {'error': f"method must be one of: {', '.join(RANK_FUNCTIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        changed = rank_examination_results(
+            examination, method=method,
+            class_id=request.query_params.get('class_id'),
+            section_id=request.query_params.get('section_id'),
+        )
+        count = ExamResult.objects.filter(**filters).count()
+
         return Response({
             'message': f'Ranks calculated for {count} student(s)',
-            'count': count
+            'count': count,
+            'changed': changed,
         })
 
     @action(detail=False, methods=['get'])
@@ -643,14 +653,16 @@ class ReportCardViewSet(viewsets.ModelViewSet):
     def generate_bulk(self, request):
         """
         Generate report cards for all students in a class/section.
+        Creates a ReportCardBatch and dispatches a Celery task; follow it
+        via /report-card-batches/<id>/progress/.
 
         Payload:
         {
-            "examination_id": 1,
-            "class_id": 1,
-            "section_id": 1,
-            "template_id": 1,      // optional
-            "generate_pdf": true    // default true
+            "examination_id": "<uuid>",
+            "class_id": "<uuid>",
+            "section_id": "<uuid>",
+            "template_id": "<uuid>",  // optional
+            "generate_pdf": true      // default true
         }
         """
         serializer = BulkGenerateReportCardSerializer(data=request.data)
@@ -667,56 +679,68 @@ class ReportCardViewSet(viewsets.ModelViewSet):
             examination=examination,
             class_obj_id=data['class_id'],
             section_id=data['section_id'],
-        ).select_related('student')
-
+        )
         if not results.exists():
             return Response(
                 {'error': 'No exam results found for this class/section.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        from .services.report_card_generator import ReportCardGenerator
-        from .services.report_card_pdf import generate_report_card_pdf
+        active_batch = ReportCardBatch.objects.filter(
+            examination=examination,
+            section_id=data['section_id'],
+            status__in=ReportCardBatch.ACTIVE_STATUSES,
+        ).first()
+        if active_batch:
+            return Response({
+                'error': 'Report cards are already being generated for this class/section.',
+                'batch_id': str(active_batch.id),
+                'status': active_batch.status,
+            }, status=status.HTTP_409_CONFLICT)
 
-        generated = 0
-        errors = []
+        batch = ReportCardBatch.objects.create(
+            examination=examination,
+            class_obj_id=data['class_id'],
+            section_id=data['section_id'],
+            template=template,
+            generate_pdf=data.get('generate_pdf', True),
+            triggered_by=request.user,
+        )
 
-        for result in results:
-            try:
-                generator = ReportCardGenerator(
-                    result.student, examination.academic_year, template
-                )
-                report_data = generator.generate_single_exam(result)
-
-                report_card, _ = ReportCard.objects.update_or_create(
-                    exam_result=result,
-                    defaults={
-                        'student': result.student,
-                        'academic_year': examination.academic_year,
-                        'report_data': report_data,
-                        'template': template,
-                        'generated_by': request.user,
-                    }
-                )
+        from .tasks import generate_report_card_batch_task
+        generate_report_card_batch_task.delay(str(batch.id))
 
-                if data.get('generate_pdf', True):
-                    try:
-                        generate_report_card_pdf(report_card)
-                    except Exception:
-                        pass
+        return Response({
+            'message': 'Report card generation started.',
+            'batch_id': str(batch.id),
+        }, status=status.HTTP_202_ACCEPTED)
 
-                generated += 1
-            except Exception as e:
-                errors.append({
-                    'student_id': result.student_id,
-                    'error': str(e),
-                })
+    @action(detail=False, methods=['get'])
+    def bulk_progress(self, request):
+        """
+        Progress of the latest bulk generation for a class/section.
 
-        return Response({
-            'message': f'Generated {generated} report card(s)',
-            'generated': generated,
-            'errors': errors,
-        })
+        Query: ?examination_id=&class_id=&section_id=
+        """
+        params = request.query_params
+        missing = [name for name in ('examination_id', 'class_id', 'section_id') if not params.get(name)]
+        if missing:
+            return Response(
+                {'error': f"Missing query parameter(s): {', '.join(missing)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        batch = ReportCardBatch.objects.filter(
+            examination_id=params['examination_id'],
+            class_obj_id=params['class_id'],
+            section_id=params['section_id'],
+        ).order_by('-created_at').first()
+        if batch is None:
+            return Response(
+                {'error': 'No bulk generation found for this class/section.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        cached = read_progress(ReportCardBatch, batch.pk)
+        return Response(cached if cached is not None else _batch_progress(batch))
 
     @action(detail=True, methods=['get'])
     def download_pdf(self, request, pk=None):
@@ -741,6 +765,67 @@ class ReportCardViewSet(viewsets.ModelViewSet):
             filename=report_card.pdf_file.name.split('/')[-1],
         )
 
+    @action(detail=False, methods=['get'])
+    def export_section(self, request):
+        """
+        Stream a class/section's report cards for printing: one merged PDF
+        (default) or a ZIP of one PDF per student. Stored PDFs are reused
+        while current; missing or stale ones are rendered on the way.
+
+        Query: ?examination_id=&class_id=&section_id=&output=merged|zip
+        """
+        params = request.query_params
+        missing = [name for name in ('examination_id', 'class_id', 'section_id') if not params.get(name)]
+        if missing:
+            return Response(
+                {'error': f"Missing query parameter(s): {', '.join(missing)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        output = params.get('output', 'merged')
+        if output not in ('merged', 'zip'):
+            return Response(
+                {'error': "output must be 'merged' or 'zip'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        from apps.academics.models import Section
+        examination = get_object_or_404(Examination, id=params['examination_id'])
+        section = get_object_or_404(
+            Section.objects.select_related('class_instance'),
+            id=params['section_id'], class_instance_id=params['class_id'],
+        )
+        cards = self.get_queryset().filter(
+            exam_result__examination=examination,
+            exam_result__class_obj_id=params['class_id'],
+            exam_result__section_id=params['section_id'],
+        ).order_by('exam_result__student__first_name', 'exam_result__student__last_name', 'id')
+        if not cards.exists():
+            return Response(
+                {'error': 'No report cards found for this class/section.'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        from django.http import StreamingHttpResponse
+        from django.utils.text import slugify
+        from .services.report_card_export import stream_merged_pdf, stream_zip
+
+        cards = cards.iterator(chunk_size=100)
+        name = slugify(f'report cards {examination.name} {section.class_instance.name} {section.name}')
+        if output == 'zip':
+            response = StreamingHttpResponse(stream_zip(cards), content_type='application/zip')
+            response['Content-Disposition'] = f'attachment; filename="{name}.zip"'
+            return response
+        try:
+            chunks = stream_merged_pdf(cards)
+        except ImportError:
+            return Response(
+                {'error': 'PDF merging failed. Ensure pypdf is installed.'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        response = StreamingHttpResponse(chunks, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{name}.pdf"'
+        return response
+
     @action(detail=False, methods=['get'])
     def my_report_cards(self, request):
         """Get report cards for logged-in student or parent's children."""
@@ -775,6 +860,28 @@ class ReportCardViewSet(viewsets.ModelViewSet):
 # AI EXAM SCHEDULER VIEWSETS
 # ============================================================================
 
+class ReportCardBatchViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for viewing background bulk report card batches,
+    including per-student errors.
+    """
+    queryset = ReportCardBatch.objects.select_related('examination', 'section', 'triggered_by')
+    serializer_class = ReportCardBatchSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['examination', 'class_obj', 'section', 'status']
+    ordering = ['-created_at']
+
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        """Get current generation progress (from the cache while the batch is running)."""
+        batch = self.get_object()
+        cached = read_progress(ReportCardBatch, batch.pk)
+        if cached is not None:
+            return Response(cached)
+        return Response(_batch_progress(batch))
+
+
 class ExamHallViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing exam halls.
@@ -879,8 +986,11 @@ class ExamScheduleRunViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=True, methods=['get'])
     def progress(self, request, pk=None):
-        """Get current generation progress."""
+        """Get current generation progress (from the cache while the run is active)."""
         run = self.get_object()
+        cached = read_progress(ExamScheduleRun, run.pk)
+        if cached is not None:
+            return Response(cached)
         return Response({
             'run_id': str(run.id),
             'status': run.status,
@@ -1027,3 +1137,17 @@ class ExamScheduleRunViewSet(viewsets.ReadOnlyModelViewSet):
             'message': f'Rolled back. {restored} schedule(s) restored.',
             'restored': restored,
         })
+
+
+def _batch_progress(batch):
+    """Progress payload of a batch from its row (readers try the cache first)."""
+    return {
+        'batch_id': str(batch.id),
+        'status': batch.status,
+        'progress_percent': batch.progress_percent,
+        'progress_message': batch.progress_message,
+        'total': batch.total_students,
+        'generated': batch.generated_count,
+        'failed': batch.failed_count,
+        'error_message': batch.error_message,
+    }
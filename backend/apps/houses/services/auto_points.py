@@ -1,6 +1,8 @@
 from apps.houses.models import House, HousePointLog, HouseMembership
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import F
+from collections import Counter
 import logging
 
 User = get_user_model()
@@ -17,13 +19,7 @@ class AutoPointService:
         """
         Awards points when a student achieves high grades.
         """
-        # Define logic: A+ gets 20 points, A gets 10 points
-        points = 0
-        if grade_name in ['A+', 'O', 'Distinction', 'Outstanding']:
-            points = 20
-        elif grade_name in ['A', 'A1', 'Exemplary']:
-            points = 10
-            
+        points = AutoPointService.academic_points(grade_name)
         if points > 0:
             membership = HouseMembership.objects.filter(student=student).first()
             if not membership:
@@ -42,6 +38,77 @@ class AutoPointService:
             )
         return None
 
+    @staticmethod
+    def academic_points(grade_name):
+        """
+        Points for a subject grade: A+ gets 20 points, A gets 10 points.
+        """
+        if grade_name in ['A+', 'O', 'Distinction', 'Outstanding']:
+            return 20
+        if grade_name in ['A', 'A1', 'Exemplary']:
+            return 10
+        return 0
+
+    @staticmethod
+    def award_academic_excellence_bulk(awards, academic_year_id):
+        """
+        Awards academic points for many marks at once: one membership query,
+        one system user query, one bulk insert and one update of the members'
+        contributed points, whatever the number of marks.
+
+        Args:
+            awards: iterable of (student_id, subject_name, grade_name).
+            academic_year_id: year of the memberships the points count towards.
+
+        Returns:
+            list: the created HousePointLog entries.
+        """
+        awards = [
+            (student_id, subject_name, grade_name, AutoPointService.academic_points(grade_name))
+            for student_id, subject_name, grade_name in awards
+        ]
+        awards = [award for award in awards if award[3] > 0]
+        if not awards:
+            return []
+
+        memberships = {
+            student_id: (membership_id, house_id)
+            for student_id, membership_id, house_id in HouseMembership.objects.filter(
+                student_id__in={award[0] for award in awards},
+                academic_year_id=academic_year_id,
+            ).values_list('student_id', 'id', 'house_id')
+        }
+        awards = [award for award in awards if award[0] in memberships]
+        if not awards:
+            return []
+
+        system_user = User.objects.filter(user_type='SUPER_ADMIN').first()
+        if system_user is None:
+            logger.warning("No SUPER_ADMIN user to award %d academic house point(s)", len(awards))
+            return []
+
+        with transaction.atomic():
+            logs = HousePointLog.objects.bulk_create([
+                HousePointLog(
+                    house_id=memberships[student_id][1],
+                    student_id=student_id,
+                    points=points,
+                    reason=f"Academic Excellence: {grade_name} in {subject_name}",
+                    category='ACADEMIC',
+                    awarded_by=system_user,
+                )
+                for student_id, subject_name, grade_name, points in awards
+            ])
+            # bulk_create skips HousePointLog.save(), which credits the member
+            contributed = Counter()
+            for student_id, subject_name, grade_name, points in awards:
+                contributed[memberships[student_id][0]] += points
+            HouseMembership.objects.bulk_update([
+                HouseMembership(id=membership_id, points_contributed=F('points_contributed') + points)
+                for membership_id, points in contributed.items()
+            ], ['points_contributed'])
+        return logs
+
     @staticmethod
     def award_for_behavior(student, remark_type, note_text):
         """
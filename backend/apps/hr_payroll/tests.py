@@ -3,9 +3,16 @@ Tests for the hr_payroll app — Department, Designation, SalaryComponent,
 SalaryStructure, PayrollRun, Payslip.
 """
 
+from datetime import date
+from unittest import mock
+
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from apps.core.services.progress import ProgressChannel, progress_key
+from apps.hr_payroll.models import PayrollRun
 
 User = get_user_model()
 
@@ -83,3 +90,31 @@ class TestHRPayrollAccess:
     def test_payslips_list(self, auth_client):
         response = auth_client.get('/api/v1/hr/payslips/')
         assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestPayrollRunProgress:
+    """Progress is served from the cache only for runs the caller can see."""
+
+    def test_cached_progress_of_a_deleted_run_is_not_found(self, auth_client, anon_client):
+        run = PayrollRun.objects.create(month=10, year=2026, run_date=date(2026, 10, 31), is_deleted=True)
+        cache.set(progress_key(PayrollRun, run.pk), {'id': str(run.id), 'progress_percent': 40})
+
+        assert anon_client.get(f'/api/v1/hr/payroll-runs/{run.id}/progress/').status_code == 401
+        assert auth_client.get(f'/api/v1/hr/payroll-runs/{run.id}/progress/').status_code == 404
+
+    def test_cached_progress(self, auth_client):
+        run = PayrollRun.objects.create(month=10, year=2026, run_date=date(2026, 10, 31), status='PROCESSING')
+        cache.set(progress_key(PayrollRun, run.pk), {'id': str(run.id), 'progress_percent': 40})
+
+        response = auth_client.get(f'/api/v1/hr/payroll-runs/{run.id}/progress/')
+        assert response.data['progress_percent'] == 40
+
+    def test_failed_processing_closes_the_channel(self, auth_client):
+        run = PayrollRun.objects.create(month=10, year=2026, run_date=date(2026, 10, 31))
+
+        with mock.patch.object(ProgressChannel, 'close') as close, \
+                mock.patch.object(PayrollRun, 'save', side_effect=[None, RuntimeError('db down')]):
+            with pytest.raises(RuntimeError):
+                auth_client.post(f'/api/v1/hr/payroll-runs/{run.id}/process/')
+        close.assert_called_once()
@@ -20,6 +20,7 @@ from .serializers import (
     PayrollRunSerializer, PayslipSerializer, PayslipListSerializer,
     PayslipComponentSerializer,
 )
+from apps.core.services.progress import ProgressChannel, read_progress
 
 
 @api_view(['GET'])
@@ -132,71 +133,94 @@ class PayrollRunViewSet(viewsets.ModelViewSet):
         payroll_run.status = 'PROCESSING'
         payroll_run.processed_by = request.user
         payroll_run.save()
-
-        # Get all active staff with salary structures
-        from apps.staff.models import StaffMember
-        active_staff = StaffMember.objects.filter(
-            is_deleted=False,
-            employment_status='ACTIVE'
+        channel = ProgressChannel.for_instance(
+            payroll_run, base={'id': str(payroll_run.id)}, percent_field=None, message_field=None,
         )
 
-        total_gross = 0
-        total_deductions = 0
-        payslips_created = 0
-
-        for staff in active_staff:
-            salary_structure = SalaryStructure.objects.filter(
-                staff=staff, is_active=True, is_deleted=False
-            ).first()
-
-            if not salary_structure:
-                continue
-
-            gross = salary_structure.total_earnings
-            deductions = salary_structure.total_deductions
-            net = gross - deductions
-
-            payslip, created = Payslip.objects.get_or_create(
-                payroll_run=payroll_run,
-                staff=staff,
-                defaults={
-                    'month': payroll_run.month,
-                    'year': payroll_run.year,
-                    'working_days': 26,
-                    'present_days': 26,
-                    'leave_days': 0,
-                    'gross_salary': gross,
-                    'total_deductions': deductions,
-                    'net_salary': net,
-                    'status': 'GENERATED',
-                }
+        try:
+            # Get all active staff with salary structures
+            from apps.staff.models import StaffMember
+            active_staff = StaffMember.objects.filter(
+                is_deleted=False,
+                employment_status='ACTIVE'
             )
-
-            if created:
-                payslips_created += 1
-                # Create payslip components
-                for sc in salary_structure.structure_components.all():
-                    PayslipComponent.objects.create(
-                        payslip=payslip,
-                        component=sc.component,
-                        amount=sc.amount,
-                        component_type=sc.component.component_type,
-                    )
-
-            total_gross += gross
-            total_deductions += deductions
-
-        payroll_run.total_gross = total_gross
-        payroll_run.total_deductions = total_deductions
-        payroll_run.total_net = total_gross - total_deductions
-        payroll_run.status = 'COMPLETED'
-        payroll_run.save()
+            total_staff = active_staff.count()
+
+            total_gross = 0
+            total_deductions = 0
+            payslips_created = 0
+
+            for idx, staff in enumerate(active_staff):
+                channel.update(int(idx / total_staff * 100), f'Processing staff {idx + 1}/{total_staff}...')
+
+                salary_structure = SalaryStructure.objects.filter(
+                    staff=staff, is_active=True, is_deleted=False
+                ).first()
+
+                if not salary_structure:
+                    continue
+
+                gross = salary_structure.total_earnings
+                deductions = salary_structure.total_deductions
+                net = gross - deductions
+
+                payslip, created = Payslip.objects.get_or_create(
+                    payroll_run=payroll_run,
+                    staff=staff,
+                    defaults={
+                        'month': payroll_run.month,
+                        'year': payroll_run.year,
+                        'working_days': 26,
+                        'present_days': 26,
+                        'leave_days': 0,
+                        'gross_salary': gross,
+                        'total_deductions': deductions,
+                        'net_salary': net,
+                        'status': 'GENERATED',
+                    }
+                )
+
+                if created:
+                    payslips_created += 1
+                    # Create payslip components
+                    for sc in salary_structure.structure_components.all():
+                        PayslipComponent.objects.create(
+                            payslip=payslip,
+                            component=sc.component,
+                            amount=sc.amount,
+                            component_type=sc.component.component_type,
+                        )
+
+                total_gross += gross
+                total_deductions += deductions
+
+            payroll_run.total_gross = total_gross
+            payroll_run.total_deductions = total_deductions
+            payroll_run.total_net = total_gross - total_deductions
+            payroll_run.status = 'COMPLETED'
+            payroll_run.save()
+        finally:
+            channel.close()
 
         return Response({
             'detail': f'Payroll processed. {payslips_created} payslips generated.',
             'payroll_run': PayrollRunSerializer(payroll_run).data,
         })
 
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        """Processing progress (from the cache while the run is being processed)."""
+        payroll_run = self.get_object()
+        cached = read_progress(PayrollRun, payroll_run.pk)
+        if cached is not None:
+            return Response(cached)
+        return Response({
+            'id': str(payroll_run.id),
+            'status': payroll_run.status,
+            'progress_percent': 100 if payroll_run.status == 'COMPLETED' else 0,
+            'progress_message': payroll_run.get_status_display(),
+        })
+
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         """Cancel a payroll run."""
@@ -62,6 +62,35 @@ class WebhookService:
         logger.info(f"Created {len(delivery_ids)} webhook deliveries for {event_type}")
         return delivery_ids
 
+    @staticmethod
+    def trigger_events(event_type: str, payloads: list):
+        """
+        Trigger the same event for many payloads (bulk writes).
+        One event lookup, one subscription query and one bulk insert of
+        WebhookDelivery records, instead of trigger_event per payload.
+        """
+        if not payloads:
+            return []
+        logger.info(f"Triggering {len(payloads)} {event_type} events")
+
+        if not WebhookEvent.objects.filter(event_type=event_type).exists():
+            logger.warning(f"Event type {event_type} not found in registry")
+            return []
+
+        subscriptions = list(WebhookSubscription.objects.filter(
+            event__event_type=event_type,
+            is_active=True
+        ))
+        now = timezone.now()
+        deliveries = WebhookDelivery.objects.bulk_create([
+            WebhookDelivery(subscription=sub, payload=payload, status='PENDING', next_retry_at=now)
+            for payload in payloads
+            for sub in subscriptions
+        ])
+
+        logger.info(f"Created {len(deliveries)} webhook deliveries for {event_type}")
+        return [delivery.id for delivery in deliveries]
+
     @staticmethod
     def send_webhook(delivery_id):
         """
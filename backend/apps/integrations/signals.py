@@ -1,5 +1,6 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from apps.attendance.signals import student_attendance_bulk_marked
 from .services import WebhookService
 import logging
 
@@ -51,6 +52,23 @@ def attendance_marked_handler(sender, instance, created, **kwargs):
         }
         safe_trigger('attendance.marked', payload)
 
+
+@receiver(student_attendance_bulk_marked)
+def bulk_attendance_marked_handler(sender, created_records, **kwargs):
+    # Same per-student event as attendance_marked_handler for rows the bulk
+    # path created (bulk_create does not send post_save)
+    payloads = [{
+        'event': 'attendance.marked',
+        'student_id': str(instance.student_id),
+        'date': str(instance.date),
+        'status': instance.status,
+        'timestamp': str(instance.marked_at)
+    } for instance in created_records]
+    try:
+        WebhookService.trigger_events('attendance.marked', payloads)
+    except Exception as e:
+        logger.error(f"Failed to trigger webhook attendance.marked: {e}")
+
 @receiver(post_save, sender='examinations.ExamResult')
 def result_published_handler(sender, instance, created, **kwargs):
     # Trigger when examination is published?
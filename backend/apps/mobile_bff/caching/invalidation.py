@@ -0,0 +1,225 @@
+"""
+Batched Today View cache invalidation.
+
+Signal receivers used to hit the cache once per saved row (plus one
+``StudentParent`` query and one delete per parent). Marking attendance for a
+section or publishing an assignment therefore turned into dozens of round
+trips for what is logically one invalidation.
+
+Receivers now record *what* needs invalidating on an ``InvalidationCollector``
+and the collector flushes once:
+
+- inside a request (``CacheInvalidationMiddleware``) or a Celery task
+  (``task_prerun`` / ``task_postrun`` hooks in ``apps.mobile_bff.signals``),
+  when the request or task finishes;
+- inside ``transaction.atomic`` with no request/task collector, on commit
+  (nothing is flushed if the transaction rolls back);
+- otherwise immediately, as before.
+
+A flush resolves parents for all collected students with one query, bumps
+every student and section version with one ``set_many`` and removes parent
+entries with one ``delete_many``. Repeated keys are deduplicated; the number
+of cache operations saved is reported as ``coalesced``.
+
+Usage:
+    from apps.mobile_bff.caching import invalidation
+
+    invalidation.invalidate_student(student_id, include_parents=True)
+
+    with invalidation.collect() as collector:
+        ...  # bulk writes
+    collector.result  # {'requested': 80, 'flushed': 3, 'coalesced': 77}
+"""
+
+import contextvars
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from apps.mobile_bff.caching.today_view_cache import TodayViewCache
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('today_view_invalidation', default=None)
+
+_stats_lock = threading.Lock()
+_stats = {'flushes': 0, 'requested': 0, 'flushed': 0, 'coalesced': 0}
+
+
+class InvalidationCollector:
+    """Deduplicating set of pending Today View invalidations."""
+
+    def __init__(self):
+        self.students = set()
+        self.sections = set()
+        self.parents = set()  # (parent_id, date)
+        # student_id -> {date: number of requests}; parents resolved on flush
+        self.parents_of = defaultdict(lambda: defaultdict(int))
+        self.requested = 0
+        self.result = None
+
+    def __bool__(self):
+        return bool(self.students or self.sections or self.parents or self.parents_of)
+
+    def add_student(self, student_id, date=None, include_parents=False):
+        self.students.add(str(student_id))
+        self.requested += 1
+        if include_parents:
+            self.parents_of[str(student_id)][date] += 1
+
+    def add_section(self, section_id):
+        self.sections.add(str(section_id))
+        self.requested += 1
+
+    def add_parent(self, parent_id, date=None):
+        self.parents.add((str(parent_id), date))
+        self.requested += 1
+
+    def flush(self):
+        """
+        Apply all pending invalidations and reset the collector.
+
+        Returns ``{'requested', 'flushed', 'coalesced'}`` where ``requested``
+        is the number of cache operations the per-row receivers would have
+        made and ``flushed`` the number of distinct keys actually touched.
+        """
+        requested = self.requested
+        parents = set(self.parents)
+
+        if self.parents_of:
+            from apps.students.models import StudentParent
+
+            links = StudentParent.objects.filter(
+                student_id__in=list(self.parents_of)
+            ).values_list('student_id', 'parent_id')
+            for student_id, parent_id in links:
+                for date, count in self.parents_of[str(student_id)].items():
+                    parents.add((str(parent_id), date))
+                    requested += count
+
+        flushed = TodayViewCache.bump_many(self.students, self.sections)
+        flushed += TodayViewCache.invalidate_parents_many(parents)
+
+        result = {
+            'requested': requested,
+            'flushed': flushed,
+            'coalesced': max(requested - flushed, 0),
+        }
+        self._reset()
+        self.result = result
+        _record(result)
+        if result['coalesced']:
+            logger.debug(
+                "Today view invalidation: %(flushed)d keys for %(requested)d requests "
+                "(%(coalesced)d coalesced)", result,
+            )
+        return result
+
+    def _reset(self):
+        self.students.clear()
+        self.sections.clear()
+        self.parents.clear()
+        self.parents_of.clear()
+        self.requested = 0
+
+
+def _record(result):
+    with _stats_lock:
+        _stats['flushes'] += 1
+        for name in ('requested', 'flushed', 'coalesced'):
+            _stats[name] += result[name]
+
+
+def stats():
+    """Process-wide totals since start-up."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _transaction_collector():
+    """
+    Collector bound to the current transaction, flushed on commit.
+
+    Django discards on-commit callbacks on rollback, so a collector whose
+    callback is no longer registered is replaced rather than reused.
+    """
+    connection = transaction.get_connection()
+    collector = getattr(connection, '_today_view_invalidation', None)
+    if collector is not None and any(
+        callback == collector.flush for _, callback, *_ in connection.run_on_commit
+    ):
+        return collector
+
+    collector = InvalidationCollector()
+    connection._today_view_invalidation = collector
+    transaction.on_commit(collector.flush)
+    return collector
+
+
+def _collector():
+    collector = _current.get()
+    if collector is not None:
+        return collector, False
+    if transaction.get_connection().in_atomic_block:
+        return _transaction_collector(), False
+    return InvalidationCollector(), True
+
+
+def _safe_flush(collector):
+    try:
+        return collector.flush()
+    except Exception:
+        # A failed invalidation must never break the write that caused it
+        logger.exception("Failed to flush Today View cache invalidations")
+        return None
+
+
+def invalidate_student(student_id, date=None, include_parents=False):
+    """Invalidate a student's fragments (and optionally their parents' entries)."""
+    collector, immediate = _collector()
+    collector.add_student(student_id, date, include_parents)
+    if immediate:
+        _safe_flush(collector)
+
+
+def invalidate_section(section_id):
+    """Invalidate the section fragments shared by every student in the section."""
+    collector, immediate = _collector()
+    collector.add_section(section_id)
+    if immediate:
+        _safe_flush(collector)
+
+
+def invalidate_parent(parent_id, date=None):
+    collector, immediate = _collector()
+    collector.add_parent(parent_id, date)
+    if immediate:
+        _safe_flush(collector)
+
+
+def begin():
+    """Start collecting in the current context; returns a token for ``end``."""
+    return _current.set(InvalidationCollector())
+
+
+def end(token):
+    """Flush the collector started by ``begin`` and restore the previous one."""
+    collector = _current.get()
+    _current.reset(token)
+    if collector:
+        return _safe_flush(collector)
+    return None
+
+
+@contextmanager
+def collect():
+    """Collect invalidations for the enclosed block and flush them once."""
+    token = begin()
+    collector = _current.get()
+    try:
+        yield collector
+    finally:
+        end(token)
@@ -1,10 +1,11 @@
 """
 Redis Caching Strategy for Today View API
-Implements per-student per-day caching with smart invalidation
+Implements section/student fragment caching with version-key invalidation
 """
 
 import json
 import hashlib
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from django.core.cache import cache
@@ -14,7 +15,27 @@ from django.utils import timezone
 class TodayViewCache:
     """
     Redis cache manager for Today View data
-    Implements per-student per-day caching strategy
+
+    A student's Today payload is stored as composable fragments rather than
+    one blob per student:
+
+    - Section-scoped fragments (timetable, homework, exams) are shared by
+      every student in the section:
+      ``today_view:frag:section:{section_id}:{date}:{name}``
+    - Student-scoped fragments (student info, fees, attendance, remarks,
+      homework submission statuses):
+      ``today_view:frag:student:{student_id}:{date}:{name}``
+
+    Each scope has a version key (``today_view:ver:{scope}:{id}``) and every
+    fragment records the version it was built against. Invalidating a section
+    or a student is a single version bump; fragments with an older version
+    are ignored on read and overwritten on the next miss. Reads are a single
+    ``get_many`` once the student's section is known to this process.
+
+    Fragments are stored under the versions read when the data was found
+    missing (``versions=`` on the reads, ``capture_versions``), not the ones
+    current when it has been built: a fragment built across an invalidation
+    is not stored, and could never be read as current.
     """
     
     # Cache TTL configurations
@@ -27,6 +48,29 @@ class TodayViewCache:
     PREFIX_TODAY_VIEW = "today_view"
     PREFIX_STUDENT = "student"
     PREFIX_PARENT = "parent"
+    PREFIX_SECTION = "section"
+    PREFIX_FRAGMENT = "frag"
+    PREFIX_VERSION = "ver"
+
+    # Fragment layout
+    SECTION_FRAGMENTS = ('timetable', 'homework', 'exams')
+    STUDENT_FRAGMENTS = ('student', 'fees_due', 'teacher_remarks', 'attendance', 'homework_status')
+    FRAGMENT_DEFAULTS = {
+        'timetable': {},
+        'homework': [],
+        'exams': [],
+        'student': {},
+        'fees_due': {},
+        'teacher_remarks': [],
+        'attendance': {},
+        'homework_status': {},
+    }
+    NO_SECTION = 'none'
+
+    # Process-local student -> section hints so a warm read is one get_many.
+    # Hints are only trusted after the student fragment confirms them.
+    _section_hints: Dict[str, str] = {}
+    SECTION_HINTS_MAX = 10000
     
     @classmethod
     def _get_cache_key(cls, student_id: str, date: str = None) -> str:
@@ -49,6 +93,18 @@ class TodayViewCache:
             date = timezone.now().date().isoformat()
         
         return f"{cls.PREFIX_TODAY_VIEW}:{cls.PREFIX_PARENT}:{parent_id}:{date}"
+
+    @classmethod
+    def _version_key(cls, scope: str, scope_id: str) -> str:
+        return f"{cls.PREFIX_TODAY_VIEW}:{cls.PREFIX_VERSION}:{scope}:{scope_id}"
+
+    @classmethod
+    def _fragment_key(cls, scope: str, scope_id: str, date: str, name: str) -> str:
+        return f"{cls.PREFIX_TODAY_VIEW}:{cls.PREFIX_FRAGMENT}:{scope}:{scope_id}:{date}:{name}"
+
+    @classmethod
+    def _section_scope_id(cls, section_id) -> str:
+        return str(section_id) if section_id else cls.NO_SECTION
     
     @classmethod
     def _get_dynamic_ttl(cls) -> int:
@@ -65,45 +121,347 @@ class TodayViewCache:
             return cls.CACHE_TTL_AFTERNOON
         else:
             return cls.CACHE_TTL_EVENING
+
+    # ------------------------------------------------------------------
+    # Versions
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _new_version() -> str:
+        # Random token rather than a counter: a version key that was evicted
+        # and recreated can never match the version in an older fragment,
+        # and bumps can be written with a plain set_many.
+        return uuid.uuid4().hex
+
+    @classmethod
+    def _ensure_versions(cls, version_keys) -> Dict[str, str]:
+        """Current value of each version key, creating missing ones."""
+        version_keys = list(dict.fromkeys(version_keys))
+        versions = cache.get_many(version_keys)
+        missing = [key for key in version_keys if key not in versions]
+        if missing:
+            seed = cls._new_version()
+            for key in missing:
+                cache.add(key, seed, None)
+            versions.update(cache.get_many(missing))
+        return versions
+
+    @classmethod
+    def _capture(cls, values, version_keys, versions) -> None:
+        """Add the version keys' values in ``values`` to ``versions``, creating missing ones."""
+        missing = [key for key in version_keys if key not in values]
+        versions.update({key: values[key] for key in version_keys if key in values})
+        if missing:
+            versions.update(cls._ensure_versions(missing))
+
+    @classmethod
+    def capture_versions(cls, student_ids=(), section_ids=()) -> Dict[str, str]:
+        """
+        Current versions of the given students and sections (``None``: no
+        section), for ``set_fragments(..., versions=...)``. Take them before
+        building the data.
+        """
+        version_keys = [cls._version_key(cls.PREFIX_STUDENT, str(sid)) for sid in student_ids]
+        version_keys += [
+            cls._version_key(cls.PREFIX_SECTION, cls._section_scope_id(sid)) for sid in section_ids
+        ]
+        return cls._ensure_versions(version_keys)
+
+    @classmethod
+    def _bump(cls, version_key: str) -> None:
+        cache.set(version_key, cls._new_version(), None)
+
+    @classmethod
+    def bump_many(cls, student_ids=(), section_ids=()) -> int:
+        """Invalidate several students and sections with one ``set_many``."""
+        version_keys = [cls._version_key(cls.PREFIX_STUDENT, str(sid)) for sid in student_ids]
+        version_keys += [cls._version_key(cls.PREFIX_SECTION, str(sid)) for sid in section_ids]
+        if version_keys:
+            cache.set_many({key: cls._new_version() for key in version_keys}, None)
+        return len(version_keys)
+
+    # ------------------------------------------------------------------
+    # Fragment reads / writes
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _remember_section(cls, student_id: str, section_id) -> None:
+        if len(cls._section_hints) >= cls.SECTION_HINTS_MAX:
+            cls._section_hints.clear()
+        cls._section_hints[student_id] = cls._section_scope_id(section_id)
+
+    @classmethod
+    def _read_scope(cls, values, scope, scope_id, date, names) -> Dict[str, Any]:
+        version = values.get(cls._version_key(scope, scope_id))
+        fragments = {}
+        if version is None:
+            return fragments
+        for name in names:
+            entry = values.get(cls._fragment_key(scope, scope_id, date, name))
+            if entry and entry.get('v') == version:
+                fragments[name] = entry
+        return fragments
+
+    @classmethod
+    def _section_keys(cls, section_scope_id: str, date: str):
+        return [cls._version_key(cls.PREFIX_SECTION, section_scope_id)] + [
+            cls._fragment_key(cls.PREFIX_SECTION, section_scope_id, date, name)
+            for name in cls.SECTION_FRAGMENTS
+        ]
+
+    @classmethod
+    def get_fragments(cls, student_id: str, date: str = None, versions: Dict[str, str] = None):
+        """
+        Read all valid fragments for a student.
+
+        Returns ``(fragments, section_id)`` where ``fragments`` maps fragment
+        name to its cache entry (``{'v', 'data', 'at', ...}``) and
+        ``section_id`` is the section recorded in the student fragment
+        (``None`` if unknown). Missing or stale fragments are simply absent.
+
+        ``versions``, when given, receives the versions read (the student's,
+        and the section's once known) for storing the missing fragments.
+        """
+        student_id = str(student_id)
+        if date is None:
+            date = timezone.now().date().isoformat()
+
+        keys = [cls._version_key(cls.PREFIX_STUDENT, student_id)] + [
+            cls._fragment_key(cls.PREFIX_STUDENT, student_id, date, name)
+            for name in cls.STUDENT_FRAGMENTS
+        ]
+        hint = cls._section_hints.get(student_id)
+        if hint is not None:
+            keys += cls._section_keys(hint, date)
+
+        values = cache.get_many(keys)
+        fragments = cls._read_scope(values, cls.PREFIX_STUDENT, student_id, date, cls.STUDENT_FRAGMENTS)
+        if versions is not None:
+            cls._capture(values, [keys[0]], versions)
+
+        profile = fragments.get('student')
+        if profile is None:
+            return fragments, None
+
+        section_scope_id = profile.get('section_id') or cls.NO_SECTION
+        if section_scope_id != hint:
+            values = cache.get_many(cls._section_keys(section_scope_id, date))
+            cls._remember_section(student_id, section_scope_id)
+
+        fragments.update(cls._read_scope(values, cls.PREFIX_SECTION, section_scope_id, date, cls.SECTION_FRAGMENTS))
+        if versions is not None:
+            cls._capture(values, [cls._version_key(cls.PREFIX_SECTION, section_scope_id)], versions)
+        return fragments, (None if section_scope_id == cls.NO_SECTION else section_scope_id)
+
+    @classmethod
+    def get_section_fragments(cls, section_id, date: str = None, versions: Dict[str, str] = None) -> Dict[str, Any]:
+        """Valid section-scoped fragments for ``section_id`` (``versions``: as for ``get_fragments``)."""
+        if date is None:
+            date = timezone.now().date().isoformat()
+        section_scope_id = cls._section_scope_id(section_id)
+        keys = cls._section_keys(section_scope_id, date)
+        values = cache.get_many(keys)
+        if versions is not None:
+            cls._capture(values, [keys[0]], versions)
+        return cls._read_scope(values, cls.PREFIX_SECTION, section_scope_id, date, cls.SECTION_FRAGMENTS)
+
+    @classmethod
+    def set_fragments(cls, entries, date: str = None, ttl: int = None, versions: Dict[str, str] = None) -> int:
+        """
+        Store fragments for several students in one ``set_many``.
+
+        ``entries`` is an iterable of ``(student_id, section_id, fragments)``
+        where ``fragments`` maps fragment names to data; names may be any
+        subset of SECTION_FRAGMENTS + STUDENT_FRAGMENTS. The ``student``
+        fragment may carry payload meta under ``meta``.
+
+        ``versions`` are the scope versions taken before the data was built
+        (see the class docstring); fragments of a scope whose version has
+        changed since, or was not taken, are not stored. Without it the
+        current versions are used.
+        """
+        entries = [(str(sid), section_id, frags) for sid, section_id, frags in entries]
+        if not entries:
+            return 0
+        if date is None:
+            date = timezone.now().date().isoformat()
+        if ttl is None:
+            ttl = cls._get_dynamic_ttl()
+
+        version_keys = []
+        for student_id, section_id, _ in entries:
+            version_keys.append(cls._version_key(cls.PREFIX_STUDENT, student_id))
+            version_keys.append(cls._version_key(cls.PREFIX_SECTION, cls._section_scope_id(section_id)))
+        if versions is None:
+            versions = cls._ensure_versions(version_keys)
+        else:
+            current = cache.get_many(list(dict.fromkeys(version_keys)))
+            versions = {key: value for key, value in versions.items() if current.get(key) == value}
+
+        timestamp = timezone.now().isoformat()
+        to_store = {}
+        for student_id, section_id, frags in entries:
+            section_scope_id = cls._section_scope_id(section_id)
+            student_version = versions.get(cls._version_key(cls.PREFIX_STUDENT, student_id))
+            section_version = versions.get(cls._version_key(cls.PREFIX_SECTION, section_scope_id))
+            for name, data in frags.items():
+                if name == 'meta':
+                    continue
+                if name in cls.SECTION_FRAGMENTS:
+                    if section_version is None:
+                        continue
+                    key = cls._fragment_key(cls.PREFIX_SECTION, section_scope_id, date, name)
+                    entry = {'v': section_version, 'data': data, 'at': timestamp}
+                else:
+                    if student_version is None:
+                        continue
+                    key = cls._fragment_key(cls.PREFIX_STUDENT, student_id, date, name)
+                    entry = {'v': student_version, 'data': data, 'at': timestamp}
+                    if name == 'student':
+                        entry['section_id'] = section_scope_id
+                        entry['meta'] = frags.get('meta', {})
+                to_store[key] = entry
+            cls._remember_section(student_id, section_id)
+
+        if to_store:
+            cache.set_many(to_store, ttl)
+        return len(entries)
+
+    @classmethod
+    def split_payload(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Split a full Today payload into fragments."""
+        fragments = {
+            name: data.get(name, cls.FRAGMENT_DEFAULTS[name])
+            for name in cls.SECTION_FRAGMENTS + cls.STUDENT_FRAGMENTS
+            if name != 'homework_status'
+        }
+        fragments['homework_status'] = {
+            item['id']: item.get('submission_status', 'PENDING')
+            for item in data.get('homework', []) if 'id' in item
+        }
+        fragments['meta'] = {
+            key: data[key] for key in ('date', 'day_of_week', 'generated_at') if key in data
+        }
+        return fragments
+
+    @classmethod
+    def compose_homework(cls, items, statuses) -> list:
+        """Overlay a student's submission statuses on the section homework list."""
+        now = timezone.now()
+        composed = []
+        for item in items:
+            submission_status = statuses.get(item.get('id'), 'PENDING')
+            try:
+                due = datetime.fromisoformat(item['due_date'])
+                is_overdue = due < now and submission_status == 'PENDING'
+            except (KeyError, TypeError, ValueError):
+                is_overdue = item.get('is_overdue', False)
+            composed.append({
+                **item,
+                'submission_status': submission_status,
+                'is_overdue': is_overdue,
+                'priority': 'high' if item.get('is_due_today') or is_overdue else 'normal',
+            })
+        return composed
+
+    @classmethod
+    def assemble(cls, fragments: Dict[str, Any], date: str = None) -> Dict[str, Any]:
+        """Build the Today payload from a complete fragment set."""
+        if date is None:
+            date = timezone.now().date().isoformat()
+        meta = fragments['student'].get('meta') or {}
+        day = datetime.fromisoformat(date)
+        data = {
+            'date': meta.get('date', date),
+            'day_of_week': meta.get('day_of_week', day.strftime('%A').upper()),
+            'student': fragments['student']['data'],
+            'timetable': fragments['timetable']['data'],
+            'homework': cls.compose_homework(
+                fragments['homework']['data'], fragments['homework_status']['data']
+            ),
+            'fees_due': fragments['fees_due']['data'],
+            'teacher_remarks': fragments['teacher_remarks']['data'],
+            'attendance': fragments['attendance']['data'],
+            'exams': fragments['exams']['data'],
+            'generated_at': meta.get('generated_at', fragments['student']['at']),
+        }
+        data['_cache_hit'] = True
+        data['_cached_at'] = min(entry['at'] for entry in fragments.values())
+        return data
+
+    @classmethod
+    def is_complete(cls, fragments: Dict[str, Any]) -> bool:
+        return all(name in fragments for name in cls.SECTION_FRAGMENTS + cls.STUDENT_FRAGMENTS)
     
     @classmethod
     def get(cls, student_id: str, date: str = None) -> Optional[Dict[str, Any]]:
         """
-        Get cached today view data for a student
+        Get cached today view data for a student (None unless every
+        fragment is present and current)
         """
-        cache_key = cls._get_cache_key(student_id, date)
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            # Add cache metadata
-            if isinstance(cached_data, dict):
-                cached_data['_cache_hit'] = True
-                cached_data['_cached_at'] = cache.get(f"{cache_key}:timestamp")
-        
-        return cached_data
+        if date is None:
+            date = timezone.now().date().isoformat()
+        fragments, _ = cls.get_fragments(student_id, date)
+        if not cls.is_complete(fragments):
+            return None
+        return cls.assemble(fragments, date)
+
+    @classmethod
+    def _resolve_section_ids(cls, student_ids) -> Dict[str, Any]:
+        from apps.academics.models import StudentEnrollment
+
+        section_ids = {}
+        for student_id, section_id in StudentEnrollment.objects.filter(
+            student_id__in=list(student_ids), is_active=True
+        ).order_by(*(StudentEnrollment._meta.ordering or ['pk'])).values_list('student_id', 'section_id'):
+            section_ids.setdefault(str(student_id), section_id)
+        return section_ids
     
     @classmethod
-    def set(cls, student_id: str, data: Dict[str, Any], date: str = None, ttl: int = None) -> bool:
+    def set(cls, student_id: str, data: Dict[str, Any], date: str = None, ttl: int = None,
+            section_id=None, versions: Dict[str, str] = None) -> bool:
         """
         Set today view data in cache
+
+        ``section_id`` should be passed by callers that know it; otherwise it
+        is looked up so section-level invalidation still reaches this entry.
+        ``versions``: as for ``set_fragments``.
         """
-        cache_key = cls._get_cache_key(student_id, date)
-        
         if ttl is None:
             ttl = cls._get_dynamic_ttl()
+        if section_id is None:
+            section_id = cls._resolve_section_ids([student_id]).get(str(student_id))
         
         # Add cache metadata to data
         data['_cache_hit'] = False
         data['_cache_ttl'] = ttl
         
-        # Store data
-        success = cache.set(cache_key, data, ttl)
+        entries = [(student_id, section_id, cls.split_payload(data))]
+        return bool(cls.set_fragments(entries, date, ttl, versions=versions))
+
+    @classmethod
+    def set_many(cls, data_by_student: Dict[str, Dict[str, Any]], date: str = None, ttl: int = None,
+                 section_ids: Dict[str, Any] = None, versions: Dict[str, str] = None) -> int:
+        """
+        Set today view data for several students in one cache round trip
+        (plus one ``get_many`` for the version keys). ``versions``: as for
+        ``set_fragments``.
+        """
+        if not data_by_student:
+            return 0
         
-        # Store timestamp separately for tracking
-        if success:
-            cache.set(f"{cache_key}:timestamp", timezone.now().isoformat(), ttl)
+        if ttl is None:
+            ttl = cls._get_dynamic_ttl()
+        if section_ids is None:
+            section_ids = cls._resolve_section_ids(data_by_student.keys())
         
-        return success
+        entries = []
+        for student_id, data in data_by_student.items():
+            data['_cache_hit'] = False
+            data['_cache_ttl'] = ttl
+            entries.append((student_id, section_ids.get(str(student_id)), cls.split_payload(data)))
+        
+        return cls.set_fragments(entries, date, ttl, versions=versions)
     
     @classmethod
     def get_parent(cls, parent_id: str, date: str = None) -> Optional[Dict[str, Any]]:
@@ -145,10 +503,11 @@ class TodayViewCache:
         """
         Invalidate cache for a specific student
         Used when data changes (new homework, fee payment, etc.)
+
+        One version bump covers every date; ``date`` is accepted for
+        backward compatibility.
         """
-        cache_key = cls._get_cache_key(student_id, date)
-        cache.delete(cache_key)
-        cache.delete(f"{cache_key}:timestamp")
+        cls._bump(cls._version_key(cls.PREFIX_STUDENT, str(student_id)))
         return True
     
     @classmethod
@@ -161,26 +520,32 @@ class TodayViewCache:
         cache.delete(f"{cache_key}:timestamp")
         return True
     
+    @classmethod
+    def invalidate_parents_many(cls, parent_dates) -> int:
+        """
+        Invalidate several parent entries with one ``delete_many``
+        ``parent_dates`` is an iterable of ``(parent_id, date)`` pairs.
+        """
+        keys = []
+        for parent_id, date in parent_dates:
+            cache_key = cls._get_parent_cache_key(str(parent_id), date)
+            keys += [cache_key, f"{cache_key}:timestamp"]
+        if keys:
+            cache.delete_many(keys)
+        return len(keys) // 2
+    
     @classmethod
     def invalidate_by_section(cls, section_id: str, date: str = None) -> int:
         """
         Invalidate cache for all students in a section
         Used when class-wide changes occur (timetable change, new assignment, etc.)
+
+        Only the section-scoped fragments (timetable, homework, exams) depend
+        on the section, so this is a single version bump regardless of how
+        many students are enrolled. Returns the number of scopes bumped.
         """
-        from apps.academics.models import StudentEnrollment
-        
-        # Get all students in this section
-        enrollments = StudentEnrollment.objects.filter(
-            section_id=section_id,
-            is_active=True
-        ).values_list('student_id', flat=True)
-        
-        count = 0
-        for student_id in enrollments:
-            if cls.invalidate(str(student_id), date):
-                count += 1
-        
-        return count
+        cls._bump(cls._version_key(cls.PREFIX_SECTION, str(section_id)))
+        return 1
     
     @classmethod
     def invalidate_multiple_students(cls, student_ids: list, date: str = None) -> int:
@@ -275,7 +640,7 @@ class CacheWarmer:
         for student_id in enrollments:
             service = TodayViewService(str(student_id))
             data = await service.get_today_data()
-            TodayViewCache.set(str(student_id), data, date)
+            TodayViewCache.set(str(student_id), data, date, section_id=section_id)
     
     @staticmethod
     async def warm_all_active_students(date: str = None):
@@ -312,20 +677,26 @@ class CacheStats:
     
     STATS_KEY_PREFIX = "today_view:stats"
     
+    STATS_TTL = 7 * 24 * 3600
+    
+    @classmethod
+    def _incr(cls, key: str):
+        # add() creates the counter with its 7 day expiry; incr() keeps it
+        cache.add(key, 0, cls.STATS_TTL)
+        try:
+            cache.incr(key, 1)
+        except ValueError:
+            cache.set(key, 1, cls.STATS_TTL)
+    
     @classmethod
     def record_hit(cls, student_id: str):
         """Record a cache hit"""
-        key = f"{cls.STATS_KEY_PREFIX}:hits:{timezone.now().date().isoformat()}"
-        cache.incr(key, 1)
-        # Set expiry to 7 days
-        cache.expire(key, 7 * 24 * 3600)
+        cls._incr(f"{cls.STATS_KEY_PREFIX}:hits:{timezone.now().date().isoformat()}")
     
     @classmethod
     def record_miss(cls, student_id: str):
         """Record a cache miss"""
-        key = f"{cls.STATS_KEY_PREFIX}:misses:{timezone.now().date().isoformat()}"
-        cache.incr(key, 1)
-        cache.expire(key, 7 * 24 * 3600)
+        cls._incr(f"{cls.STATS_KEY_PREFIX}:misses:{timezone.now().date().isoformat()}")
     
     @classmethod
     def get_today_stats(cls) -> Dict[str, int]:
@@ -0,0 +1,88 @@
+"""
+Management command to benchmark Today View aggregation latency.
+
+Compares the serial execution path (what the old asyncio.gather +
+thread-sensitive sync_to_async design effectively did) against the
+threaded path, on real data in a tenant schema.
+
+Usage:
+    python manage.py benchmark_today_view veda --students 20 --iterations 5
+"""
+
+import statistics
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.academics.models import StudentEnrollment
+from apps.mobile_bff.services.today_view import (
+    EXECUTION_MODES, EXECUTION_SERIAL, EXECUTION_THREADED, TodayViewService,
+)
+from apps.tenants.models import School
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Today View latency: serial vs threaded fetchers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('subdomain', type=str, help='Tenant subdomain (e.g., demo, veda)')
+        parser.add_argument('--students', type=int, default=20, help='Number of enrolled students to sample')
+        parser.add_argument('--iterations', type=int, default=5, help='Runs per student per mode')
+        parser.add_argument(
+            '--modes', nargs='+', default=[EXECUTION_SERIAL, EXECUTION_THREADED],
+            choices=EXECUTION_MODES, help='Execution modes to compare',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            tenant = School.objects.get(subdomain=options['subdomain'])
+        except School.DoesNotExist:
+            raise CommandError(f"Tenant '{options['subdomain']}' not found")
+
+        if connection.vendor == 'postgresql':
+            from django_tenants.utils import tenant_context
+            context = tenant_context(tenant)
+        else:
+            context = nullcontext()
+
+        with context:
+            student_ids = [
+                str(sid) for sid in StudentEnrollment.objects.filter(
+                    is_active=True
+                ).values_list('student_id', flat=True)[:options['students']]
+            ]
+            if not student_ids:
+                raise CommandError('No active enrollments found in this tenant')
+
+            # Warm-up: open pool connections and fill ORM caches.
+            for mode in options['modes']:
+                TodayViewService(student_ids[0]).get_today_data_sync(mode=mode)
+
+            timings = {}
+            for mode in options['modes']:
+                samples = []
+                for student_id in student_ids:
+                    for _ in range(options['iterations']):
+                        started = time.perf_counter()
+                        TodayViewService(student_id).get_today_data_sync(mode=mode)
+                        samples.append((time.perf_counter() - started) * 1000)
+                timings[mode] = samples
+
+        self.stdout.write(
+            f"\nTenant: {tenant.schema_name} | students: {len(student_ids)} | "
+            f"iterations: {options['iterations']}\n"
+        )
+        self.stdout.write(f"{'mode':<10} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+        for mode, samples in timings.items():
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            self.stdout.write(
+                f"{mode:<10} {statistics.mean(samples):>10.1f} {statistics.median(samples):>10.1f} "
+                f"{p95:>10.1f} {ordered[-1]:>10.1f}"
+            )
+
+        if EXECUTION_SERIAL in timings and EXECUTION_THREADED in timings:
+            speedup = statistics.median(timings[EXECUTION_SERIAL]) / statistics.median(timings[EXECUTION_THREADED])
+            self.stdout.write(self.style.SUCCESS(f"\nThreaded speedup (p50): {speedup:.2f}x"))
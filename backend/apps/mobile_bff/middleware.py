@@ -0,0 +1,25 @@
+"""
+Mobile BFF middleware.
+"""
+
+from apps.mobile_bff.caching import invalidation
+
+
+class CacheInvalidationMiddleware:
+    """
+    Collect Today View cache invalidations raised by signals during a request
+    and flush them once when the response is ready.
+
+    Must run inside the tenant middleware so the flush (which looks up
+    parents) sees the request's tenant schema.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = invalidation.begin()
+        try:
+            return self.get_response(request)
+        finally:
+            invalidation.end(token)
@@ -11,6 +11,7 @@ from apps.timetable.models import TeacherTimetable, TimetableSubstitution
 from apps.examinations.models import ExamSchedule
 from apps.assignments.models import Assignment, AssignmentSubmission
 from apps.attendance.models import StudentAttendance, StudentLeave
+from apps.attendance.services.statistics import attendance_statistics, student_attendance_statistics
 from apps.communication.models import Notification
 from apps.core.models import AuditLog
 import asyncio
@@ -52,9 +53,11 @@ class DashboardAggregator:
         @sync_to_async
         def get_attendance_today():
             today = date.today()
-            total = StudentAttendance.objects.filter(date=today).count()
-            present = StudentAttendance.objects.filter(date=today, status='PRESENT').count()
-            return {"total_marked": total, "present": present}
+            counts = StudentAttendance.objects.filter(date=today).aggregate(
+                total=Count('id'),
+                present=Count('id', filter=Q(status='PRESENT')),
+            )
+            return {"total_marked": counts['total'], "present": counts['present']}
 
         total_students, total_staff, revenue, activities, attendance = await asyncio.gather(
             get_total_students(),
@@ -398,19 +401,8 @@ class DashboardAggregator:
 
         @sync_to_async
         def get_attendance_percentage():
-            academic_year = enrollment.academic_year
-            total = StudentAttendance.objects.filter(
-                student=student,
-                academic_year=academic_year,
-            ).count()
-            if total == 0:
-                return 0.0
-            present = StudentAttendance.objects.filter(
-                student=student,
-                academic_year=academic_year,
-                status__in=['PRESENT', 'LATE'],
-            ).count()
-            return round((present / total) * 100, 1)
+            stats = student_attendance_statistics(student.id, academic_year=enrollment.academic_year)
+            return round(stats['attendance_percentage'], 1)
 
         @sync_to_async
         def get_upcoming_exams():
@@ -464,18 +456,31 @@ class DashboardAggregator:
 
         @sync_to_async
         def get_children_data():
-            links = StudentParent.objects.filter(
+            links = list(StudentParent.objects.filter(
                 parent=user
-            ).select_related('student').all()
+            ).select_related('student').all())
+
+            enrollments = {}
+            for enrollment in StudentEnrollment.objects.filter(
+                student_id__in=[link.student_id for link in links],
+                is_active=True,
+                academic_year__is_current=True,
+            ).select_related('section', 'section__class_instance', 'academic_year'):
+                # First enrollment per student wins, as .first() did
+                enrollments.setdefault(enrollment.student_id, enrollment)
+
+            # One statistics pass per academic year (normally just the current one)
+            by_year = {}
+            for enrollment in enrollments.values():
+                by_year.setdefault(enrollment.academic_year_id, []).append(enrollment.student_id)
+            attendance = {}
+            for academic_year_id, student_ids in by_year.items():
+                attendance.update(attendance_statistics(student_ids, academic_year=academic_year_id))
 
             children_summary = []
             for link in links:
                 student = link.student
-                enrollment = StudentEnrollment.objects.filter(
-                    student=student,
-                    is_active=True,
-                    academic_year__is_current=True,
-                ).select_related('section', 'section__class_instance', 'academic_year').first()
+                enrollment = enrollments.get(student.id)
 
                 child_data = {
                     "student_id": str(student.id),
@@ -491,17 +496,9 @@ class DashboardAggregator:
                     child_data["class_name"] = f"{enrollment.section.class_instance.name} - {enrollment.section.name}"
 
                     # Attendance
-                    total = StudentAttendance.objects.filter(
-                        student=student,
-                        academic_year=enrollment.academic_year,
-                    ).count()
-                    if total > 0:
-                        present = StudentAttendance.objects.filter(
-                            student=student,
-                            academic_year=enrollment.academic_year,
-                            status__in=['PRESENT', 'LATE'],
-                        ).count()
-                        child_data["attendance_percentage"] = round((present / total) * 100, 1)
+                    stats = attendance[str(student.id)]
+                    if stats['total_days']:
+                        child_data["attendance_percentage"] = round(stats['attendance_percentage'], 1)
 
                     # Pending fees
                     from apps.finance.models import StudentFee
@@ -1,11 +1,29 @@
 """
 Today View Aggregation Service - Enhanced
 Aggregates all student/parent "Today" data in a single optimized call
+
+Execution modes (``settings.TODAY_VIEW_EXECUTION_MODE``):
+- ``threaded`` (default): the seven fetchers run concurrently on a bounded
+  thread pool. Each worker thread uses its own DB connection, switched to the
+  request's tenant schema before running.
+- ``serial``: the fetchers run one after another on the calling thread. This
+  is what the old ``asyncio.gather`` + ``sync_to_async`` design did in
+  practice, because thread-sensitive ``sync_to_async`` calls share one thread.
+
+``BatchTodayViewService`` builds the same payload for N students at once
+(one ``__in`` query per dataset) and is used for parents with several
+children.
 """
 
-import asyncio
+import contextvars
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any
+from django.conf import settings
+from django.db import close_old_connections, connection
 from django.db.models import Q, Prefetch, F, Count, Sum
 from django.utils import timezone
 from asgiref.sync import sync_to_async
@@ -17,187 +35,543 @@ from apps.finance.models import StudentFee
 from apps.attendance.models import StudentAttendance
 from apps.examinations.models import ExamSchedule
 
+logger = logging.getLogger(__name__)
+
+EXECUTION_SERIAL = 'serial'
+EXECUTION_THREADED = 'threaded'
+EXECUTION_MODES = (EXECUTION_SERIAL, EXECUTION_THREADED)
+
+DEFAULT_MAX_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_UNSET = object()
+
+
+def get_execution_mode() -> str:
+    mode = getattr(settings, 'TODAY_VIEW_EXECUTION_MODE', EXECUTION_THREADED)
+    return mode if mode in EXECUTION_MODES else EXECUTION_SERIAL
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide bounded pool shared by all Today View requests.
+
+    Bounding the pool also bounds the number of extra DB connections a worker
+    process can open (one per pool thread, kept alive by CONN_MAX_AGE).
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'TODAY_VIEW_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+                    thread_name_prefix='today-view',
+                )
+    return _executor
+
+
+def _run_in_tenant(tenant, func: Callable):
+    """
+    Run ``func`` on a pool thread against the caller's tenant schema.
+
+    Pool threads own their DB connection, so the schema has to be set on it
+    explicitly; stale or broken connections are recycled before and after.
+    """
+    close_old_connections()
+    try:
+        if tenant is not None and hasattr(connection, 'set_tenant'):
+            connection.set_tenant(tenant)
+        return func()
+    finally:
+        close_old_connections()
+
+
+def run_fetchers(fetchers: List[Callable], mode: str = None) -> List[Any]:
+    """
+    Run zero-argument callables and return their results in order.
+
+    Exceptions are returned in place of results (like
+    ``asyncio.gather(return_exceptions=True)``) so callers can fall back
+    per section instead of failing the whole response.
+    """
+    mode = mode or get_execution_mode()
+
+    if mode != EXECUTION_THREADED or len(fetchers) < 2:
+        results = []
+        for fetch in fetchers:
+            try:
+                results.append(fetch())
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    tenant = getattr(connection, 'tenant', None)
+    executor = get_executor()
+    # copy_context() carries contextvars (e.g. the db_router tenant) into
+    # the pool thread; each submission needs its own copy.
+    futures = [
+        executor.submit(contextvars.copy_context().run, _run_in_tenant, tenant, fetch)
+        for fetch in fetchers
+    ]
+
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Payload builders
+# Shared by the single-student and batched paths so both return identical
+# shapes; they only format rows that were already loaded.
+# ---------------------------------------------------------------------------
+
+WEEKEND_TIMETABLE = {
+    'is_holiday': True,
+    'holiday_name': 'Weekend',
+    'periods': []
+}
+
+
+def is_weekend(day: date) -> bool:
+    # (Note: In a real system, you'd check a Holiday table here)
+    return day.weekday() in [5, 6]  # Saturday, Sunday
+
+
+def build_student_info(student, enrollment) -> Dict[str, Any]:
+    return {
+        'id': str(student.id),
+        'name': student.get_full_name(),
+        'admission_number': student.admission_number,
+        'class': enrollment.section.class_instance.display_name if enrollment else None,
+        'section': enrollment.section.name if enrollment else None,
+        'roll_number': enrollment.roll_number if enrollment else None,
+    }
+
+
+def build_timetable(timetable_entries, sub_map) -> Dict[str, Any]:
+    periods = []
+    for entry in timetable_entries:
+        substitution = sub_map.get(entry.id)
+        teacher = substitution.substitute_teacher if substitution else entry.teacher
+        
+        periods.append({
+            'period_number': entry.time_slot.order if entry.time_slot else 0,
+            'time_slot': {
+                'start_time': entry.time_slot.start_time.strftime('%H:%M'),
+                'end_time': entry.time_slot.end_time.strftime('%H:%M'),
+                'duration_minutes': entry.time_slot.duration_minutes,
+                'slot_type': entry.time_slot.slot_type,
+                'name': entry.time_slot.name,
+            } if entry.time_slot else None,
+            'subject': {
+                'id': str(entry.subject.id) if entry.subject else None,
+                'name': entry.subject.name if entry.subject else 'Break',
+                'code': entry.subject.code if entry.subject else None,
+            } if entry.subject else None,
+            'teacher': {
+                'id': str(teacher.id) if teacher else None,
+                'name': teacher.user.get_full_name() if teacher and teacher.user else None,
+            } if teacher else None,
+            'room_number': entry.room_number,
+            'is_substitution': substitution is not None,
+            'substitution_reason': substitution.reason if substitution else None,
+        })
+    
+    return {
+        'is_holiday': False,
+        'periods': periods,
+        'total_periods': len(periods),
+    }
+
+
+def build_homework(assignments, submission_map, today: date) -> List[Dict[str, Any]]:
+    now = timezone.now()
+    homework_list = []
+    for assignment in assignments:
+        submission_status = submission_map.get(str(assignment.id), 'PENDING')
+        is_due_today = assignment.due_date.date() == today
+        is_overdue = assignment.due_date < now and submission_status == 'PENDING'
+        
+        homework_list.append({
+            'id': str(assignment.id),
+            'title': assignment.title,
+            'subject': {
+                'id': str(assignment.subject.id),
+                'name': assignment.subject.name,
+            },
+            'teacher': {
+                'name': (
+                    assignment.teacher.user.get_full_name()
+                    if assignment.teacher and assignment.teacher.user else None
+                ),
+            },
+            'due_date': assignment.due_date.isoformat(),
+            'due_date_display': assignment.due_date.strftime('%d %b, %I:%M %p'),
+            'submission_status': submission_status,
+            'is_due_today': is_due_today,
+            'is_overdue': is_overdue,
+            'priority': 'high' if is_due_today or is_overdue else 'normal',
+        })
+    
+    return homework_list
+
+
+def build_fees_due(fees, today: date) -> Dict[str, Any]:
+    total_due = 0
+    overdue_amount = 0
+    due_today_amount = 0
+    upcoming_fees = []
+    
+    for fee in fees:
+        # Use total_amount - paid_amount as balance if balance_amount() method not convenient in async
+        balance = float(fee.amount - fee.paid_amount)
+        total_due += balance
+        
+        is_overdue = fee.due_date < today if fee.due_date else False
+        is_due_today = fee.due_date == today if fee.due_date else False
+        
+        if is_overdue:
+            overdue_amount += balance
+        elif is_due_today:
+            due_today_amount += balance
+        
+        if fee.due_date and fee.due_date <= today + timedelta(days=30):
+            upcoming_fees.append({
+                'id': str(fee.id),
+                'category': fee.fee_structure.fee_category.name if fee.fee_structure else "Fee",
+                'balance': balance,
+                'due_date': fee.due_date.isoformat(),
+                'due_date_display': fee.due_date.strftime('%d %b'),
+                'status': fee.status,
+                'is_overdue': is_overdue,
+            })
+    
+    return {
+        'total_due': total_due,
+        'overdue_amount': overdue_amount,
+        'due_today_amount': due_today_amount,
+        'upcoming_fees': upcoming_fees[:5],
+        'has_overdue': overdue_amount > 0,
+    }
+
+
+def build_remarks(notes) -> List[Dict[str, Any]]:
+    return [{
+        'id': str(note.id),
+        'type': note.note_type,
+        'title': note.title,
+        'content': note.content,
+        'created_at': note.created_at.isoformat(),
+        'created_at_display': note.created_at.strftime('%d %b'),
+        'created_by': note.created_by.get_full_name() if note.created_by else 'Staff',
+        'is_important': note.is_important,
+    } for note in notes]
+
+
+def build_attendance(attendance, total: int = 0, present: int = 0) -> Dict[str, Any]:
+    return {
+        'marked': attendance is not None,
+        'status': attendance.status if attendance else None,
+        'remarks': attendance.remarks if attendance else "",
+        'summary': {
+            'percentage': round((present / total * 100), 1) if total > 0 else 0,
+            'present_days': present,
+            'total_days': total
+        }
+    }
+
+
+def build_exams(upcoming_exams) -> List[Dict[str, Any]]:
+    return [{
+        'id': str(exam.id),
+        'exam_name': exam.examination.name,
+        'subject': exam.subject.name,
+        'date': exam.exam_date.isoformat(),
+        'date_display': exam.exam_date.strftime('%d %b'),
+        'start_time': exam.start_time.strftime('%I:%M %p'),
+        'max_marks': float(exam.max_marks),
+    } for exam in upcoming_exams]
+
+
+def _timetable_queryset(today_name: str):
+    return ClassTimetable.objects.filter(
+        day_of_week=today_name,
+        is_active=True
+    ).select_related(
+        'time_slot',
+        'subject',
+        'teacher__user'
+    ).order_by('time_slot__order')
+
+
+def _substitution_queryset(today: date):
+    return TimetableSubstitution.objects.filter(
+        date=today,
+        status='APPROVED',
+    ).select_related('substitute_teacher__user')
+
+
+def _homework_queryset(today: date):
+    upcoming_date = today + timedelta(days=7)
+    return Assignment.objects.filter(
+        status='PUBLISHED',
+        due_date__gte=timezone.now(),
+        due_date__date__lte=upcoming_date,
+        is_deleted=False
+    ).select_related('subject', 'teacher__user').order_by('due_date')
+
+
+def _fees_queryset():
+    return StudentFee.objects.filter(
+        status__in=['PENDING', 'PARTIAL', 'OVERDUE']
+    ).select_related('fee_structure__fee_category').order_by('due_date')
+
+
+def _remarks_queryset(today: date):
+    week_ago = today - timedelta(days=7)
+    return StudentNote.objects.filter(
+        created_at__date__gte=week_ago,
+        is_private=False
+    ).select_related('created_by').order_by('-created_at')
+
+
+def _exam_queryset(today: date):
+    return ExamSchedule.objects.filter(
+        exam_date__gte=today,
+        exam_date__lte=today + timedelta(days=14)
+    ).select_related('subject', 'examination').order_by('exam_date', 'start_time')
+
+
+def _unpack(result, default):
+    return default if isinstance(result, Exception) else result
+
+
+PAYLOAD_SECTIONS = ('student', 'timetable', 'homework', 'fees_due', 'teacher_remarks', 'attendance', 'exams')
+
+
+def assemble_payload(today: date, results: List[Any]) -> Dict[str, Any]:
+    """Combine the seven section results (or exceptions) into one payload."""
+    return {
+        'date': today.isoformat(),
+        'day_of_week': today.strftime('%A').upper(),
+        'student': _unpack(results[0], {}),
+        'timetable': _unpack(results[1], {}),
+        'homework': _unpack(results[2], []),
+        'fees_due': _unpack(results[3], {}),
+        'teacher_remarks': _unpack(results[4], []),
+        'attendance': _unpack(results[5], {}),
+        'exams': _unpack(results[6], []),
+        'generated_at': timezone.now().isoformat(),
+    }
+
 
 class TodayViewService:
     """
     Service to aggregate all 'Today' data for a student/parent view
     """
     
-    def __init__(self, student_id: str, user=None):
+    def __init__(self, student_id: str, user=None, execution_mode: str = None):
         self.student_id = student_id
         self.user = user
+        self.execution_mode = execution_mode
         self.today = timezone.now().date()
         self.current_day = self.today.strftime('%A').upper()
-        
+        self._enrollment = _UNSET
+
     async def get_today_data(self) -> Dict[str, Any]:
         """
         Main aggregation method - fetches all today data in parallel
         """
-        # Run all data fetches in parallel
-        results = await asyncio.gather(
-            self._get_student_info(),
-            self._get_timetable_data(),
-            self._get_homework_data(),
-            self._get_fees_due(),
-            self._get_teacher_remarks(),
-            self._get_attendance_status(),
-            self._get_exam_data(),
-            return_exceptions=True
-        )
-        
-        # Unpack results (handle exceptions gracefully)
-        student_info = results[0] if not isinstance(results[0], Exception) else {}
-        timetable = results[1] if not isinstance(results[1], Exception) else {}
-        homework = results[2] if not isinstance(results[2], Exception) else []
-        fees = results[3] if not isinstance(results[3], Exception) else {}
-        remarks = results[4] if not isinstance(results[4], Exception) else []
-        attendance = results[5] if not isinstance(results[5], Exception) else {}
-        exams = results[6] if not isinstance(results[6], Exception) else []
-        
+        return await sync_to_async(self.get_today_data_sync)()
+
+    def get_today_data_sync(self, mode: str = None) -> Dict[str, Any]:
+        """
+        Synchronous entry point used by the views.
+
+        The active enrollment is loaded once up front and shared by every
+        fetcher, then the fetchers run according to the execution mode.
+        """
+        self._get_enrollment()
+
+        results = run_fetchers([
+            self._fetch_student_info,
+            self._fetch_timetable_data,
+            self._fetch_homework_data,
+            self._fetch_fees_due,
+            self._fetch_teacher_remarks,
+            self._fetch_attendance_status,
+            self._fetch_exam_data,
+        ], mode or self.execution_mode)
+
+        return assemble_payload(self.today, results)
+
+    def get_today_data_cached(self, mode: str = None, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Today payload built from cache fragments, computing only the missing ones.
+
+        Section fragments (timetable, homework, exams) are shared with every
+        classmate, so after one student in a section has loaded the view the
+        others only compute their own fragments. Fragments that failed to
+        load are returned but not cached, and so are fragments whose scope was
+        invalidated while they were being computed.
+        """
+        from apps.mobile_bff.caching.today_view_cache import TodayViewCache
+
+        date_key = self.today.isoformat()
+        fragments = {}
+        versions = {}
+        if not force_refresh:
+            fragments, _ = TodayViewCache.get_fragments(self.student_id, date_key, versions=versions)
+            if TodayViewCache.is_complete(fragments):
+                return TodayViewCache.assemble(fragments, date_key)
+
+        enrollment = self._get_enrollment()
+        section_id = enrollment.section_id if enrollment else None
+        if not force_refresh and 'student' not in fragments:
+            # Section unknown until now; classmates may have cached it already
+            fragments.update(TodayViewCache.get_section_fragments(section_id, date_key, versions=versions))
+        if force_refresh:
+            versions = TodayViewCache.capture_versions([self.student_id], [section_id])
+
+        fetchers = {
+            'student': self._fetch_student_info,
+            'timetable': self._fetch_timetable_data,
+            'homework': self._fetch_homework_data,
+            'fees_due': self._fetch_fees_due,
+            'teacher_remarks': self._fetch_teacher_remarks,
+            'attendance': self._fetch_attendance_status,
+            'exams': self._fetch_exam_data,
+        }
+        if 'homework' in fragments and 'homework_status' not in fragments:
+            homework_ids = [item['id'] for item in fragments['homework']['data']]
+            fetchers['homework_status'] = lambda: self._fetch_homework_status(homework_ids)
+        missing = [name for name in fetchers if name not in fragments]
+
+        results = run_fetchers([fetchers[name] for name in missing], mode or self.execution_mode)
+
+        computed = {}
+        for name, result in zip(missing, results):
+            if isinstance(result, Exception) or (isinstance(result, dict) and 'error' in result):
+                continue
+            computed[name] = result
+        if 'homework' in computed:
+            computed['homework_status'] = {
+                item['id']: item['submission_status'] for item in computed['homework']
+            }
+        if 'student' in computed:
+            computed['meta'] = {'date': date_key, 'day_of_week': self.today.strftime('%A').upper()}
+        if computed:
+            TodayViewCache.set_fragments([(self.student_id, section_id, computed)], date_key, versions=versions)
+
+        values = {name: entry['data'] for name, entry in fragments.items()}
+        values.update(zip(missing, results))
+        if 'homework' in fragments:
+            values['homework'] = TodayViewCache.compose_homework(
+                fragments['homework']['data'], _unpack(values.get('homework_status'), {}),
+            )
+        return assemble_payload(self.today, [values[name] for name in PAYLOAD_SECTIONS])
+
+    def _fetch_homework_status(self, assignment_ids: List[str]) -> Dict[str, str]:
+        """Submission status per assignment for cached section homework."""
         return {
-            'date': self.today.isoformat(),
-            'day_of_week': self.current_day,
-            'student': student_info,
-            'timetable': timetable,
-            'homework': homework,
-            'fees_due': fees,
-            'teacher_remarks': remarks,
-            'attendance': attendance,
-            'exams': exams,
-            'generated_at': timezone.now().isoformat(),
+            str(assignment_id): status
+            for assignment_id, status in AssignmentSubmission.objects.filter(
+                student_id=self.student_id,
+                assignment_id__in=assignment_ids,
+            ).values_list('assignment_id', 'status')
         }
-    
-    @sync_to_async
-    def _get_student_info(self) -> Dict[str, Any]:
-        """Get basic student information"""
-        try:
-            student = Student.objects.select_related(
-                'current_class',
-                'current_section'
-            ).get(id=self.student_id, is_deleted=False)
-            
-            # Get current enrollment
-            enrollment = StudentEnrollment.objects.filter(
-                student=student,
+
+    def _get_enrollment(self):
+        """Active enrollment, loaded once per service instance."""
+        if self._enrollment is _UNSET:
+            self._enrollment = StudentEnrollment.objects.filter(
+                student_id=self.student_id,
                 is_active=True
             ).select_related('section__class_instance', 'academic_year').first()
+        return self._enrollment
+
+    # Async wrappers kept for callers that await individual sections.
+
+    async def _get_student_info(self) -> Dict[str, Any]:
+        return await sync_to_async(self._fetch_student_info)()
+
+    async def _get_timetable_data(self) -> Dict[str, Any]:
+        return await sync_to_async(self._fetch_timetable_data)()
+
+    async def _get_homework_data(self) -> List[Dict[str, Any]]:
+        return await sync_to_async(self._fetch_homework_data)()
+
+    async def _get_fees_due(self) -> Dict[str, Any]:
+        return await sync_to_async(self._fetch_fees_due)()
+
+    async def _get_teacher_remarks(self) -> List[Dict[str, Any]]:
+        return await sync_to_async(self._fetch_teacher_remarks)()
+
+    async def _get_attendance_status(self) -> Dict[str, Any]:
+        return await sync_to_async(self._fetch_attendance_status)()
+
+    async def _get_exam_data(self) -> List[Dict[str, Any]]:
+        return await sync_to_async(self._fetch_exam_data)()
+
+    def _fetch_student_info(self) -> Dict[str, Any]:
+        """Get basic student information"""
+        try:
+            # Class/section come from the enrollment, not the Student row
+            student = Student.objects.get(id=self.student_id, is_deleted=False)
             
-            return {
-                'id': str(student.id),
-                'name': student.get_full_name(),
-                'admission_number': student.admission_number,
-                'class': enrollment.section.class_instance.display_name if enrollment else None,
-                'section': enrollment.section.name if enrollment else None,
-                'roll_number': enrollment.roll_number if enrollment else None,
-            }
+            return build_student_info(student, self._get_enrollment())
         except Student.DoesNotExist:
             return {}
     
-    @sync_to_async
-    def _get_timetable_data(self) -> Dict[str, Any]:
+    def _fetch_timetable_data(self) -> Dict[str, Any]:
         """Get today's timetable or holiday information"""
         try:
             # Get student's current section
-            enrollment = StudentEnrollment.objects.filter(
-                student_id=self.student_id,
-                is_active=True
-            ).select_related('section', 'academic_year').first()
+            enrollment = self._get_enrollment()
             
             if not enrollment:
                 return {'is_holiday': False, 'periods': []}
             
-            # Use current day from self.current_day
-            is_weekend = self.today.weekday() in [5, 6]  # Saturday, Sunday
-            
-            # (Note: In a real system, you'd check a Holiday table here)
-            if is_weekend:
-                return {
-                    'is_holiday': True,
-                    'holiday_name': 'Weekend',
-                    'periods': []
-                }
+            if is_weekend(self.today):
+                return dict(WEEKEND_TIMETABLE)
             
             # Get timetable for today
-            timetable_entries = ClassTimetable.objects.filter(
+            timetable_entries = _timetable_queryset(self.current_day).filter(
                 academic_year=enrollment.academic_year,
                 section=enrollment.section,
-                day_of_week=self.current_day,
-                is_active=True
-            ).select_related(
-                'time_slot',
-                'subject',
-                'teacher__user'
-            ).order_by('time_slot__order')
+            )
             
             # Check for substitutions
-            substitutions = TimetableSubstitution.objects.filter(
-                date=self.today,
-                status='APPROVED',
+            substitutions = _substitution_queryset(self.today).filter(
                 original_entry__in=timetable_entries
-            ).select_related('substitute_teacher__user')
+            )
             
             # Create substitution map
             sub_map = {sub.original_entry_id: sub for sub in substitutions}
             
-            periods = []
-            for entry in timetable_entries:
-                substitution = sub_map.get(entry.id)
-                teacher = substitution.substitute_teacher if substitution else entry.teacher
-                
-                periods.append({
-                    'period_number': entry.time_slot.order if entry.time_slot else 0,
-                    'time_slot': {
-                        'start_time': entry.time_slot.start_time.strftime('%H:%M'),
-                        'end_time': entry.time_slot.end_time.strftime('%H:%M'),
-                        'duration_minutes': entry.time_slot.duration_minutes,
-                        'slot_type': entry.time_slot.slot_type,
-                        'name': entry.time_slot.name,
-                    } if entry.time_slot else None,
-                    'subject': {
-                        'id': str(entry.subject.id) if entry.subject else None,
-                        'name': entry.subject.name if entry.subject else 'Break',
-                        'code': entry.subject.code if entry.subject else None,
-                    } if entry.subject else None,
-                    'teacher': {
-                        'id': str(teacher.id) if teacher else None,
-                        'name': teacher.user.get_full_name() if teacher and teacher.user else None,
-                    } if teacher else None,
-                    'room_number': entry.room_number,
-                    'is_substitution': substitution is not None,
-                    'substitution_reason': substitution.reason if substitution else None,
-                })
-            
-            return {
-                'is_holiday': False,
-                'periods': periods,
-                'total_periods': len(periods),
-            }
+            return build_timetable(timetable_entries, sub_map)
             
         except Exception as e:
             return {'is_holiday': False, 'periods': [], 'error': str(e)}
     
-    @sync_to_async
-    def _get_homework_data(self) -> List[Dict[str, Any]]:
+    def _fetch_homework_data(self) -> List[Dict[str, Any]]:
         """Get pending and upcoming homework/assignments"""
         try:
-            enrollment = StudentEnrollment.objects.filter(
-                student_id=self.student_id,
-                is_active=True
-            ).select_related('section', 'academic_year').first()
+            enrollment = self._get_enrollment()
             
             if not enrollment:
                 return []
             
-            upcoming_date = self.today + timedelta(days=7)
-            
-            assignments = Assignment.objects.filter(
+            assignments = _homework_queryset(self.today).filter(
                 section=enrollment.section,
                 academic_year=enrollment.academic_year,
-                status='PUBLISHED',
-                due_date__gte=timezone.now(),
-                due_date__date__lte=upcoming_date,
-                is_deleted=False
-            ).select_related('subject', 'teacher__user').order_by('due_date')[:10]
+            )[:10]
             
             submissions = AssignmentSubmission.objects.filter(
                 student_id=self.student_id,
@@ -206,108 +580,27 @@ class TodayViewService:
             
             submission_map = {str(assignment_id): status for assignment_id, status in submissions}
             
-            homework_list = []
-            for assignment in assignments:
-                submission_status = submission_map.get(str(assignment.id), 'PENDING')
-                is_due_today = assignment.due_date.date() == self.today
-                is_overdue = assignment.due_date < timezone.now() and submission_status == 'PENDING'
-                
-                homework_list.append({
-                    'id': str(assignment.id),
-                    'title': assignment.title,
-                    'subject': {
-                        'id': str(assignment.subject.id),
-                        'name': assignment.subject.name,
-                    },
-                    'teacher': {
-                        'name': assignment.teacher.user.get_full_name() if assignment.teacher and assignment.teacher.user else None,
-                    },
-                    'due_date': assignment.due_date.isoformat(),
-                    'due_date_display': assignment.due_date.strftime('%d %b, %I:%M %p'),
-                    'submission_status': submission_status,
-                    'is_due_today': is_due_today,
-                    'is_overdue': is_overdue,
-                    'priority': 'high' if is_due_today or is_overdue else 'normal',
-                })
-            
-            return homework_list
+            return build_homework(assignments, submission_map, self.today)
         except Exception:
             return []
     
-    @sync_to_async
-    def _get_fees_due(self) -> Dict[str, Any]:
+    def _fetch_fees_due(self) -> Dict[str, Any]:
         """Get fees due information"""
         try:
-            fees = StudentFee.objects.filter(
-                student_id=self.student_id,
-                status__in=['PENDING', 'PARTIAL', 'OVERDUE']
-            ).select_related('fee_structure__fee_category').order_by('due_date')
-            
-            total_due = 0
-            overdue_amount = 0
-            due_today_amount = 0
-            upcoming_fees = []
-            
-            for fee in fees:
-                # Use total_amount - paid_amount as balance if balance_amount() method not convenient in async
-                balance = float(fee.amount - fee.paid_amount)
-                total_due += balance
-                
-                is_overdue = fee.due_date < self.today if fee.due_date else False
-                is_due_today = fee.due_date == self.today if fee.due_date else False
-                
-                if is_overdue:
-                    overdue_amount += balance
-                elif is_due_today:
-                    due_today_amount += balance
-                
-                if fee.due_date and fee.due_date <= self.today + timedelta(days=30):
-                    upcoming_fees.append({
-                        'id': str(fee.id),
-                        'category': fee.fee_structure.fee_category.name if fee.fee_structure else "Fee",
-                        'balance': balance,
-                        'due_date': fee.due_date.isoformat(),
-                        'due_date_display': fee.due_date.strftime('%d %b'),
-                        'status': fee.status,
-                        'is_overdue': is_overdue,
-                    })
-            
-            return {
-                'total_due': total_due,
-                'overdue_amount': overdue_amount,
-                'due_today_amount': due_today_amount,
-                'upcoming_fees': upcoming_fees[:5],
-                'has_overdue': overdue_amount > 0,
-            }
+            fees = _fees_queryset().filter(student_id=self.student_id)
+            return build_fees_due(fees, self.today)
         except Exception:
             return {'total_due': 0, 'overdue_amount': 0, 'upcoming_fees': []}
     
-    @sync_to_async
-    def _get_teacher_remarks(self) -> List[Dict[str, Any]]:
+    def _fetch_teacher_remarks(self) -> List[Dict[str, Any]]:
         """Get recent teacher remarks"""
         try:
-            week_ago = self.today - timedelta(days=7)
-            notes = StudentNote.objects.filter(
-                student_id=self.student_id,
-                created_at__date__gte=week_ago,
-                is_confidential=False
-            ).select_related('created_by').order_by('-created_at')[:5]
-            
-            return [{
-                'id': str(note.id),
-                'type': note.note_type,
-                'title': note.title,
-                'content': note.content,
-                'created_at': note.created_at.isoformat(),
-                'created_at_display': note.created_at.strftime('%d %b'),
-                'created_by': note.created_by.get_full_name() if note.created_by else 'Staff',
-                'is_important': note.is_important,
-            } for note in notes]
+            notes = _remarks_queryset(self.today).filter(student_id=self.student_id)[:5]
+            return build_remarks(notes)
         except Exception:
             return []
     
-    @sync_to_async
-    def _get_attendance_status(self) -> Dict[str, Any]:
+    def _fetch_attendance_status(self) -> Dict[str, Any]:
         """Get today's attendance status and term summary"""
         try:
             # 1. Today's status
@@ -317,16 +610,9 @@ class TodayViewService:
             ).first()
             
             # 2. Term summary
-            enrollment = StudentEnrollment.objects.filter(
-                student_id=self.student_id, is_active=True
-            ).first()
-            
-            summary = {
-                'percentage': 0,
-                'present_days': 0,
-                'total_days': 0
-            }
+            enrollment = self._get_enrollment()
             
+            total = present = 0
             if enrollment:
                 att_stats = StudentAttendance.objects.filter(
                     student_id=self.student_id,
@@ -338,51 +624,237 @@ class TodayViewService:
                 
                 total = att_stats['total'] or 0
                 present = att_stats['present'] or 0
-                summary = {
-                    'percentage': round((present / total * 100), 1) if total > 0 else 0,
-                    'present_days': present,
-                    'total_days': total
-                }
             
-            return {
-                'marked': attendance is not None,
-                'status': attendance.status if attendance else None,
-                'remarks': attendance.remarks if attendance else "",
-                'summary': summary
-            }
+            return build_attendance(attendance, total, present)
         except Exception:
             return {'marked': False, 'status': None, 'summary': {'percentage': 0}}
 
-    @sync_to_async
-    def _get_exam_data(self) -> List[Dict[str, Any]]:
+    def _fetch_exam_data(self) -> List[Dict[str, Any]]:
         """Get upcoming exams for the student's section"""
         try:
-            enrollment = StudentEnrollment.objects.filter(
-                student_id=self.student_id, is_active=True
-            ).select_related('section').first()
+            enrollment = self._get_enrollment()
             
             if not enrollment:
                 return []
                 
-            upcoming_exams = ExamSchedule.objects.filter(
-                section=enrollment.section,
-                exam_date__gte=self.today,
-                exam_date__lte=self.today + timedelta(days=14)
-            ).select_related('subject', 'examination').order_by('exam_date', 'start_time')[:5]
-            
-            return [{
-                'id': str(exam.id),
-                'exam_name': exam.examination.name,
-                'subject': exam.subject.name,
-                'date': exam.exam_date.isoformat(),
-                'date_display': exam.exam_date.strftime('%d %b'),
-                'start_time': exam.start_time.strftime('%I:%M %p'),
-                'max_marks': float(exam.max_marks),
-            } for exam in upcoming_exams]
+            upcoming_exams = _exam_queryset(self.today).filter(section=enrollment.section)[:5]
+            return build_exams(upcoming_exams)
         except Exception:
             return []
 
 
+class BatchTodayViewService:
+    """
+    Today View for several students in one pass (e.g. siblings).
+
+    Each dataset is loaded with a single ``__in`` query for all students and
+    fanned out in memory, so the query count does not grow with the number
+    of children. Timetable rows are loaded per section and shared between
+    siblings in the same section.
+    """
+
+    def __init__(self, student_ids: List[str], execution_mode: str = None):
+        # Preserve caller order, drop duplicates
+        self.student_ids = list(dict.fromkeys(str(sid) for sid in student_ids))
+        self.execution_mode = execution_mode
+        self.today = timezone.now().date()
+        self.current_day = self.today.strftime('%A').upper()
+        self.students = {}
+        self.enrollments = {}
+
+    def get_today_data(self, mode: str = None, versions: Dict[str, str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Return ``{student_id: today_payload}`` for every requested student.
+
+        ``versions``, when given, receives the Today View cache versions of the
+        students and their sections, taken before anything is fetched.
+        """
+        if not self.student_ids:
+            return {}
+
+        self._load_students_and_enrollments()
+        if versions is not None:
+            from apps.mobile_bff.caching.today_view_cache import TodayViewCache
+
+            versions.update(TodayViewCache.capture_versions(self.student_ids, [
+                enrollment.section_id if enrollment else None
+                for enrollment in map(self.enrollments.get, self.student_ids)
+            ]))
+
+        results = run_fetchers([
+            self._fetch_timetables,
+            self._fetch_homework,
+            self._fetch_fees,
+            self._fetch_remarks,
+            self._fetch_attendance,
+            self._fetch_exams,
+        ], mode or self.execution_mode)
+        timetables, homework, fees, remarks, attendance, exams = results
+
+        data = {}
+        for student_id in self.student_ids:
+            student = self.students.get(student_id)
+            enrollment = self.enrollments.get(student_id)
+            data[student_id] = assemble_payload(self.today, [
+                build_student_info(student, enrollment) if student else {},
+                self._for_student(timetables, student_id, {'is_holiday': False, 'periods': []}),
+                self._for_student(homework, student_id, []),
+                self._for_student(fees, student_id, {'total_due': 0, 'overdue_amount': 0, 'upcoming_fees': []}),
+                self._for_student(remarks, student_id, []),
+                self._for_student(
+                    attendance, student_id, {'marked': False, 'status': None, 'summary': {'percentage': 0}},
+                ),
+                self._for_student(exams, student_id, []),
+            ])
+        return data
+
+    @staticmethod
+    def _for_student(result, student_id, default):
+        if isinstance(result, Exception):
+            return default
+        return result.get(student_id, default)
+
+    def _load_students_and_enrollments(self):
+        self.students = {
+            str(student.id): student
+            for student in Student.objects.filter(id__in=self.student_ids, is_deleted=False)
+        }
+        # Keep the first active enrollment per student, in the same order
+        # ``.first()`` would pick in the single-student path.
+        enrollments = StudentEnrollment.objects.filter(
+            student_id__in=self.student_ids,
+            is_active=True
+        ).select_related('section__class_instance', 'academic_year').order_by(
+            *(StudentEnrollment._meta.ordering or ['pk'])
+        )
+        for enrollment in enrollments:
+            self.enrollments.setdefault(str(enrollment.student_id), enrollment)
+
+    def _students_by_section(self):
+        """``{(section_id, academic_year_id): [student_id, ...]}``"""
+        grouped = defaultdict(list)
+        for student_id, enrollment in self.enrollments.items():
+            grouped[(enrollment.section_id, enrollment.academic_year_id)].append(student_id)
+        return grouped
+
+    def _fetch_timetables(self) -> Dict[str, Dict[str, Any]]:
+        grouped = self._students_by_section()
+        if is_weekend(self.today):
+            return {sid: dict(WEEKEND_TIMETABLE) for sids in grouped.values() for sid in sids}
+
+        q = Q()
+        for section_id, academic_year_id in grouped:
+            q |= Q(section_id=section_id, academic_year_id=academic_year_id)
+        entries = list(_timetable_queryset(self.current_day).filter(q)) if grouped else []
+
+        sub_map = {
+            sub.original_entry_id: sub
+            for sub in _substitution_queryset(self.today).filter(
+                original_entry_id__in=[entry.id for entry in entries]
+            )
+        } if entries else {}
+
+        entries_by_section = defaultdict(list)
+        for entry in entries:
+            entries_by_section[(entry.section_id, entry.academic_year_id)].append(entry)
+
+        data = {}
+        for key, student_ids in grouped.items():
+            # Built once per section and shared by siblings in that section
+            timetable = build_timetable(entries_by_section.get(key, []), sub_map)
+            for student_id in student_ids:
+                data[student_id] = timetable
+        return data
+
+    def _fetch_homework(self) -> Dict[str, List[Dict[str, Any]]]:
+        grouped = self._students_by_section()
+        if not grouped:
+            return {}
+
+        q = Q()
+        for section_id, academic_year_id in grouped:
+            q |= Q(section_id=section_id, academic_year_id=academic_year_id)
+
+        by_section = defaultdict(list)
+        for assignment in _homework_queryset(self.today).filter(q):
+            key = (assignment.section_id, assignment.academic_year_id)
+            if len(by_section[key]) < 10:
+                by_section[key].append(assignment)
+
+        assignment_ids = [a.id for items in by_section.values() for a in items]
+        submissions = defaultdict(dict)
+        if assignment_ids:
+            for student_id, assignment_id, status in AssignmentSubmission.objects.filter(
+                student_id__in=list(self.enrollments),
+                assignment_id__in=assignment_ids
+            ).values_list('student_id', 'assignment_id', 'status'):
+                submissions[str(student_id)][str(assignment_id)] = status
+
+        data = {}
+        for key, student_ids in grouped.items():
+            for student_id in student_ids:
+                data[student_id] = build_homework(by_section.get(key, []), submissions[student_id], self.today)
+        return data
+
+    def _fetch_fees(self) -> Dict[str, Dict[str, Any]]:
+        by_student = defaultdict(list)
+        for fee in _fees_queryset().filter(student_id__in=self.student_ids):
+            by_student[str(fee.student_id)].append(fee)
+        return {sid: build_fees_due(by_student.get(sid, []), self.today) for sid in self.student_ids}
+
+    def _fetch_remarks(self) -> Dict[str, List[Dict[str, Any]]]:
+        by_student = defaultdict(list)
+        for note in _remarks_queryset(self.today).filter(student_id__in=self.student_ids):
+            notes = by_student[str(note.student_id)]
+            if len(notes) < 5:
+                notes.append(note)
+        return {sid: build_remarks(by_student.get(sid, [])) for sid in self.student_ids}
+
+    def _fetch_attendance(self) -> Dict[str, Dict[str, Any]]:
+        today_rows = {}
+        for row in StudentAttendance.objects.filter(
+            student_id__in=self.student_ids,
+            date=self.today
+        ).order_by(*(StudentAttendance._meta.ordering or ['pk'])):
+            today_rows.setdefault(str(row.student_id), row)
+
+        stats = {}
+        year_ids = {e.academic_year_id for e in self.enrollments.values()}
+        if year_ids:
+            for row in StudentAttendance.objects.filter(
+                student_id__in=list(self.enrollments),
+                academic_year_id__in=year_ids
+            ).values('student_id', 'academic_year_id').annotate(
+                total=Count('id'),
+                present=Count('id', filter=Q(status='PRESENT'))
+            ).order_by():
+                stats[(str(row['student_id']), row['academic_year_id'])] = (row['total'], row['present'])
+
+        data = {}
+        for student_id in self.student_ids:
+            enrollment = self.enrollments.get(student_id)
+            total, present = stats.get(
+                (student_id, enrollment.academic_year_id), (0, 0)
+            ) if enrollment else (0, 0)
+            data[student_id] = build_attendance(today_rows.get(student_id), total, present)
+        return data
+
+    def _fetch_exams(self) -> Dict[str, List[Dict[str, Any]]]:
+        section_ids = {e.section_id for e in self.enrollments.values()}
+        if not section_ids:
+            return {}
+
+        by_section = defaultdict(list)
+        for exam in _exam_queryset(self.today).filter(section_id__in=section_ids):
+            if len(by_section[exam.section_id]) < 5:
+                by_section[exam.section_id].append(exam)
+
+        return {
+            student_id: build_exams(by_section.get(enrollment.section_id, []))
+            for student_id, enrollment in self.enrollments.items()
+        }
+
+
 class ParentTodayViewService:
     """
     Service for parent's today view (multiple children)
@@ -393,27 +865,45 @@ class ParentTodayViewService:
     
     async def get_today_data(self) -> Dict[str, Any]:
         """Get today data for all children of a parent"""
-        # Get all children
-        children = await self._get_children()
-        
-        # Fetch today data for each child in parallel
-        tasks = [
-            TodayViewService(child['id']).get_today_data()
-            for child in children
-        ]
-        
-        children_data = await asyncio.gather(*tasks, return_exceptions=True)
+        return await sync_to_async(self.get_today_data_sync)()
+
+    def get_today_data_sync(self) -> Dict[str, Any]:
+        """
+        Build today data for every child with one batched aggregation.
+
+        Each child's payload is also written to the per-student Today View
+        cache (one ``set_many``) so a later single-child request is a hit.
+        """
+        from apps.mobile_bff.caching.today_view_cache import TodayViewCache
+
+        children = self._load_children()
         
+        batch = BatchTodayViewService([child['id'] for child in children])
+        versions = {}
+        try:
+            children_map = batch.get_today_data(versions=versions)
+        except Exception:
+            logger.exception("Batched today view failed for parent %s", self.parent_user_id)
+            children_map = {}
+
         valid_children_data = []
-        for i, data in enumerate(children_data):
-            if isinstance(data, Exception):
+        for child in children:
+            data = children_map.get(child['id'])
+            if data is None:
                 # Fallback basic info if service fails
                 valid_children_data.append({
-                    'student': children[i],
+                    'student': child,
                     'error': True
                 })
             else:
                 valid_children_data.append(data)
+
+        if children_map:
+            TodayViewCache.set_many({
+                student_id: dict(data) for student_id, data in children_map.items()
+            }, section_ids={
+                student_id: enrollment.section_id for student_id, enrollment in batch.enrollments.items()
+            }, versions=versions)
         
         return {
             'date': timezone.now().date().isoformat(),
@@ -422,8 +912,10 @@ class ParentTodayViewService:
             'generated_at': timezone.now().isoformat(),
         }
     
-    @sync_to_async
-    def _get_children(self) -> List[Dict[str, Any]]:
+    async def _get_children(self) -> List[Dict[str, Any]]:
+        return await sync_to_async(self._load_children)()
+
+    def _load_children(self) -> List[Dict[str, Any]]:
         """Get list of children for this parent"""
         from apps.students.models import StudentParent
         
@@ -1,17 +1,25 @@
 """
 Django Signals for Today View Cache Invalidation
 Automatically invalidates cache when relevant data changes
+
+Receivers only record what to invalidate; ``apps.mobile_bff.caching.invalidation``
+deduplicates and flushes once per request, Celery task or transaction.
 """
 
+from celery.signals import task_postrun, task_prerun
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from apps.academics.models import StudentEnrollment
 from apps.assignments.models import Assignment, AssignmentSubmission
 from apps.finance.models import Payment, StudentFee
 from apps.students.models import StudentNote
 from apps.timetable.models import TimetableSubstitution
+from apps.timetable.signals import timetable_cells_changed
 from apps.attendance.models import StudentAttendance
+from apps.attendance.signals import student_attendance_bulk_marked
 from apps.examinations.models import ExamSchedule
+from apps.mobile_bff.caching import invalidation
 from apps.mobile_bff.caching.today_view_cache import TodayViewCache
 
 
@@ -19,42 +27,25 @@ from apps.mobile_bff.caching.today_view_cache import TodayViewCache
 def invalidate_cache_on_assignment_save(sender, instance, created, **kwargs):
     """
     Invalidate cache when assignment is created or updated
-    Affects all students in the section
+    Affects all students in the section (one section version bump)
     """
     if instance.status == 'PUBLISHED':
-        section_id = str(instance.section_id)
-        # Invalidate for due date
-        if instance.due_date:
-            date = instance.due_date.date().isoformat()
-            TodayViewCache.invalidate_by_section(section_id, date)
-        # Also invalidate for today (in case it's already listed)
-        TodayViewCache.invalidate_by_section(section_id)
+        invalidation.invalidate_section(instance.section_id)
 
 
 @receiver(post_delete, sender=Assignment)
 def invalidate_cache_on_assignment_delete(sender, instance, **kwargs):
     """Invalidate cache when assignment is deleted"""
-    section_id = str(instance.section_id)
-    if instance.due_date:
-        date = instance.due_date.date().isoformat()
-        TodayViewCache.invalidate_by_section(section_id, date)
-    TodayViewCache.invalidate_by_section(section_id)
+    invalidation.invalidate_section(instance.section_id)
 
 
 @receiver(post_save, sender=AssignmentSubmission)
 def invalidate_cache_on_submission(sender, instance, **kwargs):
     """
     Invalidate cache when student submits assignment
-    Only affects the specific student
+    Only affects the specific student (and their parents)
     """
-    student_id = str(instance.student_id)
-    TodayViewCache.invalidate(student_id)
-    
-    # Also invalidate parent cache
-    from apps.students.models import StudentParent
-    parents = StudentParent.objects.filter(student_id=student_id).values_list('parent_id', flat=True)
-    for parent_id in parents:
-        TodayViewCache.invalidate_parent(str(parent_id))
+    invalidation.invalidate_student(instance.student_id, include_parents=True)
 
 
 @receiver(post_save, sender=Payment)
@@ -63,14 +54,7 @@ def invalidate_cache_on_payment(sender, instance, created, **kwargs):
     Invalidate cache when fee payment is made
     """
     if instance.status in ['COMPLETED', 'VERIFIED']:
-        student_id = str(instance.student_id)
-        TodayViewCache.invalidate(student_id)
-        
-        # Invalidate parent cache
-        from apps.students.models import StudentParent
-        parents = StudentParent.objects.filter(student_id=student_id).values_list('parent_id', flat=True)
-        for parent_id in parents:
-            TodayViewCache.invalidate_parent(str(parent_id))
+        invalidation.invalidate_student(instance.student_id, include_parents=True)
 
 
 @receiver(post_save, sender=StudentFee)
@@ -78,14 +62,7 @@ def invalidate_cache_on_fee_update(sender, instance, **kwargs):
     """
     Invalidate cache when student fee is updated
     """
-    student_id = str(instance.student_id)
-    TodayViewCache.invalidate(student_id)
-    
-    # Invalidate parent cache
-    from apps.students.models import StudentParent
-    parents = StudentParent.objects.filter(student_id=student_id).values_list('parent_id', flat=True)
-    for parent_id in parents:
-        TodayViewCache.invalidate_parent(str(parent_id))
+    invalidation.invalidate_student(instance.student_id, include_parents=True)
 
 
 @receiver(post_save, sender=StudentNote)
@@ -94,26 +71,13 @@ def invalidate_cache_on_note(sender, instance, created, **kwargs):
     Invalidate cache when teacher adds a note
     """
     if not instance.is_private:  # Only non-private notes appear in today view
-        student_id = str(instance.student_id)
-        TodayViewCache.invalidate(student_id)
-        
-        # Invalidate parent cache
-        from apps.students.models import StudentParent
-        parents = StudentParent.objects.filter(student_id=student_id).values_list('parent_id', flat=True)
-        for parent_id in parents:
-            TodayViewCache.invalidate_parent(str(parent_id))
+        invalidation.invalidate_student(instance.student_id, include_parents=True)
 
 
 @receiver(post_delete, sender=StudentNote)
 def invalidate_cache_on_note_delete(sender, instance, **kwargs):
     """Invalidate cache when note is deleted"""
-    student_id = str(instance.student_id)
-    TodayViewCache.invalidate(student_id)
-    
-    from apps.students.models import StudentParent
-    parents = StudentParent.objects.filter(student_id=student_id).values_list('parent_id', flat=True)
-    for parent_id in parents:
-        TodayViewCache.invalidate_parent(str(parent_id))
+    invalidation.invalidate_student(instance.student_id, include_parents=True)
 
 
 @receiver(post_save, sender=TimetableSubstitution)
@@ -122,18 +86,24 @@ def invalidate_cache_on_substitution(sender, instance, **kwargs):
     Invalidate cache when timetable substitution is created/updated
     """
     if instance.status == 'APPROVED' and instance.original_entry:
-        section_id = str(instance.original_entry.section_id)
-        date = instance.date.isoformat()
-        TodayViewCache.invalidate_by_section(section_id, date)
+        invalidation.invalidate_section(instance.original_entry.section_id)
 
 
 @receiver(post_delete, sender=TimetableSubstitution)
 def invalidate_cache_on_substitution_delete(sender, instance, **kwargs):
     """Invalidate cache when substitution is deleted"""
     if instance.original_entry:
-        section_id = str(instance.original_entry.section_id)
-        date = instance.date.isoformat()
-        TodayViewCache.invalidate_by_section(section_id, date)
+        invalidation.invalidate_section(instance.original_entry.section_id)
+
+
+@receiver(timetable_cells_changed)
+def invalidate_cache_on_timetable_apply(sender, section_ids, **kwargs):
+    """
+    Invalidate cache for the sections whose cells changed when a generated
+    timetable is applied or rolled back
+    """
+    for section_id in section_ids:
+        invalidation.invalidate_section(section_id)
 
 
 @receiver(post_save, sender=StudentAttendance)
@@ -141,34 +111,57 @@ def invalidate_cache_on_attendance(sender, instance, **kwargs):
     """
     Invalidate cache when attendance is marked
     """
-    student_id = str(instance.student_id)
-    date = instance.date.isoformat()
-    TodayViewCache.invalidate(student_id, date)
-    
-    # Invalidate parent cache
-    from apps.students.models import StudentParent
-    parents = StudentParent.objects.filter(student_id=student_id).values_list('parent_id', flat=True)
-    for parent_id in parents:
-        TodayViewCache.invalidate_parent(str(parent_id), date)
+    invalidation.invalidate_student(
+        instance.student_id, date=instance.date.isoformat(), include_parents=True,
+    )
+
+
+@receiver(student_attendance_bulk_marked)
+def invalidate_cache_on_bulk_attendance(sender, date, created_records, updated_records, **kwargs):
+    """
+    Invalidate cache for every student in a bulk attendance submission
+    """
+    date = date.isoformat()
+    for record in list(created_records) + list(updated_records):
+        invalidation.invalidate_student(record.student_id, date=date, include_parents=True)
 
 
 @receiver(post_save, sender=ExamSchedule)
 def invalidate_cache_on_exam_schedule(sender, instance, **kwargs):
     """Invalidate cache when exam is scheduled or updated"""
-    section_id = str(instance.section_id)
-    date = instance.exam_date.isoformat()
-    TodayViewCache.invalidate_by_section(section_id, date)
-    # Also invalidate for today if it's an upcoming exam notice
-    TodayViewCache.invalidate_by_section(section_id)
+    invalidation.invalidate_section(instance.section_id)
 
 
 @receiver(post_delete, sender=ExamSchedule)
 def invalidate_cache_on_exam_delete(sender, instance, **kwargs):
     """Invalidate cache when exam is cancelled/deleted"""
-    section_id = str(instance.section_id)
-    date = instance.exam_date.isoformat()
-    TodayViewCache.invalidate_by_section(section_id, date)
-    TodayViewCache.invalidate_by_section(section_id)
+    invalidation.invalidate_section(instance.section_id)
+
+
+@receiver(post_save, sender=StudentEnrollment)
+@receiver(post_delete, sender=StudentEnrollment)
+def invalidate_cache_on_enrollment_change(sender, instance, **kwargs):
+    """
+    Invalidate the student's cache when their enrollment changes
+    The cached student fragment records which section's fragments to use
+    """
+    invalidation.invalidate_student(instance.student_id)
+
+
+# Celery tasks collect like requests: one flush when the task finishes
+_task_tokens = {}
+
+
+@task_prerun.connect
+def begin_task_invalidation(task_id=None, **kwargs):
+    _task_tokens[task_id] = invalidation.begin()
+
+
+@task_postrun.connect
+def flush_task_invalidation(task_id=None, **kwargs):
+    token = _task_tokens.pop(task_id, None)
+    if token is not None:
+        invalidation.end(token)
 
 
 # Bulk operations handlers
@@ -184,4 +177,4 @@ def invalidate_cache_for_students_bulk(student_ids, date=None):
     """
     Helper function for bulk student invalidation
     """
-    return TodayViewCache.invalidate_multiple_students(student_ids, date)
+    return TodayViewCache.bump_many(student_ids=student_ids)
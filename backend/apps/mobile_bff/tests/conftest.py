@@ -0,0 +1,66 @@
+"""
+Shared fixtures for the mobile BFF tests.
+"""
+
+from datetime import date, time
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.academics.models import AcademicYear, Board, Class, Section, StudentEnrollment
+from apps.students.models import Student, StudentNote, StudentParent
+from apps.timetable.models import ClassTimetable, TimeSlot
+
+User = get_user_model()
+
+
+@pytest.fixture
+def school_data(db):
+    board = Board.objects.create(board_type='CBSE', board_name='CBSE', board_code='CBSE-T')
+    year = AcademicYear.objects.create(
+        name='2026-27', start_date=date(2026, 4, 1), end_date=date(2027, 3, 31), is_current=True,
+    )
+    class_obj = Class.objects.create(name='5', display_name='Class 5', class_order=5, board=board)
+    section_a = Section.objects.create(class_instance=class_obj, name='A', academic_year=year)
+    section_b = Section.objects.create(class_instance=class_obj, name='B', academic_year=year)
+
+    slots = [
+        TimeSlot.objects.create(
+            name=f'P{i}', start_time=time(8 + i, 0), end_time=time(8 + i, 45),
+            duration_minutes=45, order=i,
+        )
+        for i in range(1, 4)
+    ]
+    for section in (section_a, section_b):
+        for slot in slots:
+            ClassTimetable.objects.create(
+                academic_year=year, class_obj=class_obj, section=section,
+                day_of_week='MONDAY', time_slot=slot, room_number=f'{section.name}-{slot.order}',
+            )
+
+    parent = User.objects.create_user(
+        email='parent_batch@test.com', password='x', first_name='Pat', last_name='Parent',
+        phone='7000000001', user_type='PARENT',
+    )
+    students = []
+    for i, section in enumerate([section_a, section_a, section_b]):
+        user = User.objects.create_user(
+            email=f'kid{i}@test.com', password='x', first_name=f'Kid{i}', last_name='Batch',
+            phone=f'70000001{i:02d}', user_type='STUDENT',
+        )
+        student = Student.objects.create(
+            user=user, admission_number=f'BATCH{i}', admission_date=date(2026, 4, 1),
+            first_name=f'Kid{i}', last_name='Batch', date_of_birth=date(2016, 1, 1), gender='M',
+        )
+        StudentEnrollment.objects.create(
+            student=student, section=section, academic_year=year,
+            enrollment_date=date(2026, 4, 1), roll_number=str(i + 1),
+        )
+        StudentParent.objects.create(student=student, parent=parent, relation='FATHER')
+        # bulk_create: the notes only need to exist, not award house points
+        StudentNote.objects.bulk_create([
+            StudentNote(student=student, note_type='GENERAL', title=f'Note {i}', content='ok'),
+        ])
+        students.append(student)
+
+    return {'parent': parent, 'students': students}
@@ -0,0 +1,100 @@
+"""
+Tests for batched Today View cache invalidation.
+"""
+
+from datetime import date
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.academics.models import AcademicYear
+from apps.attendance.models import StudentAttendance
+from apps.mobile_bff.caching import invalidation
+from apps.mobile_bff.caching.today_view_cache import TodayViewCache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _version(scope, scope_id):
+    return cache.get(TodayViewCache._version_key(scope, str(scope_id)))
+
+
+class TestInvalidationCollector:
+
+    def test_dedupes_and_reports_coalesced(self):
+        with mock.patch.object(cache, 'set_many', wraps=cache.set_many) as set_many, \
+                mock.patch.object(cache, 'delete_many', wraps=cache.delete_many) as delete_many:
+            with invalidation.collect() as collector:
+                for _ in range(5):
+                    invalidation.invalidate_student('s1')
+                    invalidation.invalidate_section('sec-a')
+                    invalidation.invalidate_parent('p1')
+
+        assert collector.result == {'requested': 15, 'flushed': 3, 'coalesced': 12}
+        assert set_many.call_count == 1
+        assert delete_many.call_count == 1
+        assert _version('student', 's1') is not None
+        assert _version('section', 'sec-a') is not None
+
+    def test_nothing_collected_is_not_flushed(self):
+        with mock.patch.object(cache, 'set_many') as set_many:
+            with invalidation.collect() as collector:
+                pass
+        assert collector.result is None
+        set_many.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestSignalCollection:
+
+    def test_bulk_attendance_coalesces_to_one_flush(self, school_data):
+        year = AcademicYear.objects.get()
+        students = school_data['students']
+
+        with mock.patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+            with invalidation.collect() as collector:
+                for student in students:
+                    for day in (date(2026, 10, 12), date(2026, 10, 13)):
+                        StudentAttendance.objects.create(
+                            student=student, academic_year=year, date=day, status='PRESENT',
+                        )
+
+        # 6 rows: one student bump each plus one delete per parent per row,
+        # all for the same parent on two dates
+        assert collector.result['requested'] == 12
+        assert collector.result['flushed'] == 3 + 2
+        assert collector.result['coalesced'] == 7
+        assert set_many.call_count == 1
+
+    def test_transaction_scope_flushes_on_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                invalidation.invalidate_student('s1')
+                invalidation.invalidate_student('s1')
+                invalidation.invalidate_section('sec-a')
+                assert _version('student', 's1') is None
+
+        assert len(callbacks) == 1
+        assert _version('student', 's1') is not None
+        assert _version('section', 'sec-a') is not None
+
+    def test_rolled_back_savepoint_discards_collector(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    invalidation.invalidate_student('s1')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            invalidation.invalidate_section('sec-a')
+
+        assert len(callbacks) == 1
+        assert _version('student', 's1') is None
+        assert _version('section', 'sec-a') is not None
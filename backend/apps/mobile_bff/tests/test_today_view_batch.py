@@ -0,0 +1,82 @@
+"""
+Tests for the batched (multi-student) Today View aggregation.
+"""
+
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.mobile_bff.caching.today_view_cache import TodayViewCache
+from apps.mobile_bff.services.today_view import (
+    BatchTodayViewService, ParentTodayViewService, TodayViewService,
+)
+
+MONDAY = date(2026, 10, 12)
+
+
+def _strip_volatile(payload):
+    return {k: v for k, v in payload.items() if k != 'generated_at'}
+
+
+@pytest.mark.django_db
+class TestBatchTodayViewService:
+
+    def test_matches_single_student_payloads(self, school_data):
+        ids = [str(s.id) for s in school_data['students']]
+        batch = BatchTodayViewService(ids, execution_mode='serial')
+        batch.today = MONDAY
+        batch.current_day = 'MONDAY'
+        batched = batch.get_today_data()
+
+        for student_id in ids:
+            single = TodayViewService(student_id, execution_mode='serial')
+            single.today = MONDAY
+            single.current_day = 'MONDAY'
+            assert _strip_volatile(batched[student_id]) == _strip_volatile(single.get_today_data_sync())
+
+        assert len(batched[ids[0]]['timetable']['periods']) == 3
+        assert batched[ids[0]]['teacher_remarks'][0]['title'] == 'Note 0'
+
+    def test_query_count_does_not_grow_with_children(self, school_data):
+        ids = [str(s.id) for s in school_data['students']]
+
+        with CaptureQueriesContext(connection) as one:
+            BatchTodayViewService(ids[:1], execution_mode='serial').get_today_data()
+        with CaptureQueriesContext(connection) as three:
+            BatchTodayViewService(ids, execution_mode='serial').get_today_data()
+
+        assert len(three.captured_queries) == len(one.captured_queries)
+
+    def test_siblings_in_same_section_share_timetable(self, school_data):
+        first, second, other = [str(s.id) for s in school_data['students']]
+        batch = BatchTodayViewService([first, second, other], execution_mode='serial')
+        batch.today = MONDAY
+        batch.current_day = 'MONDAY'
+        data = batch.get_today_data()
+
+        assert data[first]['timetable'] is data[second]['timetable']
+        assert data[first]['timetable'] is not data[other]['timetable']
+        assert data[other]['timetable']['periods'][0]['room_number'] == 'B-1'
+
+    def test_unknown_student_gets_empty_sections(self, school_data):
+        data = BatchTodayViewService(['00000000-0000-0000-0000-000000000000'], execution_mode='serial').get_today_data()
+        payload = data['00000000-0000-0000-0000-000000000000']
+        assert payload['student'] == {}
+        assert payload['homework'] == []
+
+
+@pytest.mark.django_db
+class TestParentTodayViewBatch:
+
+    def test_populates_per_student_cache(self, school_data):
+        cache.clear()
+        data = ParentTodayViewService(str(school_data['parent'].id)).get_today_data_sync()
+
+        assert data['children_count'] == 3
+        for student in school_data['students']:
+            cached = TodayViewCache.get(str(student.id))
+            assert cached is not None
+            assert cached['student']['id'] == str(student.id)
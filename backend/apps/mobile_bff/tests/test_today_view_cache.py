@@ -0,0 +1,182 @@
+"""
+Tests for the fragment-based Today View cache.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.mobile_bff.caching.today_view_cache import TodayViewCache
+from apps.mobile_bff.services.today_view import TodayViewService
+
+
+def _payload(name, section_room, homework_status='PENDING'):
+    return {
+        'date': timezone.now().date().isoformat(),
+        'day_of_week': 'MONDAY',
+        'student': {'name': name},
+        'timetable': {'is_holiday': False, 'periods': [{'room_number': section_room}]},
+        'homework': [{
+            'id': 'hw-1',
+            'due_date': (timezone.now() + timedelta(days=1)).isoformat(),
+            'submission_status': homework_status,
+            'is_due_today': False,
+            'is_overdue': False,
+            'priority': 'normal',
+        }],
+        'fees_due': {'total_due': 0},
+        'teacher_remarks': [],
+        'attendance': {'marked': False},
+        'exams': [],
+        'generated_at': timezone.now().isoformat(),
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    TodayViewCache._section_hints.clear()
+    yield
+    cache.clear()
+
+
+class TestTodayViewFragments:
+
+    def test_round_trip_composes_student_homework_status(self):
+        TodayViewCache.set('s1', _payload('One', 'A-1', 'SUBMITTED'), section_id='sec-a')
+
+        cached = TodayViewCache.get('s1')
+        assert cached['_cache_hit'] is True
+        assert cached['student'] == {'name': 'One'}
+        assert cached['homework'][0]['submission_status'] == 'SUBMITTED'
+
+    def test_section_fragments_are_shared_by_classmates(self):
+        TodayViewCache.set('s1', _payload('One', 'A-1'), section_id='sec-a')
+        # Classmate only has their own fragments cached
+        TodayViewCache.set_fragments([('s2', 'sec-a', {
+            'student': {'name': 'Two'},
+            'fees_due': {},
+            'teacher_remarks': [],
+            'attendance': {},
+            'homework_status': {'hw-1': 'GRADED'},
+        })])
+
+        cached = TodayViewCache.get('s2')
+        assert cached['student'] == {'name': 'Two'}
+        assert cached['timetable']['periods'][0]['room_number'] == 'A-1'
+        assert cached['homework'][0]['submission_status'] == 'GRADED'
+
+    def test_section_invalidation_is_one_bump(self):
+        TodayViewCache.set('s1', _payload('One', 'A-1'), section_id='sec-a')
+        TodayViewCache.set('s2', _payload('Two', 'A-1'), section_id='sec-a')
+        TodayViewCache.set('s3', _payload('Three', 'B-1'), section_id='sec-b')
+
+        with mock.patch.object(cache, 'delete', wraps=cache.delete) as delete:
+            assert TodayViewCache.invalidate_by_section('sec-a') == 1
+        assert delete.call_count == 0
+
+        assert TodayViewCache.get('s1') is None
+        assert TodayViewCache.get('s2') is None
+        assert TodayViewCache.get('s3') is not None
+        # Student fragments survive a section bump
+        fragments, section_id = TodayViewCache.get_fragments('s1')
+        assert section_id == 'sec-a'
+        assert 'student' in fragments and 'timetable' not in fragments
+
+    def test_student_invalidation_keeps_section_fragments(self):
+        TodayViewCache.set('s1', _payload('One', 'A-1'), section_id='sec-a')
+        TodayViewCache.invalidate('s1')
+
+        assert TodayViewCache.get('s1') is None
+        assert set(TodayViewCache.get_section_fragments('sec-a')) == set(TodayViewCache.SECTION_FRAGMENTS)
+
+    def test_warm_read_is_single_round_trip(self):
+        TodayViewCache.set('s1', _payload('One', 'A-1'), section_id='sec-a')
+
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            assert TodayViewCache.get('s1') is not None
+        assert get_many.call_count == 1
+
+    def test_stale_section_hint_falls_back_to_recorded_section(self):
+        TodayViewCache.set('s1', _payload('One', 'A-1'), section_id='sec-a')
+        TodayViewCache._section_hints['s1'] = 'sec-b'
+
+        cached = TodayViewCache.get('s1')
+        assert cached['timetable']['periods'][0]['room_number'] == 'A-1'
+
+    def test_invalidation_during_build_skips_the_write(self):
+        TodayViewCache.set('s1', _payload('One', 'A-1'), section_id='sec-a')
+        TodayViewCache.invalidate_by_section('sec-a')
+
+        versions = {}
+        fragments, _ = TodayViewCache.get_fragments('s1', versions=versions)
+        assert 'timetable' not in fragments
+        # Timetable edited while the missing fragments are being built
+        TodayViewCache.invalidate_by_section('sec-a')
+        TodayViewCache.set_fragments([('s1', 'sec-a', {
+            'timetable': {'periods': [{'room_number': 'stale'}]},
+            'homework': [],
+            'exams': [],
+        })], versions=versions)
+
+        assert TodayViewCache.get_section_fragments('sec-a') == {}
+
+    def test_unchanged_versions_are_written(self):
+        versions = TodayViewCache.capture_versions(['s1'], ['sec-a'])
+        TodayViewCache.set('s1', _payload('One', 'A-1'), section_id='sec-a', versions=versions)
+
+        assert TodayViewCache.get('s1')['timetable']['periods'][0]['room_number'] == 'A-1'
+
+
+@pytest.mark.django_db
+class TestTodayViewServiceCached:
+
+    def test_classmate_reuses_section_fragments(self, school_data):
+        first, second, _ = [str(s.id) for s in school_data['students']]
+
+        cold = TodayViewService(first, execution_mode='serial').get_today_data_cached()
+        assert not cold.get('_cache_hit')
+
+        with CaptureQueriesContext(connection) as classmate:
+            TodayViewService(second, execution_mode='serial').get_today_data_cached()
+        table_hits = ' '.join(q['sql'] for q in classmate.captured_queries)
+        assert 'timetable_classtimetable' not in table_hits
+        assert 'examinations_examschedule' not in table_hits
+
+        with CaptureQueriesContext(connection) as warm:
+            data = TodayViewService(first, execution_mode='serial').get_today_data_cached()
+        assert data['_cache_hit'] is True
+        assert data['student']['id'] == first
+        assert len(warm.captured_queries) == 0
+
+    def test_invalidation_while_computing_is_not_cached(self, school_data):
+        student_id = str(school_data['students'][0].id)
+        service = TodayViewService(student_id, execution_mode='serial')
+        fetch_timetable = service._fetch_timetable_data
+
+        def edited_during_fetch():
+            data = fetch_timetable()
+            TodayViewCache.invalidate_by_section(service._get_enrollment().section_id)
+            return data
+
+        service._fetch_timetable_data = edited_during_fetch
+        service.get_today_data_cached()
+
+        fragments, _ = TodayViewCache.get_fragments(student_id)
+        assert 'student' in fragments
+        assert 'timetable' not in fragments
+
+    def test_cached_payload_matches_uncached(self, school_data):
+        student_id = str(school_data['students'][0].id)
+
+        fresh = TodayViewService(student_id, execution_mode='serial').get_today_data_sync()
+        TodayViewService(student_id, execution_mode='serial').get_today_data_cached()
+        cached = TodayViewService(student_id, execution_mode='serial').get_today_data_cached()
+
+        for key in ('student', 'timetable', 'homework', 'fees_due', 'teacher_remarks', 'attendance', 'exams'):
+            assert cached[key] == fresh[key]
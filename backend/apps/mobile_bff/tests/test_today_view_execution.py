@@ -0,0 +1,44 @@
+"""
+Tests for Today View fetcher execution modes.
+"""
+
+import threading
+
+import pytest
+
+from apps.mobile_bff.services.today_view import (
+    EXECUTION_SERIAL, EXECUTION_THREADED, run_fetchers,
+)
+
+
+class TestRunFetchers:
+
+    def test_serial_preserves_order(self):
+        results = run_fetchers([lambda: 1, lambda: 2, lambda: 3], EXECUTION_SERIAL)
+        assert results == [1, 2, 3]
+
+    def test_threaded_preserves_order(self):
+        results = run_fetchers([lambda i=i: i for i in range(7)], EXECUTION_THREADED)
+        assert results == list(range(7))
+
+    @pytest.mark.parametrize('mode', [EXECUTION_SERIAL, EXECUTION_THREADED])
+    def test_exceptions_are_returned_in_place(self, mode):
+        def boom():
+            raise ValueError('fetch failed')
+
+        results = run_fetchers([lambda: 'ok', boom], mode)
+        assert results[0] == 'ok'
+        assert isinstance(results[1], ValueError)
+
+    def test_threaded_fetchers_run_concurrently(self):
+        # Each fetcher waits for the others; this only completes if all
+        # three are running at the same time.
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fetch():
+            barrier.wait()
+            return threading.current_thread().name
+
+        results = run_fetchers([fetch, fetch, fetch], EXECUTION_THREADED)
+        assert not any(isinstance(r, Exception) for r in results)
+        assert all(name.startswith('today-view') for name in results)
@@ -12,6 +12,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from apps.mobile_bff.services.today_view import TodayViewService, ParentTodayViewService
+from apps.mobile_bff.caching import invalidation
 from apps.mobile_bff.caching.today_view_cache import TodayViewCache, CacheStats
 from apps.mobile_bff.serializers.today_view import (
     TodayViewResponseSerializer,
@@ -51,7 +52,7 @@ class StudentTodayView(APIView):
         - Auto-invalidated on data changes
         
         **Performance:**
-        - All data fetched in parallel using async
+        - Sections fetched concurrently on a bounded thread pool (TODAY_VIEW_EXECUTION_MODE)
         - Average response time: <200ms (cached), <800ms (uncached)
         """,
         parameters=[
@@ -101,24 +102,16 @@ class StudentTodayView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Check cache first (unless force_refresh)
-        if not force_refresh:
-            cached_data = TodayViewCache.get(student_id)
-            if cached_data:
-                CacheStats.record_hit(student_id)
-                return Response(cached_data, status=status.HTTP_200_OK)
-        
-        # Cache miss - fetch data
-        CacheStats.record_miss(student_id)
-        
         try:
-            # Run async service using Django's async_to_sync
-            from asgiref.sync import async_to_sync
+            # Cached fragments are reused and only missing ones are computed
+            # (force_refresh recomputes everything and rewrites the cache)
             service = TodayViewService(student_id, request.user)
-            data = async_to_sync(service.get_today_data)()
+            data = service.get_today_data_cached(force_refresh=force_refresh)
             
-            # Cache the result
-            TodayViewCache.set(student_id, data)
+            if data.get('_cache_hit'):
+                CacheStats.record_hit(student_id)
+            else:
+                CacheStats.record_miss(student_id)
             
             return Response(data, status=status.HTTP_200_OK)
             
@@ -194,8 +187,9 @@ class ParentTodayView(APIView):
         - Automatically includes all registered children
         
         **Performance:**
-        - Parallel fetching for all children
-        - Optimized for parents with multiple children
+        - All children aggregated in one batch (one query per dataset, not per child)
+        - Siblings in the same section share timetable rows
+        - Each child's payload is also written to the per-student cache
         """,
         parameters=[
             OpenApiParameter(
@@ -236,10 +230,8 @@ class ParentTodayView(APIView):
         CacheStats.record_miss(parent_id)
         
         try:
-            # Run async service using Django's async_to_sync
-            from asgiref.sync import async_to_sync
             service = ParentTodayViewService(parent_id)
-            data = async_to_sync(service.get_today_data)()
+            data = service.get_today_data_sync()
             
             # Cache the result
             TodayViewCache.set_parent(parent_id, data)
@@ -277,6 +269,10 @@ class TodayViewCacheStatsView(APIView):
                     'misses': {'type': 'integer'},
                     'total': {'type': 'integer'},
                     'hit_rate': {'type': 'number'},
+                    'invalidation': {
+                        'type': 'object',
+                        'description': 'Invalidation flush totals for this worker process',
+                    },
                 }
             },
             403: {'description': 'Admin access required'},
@@ -293,6 +289,7 @@ class TodayViewCacheStatsView(APIView):
             )
         
         stats = CacheStats.get_today_stats()
+        stats['invalidation'] = invalidation.stats()
         return Response(stats, status=status.HTTP_200_OK)
 
 
@@ -368,5 +365,6 @@ class InvalidateTodayViewCacheView(APIView):
         
         return Response({
             'invalidated_count': count,
-            'message': f'Successfully invalidated cache for {count} student(s)'
+            # A section counts once: it is a single version bump
+            'message': f'Successfully invalidated {count} cache scope(s)'
         }, status=status.HTTP_200_OK)
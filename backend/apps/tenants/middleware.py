@@ -4,6 +4,7 @@ from django.conf import settings
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from apps.tenants.models import School, Domain
+from apps.tenants.resolution import tenant_cache
 
 # URL paths that bypass tenant resolution (public endpoints)
 TENANT_EXEMPT_PATHS = [
@@ -31,9 +32,20 @@ class TenantHeaderMiddleware(TenantMainMiddleware):
 
     Local development hostnames (localhost, 127.0.0.1, etc.) use public schema
     by default and rely on the X-Tenant-Subdomain header for tenant context.
+
+    All three lookups (header, public tenant, domain fallback) go through
+    ``apps.tenants.resolution.tenant_cache`` so steady-state requests do not
+    query the database to resolve the tenant.
     """
     def get_public_tenant(self):
-        """Get or create the public tenant object."""
+        """Get or create the public tenant object (cached)."""
+        return tenant_cache.get_public(self._load_public_tenant)
+
+    def get_tenant(self, domain_model, hostname):
+        """Domain-based resolution used by TenantMainMiddleware.process_request (cached)."""
+        return tenant_cache.get_by_domain(hostname)
+
+    def _load_public_tenant(self):
         try:
             # Try to get the public tenant by schema_name
             from django.conf import settings
@@ -98,7 +110,7 @@ class TenantHeaderMiddleware(TenantMainMiddleware):
         if subdomain:
             try:
                 # Find the tenant (School) directly by subdomain
-                tenant = School.objects.get(subdomain__iexact=subdomain)
+                tenant = tenant_cache.get_by_subdomain(subdomain)
 
                 request.tenant = tenant
 
@@ -0,0 +1,245 @@
+"""
+Tenant resolution cache.
+
+Every tenant-scoped request has to turn an ``X-Tenant-Subdomain`` header or a
+hostname into a ``School`` before any view code runs. Doing that with a
+database query per request adds up quickly with mobile clients polling, so
+lookups go through two cache tiers:
+
+1. A per-process LRU with a short TTL (no network round trip at all).
+2. The shared Django cache (Redis in production), so a fresh worker or a
+   process whose LRU entry expired does not have to hit the database.
+
+Entries are invalidated from ``School`` / ``Domain`` save and delete signals
+(see ``apps.tenants.signals``). The signal clears the shared cache and the
+LRU of the process that made the change; other processes pick the change up
+once their local entry expires (``LOCAL_TTL``, 30 seconds by default).
+
+Configuration (all optional) via ``settings.TENANT_RESOLUTION_CACHE``::
+
+    TENANT_RESOLUTION_CACHE = {
+        'ENABLED': True,
+        'MAX_ENTRIES': 1024,
+        'LOCAL_TTL': 30,
+        'SHARED_TTL': 300,
+    }
+
+Usage:
+    from apps.tenants.resolution import tenant_cache
+
+    school = tenant_cache.get_by_subdomain('veda')
+    tenant_cache.stats()
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'tenant_resolve'
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 1024,
+    'LOCAL_TTL': 30,
+    'SHARED_TTL': 300,
+}
+
+
+def _get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'TENANT_RESOLUTION_CACHE', {}) or {})
+    return config
+
+
+def subdomain_key(subdomain):
+    return f"{CACHE_KEY_PREFIX}:subdomain:{subdomain.strip().lower()}"
+
+
+def domain_key(hostname):
+    return f"{CACHE_KEY_PREFIX}:domain:{hostname.strip().lower()}"
+
+
+def public_key():
+    return f"{CACHE_KEY_PREFIX}:public"
+
+
+class TenantResolutionCache:
+    """
+    Two-tier (process LRU + shared cache) lookup of School objects.
+
+    Only successful lookups are cached; a miss always falls through to the
+    database so a newly created school is visible immediately.
+    """
+
+    def __init__(self, max_entries=None, local_ttl=None, shared_ttl=None):
+        config = _get_config()
+        self.enabled = config['ENABLED']
+        self.max_entries = max_entries or config['MAX_ENTRIES']
+        self.local_ttl = local_ttl if local_ttl is not None else config['LOCAL_TTL']
+        self.shared_ttl = shared_ttl if shared_ttl is not None else config['SHARED_TTL']
+
+        self._entries = OrderedDict()  # key -> (expires_at, school)
+        self._lock = threading.Lock()
+        self._counters = {
+            'local_hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'invalidations': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public lookups
+    # ------------------------------------------------------------------
+
+    def get_by_subdomain(self, subdomain):
+        """Resolve a School by subdomain (case-insensitive)."""
+        from apps.tenants.models import School
+
+        return self._resolve(
+            subdomain_key(subdomain),
+            lambda: School.objects.select_related('subscription').get(subdomain__iexact=subdomain.strip()),
+        )
+
+    def get_by_domain(self, hostname):
+        """Resolve a School through its Domain row (production host-based routing)."""
+        from django_tenants.utils import get_tenant_domain_model
+
+        domain_model = get_tenant_domain_model()
+        return self._resolve(
+            domain_key(hostname),
+            lambda: domain_model.objects.select_related('tenant', 'tenant__subscription').get(domain=hostname).tenant,
+        )
+
+    def get_public(self, loader):
+        """Resolve the public tenant; ``loader`` fetches (or creates) it on a miss."""
+        return self._resolve(public_key(), loader)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, *keys):
+        """Drop the given keys from the local LRU and the shared cache."""
+        keys = [k for k in keys if k]
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+            self._counters['invalidations'] += len(keys)
+        try:
+            cache.delete_many(keys)
+        except Exception:
+            logger.warning("Failed to clear shared tenant cache keys %s", keys, exc_info=True)
+
+    def invalidate_school(self, school, extra_subdomains=(), extra_domains=()):
+        """Invalidate every entry that can resolve to ``school``."""
+        keys = []
+        for subdomain in {getattr(school, 'subdomain', None), *extra_subdomains}:
+            if subdomain:
+                keys.append(subdomain_key(subdomain))
+        for hostname in set(extra_domains):
+            if hostname:
+                keys.append(domain_key(hostname))
+
+        # Local entries pointing at this school (covers domains we cannot
+        # enumerate without a query, e.g. custom domains).
+        with self._lock:
+            keys.extend(
+                key for key, (_, cached) in self._entries.items()
+                if cached.pk == school.pk
+            )
+
+        if school.schema_name == getattr(settings, 'PUBLIC_SCHEMA_NAME', 'public'):
+            keys.append(public_key())
+
+        self.invalidate(*set(keys))
+
+    def clear(self):
+        """Drop all local entries (shared entries expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters for this process."""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['local_entries'] = len(self._entries)
+        lookups = counters['local_hits'] + counters['shared_hits'] + counters['misses']
+        counters['hit_rate'] = round(
+            (counters['local_hits'] + counters['shared_hits']) / lookups * 100, 2
+        ) if lookups else 0.0
+        return counters
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _resolve(self, key, loader):
+        if not self.enabled:
+            return loader()
+
+        school = self._get_local(key)
+        if school is not None:
+            self._incr('local_hits')
+            return copy.copy(school)
+
+        try:
+            school = cache.get(key)
+        except Exception:
+            logger.warning("Shared tenant cache unavailable, falling back to DB", exc_info=True)
+            school = None
+
+        if school is not None:
+            self._incr('shared_hits')
+            self._set_local(key, school)
+            return copy.copy(school)
+
+        self._incr('misses')
+        # Let DoesNotExist propagate to the caller — misses are not cached.
+        school = loader()
+        self._set_local(key, school)
+        try:
+            cache.set(key, school, self.shared_ttl)
+        except Exception:
+            logger.warning("Failed to store tenant %s in shared cache", key, exc_info=True)
+        return copy.copy(school)
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, school = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return school
+
+    def _set_local(self, key, school):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.local_ttl, school)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _incr(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+
+# Process-wide singleton used by the middleware and signal handlers.
+tenant_cache = TenantResolutionCache()
@@ -4,10 +4,11 @@ Django signals for tenant lifecycle events.
 Handles:
 - Welcome email when a new School is created
 - Expiry warning email 7 days before subscription ends (triggered by Celery beat)
+- Tenant resolution cache invalidation when a School or Domain changes
 """
 
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
@@ -71,3 +72,54 @@ def on_school_created(sender, instance, created, **kwargs):
     except Exception:
         # Never let email failure break tenant creation
         logger.exception(f"Failed to queue welcome email for school {instance.id}")
+
+
+# =====================
+# Tenant resolution cache
+# =====================
+
+@receiver(pre_save, sender='tenants.School')
+def remember_previous_subdomain(sender, instance, **kwargs):
+    """Stash the stored subdomain so a rename also evicts the old cache key."""
+    if instance._state.adding or not instance.pk:
+        return
+    instance._previous_subdomain = (
+        sender.objects.filter(pk=instance.pk).values_list('subdomain', flat=True).first()
+    )
+
+
+@receiver(post_save, sender='tenants.School')
+@receiver(post_delete, sender='tenants.School')
+def invalidate_school_resolution_cache(sender, instance, **kwargs):
+    """Evict every cached resolution of this school (subdomain, domains, public)."""
+    from apps.tenants.resolution import tenant_cache
+
+    previous = getattr(instance, '_previous_subdomain', None)
+    domains = list(instance.domains.values_list('domain', flat=True)) if instance.pk else []
+    tenant_cache.invalidate_school(
+        instance,
+        extra_subdomains=[previous] if previous else [],
+        extra_domains=domains,
+    )
+
+
+@receiver(pre_save, sender='tenants.Domain')
+def remember_previous_domain(sender, instance, **kwargs):
+    """Stash the stored hostname so a renamed domain stops resolving immediately."""
+    if instance._state.adding:
+        return
+    instance._previous_domain = (
+        sender.objects.filter(pk=instance.pk).values_list('domain', flat=True).first()
+    )
+
+
+@receiver(post_save, sender='tenants.Domain')
+@receiver(post_delete, sender='tenants.Domain')
+def invalidate_domain_resolution_cache(sender, instance, **kwargs):
+    from apps.tenants.resolution import domain_key, tenant_cache
+
+    keys = [domain_key(instance.domain)]
+    previous = getattr(instance, '_previous_domain', None)
+    if previous and previous != instance.domain:
+        keys.append(domain_key(previous))
+    tenant_cache.invalidate(*keys)
@@ -18,6 +18,7 @@ from apps.tenants.models import (
     FeatureDefinition, TenantFeature,
 )
 from apps.tenants.features import get_tenant_features, has_feature, _tier_gte
+from apps.tenants.resolution import TenantResolutionCache, tenant_cache
 
 
 # =====================
@@ -472,6 +473,83 @@ class TestFeatureService:
         assert mock_cache.set.called
 
 
+# =====================
+# Tenant Resolution Cache Tests
+# =====================
+
+@pytest.mark.django_db
+class TestTenantResolutionCache:
+
+    @pytest.fixture(autouse=True)
+    def _clear_caches(self, monkeypatch):
+        from django.core.cache import cache
+        from apps.platform_finance.tasks import sync_subscription_to_ledger
+
+        # Creating the school's subscription queues a ledger sync; no broker here
+        monkeypatch.setattr(sync_subscription_to_ledger, 'delay', lambda *args, **kwargs: None)
+        cache.clear()
+        tenant_cache.clear()
+        yield
+        cache.clear()
+        tenant_cache.clear()
+
+    def test_subdomain_lookup_is_cached(self, school, django_assert_num_queries):
+        resolver = TenantResolutionCache()
+        assert resolver.get_by_subdomain('TEST-SCHOOL').pk == school.pk
+        with django_assert_num_queries(0):
+            assert resolver.get_by_subdomain('test-school').pk == school.pk
+        stats = resolver.stats()
+        assert stats['misses'] == 1
+        assert stats['local_hits'] == 1
+
+    def test_shared_cache_used_when_local_entry_missing(self, school, django_assert_num_queries):
+        TenantResolutionCache().get_by_subdomain('test-school')
+        other_process = TenantResolutionCache()
+        with django_assert_num_queries(0):
+            assert other_process.get_by_subdomain('test-school').pk == school.pk
+        assert other_process.stats()['shared_hits'] == 1
+
+    def test_unknown_subdomain_raises_and_is_not_cached(self, school):
+        resolver = TenantResolutionCache()
+        with pytest.raises(School.DoesNotExist):
+            resolver.get_by_subdomain('nope')
+        assert resolver.stats()['local_entries'] == 0
+
+    def test_returns_copies(self, school):
+        resolver = TenantResolutionCache()
+        first = resolver.get_by_subdomain('test-school')
+        first.domain_url = 'mutated.example.com'
+        assert getattr(resolver.get_by_subdomain('test-school'), 'domain_url', None) != 'mutated.example.com'
+
+    def test_domain_lookup_is_cached(self, school, django_assert_num_queries):
+        Domain.objects.create(domain='test.schoolmgmt.in', tenant=school, is_primary=True)
+        assert tenant_cache.get_by_domain('test.schoolmgmt.in').pk == school.pk
+        with django_assert_num_queries(0):
+            assert tenant_cache.get_by_domain('test.schoolmgmt.in').pk == school.pk
+
+    def test_school_save_invalidates_old_and_new_subdomain(self, school):
+        tenant_cache.get_by_subdomain('test-school')
+        school.subdomain = 'renamed-school'
+        school.save()
+        with pytest.raises(School.DoesNotExist):
+            tenant_cache.get_by_subdomain('test-school')
+        assert tenant_cache.get_by_subdomain('renamed-school').pk == school.pk
+
+    def test_domain_save_invalidates_entry(self, school):
+        domain = Domain.objects.create(domain='old.schoolmgmt.in', tenant=school)
+        tenant_cache.get_by_domain('old.schoolmgmt.in')
+        domain.domain = 'new.schoolmgmt.in'
+        domain.save()
+        with pytest.raises(Domain.DoesNotExist):
+            tenant_cache.get_by_domain('old.schoolmgmt.in')
+
+    def test_lru_eviction(self, school, expired_school):
+        resolver = TenantResolutionCache(max_entries=1)
+        resolver.get_by_subdomain('test-school')
+        resolver.get_by_subdomain('expired-school')
+        assert resolver.stats()['local_entries'] == 1
+
+
 # =====================
 # API Tests
 # =====================
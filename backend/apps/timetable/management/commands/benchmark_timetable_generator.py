@@ -0,0 +1,105 @@
+"""
+Management command to benchmark the CSP timetable generator.
+
+Generates synthetic schools (no database access) and times
+``TimetableGenerator.generate()`` with the indexed occupancy checks against
+the previous full-timetable scans, which are kept as the un-indexed path of
+the constraint functions.
+
+Usage:
+    python manage.py benchmark_timetable_generator --sections 20 40 80
+    python manage.py benchmark_timetable_generator --sections 40 --baseline-max-sections 40
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.timetable.services.constraints import check_all_hard_constraints, check_lab_room_available
+from apps.timetable.services.generator import TimetableGenerator
+from apps.timetable.services.occupancy import Occupancy
+from apps.timetable.services.synthetic import build_synthetic_inputs
+
+
+class ScanTimetableGenerator(TimetableGenerator):
+    """The generator as it was: every hard-constraint check scans the timetable."""
+
+    def _get_valid_placements(self, timetable, section_id, teacher_id,
+                              consecutive, requires_lab, preferred_room_type):
+        placements = []
+        for day in self.days:
+            avail = self.teacher_availability.get((teacher_id, day)) if teacher_id else None
+            if avail and not avail['is_available']:
+                continue
+            for start_slot in range(self.num_slots - consecutive + 1):
+                if all(
+                    check_all_hard_constraints(
+                        timetable, section_id, day, start_slot + offset, teacher_id,
+                        None, False, self.teacher_availability, self.slot_info.get(start_slot + offset, {}),
+                    )[0]
+                    for offset in range(consecutive)
+                ):
+                    placements.append((day, start_slot))
+        return placements
+
+    def _find_room(self, timetable, day, start_slot, consecutive, requires_lab, preferred_room_type):
+        if not requires_lab and not preferred_room_type:
+            return None
+        for room in self._candidate_rooms(requires_lab, preferred_room_type):
+            if all(
+                check_lab_room_available(timetable, day, start_slot + offset, room['id'], True)
+                for offset in range(consecutive)
+            ):
+                return room['id']
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark CSP timetable generation on synthetic schools: indexed vs scanning checks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', nargs='+', type=int, default=[20, 40, 80], help='School sizes to generate')
+        parser.add_argument('--slots', type=int, default=8, help='Periods per day')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per size and engine')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for inputs and placement shuffling')
+        parser.add_argument(
+            '--baseline-max-sections', type=int, default=40,
+            help='Largest school to also time with the scanning checks (0 to skip the baseline)',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+
+        self.stdout.write(
+            f"\n{'sections':>8} {'blocks':>7} {'engine':<8} {'median s':>10} {'min s':>10} {'valid':>6}"
+        )
+        for num_sections in options['sections']:
+            inputs = build_synthetic_inputs(num_sections, num_slots=options['slots'], seed=options['seed'])
+            engines = [('indexed', TimetableGenerator)]
+            if num_sections <= options['baseline_max_sections']:
+                engines.append(('scan', ScanTimetableGenerator))
+
+            medians = {}
+            for name, generator_class in engines:
+                samples, timetable, blocks = [], None, 0
+                for _ in range(options['repeat']):
+                    random.seed(options['seed'])
+                    generator = generator_class(inputs)
+                    started = time.perf_counter()
+                    timetable = generator.generate()
+                    samples.append(time.perf_counter() - started)
+                    blocks = len(generator._build_assignments())
+                medians[name] = statistics.median(samples)
+                valid = timetable is not None and Occupancy(timetable).is_valid
+                self.stdout.write(
+                    f"{num_sections:>8} {blocks:>7} {name:<8} {medians[name]:>10.3f} "
+                    f"{min(samples):>10.3f} {'yes' if valid else 'no':>6}"
+                )
+
+            if 'scan' in medians and medians['indexed']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{num_sections:>8} sections: indexed speedup {medians['scan'] / medians['indexed']:.1f}x"
+                ))
@@ -0,0 +1,159 @@
+"""
+Management command to benchmark the timetable GA optimizer.
+
+Runs the CSP generator on a synthetic school (no database access), then
+times a fixed number of GA generations with each fitness engine:
+
+- incremental: per-row delta evaluation maintained by TimetableState
+- tensor: every generation scored as one batched NumPy tensor
+- dict: the previous per-timetable dict scoring, kept here as
+  ``DictFitnessOptimizer``
+
+Each engine's memory profile (peak RSS, net allocated blocks and GC
+collections per generation) is printed after the timings; add
+``--trace-allocations`` to also measure bytes allocated per generation with
+tracemalloc (slower, so timings with it are not comparable).
+
+With ``--islands N`` an incremental island-model run (N populations in a
+process pool) is timed as well; its gen/s counts generations on all islands.
+
+Usage:
+    python manage.py benchmark_timetable_optimizer --sections 20 --population 30 --generations 10
+"""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.timetable.models import TimetableGenerationConfig
+from apps.timetable.services.constraints import (
+    calc_consecutive_teacher_periods,
+    calc_heavy_subject_adjacency,
+    calc_room_changes,
+    calc_subject_clustering,
+    calc_teacher_preference_violations,
+    calc_workload_variance,
+)
+from apps.timetable.services.generator import TimetableGenerator
+from apps.timetable.services.optimizer import EVALUATION_BATCH, EVALUATION_INCREMENTAL, TimetableOptimizer
+from apps.timetable.services.synthetic import build_synthetic_inputs
+
+
+class DictFitnessOptimizer(TimetableOptimizer):
+    """The optimizer as it was: each timetable scored by walking the dict."""
+
+    def score_population(self, population):
+        return [self.dict_fitness(timetable) for timetable in population]
+
+    def dict_fitness(self, timetable):
+        score = 100.0
+        score -= self.weights['workload_balance'] * calc_workload_variance(
+            timetable, self.teachers, self.days
+        )
+        score -= self.weights['no_consecutive_heavy'] * calc_heavy_subject_adjacency(
+            timetable, self.heavy_subject_ids, self.section_ids, self.days, self.num_slots
+        )
+        score -= self.weights['subject_spread'] * calc_subject_clustering(
+            timetable, self.section_ids, self.days, self.num_slots
+        )
+        score -= self.weights['teacher_preference'] * calc_teacher_preference_violations(
+            timetable, self.teacher_availability, self.days
+        )
+        score -= self.weights['room_optimization'] * calc_room_changes(
+            timetable, self.section_ids, self.days, self.num_slots
+        )
+        score -= self.weights['workload_balance'] * calc_consecutive_teacher_periods(
+            timetable, self.teachers, self.days, self.num_slots, self.teacher_availability
+        ) * 0.5
+        return max(0.0, score)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark GA generations per second: incremental vs batched tensor vs dict fitness'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', type=int, default=20, help='Synthetic school size')
+        parser.add_argument('--population', type=int, default=30, help='GA population size')
+        parser.add_argument('--generations', type=int, default=10, help='Generations to run per engine')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for inputs, CSP and GA')
+        parser.add_argument('--skip-baseline', action='store_true', help='Do not time the dict fitness')
+        parser.add_argument('--islands', type=int, default=1, help='Also time an island-model run')
+        parser.add_argument('--trace-allocations', action='store_true',
+                            help='Measure bytes allocated per generation (tracemalloc)')
+
+    def handle(self, *args, **options):
+        if options['generations'] < 1:
+            raise CommandError('--generations must be at least 1')
+
+        inputs = build_synthetic_inputs(options['sections'], seed=options['seed'])
+        random.seed(options['seed'])
+        feasible = TimetableGenerator(inputs).generate()
+        if feasible is None:
+            raise CommandError('CSP found no feasible timetable for the synthetic school')
+
+        config = TimetableGenerationConfig(
+            population_size=options['population'],
+            max_iterations=options['generations'],
+        )
+        island_config = TimetableGenerationConfig(
+            population_size=options['population'],
+            max_iterations=options['generations'],
+            island_count=options['islands'],
+            migration_interval=max(1, options['generations'] // 4),
+        )
+        engines = [
+            ('incremental', TimetableOptimizer, EVALUATION_INCREMENTAL, config),
+            ('tensor', TimetableOptimizer, EVALUATION_BATCH, config),
+        ]
+        if options['islands'] > 1:
+            engines.append(
+                (f"islands x{options['islands']}", TimetableOptimizer, EVALUATION_INCREMENTAL, island_config),
+            )
+        if not options['skip_baseline']:
+            engines.append(('dict', DictFitnessOptimizer, EVALUATION_BATCH, config))
+
+        self.stdout.write(
+            f"\nsections: {options['sections']} | population: {options['population']} | "
+            f"generations: {options['generations']}\n"
+        )
+        self.stdout.write(f"{'fitness':<12} {'seconds':>10} {'gen/s':>10} {'score ms':>10} {'best':>8}")
+        rates = {}
+        profiles = {}
+        for name, optimizer_class, evaluation, engine_config in engines:
+            optimizer = optimizer_class(
+                feasible, inputs, engine_config, evaluation=evaluation, seed=options['seed'],
+                trace_allocations=options['trace_allocations'],
+            )
+            started = time.perf_counter()
+            _, best = optimizer.optimize()
+            elapsed = time.perf_counter() - started
+            rates[name] = optimizer.generations_run / elapsed
+            profiles[name] = optimizer.memory_profile.summary()
+
+            # Scoring alone: one full population
+            population = optimizer._generate_population()
+            started = time.perf_counter()
+            optimizer._score_states(population)
+            scoring_ms = (time.perf_counter() - started) * 1000
+
+            self.stdout.write(
+                f"{name:<12} {elapsed:>10.2f} {rates[name]:>10.2f} {scoring_ms:>10.1f} {best:>8.2f}"
+            )
+
+        self.stdout.write(
+            f"\n{'memory':<12} {'peak RSS MB':>12} {'blocks/gen':>12} {'gc/gen':>8} {'gc ms':>8} {'alloc KB/gen':>13}"
+        )
+        for name, profile in profiles.items():
+            allocated = profile.get('allocated_kb_per_generation', {}).get('mean', '-')
+            self.stdout.write(
+                f"{name:<12} {profile['peak_rss_mb']:>12} "
+                f"{profile['allocated_blocks_per_generation']['mean']:>12} "
+                f"{profile['gc_collections_per_generation']:>8} {profile['gc_pause_ms']:>8} {allocated:>13}"
+            )
+
+        if 'dict' in rates:
+            for name in [name for name in rates if name != 'dict']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name} speedup over dict fitness: {rates[name] / rates['dict']:.1f}x"
+                ))
@@ -0,0 +1,90 @@
+"""
+Management command to benchmark incremental (warm-start) regeneration.
+
+Generates a synthetic school, applies a mid-term change (a teacher on leave,
+extra periods for one class, a new teacher for one section) and compares
+regenerating from scratch with repairing the existing timetable: time taken
+and how many cells of the timetable in use would change.
+
+Usage:
+    python manage.py benchmark_timetable_repair --sections 40 80 160
+    python manage.py benchmark_timetable_repair --sections 80 --leave-days 3 --extra-periods 2
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.timetable.services.generator import TimetableGenerator
+from apps.timetable.services.occupancy import Occupancy
+from apps.timetable.services.repair import TimetableRepairer
+from apps.timetable.services.synthetic import build_midterm_change, build_synthetic_inputs
+
+
+class Command(BaseCommand):
+    help = 'Benchmark incremental timetable repair against full regeneration on synthetic schools'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', nargs='+', type=int, default=[40, 80, 160], help='School sizes to generate')
+        parser.add_argument('--slots', type=int, default=8, help='Periods per day')
+        parser.add_argument('--leave-days', type=int, default=2, help='Days the changed teacher is away')
+        parser.add_argument('--extra-periods', type=int, default=1, help='Periods added to one class')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per size and engine')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for inputs and placement shuffling')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+
+        self.stdout.write(
+            f"\n{'sections':>8} {'cells':>6} {'engine':<8} {'median s':>10} {'min s':>10} "
+            f"{'moved':>8} {'stable %':>9} {'valid':>6}"
+        )
+        for num_sections in options['sections']:
+            inputs = build_synthetic_inputs(num_sections, num_slots=options['slots'], seed=options['seed'])
+            random.seed(options['seed'])
+            current = TimetableGenerator(inputs).generate()
+            if current is None:
+                raise CommandError(f'No feasible starting timetable for {num_sections} sections')
+            changed = build_midterm_change(
+                inputs, leave_days=options['leave_days'],
+                extra_periods=options['extra_periods'], seed=options['seed'],
+            )
+
+            medians = {}
+            for name in ('full', 'repair'):
+                samples, timetable = [], None
+                for _ in range(options['repeat']):
+                    random.seed(options['seed'])
+                    started = time.perf_counter()
+                    if name == 'full':
+                        timetable = TimetableGenerator(changed).generate()
+                    else:
+                        timetable = TimetableRepairer(changed).repair(current)
+                    samples.append(time.perf_counter() - started)
+                medians[name] = statistics.median(samples)
+
+                valid = timetable is not None and Occupancy(timetable).is_valid
+                kept = _kept_cells(current, timetable or {})
+                self.stdout.write(
+                    f"{num_sections:>8} {len(current):>6} {name:<8} {medians[name]:>10.3f} "
+                    f"{min(samples):>10.3f} {len(current) - kept:>8} {100 * kept / len(current):>8.1f}% "
+                    f"{'yes' if valid else 'no':>6}"
+                )
+
+            if medians['repair']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{num_sections:>8} sections: repair speedup {medians['full'] / medians['repair']:.1f}x"
+                ))
+
+
+def _kept_cells(before, after):
+    """Cells of ``before`` with the same subject and teacher in ``after``."""
+    return sum(
+        1 for key, cell in before.items()
+        if key in after
+        and after[key]['subject_id'] == cell['subject_id']
+        and after[key]['teacher_id'] == cell['teacher_id']
+    )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetable', '0005_timetablegenerationconfig_island_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timetablegenerationrun',
+            name='mode',
+            field=models.CharField(choices=[('FULL', 'Full Generation'), ('INCREMENTAL', 'Incremental (Warm Start)')], default='FULL', help_text='INCREMENTAL repairs the current timetable instead of starting from scratch', max_length=20),
+        ),
+    ]
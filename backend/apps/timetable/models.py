@@ -314,6 +314,14 @@ class TimetableSubstitution(BaseModel):
             models.Index(fields=['substitute_teacher']),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored date so an edit that moves the substitution
+        # also frees the substitute on the old date (services.availability)
+        instance._stored_date = instance.date
+        return instance
+
     def __str__(self):
         return f"{self.original_teacher.get_full_name()} → {self.substitute_teacher.get_full_name()} on {self.date}"
 
@@ -629,6 +637,21 @@ class TimetableGenerationConfig(BaseModel):
         validators=[MinValueValidator(10), MaxValueValidator(200)],
         help_text='Population size for genetic algorithm'
     )
+    island_count = models.IntegerField(
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(16)],
+        help_text='Parallel GA populations (islands); 1 runs a single population'
+    )
+    migration_interval = models.IntegerField(
+        default=10,
+        validators=[MinValueValidator(1), MaxValueValidator(100)],
+        help_text='Generations between exchanges of the best individuals across islands'
+    )
+    random_seed = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text='Seed for reproducible optimization runs (empty = random)'
+    )
 
     # Soft constraint weights (0.0 to 1.0)
     weight_workload_balance = models.FloatField(
@@ -709,12 +732,23 @@ class TimetableGenerationRun(BaseModel):
         ('ROLLED_BACK', 'Rolled Back'),
     ]
 
+    MODE_CHOICES = [
+        ('FULL', 'Full Generation'),
+        ('INCREMENTAL', 'Incremental (Warm Start)'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     config = models.ForeignKey(
         TimetableGenerationConfig,
         on_delete=models.CASCADE,
         related_name='runs'
     )
+    mode = models.CharField(
+        max_length=20,
+        choices=MODE_CHOICES,
+        default='FULL',
+        help_text='INCREMENTAL repairs the current timetable instead of starting from scratch'
+    )
 
     status = models.CharField(
         max_length=20,
@@ -343,6 +343,7 @@ class TimetableGenerationConfigSerializer(serializers.ModelSerializer):
             'class_names', 'working_days',
             'algorithm', 'algorithm_display',
             'max_iterations', 'population_size',
+            'island_count', 'migration_interval', 'random_seed',
             'weight_workload_balance', 'weight_subject_spread',
             'weight_teacher_preference', 'weight_room_optimization',
             'weight_no_consecutive_heavy',
@@ -393,7 +394,7 @@ class TimetableGenerationRunSerializer(serializers.ModelSerializer):
     class Meta:
         model = TimetableGenerationRun
         fields = [
-            'id', 'config', 'config_name', 'status', 'status_display',
+            'id', 'config', 'config_name', 'mode', 'status', 'status_display',
             'progress_percent', 'progress_message',
             'generated_timetable', 'fitness_score',
             'conflicts_found', 'warnings',
@@ -403,7 +404,7 @@ class TimetableGenerationRunSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at',
         ]
         read_only_fields = [
-            'id', 'status', 'progress_percent', 'progress_message',
+            'id', 'mode', 'status', 'progress_percent', 'progress_message',
             'generated_timetable', 'fitness_score', 'conflicts_found',
             'warnings', 'started_at', 'completed_at', 'duration_seconds',
             'celery_task_id', 'error_message', 'triggered_by',
@@ -424,7 +425,7 @@ class TimetableGenerationRunListSerializer(serializers.ModelSerializer):
     class Meta:
         model = TimetableGenerationRun
         fields = [
-            'id', 'config', 'config_name', 'status', 'status_display',
+            'id', 'config', 'config_name', 'mode', 'status', 'status_display',
             'progress_percent', 'fitness_score', 'conflicts_found',
             'started_at', 'completed_at', 'duration_seconds',
             'created_at',
@@ -449,3 +450,8 @@ class TimetableGenerationRunProgressSerializer(serializers.ModelSerializer):
 class GenerationRunTriggerSerializer(serializers.Serializer):
     """Serializer for triggering a new generation run."""
     config_id = serializers.UUIDField(help_text='ID of the generation config to use')
+    mode = serializers.ChoiceField(
+        choices=TimetableGenerationRun.MODE_CHOICES,
+        default='FULL',
+        help_text='INCREMENTAL repairs the current timetable around the changed inputs'
+    )
@@ -3,9 +3,12 @@ AI Timetable Generation Services.
 
 This package contains the core scheduling engine:
 - constraints.py: Hard & soft constraint definitions
+- occupancy.py: Bitmask teacher/room/section occupancy for O(1) hard checks
 - generator.py: CSP backtracking solver for feasible timetables
 - optimizer.py: Genetic algorithm for optimizing soft constraints
+- tensor.py: NumPy timetable encoding and batched soft-constraint fitness
 - validators.py: Pre/post generation validation
+- synthetic.py: Synthetic school inputs for benchmarks
 """
 
 from .apply import apply_generated_timetable, rollback_generated_timetable, analyze_generated_timetable
@@ -1,18 +1,21 @@
 """
 Apply, rollback, and analysis utilities for generated timetables.
 
-- apply_generated_timetable: Write generated data into ClassTimetable + TeacherTimetable
-- rollback_generated_timetable: Restore from snapshot
+- apply_generated_timetable: Write the changed cells of generated data into
+  ClassTimetable + TeacherTimetable, keeping a reverse diff for rollback
+- rollback_generated_timetable: Undo an apply from its reverse diff
 - analyze_generated_timetable: Generate conflict/utilization reports
 """
 
+import uuid
 from collections import defaultdict
 from django.db import transaction
 from django.utils import timezone
 
 from apps.timetable.models import (
-    ClassTimetable, TeacherTimetable, TimeSlot, TimetableGenerationRun,
+    ClassTimetable, RoomAllocation, TeacherTimetable, TimeSlot, TimetableGenerationRun,
 )
+from apps.timetable.signals import timetable_cells_changed
 from apps.academics.models import Section
 
 
@@ -20,9 +23,11 @@ def apply_generated_timetable(run):
     """
     Apply a completed generation run to ClassTimetable and TeacherTimetable.
 
-    1. Snapshot current timetable for rollback
-    2. Delete existing entries for the affected sections/academic year
-    3. Create new entries from generated_timetable
+    1. Build the target cells from generated_timetable (sections and rooms
+       resolved in one query each)
+    2. Diff them against the current active rows of the affected sections
+    3. Write only the changed cells: bulk delete, bulk update, bulk create
+    4. Store the reverse diff of those changes for rollback
 
     Args:
         run: TimetableGenerationRun instance (status=COMPLETED)
@@ -47,108 +52,77 @@ def apply_generated_timetable(run):
     )
     slot_by_index = {idx: slot for idx, slot in enumerate(period_slots)}
 
-    with transaction.atomic():
-        # Step 1: Snapshot existing timetable for rollback
-        snapshot = _create_snapshot(academic_year, sections_data.keys())
-        run.rollback_snapshot = snapshot
-
-        # Step 2: Delete existing entries for affected sections
-        section_ids = []
-        for section_key in sections_data.keys():
-            # Try to resolve the section
-            try:
-                section = Section.objects.get(id=section_key)
-                section_ids.append(section.id)
-            except (Section.DoesNotExist, ValueError):
-                continue
-
-        deleted_class = ClassTimetable.objects.filter(
-            academic_year=academic_year,
-            section_id__in=section_ids,
-            is_active=True,
-        ).delete()
+    sections = {
+        str(section.id): section
+        for section in Section.objects.filter(id__in=_valid_ids(sections_data.keys()))
+    }
+    room_ids = {
+        slot_entry['room_id']
+        for section_data in sections_data.values()
+        for slots in section_data.get('days', {}).values()
+        for slot_entry in slots
+        if slot_entry.get('subject_id') and slot_entry.get('room_id')
+    }
+    room_numbers = {
+        str(room_id): room_number
+        for room_id, room_number in RoomAllocation.objects.filter(
+            id__in=_valid_ids(room_ids)
+        ).values_list('id', 'room_number')
+    }
 
-        deleted_teacher = TeacherTimetable.objects.filter(
-            academic_year=academic_year,
-            section_id__in=section_ids,
-            is_active=True,
-        ).delete()
-
-        # Step 3: Create new entries
-        class_entries_created = 0
-        teacher_entries_created = 0
-
-        for section_key, section_data in sections_data.items():
-            try:
-                section = Section.objects.select_related('class_instance').get(id=section_key)
-            except (Section.DoesNotExist, ValueError):
-                continue
-
-            class_obj = section.class_instance
-            days_data = section_data.get('days', {})
-
-            for day, slots in days_data.items():
-                for slot_entry in slots:
-                    subject_id = slot_entry.get('subject_id')
-                    teacher_id = slot_entry.get('teacher_id')
-                    slot_idx = slot_entry.get('slot_index', 0)
-                    room_id = slot_entry.get('room_id')
-
-                    if not subject_id:
-                        continue  # Skip empty slots
-
-                    time_slot = slot_by_index.get(slot_idx)
-                    if not time_slot:
-                        continue
-
-                    # Determine room_number from room_id
-                    room_number = ''
-                    if room_id:
-                        from apps.timetable.models import RoomAllocation
-                        try:
-                            room = RoomAllocation.objects.get(id=room_id)
-                            room_number = room.room_number
-                        except RoomAllocation.DoesNotExist:
-                            pass
-
-                    # Create ClassTimetable entry
-                    ClassTimetable.objects.create(
-                        academic_year=academic_year,
-                        class_obj=class_obj,
-                        section=section,
-                        day_of_week=day,
-                        time_slot=time_slot,
-                        subject_id=subject_id,
-                        teacher_id=teacher_id,
-                        room_number=room_number,
-                        is_active=True,
-                    )
-                    class_entries_created += 1
-
-                    # Create TeacherTimetable entry (denormalized)
-                    if teacher_id:
-                        TeacherTimetable.objects.create(
-                            academic_year=academic_year,
-                            teacher_id=teacher_id,
-                            day_of_week=day,
-                            time_slot=time_slot,
-                            class_obj=class_obj,
-                            section=section,
-                            subject_id=subject_id,
-                            room_number=room_number,
-                            is_active=True,
-                        )
-                        teacher_entries_created += 1
-
-        # Step 4: Update run status
+    class_cells = {}
+    for section_key, section_data in sections_data.items():
+        section = sections.get(str(section_key))
+        if section is None:
+            continue
+
+        for day, slots in section_data.get('days', {}).items():
+            for slot_entry in slots:
+                subject_id = slot_entry.get('subject_id')
+                if not subject_id:
+                    continue  # Skip empty slots
+
+                time_slot = slot_by_index.get(slot_entry.get('slot_index', 0))
+                if not time_slot:
+                    continue
+
+                class_cells[(str(section.id), day, str(time_slot.id))] = (
+                    str(section.class_instance_id),
+                    str(subject_id),
+                    _id(slot_entry.get('teacher_id')),
+                    room_numbers.get(str(slot_entry.get('room_id')), ''),
+                )
+
+    section_ids = list(sections)
+    with transaction.atomic():
+        class_diff = _sync_rows(CLASS_ROWS, academic_year, section_ids, class_cells)
+        teacher_diff = _sync_rows(
+            TEACHER_ROWS, academic_year, section_ids, _teacher_cells(class_cells),
+        )
+
+        run.rollback_snapshot = {
+            'format': 'diff',
+            'section_ids': section_ids,
+            'class': class_diff.reverse,
+            'teacher': teacher_diff.reverse,
+            'created_at': timezone.now().isoformat(),
+        }
         run.status = 'APPLIED'
         run.save(update_fields=['status', 'rollback_snapshot'])
 
+        _send_cells_changed(academic_year, class_diff)
+
     return {
         'message': 'Timetable applied successfully.',
-        'class_entries_created': class_entries_created,
-        'teacher_entries_created': teacher_entries_created,
+        'class_entries_created': class_diff.created,
+        'class_entries_updated': class_diff.updated,
+        'class_entries_deleted': class_diff.deleted,
+        'class_entries_unchanged': class_diff.unchanged,
+        'teacher_entries_created': teacher_diff.created,
+        'teacher_entries_updated': teacher_diff.updated,
+        'teacher_entries_deleted': teacher_diff.deleted,
         'sections_affected': len(section_ids),
+        'sections_changed': len(class_diff.changed_sections),
     }
 
 
@@ -156,6 +130,11 @@ def rollback_generated_timetable(run):
     """
     Rollback to the timetable state before a generation run was applied.
 
+    Diff snapshots are undone cell by cell: cells the run created are
+    deleted, and updated or deleted cells get their previous values back.
+    Full snapshots (``entries``) from before diff-based apply are restored
+    by syncing the sections to the snapshot.
+
     Args:
         run: TimetableGenerationRun instance (status=APPLIED)
 
@@ -164,71 +143,45 @@ def rollback_generated_timetable(run):
     """
     config = run.config
     academic_year = config.academic_year
-    snapshot = run.rollback_snapshot
-
-    if not snapshot or 'entries' not in snapshot:
+    snapshot = run.rollback_snapshot or {}
+
+    if snapshot.get('format') == 'diff':
+        targets = None
+    elif 'entries' in snapshot:
+        class_cells = {
+            (str(entry['section_id']), entry['day_of_week'], str(entry['time_slot_id'])): (
+                str(entry['class_obj_id']),
+                _id(entry.get('subject_id')),
+                _id(entry.get('teacher_id')),
+                entry.get('room_number') or '',
+            )
+            for entry in snapshot['entries']
+        }
+        targets = (class_cells, _teacher_cells(class_cells))
+    else:
         raise ValueError('No rollback snapshot available.')
 
+    section_ids = snapshot.get('section_ids', [])
     with transaction.atomic():
-        # Delete current entries for affected sections
-        section_ids = snapshot.get('section_ids', [])
-
-        ClassTimetable.objects.filter(
-            academic_year=academic_year,
-            section_id__in=section_ids,
-            is_active=True,
-        ).delete()
-
-        TeacherTimetable.objects.filter(
-            academic_year=academic_year,
-            section_id__in=section_ids,
-            is_active=True,
-        ).delete()
-
-        # Restore from snapshot
-        restored_class = 0
-        restored_teacher = 0
-
-        for entry in snapshot.get('entries', []):
-            time_slot = TimeSlot.objects.filter(id=entry['time_slot_id']).first()
-            if not time_slot:
-                continue
-
-            ClassTimetable.objects.create(
-                academic_year_id=entry['academic_year_id'],
-                class_obj_id=entry['class_obj_id'],
-                section_id=entry['section_id'],
-                day_of_week=entry['day_of_week'],
-                time_slot=time_slot,
-                subject_id=entry.get('subject_id'),
-                teacher_id=entry.get('teacher_id'),
-                room_number=entry.get('room_number', ''),
-                is_active=True,
-            )
-            restored_class += 1
-
-            if entry.get('teacher_id'):
-                TeacherTimetable.objects.create(
-                    academic_year_id=entry['academic_year_id'],
-                    teacher_id=entry['teacher_id'],
-                    day_of_week=entry['day_of_week'],
-                    time_slot=time_slot,
-                    class_obj_id=entry['class_obj_id'],
-                    section_id=entry['section_id'],
-                    subject_id=entry.get('subject_id'),
-                    room_number=entry.get('room_number', ''),
-                    is_active=True,
-                )
-                restored_teacher += 1
+        if targets is None:
+            class_diff = _undo_rows(CLASS_ROWS, academic_year, section_ids, snapshot.get('class', {}))
+            teacher_diff = _undo_rows(TEACHER_ROWS, academic_year, section_ids, snapshot.get('teacher', {}))
+        else:
+            class_diff = _sync_rows(CLASS_ROWS, academic_year, section_ids, targets[0])
+            teacher_diff = _sync_rows(TEACHER_ROWS, academic_year, section_ids, targets[1])
 
         # Update run status
         run.status = 'ROLLED_BACK'
         run.save(update_fields=['status'])
 
+        _send_cells_changed(academic_year, class_diff)
+
     return {
         'message': 'Timetable rolled back successfully.',
-        'class_entries_restored': restored_class,
-        'teacher_entries_restored': restored_teacher,
+        'class_entries_restored': class_diff.created + class_diff.updated,
+        'class_entries_removed': class_diff.deleted,
+        'teacher_entries_restored': teacher_diff.created + teacher_diff.updated,
+        'teacher_entries_removed': teacher_diff.deleted,
     }
 
 
@@ -242,6 +195,8 @@ def analyze_generated_timetable(run):
         - room_utilization: periods per room per day
         - subject_distribution: how subjects are spread
         - potential_issues: list of observations
+        - optimizer: GA run statistics (generations, peak RSS, allocations
+          and GC per generation) when the run was optimized
     """
     generated = run.generated_timetable
     if not generated or 'sections' not in generated:
@@ -323,6 +278,7 @@ def analyze_generated_timetable(run):
         'room_utilization': room_utilization,
         'subject_distribution': subject_distribution,
         'potential_issues': issues,
+        'optimizer': generated.get('optimizer'),
         'summary': {
             'total_teachers': len(teacher_total),
             'total_sections': len(sections_data),
@@ -331,33 +287,165 @@ def analyze_generated_timetable(run):
     }
 
 
-def _create_snapshot(academic_year, section_keys):
+class RowSpec:
     """
-    Create a snapshot of existing timetable entries for rollback.
+    How one timetable table is diffed: the fields naming a cell (``key``,
+    unique per academic year) and the fields stored in it (``values``).
+    All ids are compared as strings.
     """
-    section_ids = list(section_keys)
-    entries = ClassTimetable.objects.filter(
+
+    def __init__(self, model, key, values):
+        self.model = model
+        self.key = key
+        self.values = values
+        self.section_index = (key + values).index('section_id')
+
+    def section_of(self, key, values):
+        return (key + values)[self.section_index]
+
+
+CLASS_ROWS = RowSpec(
+    ClassTimetable,
+    key=('section_id', 'day_of_week', 'time_slot_id'),
+    values=('class_obj_id', 'subject_id', 'teacher_id', 'room_number'),
+)
+TEACHER_ROWS = RowSpec(
+    TeacherTimetable,
+    key=('teacher_id', 'day_of_week', 'time_slot_id'),
+    values=('class_obj_id', 'section_id', 'subject_id', 'room_number'),
+)
+
+
+class RowDiff:
+    """
+    Outcome of syncing one table: counts, the sections whose cells changed,
+    and ``reverse``, the compact diff that undoes the sync:
+
+        created   [key, ...]            cells to delete again
+        updated   [key + values, ...]   previous values to write back
+        deleted   [key + values, ...]   rows to recreate
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.deleted = 0
+        self.unchanged = 0
+        self.changed_sections = set()
+        self.reverse = {'created': [], 'updated': [], 'deleted': []}
+
+
+def _sync_rows(spec, academic_year, section_ids, targets):
+    """
+    Make the active rows of ``section_ids`` match ``targets``
+    (key tuple -> values tuple), touching only cells that differ.
+    """
+    current = _current_rows(spec, academic_year, section_ids)
+    diff = RowDiff()
+    to_create, to_update, to_delete = [], [], []
+
+    for key, (row_id, values) in current.items():
+        target = targets.get(key)
+        if target == values:
+            diff.unchanged += 1
+            continue
+        if target is None:
+            to_delete.append(row_id)
+            diff.reverse['deleted'].append(list(key + values))
+        else:
+            to_update.append(spec.model(id=row_id, **dict(zip(spec.values, target))))
+            diff.reverse['updated'].append(list(key + values))
+            diff.changed_sections.add(spec.section_of(key, target))
+        diff.changed_sections.add(spec.section_of(key, values))
+
+    for key, values in targets.items():
+        if key in current:
+            continue
+        to_create.append(_new_row(spec, academic_year, key, values))
+        diff.reverse['created'].append(list(key))
+        diff.changed_sections.add(spec.section_of(key, values))
+
+    _write(spec, to_create, to_update, to_delete)
+    diff.created, diff.updated, diff.deleted = len(to_create), len(to_update), len(to_delete)
+    return diff
+
+
+def _undo_rows(spec, academic_year, section_ids, reverse):
+    """Apply a reverse diff recorded by ``_sync_rows``."""
+    size = len(spec.key)
+    targets = {
+        key: values
+        for key, (row_id, values) in _current_rows(spec, academic_year, section_ids).items()
+    }
+    for key in reverse.get('created', []):
+        targets.pop(tuple(key), None)
+    for entry in reverse.get('updated', []) + reverse.get('deleted', []):
+        targets[tuple(entry[:size])] = tuple(entry[size:])
+    return _sync_rows(spec, academic_year, section_ids, targets)
+
+
+def _current_rows(spec, academic_year, section_ids):
+    """Active rows of the sections, as key -> (row id, values) with string ids."""
+    rows = spec.model.objects.filter(
         academic_year=academic_year,
         section_id__in=section_ids,
         is_active=True,
-    ).values(
-        'academic_year_id', 'class_obj_id', 'section_id',
-        'day_of_week', 'time_slot_id', 'subject_id',
-        'teacher_id', 'room_number',
-    )
+    ).values_list('id', *spec.key, *spec.values)
+    size = len(spec.key)
+    current = {}
+    for row_id, *fields in rows:
+        fields = tuple(_id(value) for value in fields)
+        current[fields[:size]] = (row_id, fields[size:])
+    return current
+
+
+def _new_row(spec, academic_year, key, values):
+    fields = dict(zip(spec.key, key))
+    fields.update(zip(spec.values, values))
+    return spec.model(academic_year=academic_year, is_active=True, **fields)
+
+
+def _write(spec, to_create, to_update, to_delete):
+    # Deletes first: a freed cell may be taken by a created row
+    if to_delete:
+        spec.model.objects.filter(id__in=to_delete).delete()
+    if to_update:
+        now = timezone.now()
+        for row in to_update:
+            row.updated_at = now
+        spec.model.objects.bulk_update(to_update, [*spec.values, 'updated_at'], batch_size=500)
+    if to_create:
+        spec.model.objects.bulk_create(to_create, batch_size=500)
+
+
+def _teacher_cells(class_cells):
+    """TeacherTimetable targets mirroring the class cells that have a teacher."""
+    cells = {}
+    for (section_id, day, time_slot_id), (class_obj_id, subject_id, teacher_id, room_number) in class_cells.items():
+        if teacher_id and subject_id:
+            cells[(teacher_id, day, time_slot_id)] = (class_obj_id, section_id, subject_id, room_number)
+    return cells
+
+
+def _send_cells_changed(academic_year, class_diff):
+    if class_diff.changed_sections:
+        timetable_cells_changed.send(
+            sender=ClassTimetable,
+            academic_year=academic_year,
+            section_ids=sorted(class_diff.changed_sections),
+        )
 
-    # Convert to serializable format
-    snapshot_entries = []
-    for e in entries:
-        entry = dict(e)
-        # Convert UUIDs/IDs to strings for JSON serialization
-        for key in entry:
-            if entry[key] is not None and hasattr(entry[key], 'hex'):
-                entry[key] = str(entry[key])
-        snapshot_entries.append(entry)
 
-    return {
-        'section_ids': [str(sid) for sid in section_ids],
-        'entries': snapshot_entries,
-        'created_at': timezone.now().isoformat(),
-    }
+def _id(value):
+    return None if value is None else str(value)
+
+
+def _valid_ids(values):
+    """The values that are valid UUIDs (generated keys may be arbitrary strings)."""
+    valid = []
+    for value in values:
+        try:
+            valid.append(uuid.UUID(str(value)))
+        except ValueError:
+            continue
+    return valid
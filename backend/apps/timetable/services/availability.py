@@ -0,0 +1,316 @@
+"""
+Materialised free-slot index for finding substitute teachers.
+
+Finding a free teacher for a period used to mean filtering TeacherTimetable
+per request. ``FreeSlotIndex`` keeps, per academic year, one busy bitset per
+(day, time slot) in the cache: bit ``i`` is set when the index's i-th
+teacher teaches then. The free teachers of a period are ``pool & ~busy``,
+and a teacher's load for a day is one bit test per slot.
+
+Date-specific changes sit in a per-date overlay on top of the weekly sets:
+substitutes already claimed for a period (pending or approved
+substitutions) and teachers on approved leave that day.
+
+- The weekly sets are rebuilt once a generated timetable is applied or
+  rolled back, and dropped when TeacherTimetable rows are edited by hand.
+- Substitutions and staff leave update the cached overlays of their dates
+  in place (see ``apps.timetable.signals``).
+- Anything missing from the cache is rebuilt from the database on read.
+
+Overlays are keyed by the version of the weekly index they were built
+against, because bit positions change when the index is rebuilt.
+
+Usage:
+    index = FreeSlotIndex.for_year(academic_year.id)
+    index.free_teachers(date, time_slot_id)
+    index.rank_candidates(date, time_slot_id, subject_id=subject.id, exclude=[absent.id])
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+
+# Staff who can stand in for a class, besides anyone already on the timetable
+TEACHING_DESIGNATIONS = (
+    'HEAD_TEACHER', 'SENIOR_TEACHER', 'TEACHER', 'JUNIOR_TEACHER', 'PRIMARY_TEACHER',
+    'PRT', 'TGT', 'PGT', 'SPORTS_TEACHER',
+)
+
+# Substitutions that occupy the substitute for the period
+ACTIVE_SUBSTITUTION_STATUSES = ('PENDING', 'APPROVED')
+
+INDEX_TTL = 7 * 24 * 3600
+OVERLAY_TTL = 24 * 3600
+
+
+def day_of_week(on_date):
+    return on_date.strftime('%A').upper()
+
+
+def _index_key(academic_year_id):
+    schema = getattr(connection, 'schema_name', 'public')
+    return f'free_slots:{schema}:{academic_year_id}'
+
+
+def _overlay_key(academic_year_id, version, on_date):
+    return f'{_index_key(academic_year_id)}:{version}:{on_date.isoformat()}'
+
+
+class FreeSlotIndex:
+    """Weekly busy bitsets of one academic year, with per-date overlays."""
+
+    def __init__(self, academic_year_id, version, teachers, slot_ids, busy, subjects):
+        self.academic_year_id = str(academic_year_id)
+        self.version = version
+        self.teachers = teachers            # bit position -> teacher id (str)
+        self.slot_ids = slot_ids            # period slot ids (str), in order
+        self.busy = busy                    # (day, slot id) -> bitset
+        self.subjects = subjects            # teacher id -> set of subject ids (str)
+        self.bits = {teacher_id: idx for idx, teacher_id in enumerate(teachers)}
+        self.pool = (1 << len(teachers)) - 1
+
+    # ------------------------------------------------------------------
+    # Building and caching
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def for_year(cls, academic_year_id):
+        """The cached index of the year, built from the database on a miss."""
+        state = cache.get(_index_key(academic_year_id))
+        if state is None:
+            return cls.rebuild(academic_year_id)
+        return cls(academic_year_id, **state)
+
+    @classmethod
+    def cached(cls, academic_year_id):
+        """The cached index of the year, or None (no database access)."""
+        state = cache.get(_index_key(academic_year_id))
+        return cls(academic_year_id, **state) if state is not None else None
+
+    @classmethod
+    def rebuild(cls, academic_year_id):
+        index = cls.build(academic_year_id)
+        cache.set(_index_key(academic_year_id), index.state(), INDEX_TTL)
+        return index
+
+    @classmethod
+    def invalidate(cls, academic_year_id):
+        cache.delete(_index_key(academic_year_id))
+
+    @classmethod
+    def build(cls, academic_year_id):
+        from apps.academics.models import ClassSubject
+        from apps.staff.models import StaffMember
+        from apps.timetable.models import SubjectPeriodRequirement, TeacherTimetable, TimeSlot
+
+        rows = list(
+            TeacherTimetable.objects.filter(academic_year_id=academic_year_id, is_active=True)
+            .values_list('teacher_id', 'day_of_week', 'time_slot_id', 'subject_id')
+        )
+        teacher_ids = {str(row[0]) for row in rows}
+        teacher_ids.update(
+            str(pk) for pk in StaffMember.objects.filter(
+                employment_status='ACTIVE', designation__in=TEACHING_DESIGNATIONS,
+            ).values_list('id', flat=True)
+        )
+        teachers = sorted(teacher_ids)
+        bits = {teacher_id: idx for idx, teacher_id in enumerate(teachers)}
+
+        busy = {}
+        subjects = {}
+        for teacher_id, day, slot_id, subject_id in rows:
+            teacher_id = str(teacher_id)
+            key = (day, str(slot_id))
+            busy[key] = busy.get(key, 0) | (1 << bits[teacher_id])
+            subjects.setdefault(teacher_id, set()).add(str(subject_id))
+
+        # Subjects a teacher is assigned to teach, even if not this term
+        assigned = list(
+            ClassSubject.objects.filter(academic_year_id=academic_year_id, teacher__isnull=False)
+            .values_list('teacher_id', 'subject_id')
+        ) + list(
+            SubjectPeriodRequirement.objects.filter(academic_year_id=academic_year_id, teacher__isnull=False)
+            .values_list('teacher_id', 'subject_id')
+        )
+        for teacher_id, subject_id in assigned:
+            if str(teacher_id) in bits:
+                subjects.setdefault(str(teacher_id), set()).add(str(subject_id))
+
+        slot_ids = [
+            str(pk) for pk in TimeSlot.objects.filter(slot_type='PERIOD', is_active=True)
+            .order_by('order').values_list('id', flat=True)
+        ]
+        return cls(academic_year_id, uuid.uuid4().hex, teachers, slot_ids, busy, subjects)
+
+    def state(self):
+        return {
+            'version': self.version,
+            'teachers': self.teachers,
+            'slot_ids': self.slot_ids,
+            'busy': self.busy,
+            'subjects': self.subjects,
+        }
+
+    # ------------------------------------------------------------------
+    # Per-date overlays
+    # ------------------------------------------------------------------
+
+    def overlay(self, on_date):
+        """
+        {'busy': {slot id: bitset}, 'away': bitset} for ``on_date``: claimed
+        substitutes per period and teachers on approved leave.
+        """
+        key = _overlay_key(self.academic_year_id, self.version, on_date)
+        overlay = cache.get(key)
+        if overlay is None:
+            overlay = self.build_overlay(on_date)
+            cache.set(key, overlay, OVERLAY_TTL)
+        return overlay
+
+    def build_overlay(self, on_date):
+        from apps.attendance.models import StaffLeave
+        from apps.timetable.models import TimetableSubstitution
+
+        overlay = {'busy': {}, 'away': 0}
+        substitutions = TimetableSubstitution.objects.filter(
+            academic_year_id=self.academic_year_id, date=on_date,
+            status__in=ACTIVE_SUBSTITUTION_STATUSES,
+        ).values_list('substitute_teacher_id', 'original_entry__time_slot_id')
+        for teacher_id, slot_id in substitutions:
+            _claim(overlay, self.bits.get(str(teacher_id)), str(slot_id))
+
+        on_leave = StaffLeave.objects.filter(
+            status='APPROVED', start_date__lte=on_date, end_date__gte=on_date,
+        ).values_list('staff_member_id', flat=True)
+        for teacher_id in on_leave:
+            bit = self.bits.get(str(teacher_id))
+            if bit is not None:
+                overlay['away'] |= 1 << bit
+        return overlay
+
+    def update_overlays(self, dates, change):
+        """Apply ``change(overlay)`` to the cached overlays of ``dates``; others are left to rebuild."""
+        cached = cache.get_many([_overlay_key(self.academic_year_id, self.version, on_date) for on_date in dates])
+        for overlay in cached.values():
+            change(overlay)
+        if cached:
+            cache.set_many(cached, OVERLAY_TTL)
+
+    def drop_overlays(self, dates):
+        cache.delete_many([_overlay_key(self.academic_year_id, self.version, on_date) for on_date in dates])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def busy_mask(self, on_date, time_slot_id, overlay=None):
+        """Teachers who cannot take ``time_slot_id`` on ``on_date``."""
+        overlay = overlay or self.overlay(on_date)
+        slot_id = str(time_slot_id)
+        return (
+            self.busy.get((day_of_week(on_date), slot_id), 0)
+            | overlay['busy'].get(slot_id, 0)
+            | overlay['away']
+        )
+
+    def free_teachers(self, on_date, time_slot_id):
+        free = self.pool & ~self.busy_mask(on_date, time_slot_id)
+        return [teacher_id for idx, teacher_id in enumerate(self.teachers) if free >> idx & 1]
+
+    def periods_on(self, on_date, overlay=None):
+        """Periods per teacher (bit position -> count) on ``on_date``, substitutions included."""
+        overlay = overlay or self.overlay(on_date)
+        day = day_of_week(on_date)
+        loads = {}
+        for slot_id in self.slot_ids:
+            mask = self.busy.get((day, slot_id), 0) | overlay['busy'].get(slot_id, 0)
+            while mask:
+                low = mask & -mask
+                idx = low.bit_length() - 1
+                loads[idx] = loads.get(idx, 0) + 1
+                mask ^= low
+        return loads
+
+    def rank_candidates(self, on_date, time_slot_id, subject_id=None, exclude=()):
+        """
+        Free teachers for the period, best first: those who teach
+        ``subject_id`` before the rest, then the lightest day.
+
+        Returns a list of {'teacher_id', 'subject_match', 'periods_today'}.
+        """
+        overlay = self.overlay(on_date)
+        free = self.pool & ~self.busy_mask(on_date, time_slot_id, overlay)
+        for teacher_id in exclude:
+            bit = self.bits.get(str(teacher_id))
+            if bit is not None:
+                free &= ~(1 << bit)
+
+        loads = self.periods_on(on_date, overlay)
+        subject_id = str(subject_id) if subject_id else None
+        candidates = []
+        for idx, teacher_id in enumerate(self.teachers):
+            if free >> idx & 1:
+                candidates.append({
+                    'teacher_id': teacher_id,
+                    'subject_match': subject_id in self.subjects.get(teacher_id, ()),
+                    'periods_today': loads.get(idx, 0),
+                })
+        candidates.sort(key=lambda c: (not c['subject_match'], c['periods_today']))
+        return candidates
+
+
+def _claim(overlay, bit, slot_id):
+    if bit is not None:
+        overlay['busy'][slot_id] = overlay['busy'].get(slot_id, 0) | (1 << bit)
+
+
+def record_substitution(substitution, deleted=False, created=False, previous_date=None):
+    """
+    Mark the substitute of a new substitution busy in the cached overlay of
+    its date. Any other change drops the overlays of the substitution's date
+    and ``previous_date`` (where an edit moved it from).
+    """
+    index = FreeSlotIndex.cached(substitution.academic_year_id)
+    if index is None:
+        return
+    if deleted or not created or substitution.status not in ACTIVE_SUBSTITUTION_STATUSES:
+        # The previous substitute may be free again while another
+        # substitution still claims them; rebuild those dates
+        index.drop_overlays({substitution.date, previous_date or substitution.date})
+        return
+
+    bit = index.bits.get(str(substitution.substitute_teacher_id))
+    slot_id = str(substitution.original_entry.time_slot_id)
+    index.update_overlays([substitution.date], lambda overlay: _claim(overlay, bit, slot_id))
+
+
+def record_staff_leave(leave, deleted=False, created=False, previous_dates=None):
+    """
+    Mark the staff member of a new approved leave away in the cached overlays
+    of its dates. Any other change drops the overlays of the leave's dates
+    and of ``previous_dates`` (the ``(start_date, end_date)`` an edit moved
+    it from).
+    """
+    from apps.academics.models import AcademicYear
+
+    ranges = {(leave.start_date, leave.end_date), previous_dates or (leave.start_date, leave.end_date)}
+    dates = {
+        start_date + timedelta(days=offset)
+        for start_date, end_date in ranges
+        for offset in range((end_date - start_date).days + 1)
+    }
+    years = AcademicYear.objects.filter(
+        start_date__lte=max(dates), end_date__gte=min(dates),
+    ).values_list('id', flat=True)
+    for academic_year_id in years:
+        index = FreeSlotIndex.cached(academic_year_id)
+        if index is None:
+            continue
+        if deleted or not created or leave.status != 'APPROVED':
+            index.drop_overlays(dates)
+            continue
+        bit = index.bits.get(str(leave.staff_member_id))
+        if bit is not None:
+            index.update_overlays(dates, lambda overlay: overlay.update(away=overlay['away'] | (1 << bit)))
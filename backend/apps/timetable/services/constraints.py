@@ -12,7 +12,7 @@ from collections import defaultdict
 # HARD CONSTRAINTS — Must all pass for a valid timetable
 # ============================================================================
 
-def check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id):
+def check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id, occupancy=None):
     """
     H1: No teacher teaches two classes at the same time slot.
 
@@ -21,6 +21,8 @@ def check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id):
         day: day string (e.g. 'MONDAY')
         slot_idx: integer slot index
         teacher_id: teacher to check
+        occupancy: optional Occupancy index kept in sync with timetable;
+                   makes the check O(1) instead of a scan of the timetable
 
     Returns:
         True if no conflict, False if teacher is already booked.
@@ -28,6 +30,9 @@ def check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id):
     if teacher_id is None:
         return True
 
+    if occupancy is not None:
+        return occupancy.teacher_free(teacher_id, day, slot_idx)
+
     for key, assignment in timetable.items():
         if assignment is None:
             continue
@@ -37,15 +42,17 @@ def check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id):
     return True
 
 
-def check_section_no_double_booking(timetable, section_id, day, slot_idx):
+def check_section_no_double_booking(timetable, section_id, day, slot_idx, occupancy=None):
     """
     H2: No class section has two subjects in the same time slot.
     """
+    if occupancy is not None:
+        return occupancy.section_free(section_id, day, slot_idx)
     key = (section_id, day, slot_idx)
     return key not in timetable or timetable[key] is None
 
 
-def check_lab_room_available(timetable, day, slot_idx, room_id, requires_lab):
+def check_lab_room_available(timetable, day, slot_idx, room_id, requires_lab, occupancy=None):
     """
     H4: Lab subjects must be assigned to lab rooms.
     If requires_lab is True and room_id is None, this fails.
@@ -57,6 +64,9 @@ def check_lab_room_available(timetable, day, slot_idx, room_id, requires_lab):
     if room_id is None:
         return False
 
+    if occupancy is not None:
+        return occupancy.room_free(room_id, day, slot_idx)
+
     # Check room not already used at this time
     for key, assignment in timetable.items():
         if assignment is None:
@@ -109,26 +119,28 @@ def check_slot_is_period(slot_info):
 
 def check_all_hard_constraints(
     timetable, section_id, day, slot_idx, teacher_id,
-    room_id, requires_lab, teacher_availability_map, slot_info
+    room_id, requires_lab, teacher_availability_map, slot_info, occupancy=None
 ):
     """
     Check all hard constraints for a proposed assignment.
+    Pass ``occupancy`` (an Occupancy kept in sync with ``timetable``) for
+    O(1) checks.
     Returns (is_valid, violation_reason).
     """
     if not check_slot_is_period(slot_info):
         return False, 'Slot is not a period type'
 
-    if not check_section_no_double_booking(timetable, section_id, day, slot_idx):
+    if not check_section_no_double_booking(timetable, section_id, day, slot_idx, occupancy):
         return False, 'Section already has assignment at this slot'
 
-    if not check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id):
+    if not check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id, occupancy):
         return False, 'Teacher already teaching at this slot'
 
     slot_time = (slot_info.get('start_time'), slot_info.get('end_time'))
     if not check_teacher_available(teacher_availability_map, teacher_id, day, slot_time):
         return False, 'Teacher not available at this time'
 
-    if not check_lab_room_available(timetable, day, slot_idx, room_id, requires_lab):
+    if not check_lab_room_available(timetable, day, slot_idx, room_id, requires_lab, occupancy):
         return False, 'Lab room not available'
 
     return True, None
@@ -11,10 +11,10 @@ Algorithm:
 """
 
 import random
-from copy import deepcopy
 from collections import defaultdict
 
-from .constraints import check_all_hard_constraints
+from .constraints import check_slot_is_period, check_teacher_available
+from .occupancy import Occupancy, block_mask, slot_bit
 
 
 class TimetableGenerator:
@@ -52,6 +52,13 @@ class TimetableGenerator:
             self.rooms_by_type[room['room_type']].append(room)
             self.rooms_by_type['ANY'].append(room)
 
+        # Slots that can hold a teaching period at all (H6)
+        self._period_mask = 0
+        for idx, slot in self.slot_info.items():
+            if check_slot_is_period(slot):
+                self._period_mask |= slot_bit(idx)
+        self._allowed_masks = {}
+
         # Track iterations for progress
         self._iterations = 0
         self._max_iterations = 100000
@@ -76,8 +83,8 @@ class TimetableGenerator:
         # Initialize empty timetable
         timetable = {}
 
-        # Track teacher period counts per day for constraint checking
-        self._teacher_day_counts = defaultdict(lambda: defaultdict(int))
+        # Teacher/room/section occupancy, kept in step with the timetable
+        self.occupancy = Occupancy()
 
         # Start backtracking
         result = self._backtrack(timetable, assignments, 0)
@@ -171,43 +178,70 @@ class TimetableGenerator:
 
     def _backtrack(self, timetable, assignments, idx):
         """
-        Recursive backtracking with forward checking.
+        Backtracking with forward checking.
+
+        Depth-first over the assignment list with an explicit stack (one
+        frame per placed assignment) so large schools are not limited by
+        Python's recursion depth.
         """
-        if idx >= len(assignments):
-            return timetable  # All assigned successfully
+        stack = []
+
+        while True:
+            if idx >= len(assignments):
+                return timetable  # All assigned successfully
+
+            self._iterations += 1
+            if self._iterations > self._max_iterations:
+                return None  # Give up after max iterations
+
+            # Progress reporting
+            if self._iterations % 500 == 0:
+                pct = min(95, int((idx / max(len(assignments), 1)) * 100))
+                self._report_progress(pct, f'Placing assignment {idx+1}/{len(assignments)}')
+
+            assignment = assignments[idx]
+
+            # Get valid placements for this assignment
+            placements = self._get_valid_placements(
+                timetable, assignment['section_id'], assignment['teacher_id'],
+                assignment['consecutive_periods'], assignment['requires_lab'],
+                assignment['preferred_room_type']
+            )
+
+            # Shuffle to add randomness (helps avoid getting stuck)
+            random.shuffle(placements)
+            stack.append((assignment, iter(placements), []))
 
-        self._iterations += 1
-        if self._iterations > self._max_iterations:
-            return None  # Give up after max iterations
+            # Place the deepest assignment's next candidate; unwind exhausted frames
+            while not self._place_next(timetable, *stack[-1]):
+                stack.pop()
+                if not stack:
+                    return None  # No valid placement found
+                idx -= 1
+            idx += 1
 
-        # Progress reporting
-        if self._iterations % 500 == 0:
-            pct = min(95, int((idx / max(len(assignments), 1)) * 100))
-            self._report_progress(pct, f'Placing assignment {idx+1}/{len(assignments)}')
+    def _place_next(self, timetable, assignment, placements, placed_keys):
+        """
+        Undo the frame's current placement, then place the assignment at its
+        next valid candidate. Returns False when the candidates run out.
+        """
+        # Backtrack: undo placement
+        for key in placed_keys:
+            self.occupancy.unassign(key, timetable.pop(key))
+        placed_keys.clear()
 
-        assignment = assignments[idx]
         section_id = assignment['section_id']
         teacher_id = assignment['teacher_id']
         consec = assignment['consecutive_periods']
         requires_lab = assignment['requires_lab']
         preferred_room_type = assignment['preferred_room_type']
 
-        # Get valid placements for this assignment
-        placements = self._get_valid_placements(
-            timetable, section_id, teacher_id, consec,
-            requires_lab, preferred_room_type
-        )
-
-        # Shuffle to add randomness (helps avoid getting stuck)
-        random.shuffle(placements)
-
         for day, start_slot in placements:
             # Check teacher daily limit
             if teacher_id and not self._check_teacher_daily_limit(teacher_id, day, consec):
                 continue
 
             # Place the assignment
-            placed_keys = []
             room_id = self._find_room(timetable, day, start_slot, consec,
                                        requires_lab, preferred_room_type)
 
@@ -221,31 +255,22 @@ class TimetableGenerator:
                     'room_id': room_id,
                     'requires_lab': requires_lab,
                 }
+                self.occupancy.assign(key, timetable[key])
                 placed_keys.append(key)
+            return True
 
-                if teacher_id:
-                    self._teacher_day_counts[teacher_id][day] += 1
-
-            # Recurse
-            result = self._backtrack(timetable, assignments, idx + 1)
-            if result is not None:
-                return result
-
-            # Backtrack: undo placement
-            for key in placed_keys:
-                del timetable[key]
-
-            if teacher_id:
-                self._teacher_day_counts[teacher_id][day] -= consec
-
-        return None  # No valid placement found
+        return False
 
     def _get_valid_placements(self, timetable, section_id, teacher_id,
                                consecutive, requires_lab, preferred_room_type):
         """
         Get all valid (day, start_slot) pairs for an assignment.
+
+        Each candidate block is checked against the section and teacher
+        occupancy masks and the teacher's allowed-slot mask in O(1).
         """
         placements = []
+        occupancy = self.occupancy
 
         for day in self.days:
             # Check teacher available on this day
@@ -253,34 +278,35 @@ class TimetableGenerator:
             if avail and not avail['is_available']:
                 continue
 
-            for start_slot in range(self.num_slots - consecutive + 1):
-                valid = True
-
-                for offset in range(consecutive):
-                    slot_idx = start_slot + offset
-                    slot_info = self.slot_info.get(slot_idx, {})
-
-                    is_valid, _ = check_all_hard_constraints(
-                        timetable, section_id, day, slot_idx, teacher_id,
-                        None,  # room_id checked separately
-                        False,  # lab checked separately
-                        self.teacher_availability, slot_info
-                    )
-
-                    if not is_valid:
-                        valid = False
-                        break
+            busy = occupancy.section_mask(section_id, day) | ~self._allowed_mask(teacher_id, day)
+            if teacher_id:
+                busy |= occupancy.teacher_mask(teacher_id, day)
 
-                if valid:
+            for start_slot in range(self.num_slots - consecutive + 1):
+                if not busy & block_mask(start_slot, consecutive):
                     placements.append((day, start_slot))
 
         return placements
 
+    def _allowed_mask(self, teacher_id, day):
+        """Bitmask of period slots the teacher may teach on ``day`` (H5, H6)."""
+        key = (teacher_id, day)
+        mask = self._allowed_masks.get(key)
+        if mask is None:
+            mask = self._period_mask
+            if teacher_id:
+                for idx, slot in self.slot_info.items():
+                    slot_time = (slot.get('start_time'), slot.get('end_time'))
+                    if not check_teacher_available(self.teacher_availability, teacher_id, day, slot_time):
+                        mask &= ~slot_bit(idx)
+            self._allowed_masks[key] = mask
+        return mask
+
     def _check_teacher_daily_limit(self, teacher_id, day, additional):
         """Check if adding more periods would exceed teacher's daily limit."""
         avail = self.teacher_availability.get((teacher_id, day))
         max_per_day = avail['max_periods_per_day'] if avail else 6
-        current = self._teacher_day_counts[teacher_id][day]
+        current = self.occupancy.teacher_day_count(teacher_id, day)
         return (current + additional) <= max_per_day
 
     def _find_room(self, timetable, day, start_slot, consecutive,
@@ -292,39 +318,23 @@ class TimetableGenerator:
         if not requires_lab and not preferred_room_type:
             return None  # Regular classroom, no specific room needed
 
-        # Determine which rooms to consider
+        for room in self._candidate_rooms(requires_lab, preferred_room_type):
+            if self.occupancy.room_free(room['id'], day, start_slot, consecutive):
+                return room['id']
+
+        return None
+
+    def _candidate_rooms(self, requires_lab, preferred_room_type):
+        """Rooms to consider for an assignment, in preference order."""
         if preferred_room_type:
-            candidate_rooms = self.rooms_by_type.get(preferred_room_type, [])
-        elif requires_lab:
-            candidate_rooms = (
+            return self.rooms_by_type.get(preferred_room_type, [])
+        if requires_lab:
+            return (
                 self.rooms_by_type.get('LAB', []) +
                 self.rooms_by_type.get('SCIENCE_LAB', []) +
                 self.rooms_by_type.get('COMPUTER_LAB', [])
             )
-        else:
-            candidate_rooms = self.rooms_by_type.get('ANY', [])
-
-        for room in candidate_rooms:
-            room_id = room['id']
-            available = True
-
-            for offset in range(consecutive):
-                slot_idx = start_slot + offset
-                # Check if room is already used at this time
-                for key, assignment in timetable.items():
-                    if assignment is None:
-                        continue
-                    k_section, k_day, k_slot = key
-                    if k_day == day and k_slot == slot_idx and assignment.get('room_id') == room_id:
-                        available = False
-                        break
-                if not available:
-                    break
-
-            if available:
-                return room_id
-
-        return None
+        return self.rooms_by_type.get('ANY', [])
 
     def _report_progress(self, percent, message):
         """Report progress if callback is available."""
@@ -0,0 +1,375 @@
+"""
+Incremental (delta) fitness evaluation for the timetable GA.
+
+Candidates are stored compactly and share structure:
+
+- every distinct assignment dict is interned once in the ``DeltaContext``
+  and referred to by an integer code (``EMPTY`` for a free slot);
+- a ``TimetableState`` holds one immutable tuple of codes per
+  (section, day) row, and one tuple of per-slot period counts per
+  (teacher, day).
+
+Copying a state copies the row dicts (one entry per section-day), not the
+cells; parents and children share every row neither of them has changed.
+A change replaces only the tuples it touches (copy-on-write), so a GA
+generation allocates a few small tuples per mutation instead of nested
+per-cell dicts.
+
+Each soft constraint's contribution is cached per row:
+
+- per teacher:              S1 workload variance (from per-(teacher, day) counts)
+- per (teacher, day):       S7 periods beyond the max consecutive run
+- per (section, day):       S2 heavy-subject adjacency, S5 room changes
+- per (section, subject):   S3 clustering across days
+- per cell:                 S4 preference violations
+
+Changing a row (``set_row``/``set_cell``/``swap``) updates the counters of the
+slots that differ and marks only the affected rows dirty; ``score()``
+recomputes those rows and combines the running totals, so a same-day swap
+costs O(slots + days) instead of a pass over the whole school. Teacher
+double-bookings are counted the same way, making the hard-constraint check
+O(1).
+
+Changes are recorded in an undo log of replaced rows: ``mark()`` /
+``undo(mark)`` roll a state back in place (e.g. a mutation that broke a hard
+constraint), and ``commit()`` forgets the log once a candidate is kept.
+Variance and clustering totals are kept as exact integers scaled by days²,
+so a long run of deltas does not drift from a from-scratch evaluation.
+"""
+
+from .tensor import CELL_FIELDS
+
+EMPTY = -1
+
+
+class DeltaContext:
+    """Static inputs and the interned cells shared by every state of one optimizer run."""
+
+    def __init__(self, section_ids, days, num_slots, teachers, teacher_availability,
+                 heavy_subject_ids, weights):
+        self.section_ids = list(section_ids)
+        self.days = list(days)
+        self.num_slots = num_slots
+        self.num_days = len(self.days)
+        self.teachers = set(teachers)
+        self.heavy_subject_ids = set(heavy_subject_ids)
+        self.weights = weights
+
+        self.rows = set(self.section_ids)
+        self.max_consecutive = {}
+        self.preferred = {}
+        for (teacher_id, day), avail in teacher_availability.items():
+            if not avail:
+                continue
+            self.max_consecutive[(teacher_id, day)] = avail.get('max_consecutive_periods', 3)
+            if avail.get('preferred_time_slots'):
+                self.preferred[(teacher_id, day)] = set(avail['preferred_time_slots'])
+
+        self.empty_row = (EMPTY,) * num_slots
+        self.empty_counts = (0,) * num_slots
+
+        # Interned cells and per-code lookups
+        self.cells = []
+        self.cell_teacher = []
+        self.cell_subject = []
+        self.cell_room = []
+        self.cell_heavy = []
+        self._codes = {}
+
+    def intern(self, cell):
+        """Code for an assignment dict (``EMPTY`` for ``None``), allocating one on first sight."""
+        if cell is None:
+            return EMPTY
+        key = tuple(cell.get(field) for field in CELL_FIELDS)
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.cells)
+            self.cells.append(cell)
+            self.cell_teacher.append(cell.get('teacher_id') or None)
+            self.cell_subject.append(cell.get('subject_id') or None)
+            self.cell_room.append(cell.get('room_id') or None)
+            self.cell_heavy.append(cell.get('subject_id') in self.heavy_subject_ids)
+        return code
+
+    def cell(self, code):
+        return None if code == EMPTY else self.cells[code]
+
+    def violates_preference(self, teacher_id, day, slot_idx):
+        preferred = self.preferred.get((teacher_id, day))
+        return preferred is not None and slot_idx not in preferred
+
+
+class TimetableState:
+    """A candidate timetable with cached per-row penalty contributions."""
+
+    def __init__(self, context, timetable=None, rows=None):
+        """
+        Build from a dict ``timetable`` ``(section_id, day, slot_idx) -> cell``
+        or from ``rows`` ``(section_id, day) -> codes`` (e.g. another state's
+        ``rows`` shipped to a worker process).
+        """
+        self.context = context
+        self.rows = {}              # (section, day) -> tuple of cell codes
+        self.log = []
+
+        self.teacher_rows = {}      # (teacher, day) -> tuple of periods per slot
+        self.conflicts = 0          # extra periods in double-booked teacher slots
+        self.preference = 0         # S4 violations
+
+        # Row caches and their totals
+        self.variance = {}          # teacher -> days² · variance of daily load
+        self.runs = {}              # (teacher, day) -> periods over max consecutive
+        self.heavy = {}             # (section, day) -> adjacent heavy pairs
+        self.rooms = {}             # (section, day) -> room changes
+        self.clustering = {}        # (section, subject) -> days² · spread deviation
+        self.totals = dict.fromkeys(('variance', 'runs', 'heavy', 'rooms', 'clustering'), 0)
+
+        self._dirty_teachers = set()
+        self._dirty_teacher_days = set()
+        self._dirty_section_days = set()
+        self._dirty_subjects = set()
+
+        if timetable:
+            grouped = {}
+            for (section_id, day, slot_idx), cell in timetable.items():
+                if cell is not None:
+                    row = grouped.setdefault((section_id, day), list(context.empty_row))
+                    row[slot_idx] = context.intern(cell)
+            rows = {row_key: tuple(codes) for row_key, codes in grouped.items()}
+        for row_key, codes in (rows or {}).items():
+            self.set_row(row_key, codes, log=False)
+
+    def copy(self):
+        """Independent state sharing every row tuple with this one."""
+        self.flush()
+        clone = TimetableState.__new__(TimetableState)
+        clone.context = self.context
+        clone.log = []
+        for name in ('rows', 'teacher_rows', 'variance', 'runs', 'heavy', 'rooms',
+                     'clustering', 'totals'):
+            setattr(clone, name, getattr(self, name).copy())
+        clone.conflicts = self.conflicts
+        clone.preference = self.preference
+        clone._dirty_teachers = set()
+        clone._dirty_teacher_days = set()
+        clone._dirty_section_days = set()
+        clone._dirty_subjects = set()
+        return clone
+
+    @property
+    def timetable(self):
+        """The candidate as a ``(section_id, day, slot_idx) -> cell`` dict."""
+        cell = self.context.cell
+        return {
+            (section_id, day, slot_idx): cell(code)
+            for (section_id, day), codes in self.rows.items()
+            for slot_idx, code in enumerate(codes)
+            if code != EMPTY
+        }
+
+    def row(self, section_id, day):
+        return self.rows.get((section_id, day), self.context.empty_row)
+
+    def cell(self, key):
+        section_id, day, slot_idx = key
+        return self.context.cell(self.row(section_id, day)[slot_idx])
+
+    # ------------------------------------------------------------------
+    # Moves
+    # ------------------------------------------------------------------
+
+    def set_row(self, row_key, codes, log=True):
+        """Replace the (section, day) row with the ``codes`` tuple."""
+        old = self.rows.get(row_key, self.context.empty_row)
+        if old is codes or old == codes:
+            return
+        if log:
+            self.log.append((row_key, old))
+        for slot_idx, (old_code, new_code) in enumerate(zip(old, codes)):
+            if old_code != new_code:
+                if old_code != EMPTY:
+                    self._count(row_key, slot_idx, old_code, -1)
+                if new_code != EMPTY:
+                    self._count(row_key, slot_idx, new_code, 1)
+        if codes == self.context.empty_row:
+            self.rows.pop(row_key, None)
+        else:
+            self.rows[row_key] = codes
+
+    def set_cell(self, key, cell):
+        """Place ``cell`` (or clear the slot when ``None``) at ``key``."""
+        section_id, day, slot_idx = key
+        codes = list(self.row(section_id, day))
+        codes[slot_idx] = self.context.intern(cell)
+        self.set_row((section_id, day), tuple(codes))
+
+    def swap(self, section_id, day, slot_a, slot_b):
+        codes = list(self.row(section_id, day))
+        codes[slot_a], codes[slot_b] = codes[slot_b], codes[slot_a]
+        self.set_row((section_id, day), tuple(codes))
+
+    def mark(self):
+        return len(self.log)
+
+    def undo(self, mark=0):
+        """Roll back every change made since ``mark``."""
+        while len(self.log) > mark:
+            row_key, old = self.log.pop()
+            self.set_row(row_key, old, log=False)
+
+    def commit(self):
+        self.log.clear()
+
+    @property
+    def is_feasible(self):
+        """No teacher is double-booked."""
+        return self.conflicts == 0
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def penalties(self):
+        """Soft-constraint penalties, matching the ``calc_*`` functions."""
+        self.flush()
+        context, totals = self.context, self.totals
+        num_days, num_teachers = context.num_days, len(context.teachers)
+        workload = 0.0
+        if num_teachers and num_days:
+            workload = min(totals['variance'] / num_days ** 2 / num_teachers * 2.0, 10.0)
+        clustering = totals['clustering'] / num_days ** 2 if num_days else 0.0
+        return {
+            'workload_variance': workload,
+            'heavy_adjacency': min(totals['heavy'] * 1.5, 10.0),
+            'subject_clustering': min(clustering * 0.3, 10.0),
+            'teacher_preference': min(self.preference * 0.5, 10.0),
+            'room_changes': min(totals['rooms'] * 0.5, 10.0),
+            'consecutive_periods': min(totals['runs'] * 1.0, 10.0),
+        }
+
+    def score(self):
+        penalties = self.penalties()
+        weights = self.context.weights
+        score = (
+            100.0
+            - weights['workload_balance'] * penalties['workload_variance']
+            - weights['no_consecutive_heavy'] * penalties['heavy_adjacency']
+            - weights['subject_spread'] * penalties['subject_clustering']
+            - weights['teacher_preference'] * penalties['teacher_preference']
+            - weights['room_optimization'] * penalties['room_changes']
+            - weights['workload_balance'] * penalties['consecutive_periods'] * 0.5
+        )
+        return max(0.0, score)
+
+    def flush(self):
+        """Recompute the rows touched since the last flush."""
+        for teacher_id in self._dirty_teachers:
+            self._update('variance', teacher_id, self._teacher_variance(teacher_id))
+        for teacher_day in self._dirty_teacher_days:
+            self._update('runs', teacher_day, self._teacher_runs(*teacher_day))
+        for section_day in self._dirty_section_days:
+            heavy, rooms = self._section_day_row(section_day)
+            self._update('heavy', section_day, heavy)
+            self._update('rooms', section_day, rooms)
+        for section_subject in self._dirty_subjects:
+            self._update('clustering', section_subject, self._subject_spread(*section_subject))
+        self._dirty_teachers.clear()
+        self._dirty_teacher_days.clear()
+        self._dirty_section_days.clear()
+        self._dirty_subjects.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _count(self, row_key, slot_idx, code, sign):
+        section_id, day = row_key
+        context = self.context
+
+        teacher_id = context.cell_teacher[code]
+        if teacher_id:
+            teacher_day = (teacher_id, day)
+            counts = self.teacher_rows.get(teacher_day, context.empty_counts)
+            periods = counts[slot_idx]
+            if sign > 0 and periods:
+                self.conflicts += 1
+            elif sign < 0 and periods > 1:
+                self.conflicts -= 1
+            counts = counts[:slot_idx] + (periods + sign,) + counts[slot_idx + 1:]
+            if any(counts):
+                self.teacher_rows[teacher_day] = counts
+            else:
+                del self.teacher_rows[teacher_day]
+            if context.violates_preference(teacher_id, day, slot_idx):
+                self.preference += sign
+            if teacher_id in context.teachers:
+                self._dirty_teachers.add(teacher_id)
+                self._dirty_teacher_days.add(teacher_day)
+
+        if section_id in context.rows:
+            self._dirty_section_days.add(row_key)
+            subject_id = context.cell_subject[code]
+            if subject_id:
+                self._dirty_subjects.add((section_id, subject_id))
+
+    def _update(self, name, row, value):
+        cache = getattr(self, name)
+        self.totals[name] += value - cache.get(row, 0)
+        if value:
+            cache[row] = value
+        else:
+            cache.pop(row, None)
+
+    def _teacher_variance(self, teacher_id):
+        # days² · variance = days · Σc² - (Σc)²
+        empty = self.context.empty_counts
+        counts = [sum(self.teacher_rows.get((teacher_id, day), empty)) for day in self.context.days]
+        return self.context.num_days * sum(c * c for c in counts) - sum(counts) ** 2
+
+    def _teacher_runs(self, teacher_id, day):
+        limit = self.context.max_consecutive.get((teacher_id, day), 3)
+        penalty = run = 0
+        for periods in self.teacher_rows.get((teacher_id, day), ()):
+            if periods:
+                run += 1
+                if run > limit:
+                    penalty += 1
+            else:
+                run = 0
+        return penalty
+
+    def _section_day_row(self, row_key):
+        context = self.context
+        heavy = rooms = 0
+        prev_heavy = False
+        prev_room = None
+        for code in self.rows.get(row_key, ()):
+            if code == EMPTY:
+                prev_heavy = False
+                prev_room = None
+                continue
+            is_heavy = context.cell_heavy[code]
+            if is_heavy and prev_heavy:
+                heavy += 1
+            prev_heavy = is_heavy
+            room = context.cell_room[code]
+            if room and prev_room and room != prev_room:
+                rooms += 1
+            prev_room = room
+        return heavy, rooms
+
+    def _subject_spread(self, section_id, subject_id):
+        # days² · Σ_{days taught} (c - total/days)²
+        #   = days² · Σc² - 2 · days · total² + taught_days · total²
+        context = self.context
+        cell_subject = context.cell_subject
+        counts = []
+        for day in context.days:
+            count = sum(1 for code in self.row(section_id, day) if code != EMPTY and cell_subject[code] == subject_id)
+            if count:
+                counts.append(count)
+        total = sum(counts)
+        if total <= 1:
+            return 0
+        num_days = context.num_days
+        return num_days ** 2 * sum(c * c for c in counts) - 2 * num_days * total ** 2 + len(counts) * total ** 2
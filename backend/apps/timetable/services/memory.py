@@ -0,0 +1,125 @@
+"""
+Memory and GC accounting for optimizer runs.
+
+``GenerationProfile`` samples the process between GA generations:
+
+- peak RSS (``resource.getrusage``);
+- net allocated object blocks (``sys.getallocatedblocks``);
+- garbage collections and the time spent in them (``gc.callbacks``);
+- optionally (``trace_allocations=True``) the peak bytes allocated on top
+  of what was live when each generation started, via ``tracemalloc``.
+  Tracing roughly doubles run time, so it is meant for the benchmark
+  command, not production runs.
+
+``summary()`` is JSON-serializable and is stored with the generation run
+(``generated_timetable['optimizer']``) for the analysis endpoint.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+class GenerationProfile:
+    """
+    Usage:
+        profile = GenerationProfile()
+        profile.start()
+        for generation in ...:
+            ...
+            profile.sample()
+        profile.stop()
+        profile.summary()
+    """
+
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        self.generations = 0
+        self.block_deltas = []
+        self.traced_peaks = []
+        self.gc_collections = 0
+        self.gc_seconds = 0.0
+        self._gc_started = None
+        self._blocks = 0
+        self._traced = 0
+        self._started_tracing = False
+        self._running = False
+
+    def start(self):
+        self._blocks = sys.getallocatedblocks()
+        gc.callbacks.append(self._on_gc)
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            self._traced = tracemalloc.get_traced_memory()[0]
+        self._running = True
+
+    def sample(self, generations=1):
+        """Record the generation(s) run since the previous sample."""
+        if not self._running or generations < 1:
+            return
+        blocks = sys.getallocatedblocks()
+        self.block_deltas.append((blocks - self._blocks) / generations)
+        self._blocks = blocks
+        if self.trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            self.traced_peaks.append(max(0, peak - self._traced) / generations)
+            tracemalloc.reset_peak()
+            self._traced = current
+        self.generations += generations
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def summary(self):
+        generations = max(self.generations, 1)
+        summary = {
+            'generations': self.generations,
+            'peak_rss_mb': peak_rss_mb(),
+            'allocated_blocks_per_generation': _mean_max(self.block_deltas),
+            'gc_collections': self.gc_collections,
+            'gc_collections_per_generation': round(self.gc_collections / generations, 2),
+            'gc_pause_ms': round(self.gc_seconds * 1000, 1),
+        }
+        if self.trace_allocations:
+            summary['allocated_kb_per_generation'] = _mean_max([peak / 1024 for peak in self.traced_peaks])
+        return summary
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            self.gc_collections += 1
+            self.gc_seconds += time.perf_counter() - self._gc_started
+            self._gc_started = None
+
+
+def _mean_max(values):
+    if not values:
+        return {'mean': 0, 'max': 0}
+    return {'mean': round(sum(values) / len(values), 1), 'max': round(max(values), 1)}
@@ -0,0 +1,109 @@
+"""
+Indexed slot occupancy for the timetable CSP and constraint checks.
+
+The hard-constraint checks used to scan every key of the timetable dict to
+answer "is this teacher/room busy at (day, slot)?", which made each check
+O(total assignments). ``Occupancy`` keeps one integer bitmask per
+(teacher, day), (room, day) and (section, day) - bit ``i`` set means slot
+``i`` is taken - and is updated incrementally on assign/unassign, so:
+
+- a single-slot or whole-block check is one dict lookup and one AND;
+- periods already taught by a teacher on a day is a popcount.
+"""
+
+from collections import defaultdict
+
+
+def slot_bit(slot_idx):
+    return 1 << slot_idx
+
+
+def block_mask(start_slot, length):
+    """Bitmask covering ``length`` consecutive slots from ``start_slot``."""
+    return ((1 << length) - 1) << start_slot
+
+
+class Occupancy:
+    """
+    Per-day slot bitmasks for teachers, rooms and sections.
+
+    Usage:
+        occupancy = Occupancy()                 # or Occupancy(timetable)
+        occupancy.assign((section_id, day, slot_idx), assignment)
+        occupancy.teacher_free(teacher_id, day, slot_idx)
+        occupancy.unassign((section_id, day, slot_idx), assignment)
+    """
+
+    def __init__(self, timetable=None):
+        self.teachers = defaultdict(int)
+        self.rooms = defaultdict(int)
+        self.sections = defaultdict(int)
+        # Slots claimed by more than one assignment, for validating timetables
+        # that were not built through the free-checks (e.g. GA children)
+        self.teacher_conflicts = 0
+        self.room_conflicts = 0
+        if timetable:
+            for key, assignment in timetable.items():
+                if assignment is not None:
+                    self.assign(key, assignment)
+
+    def assign(self, key, assignment):
+        section_id, day, slot_idx = key
+        bit = slot_bit(slot_idx)
+        self.sections[(section_id, day)] |= bit
+
+        teacher_id = assignment.get('teacher_id')
+        if teacher_id:
+            mask_key = (teacher_id, day)
+            if self.teachers[mask_key] & bit:
+                self.teacher_conflicts += 1
+            self.teachers[mask_key] |= bit
+
+        room_id = assignment.get('room_id')
+        if room_id:
+            mask_key = (room_id, day)
+            if self.rooms[mask_key] & bit:
+                self.room_conflicts += 1
+            self.rooms[mask_key] |= bit
+
+    def unassign(self, key, assignment):
+        section_id, day, slot_idx = key
+        clear = ~slot_bit(slot_idx)
+        self.sections[(section_id, day)] &= clear
+
+        teacher_id = assignment.get('teacher_id')
+        if teacher_id:
+            self.teachers[(teacher_id, day)] &= clear
+
+        room_id = assignment.get('room_id')
+        if room_id:
+            self.rooms[(room_id, day)] &= clear
+
+    @property
+    def is_valid(self):
+        """No teacher or room was ever claimed twice for the same slot."""
+        return not (self.teacher_conflicts or self.room_conflicts)
+
+    # Lookups use .get() so checks never grow the defaultdicts
+
+    def teacher_mask(self, teacher_id, day):
+        return self.teachers.get((teacher_id, day), 0)
+
+    def room_mask(self, room_id, day):
+        return self.rooms.get((room_id, day), 0)
+
+    def section_mask(self, section_id, day):
+        return self.sections.get((section_id, day), 0)
+
+    def teacher_free(self, teacher_id, day, slot_idx, length=1):
+        return not self.teacher_mask(teacher_id, day) & block_mask(slot_idx, length)
+
+    def room_free(self, room_id, day, slot_idx, length=1):
+        return not self.room_mask(room_id, day) & block_mask(slot_idx, length)
+
+    def section_free(self, section_id, day, slot_idx, length=1):
+        return not self.section_mask(section_id, day) & block_mask(slot_idx, length)
+
+    def teacher_day_count(self, teacher_id, day):
+        """Periods the teacher already teaches on ``day``."""
+        return self.teacher_mask(teacher_id, day).bit_count()
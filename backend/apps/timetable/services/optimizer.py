@@ -7,18 +7,13 @@ while maintaining hard constraint satisfaction.
 """
 
 import random
-from copy import deepcopy
 from collections import defaultdict
 
-from .constraints import (
-    check_all_hard_constraints,
-    calc_workload_variance,
-    calc_heavy_subject_adjacency,
-    calc_subject_clustering,
-    calc_teacher_preference_violations,
-    calc_room_changes,
-    calc_consecutive_teacher_periods,
-)
+from apps.core.services.islands import model_snapshot, run_islands
+
+from .incremental import EMPTY, DeltaContext, TimetableState
+from .memory import GenerationProfile
+from .tensor import TensorFitness, TimetableEncoding
 
 
 # Subject IDs considered "heavy" for adjacency penalty
@@ -29,20 +24,40 @@ HEAVY_SUBJECT_KEYWORDS = {
     'trigonometry', 'statistics',
 }
 
+# How the GA scores candidates:
+# - incremental: each TimetableState keeps its score up to date as cells change
+# - batch: every generation is encoded and scored as one NumPy tensor
+EVALUATION_INCREMENTAL = 'incremental'
+EVALUATION_BATCH = 'batch'
+EVALUATION_MODES = (EVALUATION_INCREMENTAL, EVALUATION_BATCH)
+
 
 class TimetableOptimizer:
     """
     Genetic Algorithm optimizer for timetable soft constraints.
     """
 
-    def __init__(self, feasible_timetable, inputs, config, progress_callback=None):
+    plateau_threshold = 50
+
+    def __init__(self, feasible_timetable, inputs, config, progress_callback=None,
+                 evaluation=EVALUATION_INCREMENTAL, seed=None, trace_allocations=False):
         """
         Args:
             feasible_timetable: dict from CSP generator
             inputs: dict from collect_generation_inputs()
             config: TimetableGenerationConfig model instance
             progress_callback: callable(percent, message)
+            evaluation: one of EVALUATION_MODES
+            seed: RNG seed; defaults to config.random_seed (None = unseeded)
+            trace_allocations: also measure bytes allocated per generation
+                (tracemalloc; slow, for benchmarking)
         """
+        if evaluation not in EVALUATION_MODES:
+            raise ValueError(f'Unknown evaluation mode: {evaluation}')
+        self.evaluation = evaluation
+        self.seed = seed if seed is not None else getattr(config, 'random_seed', None)
+        self.rng = random.Random(self.seed)
+        self.memory_profile = GenerationProfile(trace_allocations=trace_allocations)
         self.initial_timetable = feasible_timetable
         self.inputs = inputs
         self.config = config
@@ -79,33 +94,86 @@ class TimetableOptimizer:
         }
 
         self.population_size = config.population_size
+        self.island_count = getattr(config, 'island_count', 1) or 1
+        self.migration_interval = getattr(config, 'migration_interval', 10) or 10
         self.max_iterations = config.max_iterations
+        self.generations_run = 0
+
+        # Array encoding used to score whole populations at once
+        self.encoding = TimetableEncoding(self.section_ids, self.days, self.num_slots, self.teachers)
+        self.tensor_fitness = TensorFitness(
+            self.encoding, self.teacher_availability, self.heavy_subject_ids, self.weights,
+        )
+
+        # Shared inputs for incrementally evaluated candidates
+        self.delta_context = DeltaContext(
+            self.section_ids, self.days, self.num_slots, self.teachers,
+            self.teacher_availability, self.heavy_subject_ids, self.weights,
+        )
+        # Intern the feasible timetable's cells first, so cell codes are the
+        # same in every process that builds this optimizer
+        self.initial_state = TimetableState(self.delta_context, feasible_timetable)
 
     def optimize(self):
         """
         Run the genetic algorithm to optimize the timetable.
 
+        Memory and GC use per generation is recorded in
+        ``self.memory_profile`` (see ``run_stats()``).
+
         Returns:
             (optimized_timetable, fitness_score)
         """
+        self.memory_profile = GenerationProfile(self.memory_profile.trace_allocations)
+        self.memory_profile.start()
+        try:
+            return self._optimize()
+        finally:
+            self.memory_profile.stop()
+
+    def run_stats(self):
+        """JSON-serializable statistics of the last ``optimize()`` run."""
+        return {
+            'evaluation': self.evaluation,
+            'island_count': self.island_count,
+            'population_size': self.population_size,
+            'generations': self.generations_run,
+            'memory': self.memory_profile.summary(),
+        }
+
+    def _optimize(self):
+        if self.island_count > 1:
+            best_solution, best_score = run_islands(
+                self, self.island_count, self.migration_interval, seed=self.seed,
+            )
+            # Worker processes are not sampled; this averages the main process
+            self.memory_profile.sample(self.generations_run)
+            self._report_progress(100, f'Optimization complete. Final score: {best_score:.1f}')
+            if best_solution is None:
+                return self.initial_timetable, best_score
+            return self.load_solution(best_solution).timetable, best_score
+
         # Generate initial population
         population = self._generate_population()
 
         best_score = -1
         best_solution = None
         no_improvement_count = 0
-        plateau_threshold = 50
+        self.generations_run = 0
 
         for generation in range(self.max_iterations):
+            self.generations_run += 1
+
             # Score all solutions
-            scored = [(sol, self.fitness(sol)) for sol in population]
+            scored = list(zip(population, self._score_states(population)))
             scored.sort(key=lambda x: x[1], reverse=True)
 
             current_best_score = scored[0][1]
 
             if current_best_score > best_score:
                 best_score = current_best_score
-                best_solution = deepcopy(scored[0][0])
+                # Kept states are never modified again, so no copy is needed
+                best_solution = scored[0][0]
                 no_improvement_count = 0
             else:
                 no_improvement_count += 1
@@ -120,7 +188,7 @@ class TimetableOptimizer:
                 )
 
             # Early termination if fitness plateaus
-            if no_improvement_count >= plateau_threshold:
+            if no_improvement_count >= self.plateau_threshold:
                 self._report_progress(
                     100,
                     f'Converged at generation {generation}. Score: {best_score:.1f}'
@@ -132,157 +200,168 @@ class TimetableOptimizer:
                 self._report_progress(100, f'Excellent score ({best_score:.1f}) reached.')
                 break
 
-            # Selection + Crossover + Mutation
-            new_population = []
+            population = self._next_generation(scored)
+            self.memory_profile.sample()
 
-            # Elitism: keep top 10%
-            elite_count = max(2, self.population_size // 10)
-            for i in range(elite_count):
-                new_population.append(deepcopy(scored[i][0]))
-
-            # Fill rest via tournament selection + crossover + mutation
-            while len(new_population) < self.population_size:
-                parent1 = self._tournament_select(scored)
-                parent2 = self._tournament_select(scored)
-
-                child = self._crossover(parent1, parent2)
-                child = self._mutate(child)
-
-                # Verify hard constraints still hold
-                if self._verify_hard_constraints(child):
-                    new_population.append(child)
-                else:
-                    # If mutation broke constraints, keep a parent
-                    new_population.append(deepcopy(parent1))
+        self._report_progress(100, f'Optimization complete. Final score: {best_score:.1f}')
 
-            population = new_population
+        if best_solution is None:
+            return self.initial_timetable, best_score
+        return best_solution.timetable, best_score
 
-        self._report_progress(100, f'Optimization complete. Final score: {best_score:.1f}')
+    def _next_generation(self, scored):
+        """
+        Selection + crossover + mutation.
 
-        return best_solution if best_solution else self.initial_timetable, best_score
+        ``scored`` is [(state, score)] sorted best first; returns the next
+        population.
+        """
+        new_population = []
+
+        # Elitism: keep top 10%
+        elite_count = max(2, self.population_size // 10)
+        for i in range(elite_count):
+            new_population.append(scored[i][0])
+
+        # Fill rest via tournament selection + crossover + mutation
+        while len(new_population) < self.population_size:
+            parent1 = self._tournament_select(scored)
+            parent2 = self._tournament_select(scored)
+
+            child = self._crossover(parent1, parent2)
+            mark = child.mark()
+            self._mutate(child)
+
+            # Verify hard constraints still hold (O(1) per state)
+            if not child.is_feasible:
+                # Undo the mutation in place; if crossover itself broke
+                # constraints, keep a parent
+                child.undo(mark)
+                if not child.is_feasible:
+                    child = parent1
+            child.commit()
+            new_population.append(child)
+
+        return new_population
 
     def fitness(self, timetable):
         """
         Calculate fitness score (0-100) for a timetable.
         Higher = better.
         """
-        score = 100.0
-
-        # S1: Teacher workload balance
-        penalty = calc_workload_variance(
-            timetable, self.teachers, self.days
-        )
-        score -= self.weights['workload_balance'] * penalty
+        return self.score_population([timetable])[0]
 
-        # S2: Heavy subject adjacency
-        penalty = calc_heavy_subject_adjacency(
-            timetable, self.heavy_subject_ids,
-            self.section_ids, self.days, self.num_slots
-        )
-        score -= self.weights['no_consecutive_heavy'] * penalty
+    def score_population(self, population):
+        """
+        Fitness of every timetable in ``population``.
+
+        The timetables are encoded into one [population, section, day, slot]
+        tensor and every soft constraint is scored as a NumPy reduction over
+        it (see ``tensor.TensorFitness``):
+
+        - S1 teacher workload balance (workload_balance weight)
+        - S2 heavy subject adjacency (no_consecutive_heavy)
+        - S3 subject clustering (subject_spread)
+        - S4 teacher preference violations (teacher_preference)
+        - S5 room changes (room_optimization)
+        - S7 consecutive teacher periods (half the workload_balance weight)
+        """
+        batch = self.encoding.encode_many(population)
+        return [float(score) for score in self.tensor_fitness.score(batch)]
 
-        # S3: Subject clustering
-        penalty = calc_subject_clustering(
-            timetable, self.section_ids, self.days, self.num_slots
-        )
-        score -= self.weights['subject_spread'] * penalty
+    # Island model hooks (see apps.core.services.islands)
 
-        # S4: Teacher preference violations
-        penalty = calc_teacher_preference_violations(
-            timetable, self.teacher_availability, self.days
-        )
-        score -= self.weights['teacher_preference'] * penalty
+    def island_worker_args(self):
+        """Constructor arguments for a copy of this optimizer in a worker process."""
+        args = (self.initial_timetable, self.inputs, model_snapshot(self.config))
+        return args, {'evaluation': self.evaluation}
 
-        # S5: Room changes
-        penalty = calc_room_changes(
-            timetable, self.section_ids, self.days, self.num_slots
-        )
-        score -= self.weights['room_optimization'] * penalty
+    def load_solution(self, rows):
+        return TimetableState(self.delta_context, rows=rows)
 
-        # S7: Consecutive teacher periods
-        penalty = calc_consecutive_teacher_periods(
-            timetable, self.teachers, self.days, self.num_slots,
-            self.teacher_availability
-        )
-        score -= self.weights['workload_balance'] * penalty * 0.5
+    def dump_solution(self, state):
+        # Cell-code rows: compact to pickle, and codes match across workers
+        return state.rows
 
-        return max(0.0, score)
+    def _score_states(self, population):
+        if self.evaluation == EVALUATION_BATCH:
+            return self.score_population([state.timetable for state in population])
+        return [state.score() for state in population]
 
     def _generate_population(self):
         """Generate initial population from the feasible timetable."""
-        population = [deepcopy(self.initial_timetable)]
+        initial = self.initial_state.copy()
+        population = [initial]
 
         for _ in range(self.population_size - 1):
-            variant = deepcopy(self.initial_timetable)
+            variant = initial.copy()
             # Apply random mutations to create variation
-            num_mutations = random.randint(3, 10)
+            num_mutations = self.rng.randint(3, 10)
             for _ in range(num_mutations):
-                variant = self._mutate(variant)
-                if not self._verify_hard_constraints(variant):
-                    variant = deepcopy(self.initial_timetable)
+                self._mutate(variant)
+                if not variant.is_feasible:
+                    variant.undo()
                     break
+            variant.commit()
             population.append(variant)
 
         return population
 
     def _tournament_select(self, scored, k=3):
         """Tournament selection: pick best from k random candidates."""
-        candidates = random.sample(scored, min(k, len(scored)))
+        candidates = self.rng.sample(scored, min(k, len(scored)))
         candidates.sort(key=lambda x: x[1], reverse=True)
-        return deepcopy(candidates[0][0])
+        return candidates[0][0]
 
     def _crossover(self, parent1, parent2):
         """
         Day-level crossover: for each section, randomly pick days
         from parent1 or parent2.
+
+        The child starts as a copy of parent1 and takes parent2's row tuple
+        for the section-days chosen from it; rows are shared, not copied,
+        and only slots that differ are re-scored.
         """
-        child = {}
+        child = parent1.copy()
 
         for section_id in self.section_ids:
             for day in self.days:
                 # Randomly choose which parent to take this day from
-                source = parent1 if random.random() < 0.5 else parent2
+                if self.rng.random() < 0.5:
+                    continue
 
-                for slot_idx in range(self.num_slots):
-                    key = (section_id, day, slot_idx)
-                    if key in source:
-                        child[key] = deepcopy(source[key])
+                child.set_row((section_id, day), parent2.row(section_id, day))
 
         return child
 
-    def _mutate(self, timetable, mutation_rate=0.1):
+    def _mutate(self, state, mutation_rate=0.1):
         """
         Mutation: swap two slots within the same section and day.
-        Only swaps if hard constraints remain satisfied.
-        """
-        if random.random() > mutation_rate:
-            return timetable
 
-        timetable = deepcopy(timetable)
+        Applied in place and recorded in the state's undo log; the caller
+        checks ``state.is_feasible`` and undoes it if needed.
+        """
+        if self.rng.random() > mutation_rate:
+            return state
 
         # Pick a random section and day
-        section_id = random.choice(self.section_ids)
-        day = random.choice(self.days)
+        section_id = self.rng.choice(self.section_ids)
+        day = self.rng.choice(self.days)
 
         # Get all filled slots for this section-day
-        filled = []
-        for slot_idx in range(self.num_slots):
-            key = (section_id, day, slot_idx)
-            if key in timetable and timetable[key] is not None:
-                filled.append(slot_idx)
+        filled = [
+            slot_idx for slot_idx, code in enumerate(state.row(section_id, day))
+            if code != EMPTY
+        ]
 
         if len(filled) < 2:
-            return timetable
+            return state
 
         # Pick two slots to swap
-        s1, s2 = random.sample(filled, 2)
-        key1 = (section_id, day, s1)
-        key2 = (section_id, day, s2)
-
-        # Swap
-        timetable[key1], timetable[key2] = timetable[key2], timetable[key1]
+        s1, s2 = self.rng.sample(filled, 2)
+        state.swap(section_id, day, s1, s2)
 
-        return timetable
+        return state
 
     def _verify_hard_constraints(self, timetable):
         """
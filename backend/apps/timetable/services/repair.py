@@ -0,0 +1,299 @@
+"""
+Warm-start repair of an existing timetable (incremental regeneration).
+
+Full generation starts the CSP from an empty timetable. When the school only
+added a teacher or changed one subject's periods, ``TimetableRepairer``
+starts from the timetable currently in use instead:
+
+1. Seed cells are matched to the new requirements: each day's runs of one
+   (section, subject, teacher) are cut into blocks of the required length,
+   up to the number of blocks the requirement needs. Cells that no longer
+   match (subject removed, teacher changed, fewer periods) are dropped and
+   their blocks become unassigned.
+2. Matched blocks are re-checked against the hard constraints in order; a
+   block that now clashes (teacher busy or unavailable, over the daily
+   limit, slot no longer a period) is unassigned as well.
+3. Unassigned blocks are placed by min-conflicts local search: each goes to
+   the slot that displaces the fewest placed blocks (free slots first, ties
+   broken at random). Displaced blocks rejoin the queue, and blocks placed
+   in the last few steps are tabu so the search does not cycle.
+
+Everything outside the delta and its conflict neighbourhood stays where it
+was; ``stats`` reports how much of the seed survived.
+"""
+
+import random
+from collections import defaultdict, deque
+
+from .generator import TimetableGenerator
+from .occupancy import Occupancy, block_mask
+
+
+class TimetableRepairer(TimetableGenerator):
+    """
+    Usage:
+        repairer = TimetableRepairer(inputs, progress_callback=cb)
+        timetable = repairer.repair(current_timetable)   # None if stuck
+        repairer.stats
+    """
+
+    # Recently placed blocks that may not be displaced again
+    tabu_tenure = 8
+    # Search steps allowed per initially unassigned block
+    steps_per_block = 50
+
+    def repair(self, seed_timetable):
+        """
+        Repair ``seed_timetable`` ((section_id, day, slot_idx) -> assignment,
+        as produced by the generator) into a feasible timetable for the
+        current inputs.
+
+        Returns:
+            dict: timetable in the generator's format, or None if the local
+                  search ran out of steps (fall back to ``generate()``).
+        """
+        self.assignments = self._build_assignments()
+        if not self.assignments:
+            return None
+
+        self.timetable = {}
+        self.occupancy = Occupancy()
+        self.placed = {}                 # block id -> cell keys
+        self.cell_owner = {}             # (section, day, slot) -> block id
+        self.teacher_owner = {}          # (teacher, day, slot) -> block id
+
+        matched, pending = self._match_seed(seed_timetable)
+        for block_id, day, start, room_id in matched:
+            if self._fits(block_id, day, start):
+                self._place(block_id, day, start, room_id)
+            else:
+                pending.append(block_id)
+
+        self.stats = {
+            'seed_cells': len(seed_timetable),
+            'kept_blocks': len(self.placed),
+            'unassigned_blocks': len(pending),
+            'steps': 0,
+            'displaced_blocks': 0,
+        }
+        self._report_progress(10, f'Kept {len(self.placed)} blocks, repairing {len(pending)}...')
+
+        if not self._min_conflicts(pending):
+            return None
+
+        self.stats.update(_changes(seed_timetable, self.timetable))
+        self._report_progress(100, 'Timetable repaired')
+        return self.timetable
+
+    # ------------------------------------------------------------------
+    # Seed matching
+    # ------------------------------------------------------------------
+
+    def _match_seed(self, seed_timetable):
+        """
+        Match seed runs to the blocks of ``self.assignments``.
+
+        Returns (matched, pending): ``matched`` lists (block id, day, start,
+        room id) at the seed's position, ``pending`` the unmatched block ids.
+        """
+        demand = defaultdict(lambda: defaultdict(list))
+        for block_id, assignment in enumerate(self.assignments):
+            key = (assignment['section_id'], assignment['subject_id'], assignment['teacher_id'])
+            demand[key][assignment['consecutive_periods']].append(block_id)
+
+        matched = []
+        for section_id, day, start, length, subject_id, teacher_id, room_id in _seed_runs(seed_timetable):
+            blocks = demand.get((section_id, subject_id, teacher_id))
+            if not blocks:
+                continue
+            pos = start
+            for size in sorted(blocks, reverse=True):
+                while blocks[size] and pos + size <= start + length:
+                    matched.append((blocks[size].pop(), day, pos, room_id))
+                    pos += size
+
+        claimed = {block_id for block_id, _, _, _ in matched}
+        pending = [block_id for block_id in range(len(self.assignments)) if block_id not in claimed]
+        return matched, pending
+
+    # ------------------------------------------------------------------
+    # Min-conflicts search
+    # ------------------------------------------------------------------
+
+    def _min_conflicts(self, pending):
+        queue = deque(sorted(
+            pending,
+            key=lambda b: (-self.assignments[b]['consecutive_periods'], not self.assignments[b]['requires_lab']),
+        ))
+        recent = deque(maxlen=self.tabu_tenure)
+        max_steps = self.steps_per_block * max(len(queue), 1) + 100
+
+        while queue:
+            self.stats['steps'] += 1
+            if self.stats['steps'] > max_steps:
+                return False
+            if self.stats['steps'] % 200 == 0:
+                self._report_progress(
+                    min(95, 10 + self.stats['steps'] * 85 // max_steps),
+                    f'Repair step {self.stats["steps"]}, {len(queue)} block(s) to place',
+                )
+
+            block_id = queue.popleft()
+            best = self._best_placement(block_id, set(recent))
+            if best is None:
+                return False
+
+            day, start, displaced = best
+            for other in displaced:
+                self._unplace(other)
+                queue.append(other)
+            self.stats['displaced_blocks'] += len(displaced)
+            self._place(block_id, day, start)
+            recent.append(block_id)
+
+        return True
+
+    def _best_placement(self, block_id, tabu):
+        """
+        (day, start, displaced block ids) minimising the blocks displaced;
+        placements that would displace a tabu block are used only if there
+        is nothing else.
+        """
+        assignment = self.assignments[block_id]
+        section_id = assignment['section_id']
+        teacher_id = assignment['teacher_id']
+        consec = assignment['consecutive_periods']
+
+        best, best_key = None, None
+        for day in self.days:
+            if not self._teacher_works(teacher_id, day):
+                continue
+            allowed = self._allowed_mask(teacher_id, day)
+            for start in range(self.num_slots - consec + 1):
+                if ~allowed & block_mask(start, consec):
+                    continue
+                displaced = set()
+                for slot_idx in range(start, start + consec):
+                    owner = self.cell_owner.get((section_id, day, slot_idx))
+                    if owner is not None:
+                        displaced.add(owner)
+                    if teacher_id:
+                        owner = self.teacher_owner.get((teacher_id, day, slot_idx))
+                        if owner is not None:
+                            displaced.add(owner)
+                if teacher_id and not self._within_daily_limit(teacher_id, day, consec, displaced):
+                    continue
+                key = (bool(displaced & tabu), len(displaced), random.random())
+                if best_key is None or key < best_key:
+                    best, best_key = (day, start, displaced), key
+        return best
+
+    # ------------------------------------------------------------------
+    # Placement bookkeeping
+    # ------------------------------------------------------------------
+
+    def _fits(self, block_id, day, start):
+        """Hard constraints for placing a block with nothing displaced."""
+        assignment = self.assignments[block_id]
+        teacher_id = assignment['teacher_id']
+        consec = assignment['consecutive_periods']
+        if day not in self.days or start + consec > self.num_slots:
+            return False
+        if not self._teacher_works(teacher_id, day):
+            return False
+        mask = block_mask(start, consec)
+        busy = self.occupancy.section_mask(assignment['section_id'], day) | ~self._allowed_mask(teacher_id, day)
+        if teacher_id:
+            busy |= self.occupancy.teacher_mask(teacher_id, day)
+            if not self._check_teacher_daily_limit(teacher_id, day, consec):
+                return False
+        return not busy & mask
+
+    def _place(self, block_id, day, start, room_id=None):
+        assignment = self.assignments[block_id]
+        consec = assignment['consecutive_periods']
+        if assignment['requires_lab'] or assignment['preferred_room_type']:
+            if not (room_id and self.occupancy.room_free(room_id, day, start, consec)):
+                room_id = self._find_room(
+                    self.timetable, day, start, consec,
+                    assignment['requires_lab'], assignment['preferred_room_type'],
+                )
+        else:
+            room_id = None
+
+        keys = []
+        for slot_idx in range(start, start + consec):
+            key = (assignment['section_id'], day, slot_idx)
+            cell = {
+                'subject_id': assignment['subject_id'],
+                'subject_name': assignment['subject_name'],
+                'teacher_id': assignment['teacher_id'],
+                'room_id': room_id,
+                'requires_lab': assignment['requires_lab'],
+            }
+            self.timetable[key] = cell
+            self.occupancy.assign(key, cell)
+            self.cell_owner[key] = block_id
+            if assignment['teacher_id']:
+                self.teacher_owner[(assignment['teacher_id'], day, slot_idx)] = block_id
+            keys.append(key)
+        self.placed[block_id] = keys
+
+    def _unplace(self, block_id):
+        teacher_id = self.assignments[block_id]['teacher_id']
+        for key in self.placed.pop(block_id):
+            self.occupancy.unassign(key, self.timetable.pop(key))
+            del self.cell_owner[key]
+            if teacher_id:
+                del self.teacher_owner[(teacher_id, key[1], key[2])]
+
+    def _teacher_works(self, teacher_id, day):
+        avail = self.teacher_availability.get((teacher_id, day)) if teacher_id else None
+        return not avail or avail['is_available']
+
+    def _within_daily_limit(self, teacher_id, day, additional, displaced):
+        """Daily limit once the teacher's displaced blocks on ``day`` are gone."""
+        freed = sum(
+            len(self.placed[other]) for other in displaced
+            if self.assignments[other]['teacher_id'] == teacher_id
+        )
+        avail = self.teacher_availability.get((teacher_id, day))
+        max_per_day = avail['max_periods_per_day'] if avail else 6
+        return self.occupancy.teacher_day_count(teacher_id, day) - freed + additional <= max_per_day
+
+
+def _seed_runs(seed_timetable):
+    """
+    Maximal runs of consecutive seed cells with the same subject and teacher:
+    (section_id, day, start, length, subject_id, teacher_id, room_id).
+    """
+    by_row = defaultdict(dict)
+    for (section_id, day, slot_idx), cell in seed_timetable.items():
+        if cell and cell.get('subject_id'):
+            by_row[(section_id, day)][slot_idx] = cell
+
+    runs = []
+    for (section_id, day), cells in by_row.items():
+        run = None
+        for slot_idx in sorted(cells):
+            cell = cells[slot_idx]
+            ident = (cell['subject_id'], cell.get('teacher_id'))
+            if run and run[0] == ident and run[1] + run[2] == slot_idx:
+                run[2] += 1
+            else:
+                if run:
+                    runs.append((section_id, day, run[1], run[2], *run[0], run[3]))
+                run = [ident, slot_idx, 1, cell.get('room_id')]
+        if run:
+            runs.append((section_id, day, run[1], run[2], *run[0], run[3]))
+    return runs
+
+
+def _changes(seed_timetable, timetable):
+    """Cells whose subject or teacher differs between the seed and the result."""
+    def ident(cell):
+        return (cell['subject_id'], cell.get('teacher_id')) if cell and cell.get('subject_id') else None
+
+    keys = set(seed_timetable) | set(timetable)
+    changed = sum(1 for key in keys if ident(seed_timetable.get(key)) != ident(timetable.get(key)))
+    return {'changed_cells': changed, 'unchanged_cells': len(keys) - changed}
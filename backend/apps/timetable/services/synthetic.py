@@ -0,0 +1,165 @@
+"""
+Synthetic school inputs for benchmarking the timetable engine.
+
+``build_synthetic_inputs`` returns a dict in the shape produced by
+``validators.collect_generation_inputs`` without touching the database, so
+the generator and optimizer can be timed on schools of any size.
+"""
+
+import copy
+import math
+import random
+from datetime import datetime, timedelta
+
+SYNTHETIC_DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY']
+
+# (name, periods_per_week, consecutive_periods, requires_lab, preferred_room_type)
+SYNTHETIC_SUBJECTS = [
+    ('Mathematics', 7, 1, False, None),
+    ('English', 6, 1, False, None),
+    ('Science', 6, 2, True, 'SCIENCE_LAB'),
+    ('Hindi', 5, 1, False, None),
+    ('Social Studies', 5, 1, False, None),
+    ('Computer Science', 2, 2, True, 'COMPUTER_LAB'),
+    ('Physical Education', 3, 1, False, None),
+    ('Art', 2, 1, False, None),
+]
+
+SECTIONS_PER_CLASS = 4
+TEACHER_WEEKLY_LOAD = 24
+LAB_WEEKLY_LOAD = 30
+
+
+def build_synthetic_inputs(num_sections, num_slots=8, days=None, seed=0):
+    """
+    Inputs for a school of ``num_sections`` sections (four per class), with
+    one teacher per subject per group of sections up to ~24 periods/week,
+    enough science and computer labs, and a sprinkling of teacher
+    availability rules and slot preferences.
+    """
+    rng = random.Random(seed)
+    days = list(days or SYNTHETIC_DAYS)
+
+    start = datetime(2026, 1, 1, 8, 0)
+    slots = []
+    for idx in range(num_slots):
+        slot_start = start + timedelta(minutes=45 * idx)
+        slots.append({
+            'id': f'slot-{idx + 1}',
+            'name': f'Period {idx + 1}',
+            'start_time': slot_start.time(),
+            'end_time': (slot_start + timedelta(minutes=45)).time(),
+            'slot_type': 'PERIOD',
+            'order': idx + 1,
+        })
+
+    sections = []
+    for idx in range(num_sections):
+        class_number = idx // SECTIONS_PER_CLASS + 1
+        sections.append({
+            'id': f'section-{idx + 1}',
+            'class_id': f'class-{class_number}',
+            'class_name': f'Class {class_number}',
+            'name': 'ABCDEFGH'[idx % SECTIONS_PER_CLASS],
+            'max_students': 40,
+        })
+
+    requirements = {section['id']: [] for section in sections}
+    teachers = set()
+    teacher_subject_map = {}
+
+    for subject_idx, (name, periods, consecutive, requires_lab, room_type) in enumerate(SYNTHETIC_SUBJECTS):
+        subject_id = f'subject-{subject_idx + 1}'
+        sections_per_teacher = max(1, TEACHER_WEEKLY_LOAD // periods)
+        for idx, section in enumerate(sections):
+            teacher_id = f'teacher-{subject_idx + 1}-{idx // sections_per_teacher + 1}'
+            teachers.add(teacher_id)
+            teacher_subject_map.setdefault(teacher_id, set()).add(subject_id)
+            requirements[section['id']].append({
+                'subject_id': subject_id,
+                'subject_name': name,
+                'teacher_id': teacher_id,
+                'periods_per_week': periods,
+                'requires_lab': requires_lab,
+                'preferred_room_type': room_type,
+                'consecutive_periods': consecutive,
+                'preferred_time_slots': [],
+            })
+
+    rooms = []
+    for room_type, periods in (('SCIENCE_LAB', 6), ('COMPUTER_LAB', 2)):
+        for idx in range(math.ceil(num_sections * periods / LAB_WEEKLY_LOAD)):
+            rooms.append({
+                'id': f'{room_type.lower()}-{idx + 1}',
+                'room_number': f'{room_type[0]}{idx + 1:02d}',
+                'room_name': f'{room_type.replace("_", " ").title()} {idx + 1}',
+                'room_type': room_type,
+                'capacity': 40,
+            })
+
+    teacher_availability = {}
+    for teacher_id in sorted(teachers):
+        roll = rng.random()
+        if roll < 0.1:
+            # One day off
+            teacher_availability[(teacher_id, rng.choice(days))] = _availability(is_available=False)
+        elif roll < 0.3:
+            # Prefers the first half of the day, all week
+            preferred = list(range(num_slots // 2))
+            for day in days:
+                teacher_availability[(teacher_id, day)] = _availability(preferred_time_slots=preferred)
+
+    return {
+        'slots': slots,
+        'days': days,
+        'sections': sections,
+        'requirements': requirements,
+        'teachers': teachers,
+        'teacher_availability': teacher_availability,
+        'rooms': rooms,
+        'teacher_subject_map': teacher_subject_map,
+    }
+
+
+def build_midterm_change(inputs, leave_days=2, extra_periods=1, seed=0):
+    """
+    A copy of ``inputs`` after a typical mid-term change, for timing
+    incremental regeneration: one teacher goes on leave for ``leave_days``
+    days, one class gets ``extra_periods`` more of a single-period subject,
+    and one section's double-period subject moves to a new teacher.
+    """
+    rng = random.Random(seed)
+    changed = copy.deepcopy(inputs)
+    sections = changed['sections']
+
+    teacher_id = rng.choice(sorted(changed['teachers']))
+    for day in rng.sample(changed['days'], leave_days):
+        changed['teacher_availability'][(teacher_id, day)] = _availability(is_available=False)
+
+    class_id = rng.choice(sections)['class_id']
+    for section in sections:
+        if section['class_id'] != class_id:
+            continue
+        singles = [req for req in changed['requirements'][section['id']] if req['consecutive_periods'] == 1]
+        min(singles, key=lambda req: req['periods_per_week'])['periods_per_week'] += extra_periods
+
+    section_id = rng.choice(sections)['id']
+    doubles = [req for req in changed['requirements'][section_id] if req['consecutive_periods'] > 1]
+    if doubles:
+        new_teacher = 'teacher-midterm-1'
+        doubles[0]['teacher_id'] = new_teacher
+        changed['teachers'].add(new_teacher)
+        changed['teacher_subject_map'][new_teacher] = {doubles[0]['subject_id']}
+
+    return changed
+
+
+def _availability(is_available=True, preferred_time_slots=None):
+    return {
+        'is_available': is_available,
+        'available_from': None,
+        'available_until': None,
+        'max_periods_per_day': 6,
+        'max_consecutive_periods': 3,
+        'preferred_time_slots': preferred_time_slots or [],
+    }
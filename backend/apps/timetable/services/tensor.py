@@ -0,0 +1,282 @@
+"""
+Array-backed timetable encoding and vectorised soft-constraint scoring.
+
+The dict timetable ``(section_id, day, slot_idx) -> assignment`` is encoded
+as an int32 array of *cell codes* indexed ``[section, day, slot]``; ``-1``
+is an empty slot. Every distinct assignment dict is interned once, and
+per-cell lookup arrays turn a code array into subject, teacher and room
+tensors of the same shape. Each lookup array ends with a ``-1`` sentinel so
+that indexing with ``-1`` (empty) yields ``-1``.
+
+``TensorFitness`` re-implements the soft constraints from
+``constraints.py`` as NumPy reductions over a ``[population, section, day,
+slot]`` batch, so the GA scores a whole generation with a handful of array
+operations instead of walking every timetable in Python.
+"""
+
+import numpy as np
+
+# Fields that make up a cell; decode() rebuilds assignment dicts from these
+CELL_FIELDS = ('subject_id', 'subject_name', 'teacher_id', 'room_id', 'requires_lab')
+
+EMPTY = -1
+
+
+class TimetableEncoding:
+    """
+    Maps dict timetables to and from ``[section, day, slot]`` cell-code arrays.
+
+    Teacher codes for ``teachers`` (the school's teacher set) come first, so
+    ``code < num_core_teachers`` identifies the teachers the workload
+    constraints are computed for.
+    """
+
+    def __init__(self, section_ids, days, num_slots, teachers=()):
+        self.section_ids = list(section_ids)
+        self.days = list(days)
+        self.num_slots = num_slots
+        self.shape = (len(self.section_ids), len(self.days), num_slots)
+
+        self.section_index = {sid: idx for idx, sid in enumerate(self.section_ids)}
+        self.day_index = {day: idx for idx, day in enumerate(self.days)}
+
+        self.cells = []
+        self._cell_codes = {}
+        self.subject_codes = {}
+        self.teacher_codes = {}
+        self.room_codes = {}
+        for teacher_id in sorted(teachers, key=str):
+            self._code(self.teacher_codes, teacher_id)
+        self.num_core_teachers = len(self.teacher_codes)
+
+        self._cell_subject = []
+        self._cell_teacher = []
+        self._cell_room = []
+        self._lookups = None
+
+    @staticmethod
+    def _code(codes, value):
+        if value is None or value == '':
+            return EMPTY
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def intern(self, cell):
+        """Code for an assignment dict, allocating one on first sight."""
+        key = tuple(cell.get(field) for field in CELL_FIELDS)
+        code = self._cell_codes.get(key)
+        if code is None:
+            code = self._cell_codes[key] = len(self.cells)
+            self.cells.append(key)
+            self._cell_subject.append(self._code(self.subject_codes, key[0]))
+            self._cell_teacher.append(self._code(self.teacher_codes, key[2]))
+            self._cell_room.append(self._code(self.room_codes, key[3]))
+            self._lookups = None
+        return code
+
+    def encode(self, timetable, out=None):
+        """``[section, day, slot]`` int32 cell codes for one dict timetable."""
+        if out is None:
+            out = np.full(self.shape, EMPTY, dtype=np.int32)
+        else:
+            out.fill(EMPTY)
+        section_index, day_index = self.section_index, self.day_index
+        for (section_id, day, slot_idx), cell in timetable.items():
+            if cell is None:
+                continue
+            section = section_index.get(section_id)
+            day_idx = day_index.get(day)
+            if section is None or day_idx is None:
+                continue
+            out[section, day_idx, slot_idx] = self.intern(cell)
+        return out
+
+    def encode_many(self, timetables):
+        """``[population, section, day, slot]`` batch for a list of timetables."""
+        batch = np.empty((len(timetables),) + self.shape, dtype=np.int32)
+        for idx, timetable in enumerate(timetables):
+            self.encode(timetable, out=batch[idx])
+        return batch
+
+    def decode(self, codes):
+        """Dict timetable for a ``[section, day, slot]`` code array."""
+        timetable = {}
+        for section, day_idx, slot_idx in zip(*np.nonzero(codes >= 0)):
+            cell = self.cells[codes[section, day_idx, slot_idx]]
+            timetable[(self.section_ids[section], self.days[day_idx], int(slot_idx))] = dict(zip(CELL_FIELDS, cell))
+        return timetable
+
+    def lookups(self):
+        """``(subject, teacher, room)`` per-cell code arrays, each ending in the -1 sentinel."""
+        if self._lookups is None:
+            self._lookups = tuple(
+                np.array(values + [EMPTY], dtype=np.int32)
+                for values in (self._cell_subject, self._cell_teacher, self._cell_room)
+            )
+        return self._lookups
+
+    def subjects(self, codes):
+        return self.lookups()[0][codes]
+
+    def teachers(self, codes):
+        return self.lookups()[1][codes]
+
+    def rooms(self, codes):
+        return self.lookups()[2][codes]
+
+
+class TensorFitness:
+    """
+    Vectorised equivalent of the soft-constraint fitness (S1-S5, S7).
+
+    ``score(batch)`` returns one 0-100 score per timetable in the batch; the
+    penalties match the ``calc_*`` functions in ``constraints.py``.
+    """
+
+    def __init__(self, encoding, teacher_availability, heavy_subject_ids, weights):
+        self.encoding = encoding
+        self.teacher_availability = teacher_availability
+        self.heavy_subject_ids = set(heavy_subject_ids)
+        self.weights = weights
+        self._tables = {}
+
+    def score(self, batch):
+        penalties = self.penalties(batch)
+        weights = self.weights
+        score = (
+            100.0
+            - weights['workload_balance'] * penalties['workload_variance']
+            - weights['no_consecutive_heavy'] * penalties['heavy_adjacency']
+            - weights['subject_spread'] * penalties['subject_clustering']
+            - weights['teacher_preference'] * penalties['teacher_preference']
+            - weights['room_optimization'] * penalties['room_changes']
+            - weights['workload_balance'] * penalties['consecutive_periods'] * 0.5
+        )
+        return np.maximum(score, 0.0)
+
+    def penalties(self, batch):
+        """Per-constraint penalty arrays (each ``[population]``) for a batch."""
+        batch = np.asarray(batch)
+        if batch.ndim == 3:
+            batch = batch[np.newaxis]
+
+        encoding = self.encoding
+        subjects = encoding.subjects(batch)
+        teachers = encoding.teachers(batch)
+        rooms = encoding.rooms(batch)
+        teaching = self._teacher_slot_occupancy(teachers)
+
+        return {
+            'workload_variance': self._workload_variance(teaching),
+            'heavy_adjacency': self._heavy_adjacency(subjects),
+            'subject_clustering': self._subject_clustering(subjects),
+            'teacher_preference': self._teacher_preference(teachers),
+            'room_changes': self._room_changes(rooms),
+            'consecutive_periods': self._consecutive_periods(teaching),
+        }
+
+    def _teacher_slot_occupancy(self, teachers):
+        """``[population, core teacher, day, slot]`` periods taught per slot."""
+        population, _, num_days, num_slots = teachers.shape
+        num_teachers = self.encoding.num_core_teachers
+        mask = (teachers >= 0) & (teachers < num_teachers)
+        pop_idx, _, day_idx, slot_idx = np.nonzero(mask)
+        flat = ((pop_idx * num_teachers + teachers[mask]) * num_days + day_idx) * num_slots + slot_idx
+        counts = np.bincount(flat, minlength=population * num_teachers * num_days * num_slots)
+        return counts.reshape(population, num_teachers, num_days, num_slots)
+
+    def _workload_variance(self, teaching):
+        """S1: mean over teachers of the variance of periods per day."""
+        population, num_teachers, num_days, _ = teaching.shape
+        if not num_teachers or not num_days:
+            return np.zeros(population)
+        per_day = teaching.sum(axis=3)
+        avg_variance = per_day.var(axis=2).sum(axis=1) / num_teachers
+        return np.minimum(avg_variance * 2.0, 10.0)
+
+    def _heavy_adjacency(self, subjects):
+        """S2: back-to-back heavy subjects within a section-day."""
+        heavy = self._table('heavy')[subjects]
+        pairs = (heavy[..., 1:] & heavy[..., :-1]).sum(axis=(1, 2, 3))
+        return np.minimum(pairs * 1.5, 10.0)
+
+    def _subject_clustering(self, subjects):
+        """S3: squared deviation of a subject's daily count from an even spread."""
+        population, num_sections, num_days, _ = subjects.shape
+        num_subjects = len(self.encoding.subject_codes)
+        if not num_subjects:
+            return np.zeros(population)
+        mask = subjects >= 0
+        pop_idx, section_idx, day_idx, _ = np.nonzero(mask)
+        flat = ((pop_idx * num_sections + section_idx) * num_subjects + subjects[mask]) * num_days + day_idx
+        counts = np.bincount(flat, minlength=population * num_sections * num_subjects * num_days)
+        counts = counts.reshape(population, num_sections, num_subjects, num_days)
+
+        totals = counts.sum(axis=3, keepdims=True)
+        deviation = (counts - totals / num_days) ** 2
+        # Only days the subject is taught, for subjects with more than one period
+        deviation[(counts == 0) | (totals <= 1).repeat(num_days, axis=3)] = 0
+        return np.minimum(deviation.sum(axis=(1, 2, 3)) * 0.3, 10.0)
+
+    def _teacher_preference(self, teachers):
+        """S4: periods outside a teacher's preferred slots."""
+        violates = self._table('preference')
+        population, _, num_days, num_slots = teachers.shape
+        day_idx = np.arange(num_days).reshape(1, 1, num_days, 1)
+        slot_idx = np.arange(num_slots).reshape(1, 1, 1, num_slots)
+        # Empty cells index the sentinel row (-1), which never violates
+        violations = violates[teachers, day_idx, slot_idx].sum(axis=(1, 2, 3))
+        return np.minimum(violations * 0.5, 10.0)
+
+    def _room_changes(self, rooms):
+        """S5: room changes between adjacent periods of a section-day."""
+        current, previous = rooms[..., 1:], rooms[..., :-1]
+        changes = ((current >= 0) & (previous >= 0) & (current != previous)).sum(axis=(1, 2, 3))
+        return np.minimum(changes * 0.5, 10.0)
+
+    def _consecutive_periods(self, teaching):
+        """S7: periods beyond each teacher's max consecutive run."""
+        population, num_teachers, num_days, num_slots = teaching.shape
+        max_consecutive = self._table('max_consecutive')
+        run = np.zeros((population, num_teachers, num_days), dtype=np.int64)
+        penalty = np.zeros(population, dtype=np.int64)
+        for slot_idx in range(num_slots):
+            run = (run + 1) * (teaching[..., slot_idx] > 0)
+            penalty += (run > max_consecutive).sum(axis=(1, 2))
+        return np.minimum(penalty * 1.0, 10.0)
+
+    def _table(self, name):
+        """Lookup tables, rebuilt when new subjects/teachers have been interned."""
+        encoding = self.encoding
+        size = (len(encoding.subject_codes), len(encoding.teacher_codes))
+        cached = self._tables.get(name)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+
+        days, num_slots = encoding.days, encoding.num_slots
+        if name == 'heavy':
+            table = np.zeros(size[0] + 1, dtype=bool)
+            for subject_id, code in encoding.subject_codes.items():
+                table[code] = subject_id in self.heavy_subject_ids
+        elif name == 'preference':
+            table = np.zeros((size[1] + 1, len(days), num_slots), dtype=bool)
+            for teacher_id, code in encoding.teacher_codes.items():
+                for day_idx, day in enumerate(days):
+                    avail = self.teacher_availability.get((teacher_id, day))
+                    if avail and avail.get('preferred_time_slots'):
+                        preferred = set(avail['preferred_time_slots'])
+                        table[code, day_idx] = [slot not in preferred for slot in range(num_slots)]
+        else:
+            table = np.full((encoding.num_core_teachers, len(days)), 3, dtype=np.int64)
+            for teacher_id, code in encoding.teacher_codes.items():
+                if code >= encoding.num_core_teachers:
+                    continue
+                for day_idx, day in enumerate(days):
+                    avail = self.teacher_availability.get((teacher_id, day))
+                    if avail:
+                        table[code, day_idx] = avail.get('max_consecutive_periods', 3)
+
+        self._tables[name] = (size, table)
+        return table
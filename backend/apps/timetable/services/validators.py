@@ -7,7 +7,7 @@ before attempting to generate a timetable.
 
 from collections import defaultdict
 from apps.timetable.models import (
-    TimeSlot, SubjectPeriodRequirement, TeacherAvailability,
+    ClassTimetable, TimeSlot, SubjectPeriodRequirement, TeacherAvailability,
     RoomAllocation, TimetableGenerationConfig,
 )
 from apps.academics.models import Class, Section, Subject, ClassSubject, AcademicYear
@@ -309,3 +309,45 @@ def collect_generation_inputs(config):
         'rooms': rooms,
         'teacher_subject_map': dict(teacher_subject_map),
     }
+
+
+def collect_current_timetable(config, inputs):
+    """
+    The active ClassTimetable of the config's sections, in the generator's
+    format, as the seed for incremental (warm-start) regeneration.
+
+    Returns a dict of (section_id, day, slot_idx) -> assignment dict. Cells
+    on slots or days that ``inputs`` no longer has are left out.
+    """
+    slot_index = {slot['id']: idx for idx, slot in enumerate(inputs['slots'])}
+    room_ids = {room['room_number']: room['id'] for room in inputs['rooms']}
+    days = set(inputs['days'])
+    requires_lab = {
+        (section_id, req['subject_id']): req['requires_lab']
+        for section_id, reqs in inputs['requirements'].items()
+        for req in reqs
+    }
+
+    rows = ClassTimetable.objects.filter(
+        academic_year=config.academic_year,
+        section_id__in=[section['id'] for section in inputs['sections']],
+        subject__isnull=False,
+        is_active=True,
+    ).values_list(
+        'section_id', 'day_of_week', 'time_slot_id',
+        'subject_id', 'subject__name', 'teacher_id', 'room_number',
+    )
+
+    timetable = {}
+    for section_id, day, slot_id, subject_id, subject_name, teacher_id, room_number in rows:
+        slot_idx = slot_index.get(slot_id)
+        if slot_idx is None or day not in days:
+            continue
+        timetable[(section_id, day, slot_idx)] = {
+            'subject_id': subject_id,
+            'subject_name': subject_name,
+            'teacher_id': teacher_id,
+            'room_id': room_ids.get(room_number) if room_number else None,
+            'requires_lab': requires_lab.get((section_id, subject_id), False),
+        }
+    return timetable
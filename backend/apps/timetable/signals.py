@@ -0,0 +1,84 @@
+"""
+Timetable signals.
+
+``timetable_cells_changed`` is sent once per apply or rollback of a
+generated timetable, after the changed cells have been written with
+bulk operations (which do not send ``post_save``). Receivers get:
+
+    sender          ClassTimetable
+    academic_year   AcademicYear the rows belong to
+    section_ids     ids (str) of the sections with at least one changed cell
+
+The receivers below keep the substitute free-slot index
+(``services.availability``) in step with the timetable, substitutions and
+staff leave.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from apps.timetable.models import TeacherTimetable, TimetableSubstitution
+
+timetable_cells_changed = Signal()
+
+
+@receiver(timetable_cells_changed)
+def rebuild_free_slot_index(sender, academic_year, **kwargs):
+    """Rebuild the year's free-slot index once the applied cells are committed"""
+    from apps.timetable.services.availability import FreeSlotIndex
+
+    transaction.on_commit(partial(FreeSlotIndex.rebuild, academic_year.pk))
+
+
+@receiver(post_save, sender=TeacherTimetable)
+@receiver(post_delete, sender=TeacherTimetable)
+def invalidate_free_slot_index(sender, instance, raw=False, **kwargs):
+    """Hand edits drop the index; the next read rebuilds it"""
+    if raw:
+        return
+    from apps.timetable.services.availability import FreeSlotIndex
+
+    transaction.on_commit(partial(FreeSlotIndex.invalidate, instance.academic_year_id))
+
+
+@receiver(post_save, sender=TimetableSubstitution)
+def update_free_slots_on_substitution(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    from apps.timetable.services.availability import record_substitution
+
+    previous_date = None if created else getattr(instance, '_stored_date', None)
+    instance._stored_date = instance.date
+    transaction.on_commit(partial(
+        record_substitution, instance, created=created, previous_date=previous_date,
+    ))
+
+
+@receiver(post_delete, sender=TimetableSubstitution)
+def update_free_slots_on_substitution_delete(sender, instance, **kwargs):
+    from apps.timetable.services.availability import record_substitution
+
+    transaction.on_commit(partial(record_substitution, instance, deleted=True))
+
+
+@receiver(post_save, sender='attendance.StaffLeave')
+def update_free_slots_on_staff_leave(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    from apps.timetable.services.availability import record_staff_leave
+
+    previous_dates = None if created else getattr(instance, '_stored_dates', None)
+    instance._stored_dates = (instance.start_date, instance.end_date)
+    transaction.on_commit(partial(
+        record_staff_leave, instance, created=created, previous_dates=previous_dates,
+    ))
+
+
+@receiver(post_delete, sender='attendance.StaffLeave')
+def update_free_slots_on_staff_leave_delete(sender, instance, **kwargs):
+    from apps.timetable.services.availability import record_staff_leave
+
+    transaction.on_commit(partial(record_staff_leave, instance, deleted=True))
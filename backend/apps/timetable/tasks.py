@@ -6,12 +6,17 @@ from celery import shared_task
 from celery.exceptions import SoftTimeLimitExceeded
 from django.utils import timezone
 
+from apps.core.services.progress import ProgressChannel
 
-def update_progress(run, percent, message):
-    """Update a generation run's progress."""
-    run.progress_percent = percent
-    run.progress_message = message
-    run.save(update_fields=['progress_percent', 'progress_message'])
+
+def progress_channel(run):
+    """
+    Progress of a generation run: throttled to the cache while the search runs,
+    saved to the run at phase boundaries (see ``apps.core.services.progress``).
+    """
+    return ProgressChannel.for_instance(
+        run, base={'id': str(run.id), 'fitness_score': None, 'error_message': ''},
+    )
 
 
 @shared_task(bind=True, max_retries=0, time_limit=600, soft_time_limit=540)
@@ -21,7 +26,8 @@ def generate_timetable_task(self, run_id):
 
     Pipeline:
     1. Validate inputs (0-10%)
-    2. CSP generation — feasible timetable (10-60%)
+    2. CSP generation — feasible timetable (10-60%); INCREMENTAL runs first
+       try to repair the current timetable and skip step 3 if that works
     3. GA optimization — optimize soft constraints (60-90%)
     4. Finalize results (90-100%)
 
@@ -34,10 +40,11 @@ def generate_timetable_task(self, run_id):
     run.status = 'VALIDATING'
     run.started_at = timezone.now()
     run.save(update_fields=['celery_task_id', 'status', 'started_at'])
+    channel = progress_channel(run)
 
     try:
         # ====== STEP 1: Validate (0-10%) ======
-        update_progress(run, 2, 'Validating configuration...')
+        channel.update(2, 'Validating configuration...', force=True)
 
         from .services.validators import validate_generation_config, collect_generation_inputs
 
@@ -49,25 +56,39 @@ def generate_timetable_task(self, run_id):
             run.save(update_fields=['status', 'error_message', 'completed_at'])
             return
 
-        update_progress(run, 5, 'Collecting generation inputs...')
+        channel.update(5, 'Collecting generation inputs...', force=True)
         inputs = collect_generation_inputs(run.config)
-        update_progress(run, 10, 'Validation complete.')
+        channel.phase(10, 'Validation complete.')
 
         # ====== STEP 2: CSP Generation (10-60%) ======
-        run.status = 'GENERATING'
-        run.save(update_fields=['status'])
-
         def csp_progress(pct, msg):
             # Map CSP progress (0-100) to overall (10-60)
             overall = 10 + int(pct * 0.5)
-            update_progress(run, overall, msg)
-
-        update_progress(run, 12, 'Building constraint model...')
+            channel.update(overall, msg)
+
+        channel.phase(12, 'Building constraint model...', status='GENERATING')
+
+        feasible = None
+        repair_stats = None
+        if run.mode == 'INCREMENTAL':
+            # Warm start: repair the current timetable around the changed inputs
+            from .services.repair import TimetableRepairer
+            from .services.validators import collect_current_timetable
+
+            seed = collect_current_timetable(run.config, inputs)
+            if seed:
+                repairer = TimetableRepairer(inputs, progress_callback=csp_progress)
+                feasible = repairer.repair(seed)
+                if feasible is not None:
+                    repair_stats = repairer.stats
+            if feasible is None:
+                channel.update(12, 'Warm start not possible; generating from scratch...', force=True)
 
-        from .services.generator import TimetableGenerator
+        if feasible is None:
+            from .services.generator import TimetableGenerator
 
-        generator = TimetableGenerator(inputs, progress_callback=csp_progress)
-        feasible = generator.generate()
+            generator = TimetableGenerator(inputs, progress_callback=csp_progress)
+            feasible = generator.generate()
 
         if feasible is None:
             run.status = 'FAILED'
@@ -83,18 +104,17 @@ def generate_timetable_task(self, run_id):
             ])
             return
 
-        update_progress(run, 60, 'Feasible timetable generated.')
-
         # ====== STEP 3: Optimization (60-90%) ======
         algorithm = run.config.algorithm
+        # A repaired timetable is kept as-is: the GA would reshuffle the cells
+        # the repair was careful not to move
+        optimizing = algorithm in ('GENETIC', 'HYBRID') and repair_stats is None
+        channel.phase(60, 'Feasible timetable generated.', status='OPTIMIZING' if optimizing else None)
 
-        if algorithm in ('GENETIC', 'HYBRID'):
-            run.status = 'OPTIMIZING'
-            run.save(update_fields=['status'])
-
+        if optimizing:
             def ga_progress(pct, msg):
                 overall = 60 + int(pct * 0.3)
-                update_progress(run, overall, msg)
+                channel.update(overall, msg)
 
             from .services.optimizer import TimetableOptimizer
 
@@ -105,6 +125,7 @@ def generate_timetable_task(self, run_id):
                 progress_callback=ga_progress,
             )
             optimized, score = optimizer.optimize()
+            optimizer_stats = optimizer.run_stats()
         else:
             # CSP-only mode: score the feasible timetable as-is
             from .services.optimizer import TimetableOptimizer
@@ -115,13 +136,18 @@ def generate_timetable_task(self, run_id):
             )
             optimized = feasible
             score = optimizer.fitness(feasible)
+            optimizer_stats = None
 
-        update_progress(run, 90, 'Optimization complete.')
+        channel.phase(90, 'Optimization complete.')
 
         # ====== STEP 4: Finalize (90-100%) ======
-        update_progress(run, 95, 'Serializing results...')
+        channel.update(95, 'Serializing results...', force=True)
 
         generated_data = _serialize_timetable(optimized, inputs)
+        if optimizer_stats:
+            generated_data['optimizer'] = optimizer_stats
+        if repair_stats:
+            generated_data['repair'] = repair_stats
         warnings = _generate_warnings(optimized, inputs)
 
         run.generated_timetable = generated_data
@@ -155,6 +181,9 @@ def generate_timetable_task(self, run_id):
         run.save()
         raise
 
+    finally:
+        channel.close()
+
 
 def _serialize_timetable(timetable, inputs):
     """
@@ -202,7 +231,7 @@ def _serialize_timetable(timetable, inputs):
                 if assignment:
                     day_entries.append({
                         'slot_index': slot_idx,
-                        'slot_id': slot.get('id'),
+                        'slot_id': str(slot['id']) if slot.get('id') else None,
                         'slot_name': slot.get('name', f'Period {slot_idx + 1}'),
                         'subject_id': str(assignment['subject_id']) if assignment['subject_id'] else None,
                         'subject_name': assignment.get('subject_name', ''),
@@ -212,7 +241,7 @@ def _serialize_timetable(timetable, inputs):
                 else:
                     day_entries.append({
                         'slot_index': slot_idx,
-                        'slot_id': slot.get('id'),
+                        'slot_id': str(slot['id']) if slot.get('id') else None,
                         'slot_name': slot.get('name', f'Period {slot_idx + 1}'),
                         'subject_id': None,
                         'subject_name': '',
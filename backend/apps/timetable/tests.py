@@ -82,3 +82,909 @@ class TestTimetableAccess:
     def test_rooms_list(self, auth_client):
         response = auth_client.get('/api/v1/timetable/rooms/')
         assert response.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Indexed occupancy for the CSP generator
+# ---------------------------------------------------------------------------
+
+import random  # noqa: E402
+
+from apps.timetable.management.commands.benchmark_timetable_generator import ScanTimetableGenerator  # noqa: E402
+from apps.timetable.services.constraints import (  # noqa: E402
+    check_all_hard_constraints, check_lab_room_available, check_teacher_no_double_booking,
+)
+from apps.timetable.services.generator import TimetableGenerator  # noqa: E402
+from apps.timetable.services.occupancy import Occupancy  # noqa: E402
+from apps.timetable.services.synthetic import build_synthetic_inputs  # noqa: E402
+
+
+def _cell(teacher_id, room_id=None):
+    return {'subject_id': 'sub', 'subject_name': 'Sub', 'teacher_id': teacher_id, 'room_id': room_id}
+
+
+class TestOccupancy:
+
+    def test_checks_match_timetable_scan(self):
+        timetable = {
+            ('s1', 'MONDAY', 0): _cell('t1', 'lab1'),
+            ('s2', 'MONDAY', 1): _cell('t2'),
+            ('s1', 'TUESDAY', 0): _cell('t2', 'lab1'),
+        }
+        occupancy = Occupancy(timetable)
+
+        for day in ('MONDAY', 'TUESDAY'):
+            for slot_idx in range(3):
+                for teacher_id in ('t1', 't2', 't3'):
+                    assert (
+                        check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id, occupancy)
+                        == check_teacher_no_double_booking(timetable, day, slot_idx, teacher_id)
+                    )
+                assert (
+                    check_lab_room_available(timetable, day, slot_idx, 'lab1', True, occupancy)
+                    == check_lab_room_available(timetable, day, slot_idx, 'lab1', True)
+                )
+
+    def test_unassign_and_day_counts(self):
+        occupancy = Occupancy()
+        occupancy.assign(('s1', 'MONDAY', 2), _cell('t1'))
+        occupancy.assign(('s2', 'MONDAY', 3), _cell('t1'))
+
+        assert occupancy.teacher_day_count('t1', 'MONDAY') == 2
+        assert not occupancy.teacher_free('t1', 'MONDAY', 1, length=2)
+        assert occupancy.teacher_free('t1', 'MONDAY', 0, length=2)
+
+        occupancy.unassign(('s1', 'MONDAY', 2), _cell('t1'))
+        assert occupancy.teacher_day_count('t1', 'MONDAY') == 1
+        assert occupancy.section_free('s1', 'MONDAY', 2)
+
+    def test_detects_double_booking(self):
+        occupancy = Occupancy({
+            ('s1', 'MONDAY', 0): _cell('t1'),
+            ('s2', 'MONDAY', 0): _cell('t1'),
+        })
+        assert occupancy.teacher_conflicts == 1
+        assert not occupancy.is_valid
+
+    def test_all_hard_constraints_with_occupancy(self):
+        timetable = {('s1', 'MONDAY', 0): _cell('t1')}
+        occupancy = Occupancy(timetable)
+        slot = {'slot_type': 'PERIOD', 'start_time': None, 'end_time': None}
+
+        assert check_all_hard_constraints(timetable, 's2', 'MONDAY', 0, 't1', None, False, {}, slot, occupancy) == (
+            False, 'Teacher already teaching at this slot',
+        )
+        assert check_all_hard_constraints(timetable, 's2', 'MONDAY', 1, 't1', None, False, {}, slot, occupancy) == (
+            True, None,
+        )
+
+
+class TestIndexedGenerator:
+
+    def test_same_timetable_as_scanning_checks(self):
+        inputs = build_synthetic_inputs(8)
+
+        random.seed(3)
+        indexed = TimetableGenerator(inputs).generate()
+        random.seed(3)
+        scanned = ScanTimetableGenerator(inputs).generate()
+
+        assert indexed is not None
+        assert indexed == scanned
+
+    def test_large_school_is_valid(self):
+        inputs = build_synthetic_inputs(40)
+        random.seed(0)
+        generator = TimetableGenerator(inputs)
+        timetable = generator.generate()
+
+        # More blocks than Python's default recursion limit
+        assert len(generator._build_assignments()) > 1000
+        assert timetable is not None
+        assert Occupancy(timetable).is_valid
+        for (section_id, day, _), cell in timetable.items():
+            avail = inputs['teacher_availability'].get((cell['teacher_id'], day))
+            assert avail is None or avail['is_available']
+            assert generator.occupancy.teacher_day_count(cell['teacher_id'], day) <= 6
+
+
+# ---------------------------------------------------------------------------
+# Tensor encoding and vectorised fitness
+# ---------------------------------------------------------------------------
+
+from apps.timetable.management.commands.benchmark_timetable_optimizer import DictFitnessOptimizer  # noqa: E402
+from apps.timetable.models import TimetableGenerationConfig  # noqa: E402
+from apps.timetable.services.optimizer import TimetableOptimizer  # noqa: E402
+from apps.timetable.services.constraints import (  # noqa: E402
+    calc_consecutive_teacher_periods, calc_heavy_subject_adjacency, calc_room_changes,
+    calc_subject_clustering, calc_teacher_preference_violations, calc_workload_variance,
+)
+
+DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY']
+
+
+def _random_timetable(rng, sections=('s1', 's2'), num_slots=6, density=0.7):
+    subjects = [('math', 'Mathematics'), ('phy', 'Physics'), ('eng', 'English'), ('art', 'Art')]
+    timetable = {}
+    for section_id in sections:
+        for day in DAYS:
+            for slot_idx in range(num_slots):
+                if rng.random() < density:
+                    subject_id, name = rng.choice(subjects)
+                    timetable[(section_id, day, slot_idx)] = {
+                        'subject_id': subject_id,
+                        'subject_name': name,
+                        'teacher_id': rng.choice(['t1', 't2', 't3', None]),
+                        'room_id': rng.choice(['r1', 'r2', None]),
+                        'requires_lab': False,
+                    }
+    return timetable
+
+
+class TestTensorFitness:
+
+    def _optimizer(self, timetable):
+        inputs = {
+            'slots': [{'slot_type': 'PERIOD'}] * 6,
+            'days': DAYS,
+            'sections': [{'id': 's1'}, {'id': 's2'}],
+            'teachers': {'t1', 't2', 't3'},
+            'teacher_availability': {
+                ('t1', 'MONDAY'): {'preferred_time_slots': [0, 1], 'max_consecutive_periods': 1},
+                ('t2', 'TUESDAY'): {'preferred_time_slots': [3], 'max_consecutive_periods': 2},
+            },
+            'requirements': {'s1': [{'subject_id': 'math', 'subject_name': 'Mathematics'},
+                                    {'subject_id': 'phy', 'subject_name': 'Physics'}]},
+        }
+        return DictFitnessOptimizer(timetable, inputs, TimetableGenerationConfig())
+
+    def test_penalties_match_dict_constraints(self):
+        rng = random.Random(7)
+        population = [_random_timetable(rng, density=rng.choice([0.2, 0.5, 0.9])) for _ in range(12)]
+        opt = self._optimizer(population[0])
+
+        penalties = opt.tensor_fitness.penalties(opt.encoding.encode_many(population))
+
+        for idx, timetable in enumerate(population):
+            expected = {
+                'workload_variance': calc_workload_variance(timetable, opt.teachers, opt.days),
+                'heavy_adjacency': calc_heavy_subject_adjacency(
+                    timetable, opt.heavy_subject_ids, opt.section_ids, opt.days, opt.num_slots),
+                'subject_clustering': calc_subject_clustering(timetable, opt.section_ids, opt.days, opt.num_slots),
+                'teacher_preference': calc_teacher_preference_violations(
+                    timetable, opt.teacher_availability, opt.days),
+                'room_changes': calc_room_changes(timetable, opt.section_ids, opt.days, opt.num_slots),
+                'consecutive_periods': calc_consecutive_teacher_periods(
+                    timetable, opt.teachers, opt.days, opt.num_slots, opt.teacher_availability),
+            }
+            for name, value in expected.items():
+                assert penalties[name][idx] == pytest.approx(value), name
+
+        assert opt.score_population(population) == pytest.approx(
+            [opt.dict_fitness(timetable) for timetable in population]
+        )
+
+    def test_encode_decode_round_trip(self):
+        timetable = _random_timetable(random.Random(1))
+        opt = self._optimizer(timetable)
+
+        codes = opt.encoding.encode(timetable)
+        assert codes.shape == (2, 3, 6)
+        assert opt.encoding.decode(codes) == timetable
+        assert (opt.encoding.teachers(codes) >= 0).sum() == sum(
+            1 for cell in timetable.values() if cell['teacher_id']
+        )
+
+    def test_optimizer_scores_synthetic_school(self):
+        inputs = build_synthetic_inputs(4)
+        random.seed(0)
+        feasible = TimetableGenerator(inputs).generate()
+        optimizer = TimetableOptimizer(
+            feasible, inputs, TimetableGenerationConfig(population_size=6, max_iterations=3),
+        )
+
+        optimized, score = optimizer.optimize()
+
+        assert optimizer.generations_run == 3
+        assert score == pytest.approx(optimizer.fitness(optimized))
+        assert Occupancy(optimized).teacher_conflicts == 0
+
+
+# ---------------------------------------------------------------------------
+# Incremental (delta) fitness
+# ---------------------------------------------------------------------------
+
+from apps.timetable.services.incremental import TimetableState  # noqa: E402
+from apps.timetable.services.optimizer import EVALUATION_BATCH  # noqa: E402
+
+
+class TestTimetableState:
+
+    def _optimizer(self, timetable):
+        return TestTensorFitness()._optimizer(timetable)
+
+    def _assert_matches_full_evaluation(self, opt, state):
+        expected = opt.tensor_fitness.penalties(opt.encoding.encode(state.timetable))
+        for name, value in state.penalties().items():
+            assert value == pytest.approx(float(expected[name][0])), name
+        assert state.score() == pytest.approx(opt.fitness(state.timetable))
+
+    def test_random_moves_match_full_evaluation(self):
+        rng = random.Random(11)
+        opt = self._optimizer(_random_timetable(rng))
+        state = TimetableState(opt.delta_context, _random_timetable(rng))
+        donor = _random_timetable(rng, density=0.9)
+        self._assert_matches_full_evaluation(opt, state)
+
+        for step in range(60):
+            section_id, day = rng.choice(['s1', 's2']), rng.choice(DAYS)
+            if step % 3:
+                state.swap(section_id, day, *rng.sample(range(6), 2))
+            else:
+                key = (section_id, day, rng.randrange(6))
+                state.set_cell(key, donor.get(key))
+            self._assert_matches_full_evaluation(opt, state)
+
+    def test_undo_restores_state(self):
+        rng = random.Random(5)
+        timetable = _random_timetable(rng)
+        opt = self._optimizer(timetable)
+        state = TimetableState(opt.delta_context, timetable)
+        before = (dict(state.timetable), state.score(), state.conflicts)
+
+        mark = state.mark()
+        for _ in range(10):
+            state.swap(rng.choice(['s1', 's2']), rng.choice(DAYS), *rng.sample(range(6), 2))
+            state.set_cell(('s1', 'MONDAY', 0), None)
+        state.undo(mark)
+
+        assert (dict(state.timetable), state.score(), state.conflicts) == before
+        assert state.log == []
+
+    def test_conflicts_track_double_booking(self):
+        cell = {'subject_id': 'math', 'subject_name': 'Mathematics', 'teacher_id': 't1', 'room_id': None}
+        opt = self._optimizer({})
+        state = TimetableState(opt.delta_context, {('s1', 'MONDAY', 0): cell, ('s2', 'MONDAY', 1): cell})
+        assert state.is_feasible
+
+        state.swap('s2', 'MONDAY', 0, 1)
+        assert not state.is_feasible
+        state.undo()
+        assert state.is_feasible
+
+    def test_copy_is_independent(self):
+        rng = random.Random(2)
+        opt = self._optimizer({})
+        state = TimetableState(opt.delta_context, _random_timetable(rng))
+        score = state.score()
+
+        clone = state.copy()
+        for day in DAYS:
+            clone.set_cell(('s1', day, 0), None)
+
+        assert state.score() == score
+        self._assert_matches_full_evaluation(opt, clone)
+
+    def test_incremental_and_batch_runs_agree(self):
+        inputs = build_synthetic_inputs(4)
+        random.seed(0)
+        feasible = TimetableGenerator(inputs).generate()
+        config = TimetableGenerationConfig(population_size=8, max_iterations=15)
+
+        results = []
+        for evaluation in ('incremental', EVALUATION_BATCH):
+            optimizer = TimetableOptimizer(feasible, inputs, config, evaluation=evaluation, seed=4)
+            results.append(optimizer.optimize())
+
+        (incremental, incremental_score), (batch, batch_score) = results
+        assert incremental == batch
+        assert incremental_score == pytest.approx(batch_score)
+
+
+# ---------------------------------------------------------------------------
+# Island-model GA
+# ---------------------------------------------------------------------------
+
+import multiprocessing  # noqa: E402
+from unittest import mock  # noqa: E402
+
+from apps.core.services.islands import Island, migrate, run_islands  # noqa: E402
+from apps.core.services.process_pool import process_pool  # noqa: E402
+
+
+class TestIslandOptimizer:
+
+    def _optimizer(self, islands, seed=7, progress=None):
+        inputs = build_synthetic_inputs(4)
+        random.seed(0)
+        feasible = TimetableGenerator(inputs).generate()
+        config = TimetableGenerationConfig(
+            population_size=10, max_iterations=24,
+            island_count=islands, migration_interval=5, random_seed=seed,
+        )
+        return TimetableOptimizer(feasible, inputs, config, progress_callback=progress)
+
+    def test_runs_are_deterministic_for_a_seed(self):
+        first = self._optimizer(3).optimize()
+        second = self._optimizer(3).optimize()
+        assert first == second
+
+    def test_worker_count_does_not_change_the_result(self):
+        pooled = run_islands(self._optimizer(3), 3, 5, seed=7, max_workers=2)
+        in_process = run_islands(self._optimizer(3), 3, 5, seed=7, max_workers=0)
+        assert pooled == in_process
+
+    def test_daemonic_worker_evolves_on_a_pool(self):
+        """Celery prefork workers are daemonic; the islands still get worker processes."""
+        expected = run_islands(self._optimizer(3), 3, 5, seed=7, max_workers=0)
+        optimizer = self._optimizer(3)
+        context = multiprocessing.get_context('fork')
+        queue = context.SimpleQueue()
+
+        def task():
+            with mock.patch('apps.core.services.islands.process_pool', wraps=process_pool) as pool:
+                result = run_islands(optimizer, 3, 5, seed=7, max_workers=2)
+            queue.put((pool.call_count, result))
+
+        worker = context.Process(target=task, daemon=True)
+        worker.start()
+        pools, result = queue.get()
+        worker.join()
+
+        assert pools == 1
+        assert result == expected
+
+    def test_serial_mode_setting(self, settings):
+        settings.GA_ISLAND_EXECUTION_MODE = 'serial'
+        with mock.patch('apps.core.services.islands.process_pool') as pool:
+            run_islands(self._optimizer(2), 2, 5, seed=7)
+        pool.assert_not_called()
+
+    def test_result_is_feasible_and_progress_is_merged(self):
+        messages = []
+        optimizer = self._optimizer(2, progress=lambda pct, msg: messages.append((pct, msg)))
+        timetable, score = optimizer.optimize()
+
+        assert 0 < score <= 100
+        assert score == pytest.approx(optimizer.fitness(timetable))
+        assert optimizer._verify_hard_constraints(timetable)
+        assert any('2 islands' in msg for _, msg in messages)
+        assert messages[-1][0] == 100
+        assert optimizer.generations_run > optimizer.max_iterations
+
+    def test_migration_replaces_worst_of_next_island(self):
+        islands = [
+            Island(index=0, rng_state=None, population=['a1', 'a2', 'a3'], scores=[90, 80, 70]),
+            Island(index=1, rng_state=None, population=['b1', 'b2', 'b3'], scores=[60, 50, 40]),
+        ]
+        migrate(islands, migrants=1)
+        assert islands[1].population == ['a1', 'b1', 'b2']
+        assert islands[0].population == ['a1', 'a2', 'b1']
+        assert islands[1].scores == [90, 60, 50]
+
+
+# ---------------------------------------------------------------------------
+# Compact candidates and memory profile
+# ---------------------------------------------------------------------------
+
+import gc  # noqa: E402
+
+from apps.timetable.services.memory import GenerationProfile  # noqa: E402
+
+
+class TestCompactCandidates:
+
+    def _optimizer(self, **kwargs):
+        inputs = build_synthetic_inputs(4)
+        random.seed(0)
+        feasible = TimetableGenerator(inputs).generate()
+        config = TimetableGenerationConfig(population_size=8, max_iterations=10)
+        return TimetableOptimizer(feasible, inputs, config, seed=1, **kwargs), feasible
+
+    def test_copies_and_children_share_rows(self):
+        optimizer, feasible = self._optimizer()
+        parent1, parent2 = optimizer.initial_state.copy(), optimizer.initial_state.copy()
+        section_id, day = optimizer.section_ids[0], optimizer.days[0]
+        parent2.swap(section_id, day, 0, 1)
+
+        child = optimizer._crossover(parent1, parent2)
+        for row_key, codes in child.rows.items():
+            assert codes is parent1.rows.get(row_key) or codes is parent2.rows.get(row_key)
+
+        # Mutating the child replaces its row; the parents keep theirs
+        before = parent1.row(section_id, day)
+        child.swap(section_id, day, 2, 3)
+        assert parent1.row(section_id, day) is before
+        assert optimizer.initial_state.timetable == feasible
+
+    def test_rows_round_trip(self):
+        optimizer, feasible = self._optimizer()
+        state = optimizer.load_solution(optimizer.dump_solution(optimizer.initial_state))
+        assert state.timetable == feasible
+        assert state.score() == pytest.approx(optimizer.fitness(feasible))
+
+    def test_run_stats_report_memory(self):
+        optimizer, _ = self._optimizer(trace_allocations=True)
+        optimizer.optimize()
+        stats = optimizer.run_stats()
+
+        assert stats['generations'] == optimizer.generations_run
+        memory = stats['memory']
+        assert memory['generations'] == optimizer.generations_run
+        assert memory['peak_rss_mb'] > 0
+        assert set(memory['allocated_kb_per_generation']) == {'mean', 'max'}
+        assert 'gc_pause_ms' in memory
+
+    def test_profile_removes_gc_callback(self):
+        profile = GenerationProfile()
+        profile.start()
+        gc.collect()
+        profile.sample()
+        profile.stop()
+        assert profile._on_gc not in gc.callbacks
+        assert profile.summary()['gc_collections'] >= 1
+
+
+# ---------------------------------------------------------------------------
+# Diff-based apply and rollback
+# ---------------------------------------------------------------------------
+
+from datetime import date, time  # noqa: E402
+
+from apps.academics.models import AcademicYear, Board, Class, Section, Subject  # noqa: E402
+from apps.staff.models import StaffMember  # noqa: E402
+from apps.timetable.models import (  # noqa: E402
+    ClassTimetable,
+    TeacherTimetable,
+    TimeSlot,
+    TimetableGenerationRun,
+)
+from apps.timetable.services.apply import apply_generated_timetable, rollback_generated_timetable  # noqa: E402
+from apps.timetable.signals import timetable_cells_changed  # noqa: E402
+
+
+def _staff_member(idx, designation='TEACHER'):
+    user = User.objects.create_user(
+        email=f'apply_teacher{idx}@test.com', password='TestPass123!',
+        first_name='Apply', last_name=f'Teacher{idx}', phone=f'777778100{idx}', user_type='TEACHER',
+    )
+    return StaffMember.objects.create(
+        user=user, employee_id=f'EMP-A{idx}', first_name='Apply', last_name=f'Teacher{idx}',
+        date_of_birth=date(1990, 1, 1), gender='M', phone_number=f'987654320{idx}',
+        email=f'apply_teacher{idx}@test.com', designation=designation, joining_date=date(2020, 4, 1),
+        emergency_contact_name='Contact', emergency_contact_number='9876500001',
+        emergency_contact_relation='Spouse', current_address_line1='1 St', current_city='City',
+        current_state='State', current_pincode='123456', permanent_address_line1='1 St',
+        permanent_city='City', permanent_state='State', permanent_pincode='123456',
+    )
+
+
+@pytest.fixture
+def apply_school(db):
+    """Two sections, two subjects/teachers and three periods on two days."""
+    year = AcademicYear.objects.create(
+        name='2026-2027', start_date=date(2026, 4, 1), end_date=date(2027, 3, 31), is_current=True,
+    )
+    board = Board.objects.create(board_type='CBSE', board_name='CBSE', board_code='CBSE-APPLY')
+    class_obj = Class.objects.create(name='7', display_name='Class 7', class_order=7, board=board)
+    sections = [
+        Section.objects.create(class_instance=class_obj, name=name, academic_year=year)
+        for name in ('A', 'B')
+    ]
+    subjects = [
+        Subject.objects.create(name=name, code=name[:4].upper(), subject_type='CORE')
+        for name in ('Mathematics', 'English')
+    ]
+    teachers = [_staff_member(idx) for idx in range(2)]
+    slots = [
+        TimeSlot.objects.create(
+            name=f'Period {idx + 1}', slot_type='PERIOD', start_time=time(9 + idx), end_time=time(9 + idx, 45),
+            duration_minutes=45, order=idx + 1,
+        )
+        for idx in range(3)
+    ]
+    config = TimetableGenerationConfig.objects.create(name='Apply', academic_year=year)
+    return {
+        'year': year, 'class_obj': class_obj, 'sections': sections, 'subjects': subjects,
+        'teachers': teachers, 'slots': slots, 'config': config, 'days': ['MONDAY', 'TUESDAY'],
+    }
+
+
+def _generated(school, cells):
+    """generated_timetable JSON; ``cells`` maps (section, day, slot) -> (subject, teacher)."""
+    sections = {}
+    for section_idx, section in enumerate(school['sections']):
+        days = {}
+        for day in school['days']:
+            entries = []
+            for slot_idx in range(len(school['slots'])):
+                cell = cells.get((section_idx, day, slot_idx))
+                entries.append({
+                    'slot_index': slot_idx,
+                    'subject_id': str(school['subjects'][cell[0]].id) if cell else None,
+                    'teacher_id': str(school['teachers'][cell[1]].id) if cell else None,
+                    'room_id': None,
+                })
+            days[day] = entries
+        sections[str(section.id)] = {'class_name': 'Class 7', 'section_name': section.name, 'days': days}
+    return {'sections': sections}
+
+
+def _run(school, cells):
+    return TimetableGenerationRun.objects.create(
+        config=school['config'], status='COMPLETED', generated_timetable=_generated(school, cells),
+    )
+
+
+def _class_state(school):
+    return {
+        (str(row.section_id), row.day_of_week, str(row.time_slot_id)): (str(row.subject_id), str(row.teacher_id))
+        for row in ClassTimetable.objects.filter(academic_year=school['year'])
+    }
+
+
+def _teacher_state(school):
+    return {
+        (str(row.teacher_id), row.day_of_week, str(row.time_slot_id)): (str(row.section_id), str(row.subject_id))
+        for row in TeacherTimetable.objects.filter(academic_year=school['year'])
+    }
+
+
+@pytest.mark.django_db
+class TestDiffApply:
+
+    # Section A: math/teacher 0 in period 1, english/teacher 1 in period 2;
+    # section B the other way round, on both days
+    BASE = {
+        (0, day, 0): (0, 0) for day in ('MONDAY', 'TUESDAY')
+    } | {
+        (0, day, 1): (1, 1) for day in ('MONDAY', 'TUESDAY')
+    } | {
+        (1, day, 0): (1, 1) for day in ('MONDAY', 'TUESDAY')
+    } | {
+        (1, day, 1): (0, 0) for day in ('MONDAY', 'TUESDAY')
+    }
+
+    def test_reapplying_same_timetable_writes_nothing(self, apply_school):
+        apply_generated_timetable(_run(apply_school, self.BASE))
+        ids = set(ClassTimetable.objects.values_list('id', flat=True))
+
+        result = apply_generated_timetable(_run(apply_school, self.BASE))
+
+        assert result['class_entries_unchanged'] == 8
+        assert (result['class_entries_created'], result['class_entries_updated'],
+                result['class_entries_deleted']) == (0, 0, 0)
+        assert result['sections_changed'] == 0
+        assert set(ClassTimetable.objects.values_list('id', flat=True)) == ids
+
+    def test_only_changed_cells_are_written_and_rollback_restores(self, apply_school):
+        apply_generated_timetable(_run(apply_school, self.BASE))
+        before_class, before_teacher = _class_state(apply_school), _teacher_state(apply_school)
+        untouched = ClassTimetable.objects.get(
+            section=apply_school['sections'][1], day_of_week='MONDAY', time_slot=apply_school['slots'][0],
+        )
+
+        changed = dict(self.BASE)
+        changed[(0, 'MONDAY', 0)] = (1, 0)      # update: subjects swap, teachers stay
+        changed[(0, 'MONDAY', 1)] = (0, 1)      # update
+        del changed[(0, 'TUESDAY', 1)]          # delete
+        changed[(0, 'TUESDAY', 2)] = (0, 0)     # create
+        run = _run(apply_school, changed)
+
+        with mock.patch.object(timetable_cells_changed, 'send') as send:
+            result = apply_generated_timetable(run)
+        assert (result['class_entries_created'], result['class_entries_updated'],
+                result['class_entries_deleted'], result['class_entries_unchanged']) == (1, 2, 1, 5)
+        assert send.call_args.kwargs['section_ids'] == [str(apply_school['sections'][0].id)]
+
+        untouched.refresh_from_db()
+        assert untouched.updated_at < ClassTimetable.objects.get(
+            section=apply_school['sections'][0], day_of_week='MONDAY', time_slot=apply_school['slots'][0],
+        ).updated_at
+        state = _class_state(apply_school)
+        assert len(state) == 8
+        section_a = str(apply_school['sections'][0].id)
+        assert state[(section_a, 'MONDAY', str(apply_school['slots'][0].id))] == (
+            str(apply_school['subjects'][1].id), str(apply_school['teachers'][0].id),
+        )
+        assert len(_teacher_state(apply_school)) == 8
+
+        # Reverse diff holds only the four changed cells
+        run.refresh_from_db()
+        reverse = run.rollback_snapshot['class']
+        assert (len(reverse['created']), len(reverse['updated']), len(reverse['deleted'])) == (1, 2, 1)
+
+        rollback_generated_timetable(run)
+        assert _class_state(apply_school) == before_class
+        assert _teacher_state(apply_school) == before_teacher
+
+    def test_rollback_of_legacy_full_snapshot(self, apply_school):
+        apply_generated_timetable(_run(apply_school, self.BASE))
+        before = _class_state(apply_school)
+        entries = [
+            {
+                'academic_year_id': str(row.academic_year_id), 'class_obj_id': str(row.class_obj_id),
+                'section_id': str(row.section_id), 'day_of_week': row.day_of_week,
+                'time_slot_id': str(row.time_slot_id), 'subject_id': str(row.subject_id),
+                'teacher_id': str(row.teacher_id), 'room_number': row.room_number,
+            }
+            for row in ClassTimetable.objects.all()
+        ]
+        run = _run(apply_school, {(0, 'MONDAY', 2): (0, 1)})
+        apply_generated_timetable(run)
+        assert len(_class_state(apply_school)) == 1
+
+        run.rollback_snapshot = {
+            'section_ids': [str(section.id) for section in apply_school['sections']],
+            'entries': entries,
+        }
+        run.save()
+        result = rollback_generated_timetable(run)
+
+        assert _class_state(apply_school) == before
+        assert result['class_entries_removed'] == 1
+
+
+# ---------------------------------------------------------------------------
+# Incremental (warm-start) regeneration
+# ---------------------------------------------------------------------------
+
+from collections import Counter  # noqa: E402
+
+from apps.timetable.models import SubjectPeriodRequirement  # noqa: E402
+from apps.timetable.services.repair import TimetableRepairer  # noqa: E402
+from apps.timetable.services.synthetic import build_midterm_change  # noqa: E402
+from apps.timetable.services.validators import collect_current_timetable, collect_generation_inputs  # noqa: E402
+from apps.timetable.tasks import generate_timetable_task  # noqa: E402
+
+
+def _periods_placed(timetable):
+    return Counter((key[0], cell['subject_id'], cell['teacher_id']) for key, cell in timetable.items())
+
+
+def _periods_required(inputs):
+    return Counter({
+        (section_id, req['subject_id'], req['teacher_id']): req['periods_per_week']
+        for section_id, reqs in inputs['requirements'].items()
+        for req in reqs
+    })
+
+
+class TestTimetableRepair:
+
+    def test_unchanged_inputs_keep_the_timetable(self):
+        inputs = build_synthetic_inputs(8)
+        random.seed(0)
+        current = TimetableGenerator(inputs).generate()
+
+        repairer = TimetableRepairer(inputs)
+        assert repairer.repair(current) == current
+        assert repairer.stats['unassigned_blocks'] == 0
+        assert repairer.stats['changed_cells'] == 0
+
+    def test_midterm_change_is_repaired_locally(self):
+        inputs = build_synthetic_inputs(40)
+        random.seed(0)
+        current = TimetableGenerator(inputs).generate()
+        changed = build_midterm_change(inputs, leave_days=2, extra_periods=1)
+
+        random.seed(0)
+        repairer = TimetableRepairer(changed)
+        timetable = repairer.repair(current)
+
+        assert timetable is not None
+        assert Occupancy(timetable).is_valid
+        assert _periods_placed(timetable) == _periods_required(changed)
+        for (_, day, _), cell in timetable.items():
+            avail = changed['teacher_availability'].get((cell['teacher_id'], day))
+            assert avail is None or avail['is_available']
+            assert repairer.occupancy.teacher_day_count(cell['teacher_id'], day) <= 6
+        # Only the delta and its neighbourhood move
+        assert 0 < repairer.stats['unassigned_blocks'] < 40
+        assert repairer.stats['changed_cells'] < len(current) * 0.05
+
+    def test_gives_up_when_infeasible(self):
+        inputs = build_synthetic_inputs(4)
+        random.seed(0)
+        current = TimetableGenerator(inputs).generate()
+        changed = build_midterm_change(inputs)
+        for reqs in changed['requirements'].values():
+            reqs[0]['periods_per_week'] = 60
+
+        assert TimetableRepairer(changed).repair(current) is None
+
+
+@pytest.mark.django_db
+class TestIncrementalRun:
+
+    def _requirements(self, school, math_periods):
+        for subject, teacher, periods in ((0, 0, math_periods), (1, 1, 2)):
+            SubjectPeriodRequirement.objects.update_or_create(
+                academic_year=school['year'], class_obj=school['class_obj'], subject=school['subjects'][subject],
+                defaults={'teacher': school['teachers'][teacher], 'periods_per_week': periods},
+            )
+
+    def _configure(self, school):
+        config = school['config']
+        config.working_days = school['days']
+        config.algorithm = 'CSP'
+        config.save()
+        config.classes.add(school['class_obj'])
+        self._requirements(school, math_periods=2)
+        apply_generated_timetable(_run(school, TestDiffApply.BASE))
+        return config
+
+    def test_seed_is_read_from_the_current_timetable(self, apply_school):
+        config = self._configure(apply_school)
+
+        inputs = collect_generation_inputs(config)
+        seed = collect_current_timetable(config, inputs)
+
+        assert len(seed) == 8
+        cell = seed[(apply_school['sections'][0].id, 'MONDAY', 0)]
+        assert (cell['subject_id'], cell['teacher_id']) == (
+            apply_school['subjects'][0].id, apply_school['teachers'][0].id,
+        )
+
+    def test_incremental_run_keeps_current_cells(self, apply_school):
+        config = self._configure(apply_school)
+        before = _class_state(apply_school)
+        self._requirements(apply_school, math_periods=3)
+
+        run = TimetableGenerationRun.objects.create(config=config, mode='INCREMENTAL')
+        generate_timetable_task.apply(args=[str(run.id)])
+        run.refresh_from_db()
+
+        assert run.status == 'COMPLETED', run.error_message
+        assert run.generated_timetable['repair']['unchanged_cells'] == 8
+        assert run.generated_timetable['repair']['changed_cells'] == 2
+
+        apply_generated_timetable(run)
+        after = _class_state(apply_school)
+        assert len(after) == 10
+        assert all(after[key] == value for key, value in before.items())
+
+
+# ---------------------------------------------------------------------------
+# Substitute free-slot index
+# ---------------------------------------------------------------------------
+
+from apps.attendance.models import StaffLeave  # noqa: E402
+from apps.timetable.models import TimetableSubstitution  # noqa: E402
+from apps.timetable.services.availability import FreeSlotIndex  # noqa: E402
+
+MONDAY = date(2026, 4, 6)
+
+
+@pytest.fixture
+def indexed_school(apply_school, django_capture_on_commit_callbacks):
+    """apply_school with the BASE timetable applied, a free teacher and an accountant."""
+    apply_school['teachers'].append(_staff_member(2))
+    _staff_member(3, designation='ACCOUNTANT')
+    with django_capture_on_commit_callbacks(execute=True):
+        apply_generated_timetable(_run(apply_school, TestDiffApply.BASE))
+    return apply_school
+
+
+def _ids(*teachers):
+    return [str(teacher.id) for teacher in teachers]
+
+
+@pytest.mark.django_db
+class TestFreeSlotIndex:
+
+    def test_free_teachers_per_period(self, indexed_school):
+        t0, t1, t2 = indexed_school['teachers']
+        p1, _, p3 = indexed_school['slots']
+
+        index = FreeSlotIndex.cached(indexed_school['year'].id)
+        assert index is not None    # rebuilt when the timetable was applied
+
+        assert index.free_teachers(MONDAY, p1.id) == _ids(t2)
+        assert sorted(index.free_teachers(MONDAY, p3.id)) == sorted(_ids(t0, t1, t2))
+
+    def test_edited_substitution_frees_the_previous_substitute(
+            self, indexed_school, django_capture_on_commit_callbacks):
+        t0, t1, t2 = indexed_school['teachers']
+        p1 = indexed_school['slots'][0]
+        year_id = indexed_school['year'].id
+        next_monday = date(2026, 4, 13)
+        entry = ClassTimetable.objects.get(section=indexed_school['sections'][0], day_of_week='MONDAY', time_slot=p1)
+        with django_capture_on_commit_callbacks(execute=True):
+            substitution = TimetableSubstitution.objects.create(
+                academic_year=indexed_school['year'], original_entry=entry, date=MONDAY,
+                original_teacher=t0, substitute_teacher=t2, reason='Sick',
+            )
+        assert FreeSlotIndex.for_year(year_id).free_teachers(next_monday, p1.id) == _ids(t2)
+
+        substitution = TimetableSubstitution.objects.get(pk=substitution.pk)
+        substitution.date = next_monday
+        with django_capture_on_commit_callbacks(execute=True):
+            substitution.save()
+        index = FreeSlotIndex.for_year(year_id)
+        assert index.free_teachers(MONDAY, p1.id) == _ids(t2)
+        assert index.free_teachers(next_monday, p1.id) == []
+
+        substitution.substitute_teacher = t1
+        with django_capture_on_commit_callbacks(execute=True):
+            substitution.save()
+        assert FreeSlotIndex.for_year(year_id).free_teachers(next_monday, p1.id) == _ids(t2)
+
+    def test_moved_leave_frees_the_previous_dates(self, indexed_school, django_capture_on_commit_callbacks):
+        t2 = indexed_school['teachers'][2]
+        p1 = indexed_school['slots'][0]
+        year_id = indexed_school['year'].id
+        next_monday = date(2026, 4, 13)
+        with django_capture_on_commit_callbacks(execute=True):
+            leave = StaffLeave.objects.create(
+                staff_member=t2, leave_type='CASUAL', start_date=MONDAY, end_date=MONDAY,
+                reason='Away', status='APPROVED',
+            )
+        index = FreeSlotIndex.for_year(year_id)
+        assert index.free_teachers(MONDAY, p1.id) == []
+        assert index.free_teachers(next_monday, p1.id) == _ids(t2)
+
+        leave = StaffLeave.objects.get(pk=leave.pk)
+        leave.start_date = leave.end_date = next_monday
+        with django_capture_on_commit_callbacks(execute=True):
+            leave.save()
+        index = FreeSlotIndex.for_year(year_id)
+        assert index.free_teachers(MONDAY, p1.id) == _ids(t2)
+        assert index.free_teachers(next_monday, p1.id) == []
+
+    def test_candidates_ranked_by_subject_then_load(self, indexed_school):
+        t0, t1, t2 = indexed_school['teachers']
+        p3 = indexed_school['slots'][2]
+        index = FreeSlotIndex.for_year(indexed_school['year'].id)
+
+        ranked = index.rank_candidates(MONDAY, p3.id, subject_id=indexed_school['subjects'][0].id, exclude=[t1.id])
+        assert [c['teacher_id'] for c in ranked] == _ids(t0, t2)
+        assert ranked[0] == {'teacher_id': str(t0.id), 'subject_match': True, 'periods_today': 2}
+        assert ranked[1]['periods_today'] == 0
+
+    def test_substitutions_and_leave_update_the_date(self, indexed_school, django_capture_on_commit_callbacks):
+        t0, t1, t2 = indexed_school['teachers']
+        p1 = indexed_school['slots'][0]
+        year_id = indexed_school['year'].id
+        assert FreeSlotIndex.for_year(year_id).free_teachers(MONDAY, p1.id) == _ids(t2)
+
+        entry = ClassTimetable.objects.get(section=indexed_school['sections'][0], day_of_week='MONDAY', time_slot=p1)
+        with django_capture_on_commit_callbacks(execute=True):
+            substitution = TimetableSubstitution.objects.create(
+                academic_year=indexed_school['year'], original_entry=entry, date=MONDAY,
+                original_teacher=t0, substitute_teacher=t2, reason='Sick',
+            )
+        index = FreeSlotIndex.for_year(year_id)
+        assert index.free_teachers(MONDAY, p1.id) == []
+        assert index.periods_on(MONDAY)[index.bits[str(t2.id)]] == 1
+        # Other dates are untouched
+        assert index.free_teachers(date(2026, 4, 13), p1.id) == _ids(t2)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            substitution.reject(None, 'Not needed')
+        assert FreeSlotIndex.for_year(year_id).free_teachers(MONDAY, p1.id) == _ids(t2)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            StaffLeave.objects.create(
+                staff_member=t2, leave_type='CASUAL', start_date=MONDAY, end_date=MONDAY,
+                reason='Away', status='APPROVED',
+            )
+        assert FreeSlotIndex.for_year(year_id).free_teachers(MONDAY, p1.id) == []
+
+    def test_candidates_endpoint(self, indexed_school, auth_client):
+        t0, t1, t2 = indexed_school['teachers']
+
+        response = auth_client.get('/api/v1/timetable/substitutions/candidates/', {
+            'date': MONDAY.isoformat(), 'teacher_id': str(t0.id),
+        })
+
+        assert response.status_code == 200
+        periods = response.data['periods']
+        # Teacher 0 teaches section A in period 1 and section B in period 2
+        assert [(p['section_name'], p['time_slot_name']) for p in periods] == [('A', 'Period 1'), ('B', 'Period 2')]
+        assert [c['teacher_id'] for c in periods[0]['candidates']] == _ids(t2)
+        assert periods[0]['candidates'][0]['name'] == 'Apply Teacher2'
+
+    def test_candidates_endpoint_requires_date(self, auth_client):
+        response = auth_client.get('/api/v1/timetable/substitutions/candidates/', {'teacher_id': 'x'})
+        assert response.status_code == 400
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 from django.db.models import Q
 from collections import defaultdict
 
@@ -46,6 +47,7 @@ from .serializers import (
 )
 from apps.academics.models import Class, Section, AcademicYear, Subject
 from apps.authentication.permissions import HasFeature
+from apps.core.services.progress import read_progress
 
 
 class TimeSlotViewSet(viewsets.ModelViewSet):
@@ -429,6 +431,86 @@ class TimetableSubstitutionViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(pending, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def candidates(self, request):
+        """
+        Rank free teachers to cover an absent teacher's periods
+
+        Query params:
+        - date: Date of the absence (YYYY-MM-DD)
+        - teacher_id: Absent teacher; ranks candidates for each of their periods that day
+        - entry_id: Or a single ClassTimetable entry to cover
+        - limit: Candidates per period (default 10)
+
+        Candidates who teach the period's subject come first, then those
+        with the fewest periods that day (see services.availability).
+        """
+        from apps.staff.models import StaffMember
+        from .services.availability import FreeSlotIndex, day_of_week
+
+        try:
+            on_date = parse_date(request.query_params.get('date') or '')
+        except ValueError:
+            on_date = None
+        teacher_id = request.query_params.get('teacher_id')
+        entry_id = request.query_params.get('entry_id')
+        if not on_date or not (teacher_id or entry_id):
+            return Response(
+                {'error': 'date and one of teacher_id or entry_id are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = max(1, int(request.query_params.get('limit', 10)))
+        except ValueError:
+            limit = 10
+
+        entries = ClassTimetable.objects.filter(
+            day_of_week=day_of_week(on_date), is_active=True, subject__isnull=False,
+        ).select_related('class_obj', 'section', 'subject', 'time_slot').order_by('time_slot__order')
+        if entry_id:
+            entries = entries.filter(id=entry_id)
+        else:
+            entries = entries.filter(teacher_id=teacher_id, academic_year__is_current=True)
+
+        indexes = {}
+        periods = []
+        for entry in entries:
+            index = indexes.get(entry.academic_year_id)
+            if index is None:
+                index = indexes[entry.academic_year_id] = FreeSlotIndex.for_year(entry.academic_year_id)
+            ranked = index.rank_candidates(
+                on_date, entry.time_slot_id, subject_id=entry.subject_id, exclude=[entry.teacher_id],
+            )[:limit]
+            periods.append({
+                'entry_id': str(entry.id),
+                'time_slot_id': str(entry.time_slot_id),
+                'time_slot_name': entry.time_slot.name,
+                'class_name': entry.class_obj.name,
+                'section_name': entry.section.name,
+                'subject_id': str(entry.subject_id),
+                'subject_name': entry.subject.name,
+                'teacher_id': str(entry.teacher_id) if entry.teacher_id else None,
+                'candidates': ranked,
+            })
+
+        staff = {
+            str(member['id']): member
+            for member in StaffMember.objects.filter(
+                id__in={c['teacher_id'] for period in periods for c in period['candidates']}
+            ).values('id', 'first_name', 'last_name', 'employee_id')
+        }
+        for period in periods:
+            for candidate in period['candidates']:
+                member = staff.get(candidate['teacher_id'], {})
+                candidate['name'] = f"{member.get('first_name', '')} {member.get('last_name', '')}".strip()
+                candidate['employee_id'] = member.get('employee_id', '')
+
+        return Response({
+            'date': on_date,
+            'day_of_week': day_of_week(on_date),
+            'periods': periods,
+        })
+
 
 class RoomAllocationViewSet(viewsets.ModelViewSet):
     """
@@ -695,7 +777,7 @@ class TimetableGenerationRunViewSet(viewsets.ModelViewSet):
         """
         Trigger a new timetable generation run.
 
-        Payload: { "config_id": "<uuid>" }
+        Payload: { "config_id": "<uuid>", "mode": "FULL" | "INCREMENTAL" }
         """
         serializer = GenerationRunTriggerSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -712,6 +794,7 @@ class TimetableGenerationRunViewSet(viewsets.ModelViewSet):
         # Create the run record
         run = TimetableGenerationRun.objects.create(
             config=config,
+            mode=serializer.validated_data['mode'],
             status='PENDING',
             triggered_by=request.user,
         )
@@ -734,8 +817,17 @@ class TimetableGenerationRunViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def progress(self, request, pk=None):
-        """Lightweight progress polling endpoint."""
+        """
+        Lightweight progress polling endpoint.
+
+        While a run is generating its progress is served from the cache
+        (see ``apps.core.services.progress``); the run's fields otherwise.
+        """
         run = self.get_object()
+        cached = read_progress(TimetableGenerationRun, run.pk)
+        if cached is not None:
+            status_display = dict(TimetableGenerationRun.STATUS_CHOICES).get(cached['status'], cached['status'])
+            return Response({**cached, 'status_display': status_display})
         serializer = TimetableGenerationRunProgressSerializer(run)
         return Response(serializer.data)
 
@@ -763,7 +855,7 @@ class TimetableGenerationRunViewSet(viewsets.ModelViewSet):
     def apply(self, request, pk=None):
         """
         Apply the generated timetable to ClassTimetable + TeacherTimetable.
-        Takes a snapshot of the current timetable for rollback.
+        Only changed cells are written; their reverse diff is kept for rollback.
         """
         run = self.get_object()
 
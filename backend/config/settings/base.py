@@ -85,6 +85,7 @@ INSTALLED_APPS = list(SHARED_APPS) + [app for app in TENANT_APPS if app not in S
 MIDDLEWARE = [
     'apps.core.middleware.TenantPrometheusBeforeMiddleware',
     'apps.tenants.middleware.TenantHeaderMiddleware', # Custom middleware supporting headers
+    'apps.mobile_bff.middleware.CacheInvalidationMiddleware',  # One Today View cache flush per request
     # 'django_tenants.middleware.main.TenantMainMiddleware', # Replaced by above
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -367,6 +368,22 @@ else:
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 
+# Mobile BFF - Today View aggregation
+# 'threaded' runs the per-section fetchers concurrently on a bounded pool
+# (one DB connection per pool thread); 'serial' runs them on the request thread.
+TODAY_VIEW_EXECUTION_MODE = config('TODAY_VIEW_EXECUTION_MODE', default='threaded')
+TODAY_VIEW_MAX_WORKERS = config('TODAY_VIEW_MAX_WORKERS', default=8, cast=int)
+
+# Scheduling GAs - islands evolve on a process pool, one worker per island up
+# to the CPU count (also inside Celery workers); 'serial' evolves them in the
+# calling process.
+GA_ISLAND_EXECUTION_MODE = config('GA_ISLAND_EXECUTION_MODE', default='processes')
+
+# Bulk report cards - PDFs of a batch are rendered on a process pool this
+# wide, a chunk of students at a time (1 renders in the Celery worker itself)
+REPORT_CARD_PDF_WORKERS = config('REPORT_CARD_PDF_WORKERS', default=4, cast=int)
+REPORT_CARD_CHUNK_SIZE = config('REPORT_CARD_CHUNK_SIZE', default=50, cast=int)
+
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='localhost')
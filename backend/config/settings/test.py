@@ -22,6 +22,9 @@ PASSWORD_HASHERS = [
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Today View - run fetchers on the test thread so they see the test transaction
+TODAY_VIEW_EXECUTION_MODE = 'serial'
+
 # Email - Memory backend for tests
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
@@ -43,7 +43,7 @@ def django_db_setup(django_db_blocker):
         cmd.handle(run_syncdb=True, verbosity=0, interactive=False,
                    database='default', app_label=None, check_unapplied=False,
                    fake=False, fake_initial=False, plan=False,
-                   prune=False)
+                   prune=False, skip_checks=True)
 
 @pytest.fixture(scope='session')
 def django_db_keepdb():